@@ -4,7 +4,16 @@ import os
 
 # # Add the parent directory (root) to sys.path to verify imports work
 # sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from spell_checker.utils import SpellChecker
+from spell_checker.utils import SpellChecker, expected_error
+from lexer.Lexer import Lexer
+from grammar.Grammar import Message
+from grammar.SqlGrammar import SQL, statementEnd, stoppedAfter
+
+FORMAT = "Format: ALTER TABLE <table_name> <action> ..."
+ADD_FORMAT = "Format: ADD (COLUMN) <column_name> <data_type>"
+MODIFY_FORMAT = "Format: MODIFY (COLUMN) <column_name> <data_type>"
+DROP_FORMAT = "Format: DROP COLUMN <column_name>"
+TYPE_FORMAT = "Data type arguments are numbers, e.g. VARCHAR(255) or DECIMAL(10,2)."
 
 class AlterCommand:
     """
@@ -17,6 +26,46 @@ class AlterCommand:
     4. Providing meaningful error messages and suggestions.
     """
 
+    # Tokens legal at the points where validation can stop: suggestions
+    # are only looked for among these
+    ACTIONS = ("ADD", "DROP", "MODIFY")
+    TYPES = ("INT", "INTEGER", "VARCHAR", "CHAR", "TEXT", "DATE", "DATETIME", "DECIMAL", "FLOAT", "BOOLEAN")
+
+    # Errors of a statement the grammar stops in, by rule
+    MESSAGES = {
+        "alter": Message("Query must start with 'ALTER TABLE'.", FORMAT),
+        "alter_table": Message("Query must start with 'ALTER TABLE'.", FORMAT,
+                               missing="Invalid ALTER TABLE syntax."),
+        "alter_name": Message("Invalid or missing table name.", FORMAT),
+        "alter_actions": Message("Unknown sub-command '{token}'.",
+                                missing=("No actions specified for ALTER TABLE.",
+                                         "Specify an action like ADD, DROP, or MODIFY.")),
+        "next_action": Message("Unknown sub-command '{token}'.",
+                               missing=("Missing action after ','.", "Remove the trailing comma.")),
+        "add_column": Message("Incomplete ADD command.", ADD_FORMAT),
+        "add_name": Message("Incomplete ADD command.", ADD_FORMAT),
+        "add_type": Message("Incomplete ADD command.", ADD_FORMAT),
+        "modify_column": Message("Incomplete MODIFY command.", MODIFY_FORMAT),
+        "modify_name": Message("Incomplete MODIFY command.", MODIFY_FORMAT),
+        "modify_type": Message("Incomplete MODIFY command.", MODIFY_FORMAT),
+        "type_arguments": Message("Invalid data type argument '{token}'.", TYPE_FORMAT),
+        "next_argument": Message("Invalid data type argument '{token}'.", TYPE_FORMAT),
+        "drop_column": Message("Incomplete DROP command.", DROP_FORMAT),
+        "drop_name": Message("Incomplete DROP command.", DROP_FORMAT),
+        "drop_end": Message("Too many arguments for DROP command.", "Did you mean: DROP COLUMN {column}?"),
+    }
+
+    # Verb of each rule whose first word may be a misspelled COLUMN
+    COLUMN_RULES = {"drop_name": "DROP", "modify_name": "MODIFY"}
+
+    # What the name read by each rule names, and the format to suggest
+    NAMES = {
+        "alter_name": ("table", FORMAT),
+        "add_name": ("column", ADD_FORMAT),
+        "modify_name": ("column", MODIFY_FORMAT),
+        "drop_name": ("column", DROP_FORMAT),
+    }
+
     def __init__(self, query):
         """
         Initializes the AlterCommand with the query string.
@@ -28,196 +77,104 @@ class AlterCommand:
         self.errors = []
         self.suggestions = []
         self.table_name = None
-        # Basic regex to identify ALTER TABLE statements
-        # Matches: ALTER TABLE <table_name> <commands>
-        self.alter_pattern = re.compile(r"^ALTER\s+TABLE\s+(\w+)\s+(.+)$", re.IGNORECASE | re.DOTALL)
+        # Table names are plain words
+        self.name_pattern = re.compile(r"^\w+$")
         
         # Regex for supported data types (simplified for this exercise)
         # Matches types like INT, VARCHAR(255), DECIMAL(10,2), DATE, etc.
         self.type_pattern = re.compile(r"^(INT|INTEGER|VARCHAR\(\d+\)|CHAR\(\d+\)|TEXT|DATE|DATETIME|DECIMAL(\(\d+,\d+\))?|FLOAT|BOOLEAN)$", re.IGNORECASE)
 
     def analyse(self):
-        match = self.alter_pattern.match(self.query)
-
-        if not match:
-            first_words = self.query.split(maxsplit=2)
-
-            if len(first_words) > 0 and first_words[0].upper() != "ALTER":
-                suggestions = SpellChecker.check(first_words[0])
-                if suggestions:
-                    return {
-                        "error": "Query must start with 'ALTER TABLE'.",
-                        "suggestion": f"Did you mean '{suggestions[0]}'?"
-                    }
-
-            if len(first_words) > 1 and first_words[1].upper() != "TABLE":
-                suggestions = SpellChecker.check(first_words[1])
-                if suggestions:
-                    return {
-                        "error": "Query must start with 'ALTER TABLE'.",
-                        "suggestion": f"Did you mean '{suggestions[0]}'?"
-                    }
-
-            return {
-                "error": "Invalid ALTER TABLE syntax.",
-                "suggestion": "Format: ALTER TABLE <table_name> <action> ..."
-            }
-
-        self.table_name = match.group(1)
-        remaining_query = match.group(2).strip()
-
-        if self.table_name.upper() in [
-            "ADD", "DROP", "MODIFY", "ALTER", "TABLE",
-            "COLUMN", "CREATE", "INSERT", "UPDATE",
-            "DELETE", "SELECT"
-        ]:
-            return {
-                "error": "Invalid or missing table name.",
-                "suggestion": "Format: ALTER TABLE <table_name> <action> ..."
-            }
-
-        if not remaining_query or remaining_query == ";":
-            return {
-                "error": "No actions specified for ALTER TABLE.",
-                "suggestion": "Specify an action like ADD, DROP, or MODIFY."
-            }
+        return self.analyse_stream(Lexer.tokenize(self.query))
 
-        return self._process_commands(remaining_query)
-
-
-    def _process_commands(self, commands_str):
-        if commands_str.endswith(";"):
-            commands_str = commands_str[:-1]
+    def analyse_stream(self, stream):
+        """
+        Validates an already lexed ALTER TABLE statement.
 
-        commands = re.findall(r'(?:[^,()]|\([^()]*\))+', commands_str)
-        commands = [cmd.strip() for cmd in commands if cmd.strip()]
+        Args:
+            stream (TokenStream): Tokens of the query.
+        """
+        tokens = stream.tokens
+        texts = stream.texts
+
+        # Expected shape: ALTER TABLE <table_name> <action> [, <action>] ...
+        parse = SQL.parse("alter", tokens, stream.kinds, 0, statementEnd(tokens))
+
+        col_name = None
+        for rule, start, end in parse.spans:
+            if end is None:
+                continue
+
+            if rule == "alter_name":
+                result = self._validate_table_name(texts[start])
+            elif rule in self.COLUMN_RULES:
+                result = self._validate_column_keyword(stream, start, self.COLUMN_RULES[rule])
+                col_name = texts[start]
+            elif rule == "add_name":
+                result = None
+                col_name = texts[start]
+            elif rule in ("add_type", "modify_type"):
+                result = self._validate_type(texts[start:end], col_name)
+            else:
+                continue
 
-        for cmd in commands:
-            result = self._validate_single_command(cmd)
             if result:
                 return result
 
-        return None
-
-    def _validate_single_command(self, cmd):
-        parts = cmd.split()
-        if not parts:
-            return None
-
-        verb = parts[0].upper()
-
-        if verb == "ADD":
-            return self._handle_add(parts)
-        elif verb == "DROP":
-            return self._handle_drop(parts)
-        elif verb == "MODIFY":
-            return self._handle_modify(parts)
-        elif verb == "ALTER":
+        # ALTER [COLUMN] is a sub-command of other dialects
+        if not parse.ok and parse.index < parse.end and tokens[parse.index] == "alter":
             return {
-                "error": f"Unsupported sub-command '{verb}'.",
+                "error": "Unsupported sub-command 'ALTER'.",
                 "suggestion": "Use MODIFY COLUMN instead of ALTER COLUMN."
             }
-        else:
-            suggestions = SpellChecker.check(verb)
-            return {
-                "error": f"Unknown sub-command '{verb}'.",
-                "suggestion": f"Did you mean '{suggestions[0]}'?" if suggestions else None
-            }
-        
-    def _handle_add(self, parts):
-        idx = 2 if len(parts) > 1 and parts[1].upper() == "COLUMN" else 1
 
-        if len(parts) < idx + 2:
+        # Parentheses right after a name are not arguments of anything
+        rule = stoppedAfter(parse, self.NAMES)
+        if rule and tokens[parse.index] in ("(", ")"):
+            what, suggestion = self.NAMES[rule]
             return {
-                "error": "Incomplete ADD command.",
-                "suggestion": "Format: ADD (COLUMN) <column_name> <data_type>"
+                "error": f"Parentheses are not allowed after the {what} name.",
+                "suggestion": suggestion
             }
 
-        col_name = parts[idx]
-        data_type = " ".join(parts[idx + 1:])
-
-        return self._validate_type(data_type, col_name)
-
+        return parse.error(self.MESSAGES, texts, starts=stream.starts, column=col_name)
 
-
-    def _handle_drop(self, parts):
-        idx = 1
-        if len(parts) > 1:
-            if parts[1].upper() == "COLUMN":
-                idx = 2
-            else:
-                sugg = SpellChecker.check(parts[1])
-                if sugg and sugg[0] == "COLUMN":
-                    return {
-                        "error": "Invalid DROP syntax.",
-                        "suggestion": f"Did you mean 'COLUMN' instead of '{parts[1]}'?"
-                    }
-
-        if len(parts) < idx + 1:
+    def _validate_table_name(self, name):
+        if not self.name_pattern.match(name):
             return {
-                "error": "Incomplete DROP command.",
-                "suggestion": "Format: DROP COLUMN <column_name>"
-            }
-
-        if len(parts) > idx + 1:
-            return {
-                "error": "Too many arguments for DROP command.",
-                "suggestion": f"Did you mean: DROP COLUMN {parts[idx]}?"
+                "error": "Invalid ALTER TABLE syntax.",
+                "suggestion": FORMAT
             }
 
-        return None
+        self.table_name = name
 
-    def _handle_modify(self, parts):
-        idx = 1
-        if len(parts) > 1:
-            if parts[1].upper() == "COLUMN":
-                idx = 2
-            else:
-                sugg = SpellChecker.check(parts[1])
-                if sugg and sugg[0] == "COLUMN":
-                    return {
-                        "error": "Invalid MODIFY syntax.",
-                        "suggestion": f"Did you mean 'COLUMN' instead of '{parts[1]}'?"
-                    }
-
-        if len(parts) < idx + 2:
+        if self.table_name.upper() in [
+            "ADD", "DROP", "MODIFY", "ALTER", "TABLE",
+            "COLUMN", "CREATE", "INSERT", "UPDATE",
+            "DELETE", "SELECT"
+        ]:
             return {
-                "error": "Incomplete MODIFY command.",
-                "suggestion": "Format: MODIFY (COLUMN) <column_name> <data_type>"
+                "error": "Invalid or missing table name.",
+                "suggestion": FORMAT
             }
 
-        col_name = parts[idx]
-        data_type = " ".join(parts[idx + 1:])
-
-        return self._validate_type(data_type, col_name)
-
-
-    def _handle_alter_column(self, parts):
-        idx = 1
-        if len(parts) > 1 and parts[1].upper() == "COLUMN":
-            idx = 2
-
-        if len(parts) < idx + 1:
-            return {
-                "error": "Incomplete ALTER command.",
-                "suggestion": "Use: MODIFY COLUMN <column_name> <data_type>"
-            }
+        return None
 
-        return {
-            "error": "ALTER COLUMN is not supported.",
-            "suggestion": "Use MODIFY COLUMN for ANSI/MySQL compatibility."
-        }
+    def _validate_column_keyword(self, stream, start, verb):
+        # COLUMN or the column name may follow the verb; a near miss of
+        # COLUMN is taken for a typo
+        if stream.tokens[start - 1] != "column" and SpellChecker.expect(stream.texts[start], ["COLUMN"]):
+            return expected_error(f"Invalid {verb} syntax.", stream.texts[start], ["COLUMN"])
 
+        return None
 
     def _validate_type(self, data_type, col_name):
-        base_type = data_type.split()[0]
+        # Re-join the type with its arguments, e.g. VARCHAR ( 255 ) -> VARCHAR(255)
+        base_type = "".join(data_type)
 
         if not self.type_pattern.match(base_type):
-            suggestions = SpellChecker.check(base_type)
-            return {
-                "error": f"Invalid data type '{base_type}' for column '{col_name}'.",
-                "suggestion": f"Did you mean '{suggestions[0]}'?" if suggestions else None
-            }
+            return expected_error(
+                f"Invalid data type '{base_type}' for column '{col_name}'.", data_type[0], self.TYPES
+            )
 
         return None
-
@@ -4,16 +4,29 @@ import os
 
 # Add the parent directory (root) to sys.path to verify imports work
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from spell_checker.utils import SpellChecker
+from lexer.Lexer import Lexer
+from grammar.Grammar import Message
+from grammar.SqlGrammar import SQL, statementEnd
+
+FORMAT = "Format: DELETE FROM <table_name> [WHERE <condition>]"
+
 
 class DeleteCommand:
+    # Errors of a statement the grammar stops in, by rule
+    MESSAGES = {
+        "delete": Message("Query must start with DELETE."),
+        "delete_from": Message("Missing FROM keyword.", FORMAT),
+        "delete_table": Message("Invalid DELETE syntax.", FORMAT),
+        "delete_where": Message("Invalid DELETE syntax.", FORMAT),
+        "clause": Message("Invalid WHERE clause.", FORMAT,
+                          missing=("Empty WHERE clause.", "Specify a condition after WHERE.")),
+    }
+
     def __init__(self, query):
         self.query = query.strip()
         self.table_name = None
-        self.delete_pattern = re.compile(
-            r"^DELETE\s+FROM\s+(\w+)(?:\s+WHERE\s*(.*))?;?$",
-            re.IGNORECASE | re.DOTALL
-        )
+        # Table names are plain words
+        self.name_pattern = re.compile(r"^\w+$")
 
     def validate(self):
         if not self.query:
@@ -22,67 +35,40 @@ class DeleteCommand:
                 "suggestion": "Provide a DELETE statement."
             }
 
-        match = self.delete_pattern.match(self.query)
-
-        if not match:
-            first_word = self.query.split()[0].upper()
-
-            if first_word != "DELETE":
-                sugg = SpellChecker.check(first_word)
-                return {
-                    "error": "Query must start with DELETE.",
-                    "suggestion": f"Did you mean '{sugg[0]}'?" if sugg else None
-                }
-
-            if "FROM" not in self.query.upper():
-                return {
-                    "error": "Missing FROM keyword.",
-                    "suggestion": "Format: DELETE FROM <table_name> [WHERE <condition>]"
-                }
+        return self.validate_stream(Lexer.tokenize(self.query))
 
-            if self.query.upper().startswith("DELETE") and not re.search(
-                r"DELETE\s+FROM", self.query, re.IGNORECASE
-            ):
-                return {
-                    "error": "Invalid DELETE syntax.",
-                    "suggestion": "Did you forget the FROM keyword?"
-                }
+    def validate_stream(self, stream):
+        tokens = stream.tokens
+        texts = stream.texts
 
+        if not tokens:
             return {
-                "error": "Invalid DELETE syntax.",
-                "suggestion": "Format: DELETE FROM <table_name> [WHERE <condition>]"
-            }
-
-        self.table_name = match.group(1)
-        where_clause = match.group(2)
-
-        if self.table_name.upper() in {
-            "DELETE", "FROM", "WHERE", "SELECT",
-            "INSERT", "UPDATE", "TABLE", "DATABASE"
-        }:
-            return {
-                "error": "Invalid table name.",
-                "suggestion": f"Choose a different name than '{self.table_name}'."
+                "error": "Empty query.",
+                "suggestion": "Provide a DELETE statement."
             }
 
-        if where_clause is not None:
-            result = self._validate_where_clause(where_clause)
-            if result:
-                return result
-
-        return None
+        # Expected shape: DELETE FROM <table_name> [WHERE <condition>] [;]
+        parse = SQL.parse("delete", tokens, stream.kinds, 0, statementEnd(tokens))
 
-    def _validate_where_clause(self, where_clause):
-        where_clause = where_clause.strip()
+        for rule, start, end in parse.spans:
+            if rule != "delete_table" or end is None:
+                continue
 
-        if where_clause.endswith(";"):
-            where_clause = where_clause[:-1].strip()
+            if not self.name_pattern.match(texts[start]):
+                return {
+                    "error": "Invalid DELETE syntax.",
+                    "suggestion": FORMAT
+                }
 
-        if not where_clause:
-            return {
-                "error": "Empty WHERE clause.",
-                "suggestion": "Specify a condition after WHERE."
-            }
+            self.table_name = texts[start]
 
-        return None
+            if self.table_name.upper() in {
+                "DELETE", "FROM", "WHERE", "SELECT",
+                "INSERT", "UPDATE", "TABLE", "DATABASE"
+            }:
+                return {
+                    "error": "Invalid table name.",
+                    "suggestion": f"Choose a different name than '{self.table_name}'."
+                }
 
+        return parse.error(self.MESSAGES, texts, starts=stream.starts)
@@ -0,0 +1,360 @@
+"""
+Persistent, content-addressed cache of validation results.
+
+    from DiskCache import DiskCache
+
+    with DiskCache(".sqlcheck-cache", version=VALIDATOR_VERSION) as cache:
+        result = cache.get(text)              # (valid, message) or None
+        if result is None:
+            ...
+            cache.put(text, valid, message)
+
+Everything lives in one local sqlite3 file, in a single table of
+entries:
+
+- statement results, keyed by the hash of the statement text, the
+  validator version and the lexer options
+- file manifests: every statement of a script (offsets, line, result),
+  keyed by the hash of the file content, the validator version and the
+  splitter options, so an unchanged file is answered without splitting
+  or validating it
+- file stats (size, mtime) with the content hash they were seen with,
+  so an untouched file is not even read
+
+Entries of another validator version are never looked up again and
+age out. The file is kept under max_bytes by dropping the least
+recently used entries; an entry is "used" in the run that last read or
+wrote it.
+"""
+import hashlib
+import json
+import os
+import time
+
+try:
+    import sqlite3
+except ImportError:         # Python built without the sqlite3 module
+    sqlite3 = None
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key   BLOB PRIMARY KEY,
+    value BLOB,
+    size  INTEGER NOT NULL,
+    used  INTEGER NOT NULL
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS entries_used ON entries (used);
+CREATE TABLE IF NOT EXISTS meta (
+    name  TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+"""
+
+# Key prefixes of the three kinds of entries
+STATEMENT = b"s"
+MANIFEST = b"m"
+FILE = b"f"
+
+# Bytes counted for an entry besides its key and value (row and index
+# overhead, roughly)
+ENTRY_OVERHEAD = 32
+
+# A file modified this recently may change again within the same mtime
+# tick, so its stat is not trusted to mean "unchanged"
+RACY_SECONDS = 2
+
+# Writes are committed in batches of this many entries
+COMMIT_EVERY = 10000
+
+
+def digest(data):
+    """
+    Content hash used for keys: 16 bytes of BLAKE2b.
+    """
+    return hashlib.blake2b(data, digest_size=16).digest()
+
+
+class HashingReader:
+    """
+    Binary file wrapper hashing everything read through it, so a script
+    is hashed in the same pass that splits it.
+    """
+
+    def __init__(self, source):
+        self.source = source
+        self.hash = hashlib.blake2b(digest_size=16)
+
+    def read(self, size=-1):
+        chunk = self.source.read(size)
+        self.hash.update(chunk)
+        return chunk
+
+    def digest(self):
+        return self.hash.digest()
+
+
+class DiskCache:
+    """
+    sqlite3-backed cache of statement results and file manifests.
+
+    - path      : cache file (created if missing)
+    - version   : validator version; results of other versions are
+                  never served
+    - max_bytes : size the entries are pruned back to on close()
+
+    Use it as a context manager, or call close() to write the last
+    changes and prune. One process should write a cache file at a time;
+    others wait for its lock.
+    """
+
+    def __init__(self, path, version=None, max_bytes=256 << 20):
+        if sqlite3 is None:
+            raise ValueError("the disk cache needs the sqlite3 module")
+        if max_bytes < 1:
+            raise ValueError("max_bytes must be at least 1")
+
+        self.path = path
+        self.version = b"" if version is None else str(version).encode()
+        self.max_bytes = max_bytes
+
+        try:
+            self.db = sqlite3.connect(path, timeout=60)
+            self.db.executescript(SCHEMA)
+        except sqlite3.Error as err:
+            raise OSError(f"cannot open cache file {path}: {err}") from err
+
+        # This run's number; entries read or written now get it
+        db = self.db
+        row = db.execute("SELECT value FROM meta WHERE name = 'run'").fetchone()
+        self.run = (row[0] if row else 0) + 1
+        db.execute("INSERT OR REPLACE INTO meta VALUES ('run', ?)", (self.run,))
+        db.commit()
+
+        self.bytes = db.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+
+        self.touched = set()        # keys read this run, marked used on flush
+        self.written = 0            # writes since the last commit
+
+        self.hits = 0
+        self.misses = 0
+        self.files_skipped = 0
+
+    # ---------------------------------------------------------
+    # Entries
+    # ---------------------------------------------------------
+
+    def _get(self, key):
+        row = self.db.execute("SELECT value FROM entries WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        self.touched.add(key)
+        return row[0]
+
+    def _put(self, key, value):
+        size = len(key) + len(value) + ENTRY_OVERHEAD
+        db = self.db
+        old = db.execute("SELECT size FROM entries WHERE key = ?", (key,)).fetchone()
+        db.execute("INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?)", (key, value, size, self.run))
+        self.bytes += size - (old[0] if old else 0)
+
+        self.written += 1
+        if self.written >= COMMIT_EVERY:
+            self.flush()
+
+    # ---------------------------------------------------------
+    # Statements
+    # ---------------------------------------------------------
+
+    def _statement_key(self, text, options):
+        key = STATEMENT + digest(text.encode("utf-8", "surrogatepass")) + self.version
+        return key + b"|" + options.encode() if options else key
+
+    def get(self, text, options=""):
+        """
+        (valid, message) stored for a statement text validated with
+        these lexer options, or None.
+        """
+        value = self._get(self._statement_key(text, options))
+        if value is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        if not value:
+            return True, None
+        return False, value.decode("utf-8", "surrogatepass")
+
+    def put(self, text, valid, message=None, options=""):
+        """
+        Stores the result of a statement (message: error text of an
+        invalid one).
+        """
+        value = b"" if valid else (message or "invalid").encode("utf-8", "surrogatepass")
+        self._put(self._statement_key(text, options), value)
+
+    # ---------------------------------------------------------
+    # Files
+    # ---------------------------------------------------------
+
+    def file_digest(self, path):
+        """
+        Content hash of a file. A file whose size and mtime are those
+        recorded with its last hash is not read again.
+        """
+        stat = os.stat(path)
+        key = FILE + os.fsencode(os.path.abspath(path))
+        signature = f"{stat.st_size}:{stat.st_mtime_ns}".encode()
+
+        value = self._get(key)
+        if value is not None:
+            seen, _, known = value.partition(b"=")
+            if seen == signature:
+                return known
+
+        hasher = hashlib.blake2b(digest_size=16)
+        with open(path, "rb") as source:
+            for chunk in iter(lambda: source.read(1 << 20), b""):
+                hasher.update(chunk)
+        content = hasher.digest()
+
+        self.remember_file(path, content, stat)
+        return content
+
+    def remember_file(self, path, content, stat=None):
+        """
+        Records the content hash of a file with its current size and
+        mtime. Files modified in the last RACY_SECONDS are not recorded:
+        a change within the same mtime tick would go unnoticed.
+        """
+        stat = stat or os.stat(path)
+        if stat.st_mtime_ns > time.time_ns() - RACY_SECONDS * 10 ** 9:
+            return
+        signature = f"{stat.st_size}:{stat.st_mtime_ns}".encode()
+        self._put(FILE + os.fsencode(os.path.abspath(path)), signature + b"=" + content)
+
+    def _manifest_key(self, content, options):
+        return MANIFEST + content + self.version + b"|" + options.encode()
+
+    def manifest(self, content, options=""):
+        """
+        Results stored for a script with this content hash and splitter
+        options: a list of (start, end, line, valid, message) per
+        statement, or None.
+        """
+        value = self._get(self._manifest_key(content, options))
+        if value is None:
+            return None
+
+        self.files_skipped += 1
+        data = json.loads(value)
+        messages = data["messages"]
+        flat = data["statements"]
+        results = []
+        for k in range(0, len(flat), 4):
+            number = flat[k + 3]
+            results.append((flat[k], flat[k + 1], flat[k + 2], number < 0, messages[number] if number >= 0 else None))
+        return results
+
+    def put_manifest(self, content, results, options=""):
+        """
+        Stores the results of every statement of a script, as returned
+        by manifest(). Each distinct error message is stored once.
+        """
+        numbers = {}
+        flat = []
+        for start, end, line, valid, message in results:
+            number = -1
+            if not valid:
+                number = numbers.setdefault(message, len(numbers))
+            flat += (start, end, line, number)
+
+        value = json.dumps({"statements": flat, "messages": list(numbers)}, separators=(",", ":"))
+        self._put(self._manifest_key(content, options), value.encode())
+
+    # ---------------------------------------------------------
+    # Maintenance
+    # ---------------------------------------------------------
+
+    def flush(self):
+        """
+        Marks the entries read since the last flush as used in this run
+        and commits.
+        """
+        if self.touched:
+            self.db.executemany("UPDATE entries SET used = ? WHERE key = ?",
+                                ((self.run, key) for key in self.touched))
+            self.touched.clear()
+        self.db.commit()
+        self.written = 0
+
+    def prune(self, max_bytes=None):
+        """
+        Drops least recently used entries until the cache holds at most
+        max_bytes (default: the cache's limit). Returns the number of
+        entries dropped.
+        """
+        limit = self.max_bytes if max_bytes is None else max_bytes
+        self.flush()
+
+        db = self.db
+        dropped = 0
+        while self.bytes > limit:
+            rows = db.execute("SELECT key, size FROM entries ORDER BY used LIMIT 1000").fetchall()
+            if not rows:
+                break
+
+            batch = []
+            for key, size in rows:
+                batch.append((key,))
+                self.bytes -= size
+                if self.bytes <= limit:
+                    break
+
+            db.executemany("DELETE FROM entries WHERE key = ?", batch)
+            dropped += len(batch)
+
+        db.commit()
+        return dropped
+
+    def clear(self):
+        self.db.execute("DELETE FROM entries")
+        self.db.commit()
+        self.touched.clear()
+        self.bytes = 0
+
+    def close(self):
+        """
+        Commits, prunes to max_bytes and closes the file.
+        """
+        if self.db is None:
+            return
+        self.prune()
+        self.db.close()
+        self.db = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return self.db.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+    def info(self):
+        """
+        Counters and size as a dict.
+        """
+        lookups = self.hits + self.misses
+        return {
+            "version": self.version.decode(),
+            "run": self.run,
+            "entries": len(self),
+            "bytes": self.bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "files_skipped": self.files_skipped,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
@@ -0,0 +1,174 @@
+"""
+Validation of many statements on a process pool.
+
+    from ParallelValidator import validate_parallel
+
+    for valid, message in validate_parallel(statements, workers=8, chunksize=256):
+        ...
+
+Statements go to the workers in chunks of plain text. Each worker
+process warms up once (imports, validator instances, regex caches) and
+validates every chunk it receives with the same QueryParser. It sends
+back only the positions of the invalid statements of a chunk and each
+distinct error text once, so a valid statement costs nothing on the
+way back and a repeated error is sent once per chunk.
+"""
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+from QueryParser import QueryParser
+
+
+# One statement of every type, run once per worker so the first real
+# chunk does not pay for lazy initialisation
+WARM_UP = (
+    "SELECT a, COUNT(b) FROM t JOIN u ON t.id = u.id WHERE a > 1 GROUP BY a HAVING COUNT(b) > 1 ORDER BY a LIMIT 5;",
+    "INSERT INTO t (a, b) VALUES (1, 'x');",
+    "UPDATE t SET a = 1 WHERE b = 2;",
+    "DELETE FROM t WHERE a = 1;",
+    "ALTER TABLE t ADD COLUMN c INT;",
+    "CREATE TABLE t (a INT PRIMARY KEY, b VARCHAR(10));",
+    "DROP TABLE t;",
+    "TRUNCATE TABLE t;",
+    "COMMIT;",
+)
+
+# Parser of this worker process, set by warm_up
+_parser = None
+
+
+def describe(err):
+    """
+    One-line text of a validator error.
+    """
+    if isinstance(err, dict):
+        return "; ".join(
+            f"{key}: {', '.join(value) if isinstance(value, list) else value}"
+            for key, value in err.items() if value
+        )
+    if isinstance(err, (set, list, tuple)):
+        return "; ".join(map(str, err))
+    return str(err)
+
+
+def warm_up():
+    """
+    Worker initializer: builds the process's parser and runs it once
+    over every statement type.
+    """
+    global _parser
+    _parser = QueryParser("")
+    for query in WARM_UP:
+        _parser.validate(query)
+
+
+def validate_chunk(texts, backslashEscapes=False):
+    """
+    Worker task: validates a chunk of statements. Returns
+    (failures, messages): failures is a flat tuple of
+    (position in chunk, message number) pairs for the invalid
+    statements, messages the distinct error texts of the chunk.
+    """
+    if _parser is None:
+        warm_up()
+
+    _parser.backslashEscapes = backslashEscapes
+
+    validate = _parser.validate
+    failures = []
+    numbers = {}
+    for i, text in enumerate(texts):
+        err = validate(text)
+        if err is not None:
+            message = describe(err)
+            number = numbers.get(message)
+            if number is None:
+                number = numbers[message] = len(numbers)
+            failures += (i, number)
+    return tuple(failures), tuple(numbers)
+
+
+def available_cores():
+    """
+    Cores this process may run on (honours CPU affinity where the
+    platform reports it).
+    """
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def make_pool(workers=None):
+    """
+    Process pool whose workers are warmed up on start. Pass it to
+    validate_parallel to keep the workers across calls.
+    """
+    return ProcessPoolExecutor(max_workers=workers or available_cores(), initializer=warm_up)
+
+
+def _expand(size, result):
+    """
+    (valid, message) for every statement of a chunk.
+    """
+    failures, messages = result
+    results = [(True, None)] * size
+    for k in range(0, len(failures), 2):
+        results[failures[k]] = (False, messages[failures[k + 1]])
+    return results
+
+
+def validate_parallel(statements, workers=None, chunksize=256, pool=None, backslashEscapes=False):
+    """
+    Validates an iterable of SQL statements on worker processes,
+    yielding (valid, message) for each in input order; message is None
+    for a valid statement.
+
+    - workers   : pool size (default: every core available); 1 runs in
+                  this process
+    - chunksize : statements sent to a worker per task
+    - pool      : executor from make_pool to reuse instead of starting
+                  one for this call (workers then only sizes the
+                  number of chunks in flight)
+    - backslashEscapes : lex backslashes in literals as escapes (MySQL)
+
+    The input is read lazily and at most two chunks per worker are in
+    flight, so memory stays bounded for any input length.
+    """
+    if chunksize < 1:
+        raise ValueError("chunksize must be at least 1")
+
+    statements = iter(statements)
+    chunks = iter(lambda: list(islice(statements, chunksize)), [])
+
+    if pool is None:
+        workers = workers or available_cores()
+        if workers <= 1:
+            for chunk in chunks:
+                yield from _expand(len(chunk), validate_chunk(chunk, backslashEscapes))
+            return
+
+        with make_pool(workers) as pool:
+            yield from _dispatch(pool, chunks, workers, backslashEscapes)
+        return
+
+    yield from _dispatch(pool, chunks, workers or available_cores(), backslashEscapes)
+
+
+def _dispatch(pool, chunks, workers, backslashEscapes=False):
+    """
+    Submits chunks to the pool, keeping 2 * workers in flight, and
+    yields their results in submission order.
+    """
+    pending = deque()
+
+    for chunk in chunks:
+        pending.append((len(chunk), pool.submit(validate_chunk, chunk, backslashEscapes)))
+        if len(pending) >= 2 * workers:
+            size, future = pending.popleft()
+            yield from _expand(size, future.result())
+
+    while pending:
+        size, future = pending.popleft()
+        yield from _expand(size, future.result())
@@ -0,0 +1,336 @@
+"""
+Validation of parameterized query templates.
+
+    from PreparedQuery import prepare
+
+    query = prepare("SELECT name FROM users WHERE id = ? AND status = ?;")
+    ...
+    err = query.check((42, "active"))        # None if the call is valid
+
+prepare parses and validates a template once. check then only verifies
+that the parameters fit the placeholders: their number (or names) and
+the kind of literal each value becomes (integer, negative integer,
+decimal, negative decimal, string, NULL). Which kinds a placeholder
+accepts is worked out by prepare, by validating the template with each
+kind of literal in that place. Kinds accepted one at a time may still
+not fit together, so the first check of every combination of kinds
+validates that exact combination; its result is kept for later calls.
+
+Placeholder styles, one per template:
+- ?      positional, bound from a sequence in order
+- $1     numbered (1-based), bound from a sequence; a number may repeat
+- :name  named, bound from a mapping; a name may repeat
+"""
+import datetime
+import decimal
+import math
+import re
+from collections.abc import Mapping
+from itertools import product
+
+from QueryParser import QueryParser
+
+
+# Placeholders, found outside comments, string literals and quoted
+# identifiers (the other alternatives consume those whole, as in the
+# Lexer)
+PLACEHOLDER_PATTERN = re.compile(r"""
+      --[^\n]*
+    | /\*[^*]*\*+(?:[^/*][^*]*\*+)*/
+    | '[^']*'?
+    | "[^"]*"?
+    | `[^`]*`?
+    | (?P<positional>\?)
+    | (?<![\w$])\$(?P<number>\d+)
+    | (?<![:\w]):(?P<name>[^\W\d]\w*)
+""", re.VERBOSE)
+
+# Literal kinds of parameter values
+NUMBER = "integer"
+NEGATIVE_NUMBER = "negative integer"
+DECIMAL = "decimal"
+NEGATIVE_DECIMAL = "negative decimal"
+STRING = "string"
+NULL = "null"
+
+KINDS = (NUMBER, NEGATIVE_NUMBER, DECIMAL, NEGATIVE_DECIMAL, STRING, NULL)
+
+# Values bound as strings by database drivers
+STRING_TYPES = (str, bytes, bytearray, datetime.date, datetime.time)
+
+# Templates with more placeholders than this are only tried with every
+# placeholder an integer or every placeholder a string
+MAX_SEARCHED_PARAMETERS = 10
+
+
+def _sample(kind, n):
+    """
+    Literal of the given kind standing for parameter n. Parameters get
+    distinct values, so the template is not validated as if two
+    parameters were always equal.
+    """
+    if kind == NUMBER:
+        return str(n)
+    if kind == NEGATIVE_NUMBER:
+        return f"-{n}"
+    if kind == DECIMAL:
+        return f"{n}.5"
+    if kind == NEGATIVE_DECIMAL:
+        return f"-{n}.5"
+    if kind == STRING:
+        return f"'p{n}'"
+    return "NULL"
+
+
+def literalKind(value):
+    """
+    Literal kind a parameter value is bound as, or None if its type is
+    not supported.
+    """
+    if value is None:
+        return NULL
+    if isinstance(value, STRING_TYPES):
+        return STRING
+    if isinstance(value, int):              # bool included, bound as 1 / 0
+        return NUMBER if value >= 0 else NEGATIVE_NUMBER
+    if isinstance(value, float):
+        if not math.isfinite(value):
+            return None
+    elif isinstance(value, decimal.Decimal):
+        if not value.is_finite():
+            return None
+    else:
+        return None
+    return DECIMAL if value >= 0 else NEGATIVE_DECIMAL
+
+
+class PreparedQuery:
+    """
+    A template validated once by prepare().
+
+    - template   : template text
+    - style      : "?", "$" or ":" (None without placeholders)
+    - parameters : parameter keys in binding order: positions for "?"
+                   and "$", names for ":"
+    - accepted   : parameter key -> frozenset of literal kinds it takes
+    - error      : error of the template itself, None if it is valid
+                   for at least one kind of every parameter
+    - combinations : tuple of kinds (in parameter order) -> error of
+                   the template with literals of those kinds, None if
+                   valid; filled in by prepare and by check
+    """
+
+    def __init__(self, template, style, parameters, accepted, error,
+                 combinations=None, validate=None):
+        self.template = template
+        self.style = style
+        self.parameters = parameters
+        self.accepted = accepted
+        self.error = error
+        self.combinations = combinations if combinations is not None else {}
+        self.validate = validate    # kinds tuple -> validator error
+
+    @property
+    def valid(self):
+        return self.error is None
+
+    def check(self, params=()):
+        """
+        Verifies one set of parameters: a sequence for "?" and "$"
+        templates, a mapping for ":" templates (keys not in the
+        template are ignored). Returns None if the call is valid,
+        otherwise an error dict.
+        """
+        if self.error is not None:
+            return self.error
+
+        accepted = self.accepted
+
+        if self.style == ":" or (self.style is None and isinstance(params, Mapping)):
+            try:
+                values = [(name, params[name]) for name in self.parameters]
+            except KeyError as missing:
+                return {
+                    "error": "Missing parameter",
+                    "parameter": missing.args[0],
+                }
+            except TypeError:
+                return {
+                    "error": "Named placeholders need a mapping of parameters",
+                }
+        else:
+            if isinstance(params, (str, bytes, Mapping)) or not hasattr(params, "__len__"):
+                return {
+                    "error": "Positional placeholders need a sequence of parameters",
+                }
+            if len(params) != len(self.parameters):
+                return {
+                    "error": "Wrong number of parameters",
+                    "expected": len(self.parameters),
+                    "got": len(params),
+                }
+            values = enumerate(params, start=1)
+
+        kinds = []
+        for key, value in values:
+            kind = literalKind(value)
+            if kind not in accepted[key]:
+                return {
+                    "error": "Parameter not allowed here" if kind else "Unsupported parameter type",
+                    "parameter": key,
+                    "kind": kind or type(value).__name__,
+                    "accepted": sorted(accepted[key], key=KINDS.index),
+                }
+            kinds.append(kind)
+
+        kinds = tuple(kinds)
+        try:
+            err = self.combinations[kinds]
+        except KeyError:
+            err = self.combinations[kinds] = self.validate(kinds)
+
+        if err is not None:
+            return {
+                "error": "Parameters not allowed together",
+                "kinds": list(kinds),
+                "why": err,
+            }
+        return None
+
+    def __repr__(self):
+        return f"PreparedQuery({self.template!r}, valid={self.valid})"
+
+
+def placeholders(template):
+    """
+    (style, [(start, end, key), ...]) of the placeholders of a template.
+    style is None without placeholders; a ValueError names mixed styles
+    and $0.
+    """
+    style = None
+    found = []
+    count = 0
+
+    for match in PLACEHOLDER_PATTERN.finditer(template):
+        kind = match.lastgroup
+        if kind is None:
+            continue
+
+        if kind == "positional":
+            current = "?"
+            count += 1
+            key = count
+        elif kind == "number":
+            current = "$"
+            key = int(match.group("number"))
+            if key < 1:
+                raise ValueError("numbered placeholders start at $1")
+        else:
+            current = ":"
+            key = match.group("name")
+
+        if style is None:
+            style = current
+        elif current != style:
+            raise ValueError(f"mixed placeholder styles {style!r} and {current!r}")
+
+        found.append((match.start(), match.end(), key))
+
+    return style, found
+
+
+def prepare(template, parser=None):
+    """
+    Parses and validates a parameterized template, returning a
+    PreparedQuery whose check(params) verifies each call.
+
+    The template is validated with literals in place of its
+    placeholders: first with every parameter an integer, then a string,
+    then mixes of both; a template no assignment makes valid keeps the
+    error of the all-integer attempt. From a valid assignment, every
+    other kind is tried for each parameter in turn. Other combinations
+    are validated by check, the first time they are used.
+
+    parser: optional QueryParser to validate with (its validators are
+    reused; the query type is not printed).
+    """
+    parser = parser or QueryParser("")
+
+    try:
+        style, found = placeholders(template)
+    except ValueError as err:
+        return PreparedQuery(template, None, (), {}, {
+            "error": "Invalid placeholders",
+            "why": str(err),
+        })
+
+    if style == "$":
+        parameters = tuple(range(1, max(key for _, _, key in found) + 1))
+        missing = sorted(set(parameters) - {key for _, _, key in found})
+        if missing:
+            return PreparedQuery(template, style, parameters, {}, {
+                "error": "Invalid placeholders",
+                "why": f"${missing[0]} is never used",
+            })
+    else:
+        parameters = tuple(dict.fromkeys(key for _, _, key in found))
+
+    # Parameter keys -> position, used to number the sample literals
+    numbers = {key: n for n, key in enumerate(parameters, start=1)}
+
+    def validate(choice):
+        kinds = dict(zip(parameters, choice))
+        parts = []
+        last = 0
+        for start, end, key in found:
+            parts.append(template[last:start])
+            parts.append(_sample(kinds[key], numbers[key]))
+            last = end
+        parts.append(template[last:])
+        return parser.validate("".join(parts))
+
+    # Every combination validated, including the failed ones
+    combinations = {}
+
+    def tried(choice):
+        combinations[choice] = validate(choice)
+        return combinations[choice]
+
+    base = None
+    firstError = None
+    for choice in _assignments(len(parameters)):
+        err = tried(choice)
+        if err is None:
+            base = choice
+            break
+        if firstError is None:
+            firstError = err
+
+    if base is None:
+        return PreparedQuery(template, style, parameters, {}, firstError)
+
+    accepted = {}
+    for i, key in enumerate(parameters):
+        kinds = set()
+        for kind in KINDS:
+            if kind == base[i] or tried(base[:i] + (kind,) + base[i + 1:]) is None:
+                kinds.add(kind)
+        accepted[key] = frozenset(kinds)
+
+    return PreparedQuery(template, style, parameters, accepted, None, combinations, validate)
+
+
+def _assignments(count):
+    """
+    Integer / string kinds to try for `count` parameters, most common
+    first.
+    """
+    yield (NUMBER,) * count
+    if not count:
+        return
+    yield (STRING,) * count
+    if count > MAX_SEARCHED_PARAMETERS:
+        return
+    for choice in product((NUMBER, STRING), repeat=count):
+        if NUMBER in choice and STRING in choice:
+            yield choice
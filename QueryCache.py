@@ -0,0 +1,147 @@
+import re
+import threading
+from collections import OrderedDict
+
+
+# Parts of a query kept verbatim by normalize(): string literals, quoted
+# identifiers and comments (a -- comment keeps its newline, so it never
+# swallows the next line)
+VERBATIM_PATTERN = re.compile(r"""('[^']*'?|"[^"]*"?|`[^`]*`?|--[^\n]*\n?|/\*.*?\*/)""", re.DOTALL)
+
+
+class QueryCache:
+    """
+    Thread-safe, size-bounded LRU cache of validation results.
+
+    Keys are normalized query texts (see normalize), so queries that
+    differ only in whitespace or keyword/identifier case share one
+    entry. Each entry holds what QueryParser.analyse needs to answer
+    again: the query type it printed and the error (None if valid).
+    A QueryParser templates cache uses the same class with query shapes
+    (lexer.Fingerprint.shape) as keys and query types as entries.
+
+    Entries belong to one validator version; looking up with another
+    version empties the cache first, so results of older validators are
+    never served.
+
+    Counters: hits, misses, evictions (entries dropped for size) and
+    invalidations (version changes).
+
+    Verdicts never depend on the normalized differences, but an error
+    that quotes the query (e.g. "Invalid table name 'Users'") shows it
+    as written in the query that filled the entry. Cached error dicts
+    are shared between hits and must be treated as read-only.
+    """
+
+    def __init__(self, maxsize=4096, version=None):
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+
+        self.maxsize = maxsize
+        self.version = version
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def normalize(query):
+        """
+        Cache key of a query: outside literals, quoted identifiers and
+        comments, whitespace runs become one space and text is
+        lowercased.
+        """
+        parts = VERBATIM_PATTERN.split(query.strip())
+
+        # Odd positions are the verbatim parts
+        for i in range(0, len(parts), 2):
+            part = parts[i]
+            if part:
+                parts[i] = _collapse(part).lower()
+
+        return "".join(parts)
+
+    def get(self, key, version=None):
+        """
+        Entry stored for key, or None. A version other than the cache's
+        clears it first.
+        """
+        with self.lock:
+            if version != self.version:
+                self._invalidate(version)
+
+            entry = self.entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key, entry, version=None):
+        """
+        Stores an entry, evicting the least recently used ones beyond
+        maxsize. Entries of a version other than the cache's are not
+        stored.
+        """
+        with self.lock:
+            if version != self.version:
+                return
+
+            entries = self.entries
+            entries[key] = entry
+            entries.move_to_end(key)
+
+            while len(entries) > self.maxsize:
+                entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+    def _invalidate(self, version):
+        # A new cache adopts the first version it is used with
+        if self.version is not None or self.entries:
+            self.invalidations += 1
+        self.entries.clear()
+        self.version = version
+
+    def __len__(self):
+        return len(self.entries)
+
+    def info(self):
+        """
+        Counters and size as a dict.
+        """
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {
+                "version": self.version,
+                "size": len(self.entries),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+
+def _collapse(text):
+    """
+    text with every whitespace run replaced by one space (str.split is
+    several times faster than a regex substitution here).
+    """
+    collapsed = " ".join(text.split())
+    if not collapsed:
+        return " "
+    if text[0].isspace():
+        collapsed = " " + collapsed
+    if text[-1].isspace():
+        collapsed += " "
+    return collapsed
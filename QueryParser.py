@@ -1,3 +1,6 @@
+import time
+from collections import deque
+
 from select_module.selectParser import SelectParser
 from Alter_module.alter import AlterCommand
 from Delete_module.delete import DeleteCommand
@@ -8,19 +11,70 @@ from truncate.TruncateDDL import TruncateDDL
 from drop.DropDDL import DropDDL
 from tcl.tcl_validator import TCLValidator
 from select_module.helper.utils import spell_check_tokens
+from spell_checker.utils import expected_error
+from lexer.Lexer import Lexer
+from lexer.ByteLexer import ByteLexer
+from lexer.ScriptSplitter import ScriptSplitter, openMapped
+from lexer.Fingerprint import shape
+from QueryCache import QueryCache
+
+
+# Version of the validators' behaviour. Cached results (QueryCache) are
+# only served for the version they were computed with, so bump this
+# whenever a validator starts accepting or rejecting different queries.
+VALIDATOR_VERSION = "10"
+
+
+class BatchStats:
+    """
+    Running totals of one QueryParser.analyse_many run.
+
+    Only time spent validating is counted, not the time the caller
+    spends between results.
+    """
+
+    def __init__(self):
+        self.statements = 0
+        self.invalid = 0
+        self.elapsed = 0.0
+
+    @property
+    def valid(self):
+        return self.statements - self.invalid
+
+    @property
+    def rate(self):
+        """
+        Statements validated per second.
+        """
+        return self.statements / self.elapsed if self.elapsed else 0.0
+
+    def summary(self):
+        return (
+            f"{self.statements:,} statements "
+            f"({self.valid:,} valid, {self.invalid:,} invalid) "
+            f"in {self.elapsed:.2f} s, {self.rate:,.0f} statements/s"
+        )
+
 
 class QueryParser:
     """
     Top-level SQL query parser and dispatcher.
 
     Responsibilities:
-    - Tokenize raw SQL input
+    - Tokenize raw SQL input (once; the stream is cached and shared)
     - Validate query-level syntax (semicolon, empty query)
     - Route query to the appropriate statement parser
     """
 
-    def __init__(self, query):
+    def __init__(self, query, cache=None, templates=None, backslashEscapes=False):
         self.query = query
+        self.stream = None             # cached TokenStream
+        self.backslashEscapes = backslashEscapes  # backslash escapes in literals (MySQL)
+        self.validators = {}           # validator class -> reused instance
+        self.cache = cache             # optional QueryCache of results
+        self.templates = templates     # optional QueryCache of valid shapes
+        self.queryType = None          # statement type found by dispatch
 
         # Supported SQL statement types
         self.queryTypes = [
@@ -40,84 +94,267 @@ class QueryParser:
         """
         Converts raw SQL string into a list of tokens.
 
-        Rules:
-        - Identifiers are lowercased
+        Rules (see Lexer):
+        - Identifiers and keywords are lowercased
         - Operators are grouped (<=, >=, !=)
+        - String literals and quoted identifiers are single tokens
         - Symbols are emitted as standalone tokens
         - Whitespace is ignored
+
+        The query is lexed only once; later calls reuse the stream.
+        """
+        if self.stream is None:
+            self.stream = Lexer.tokenize(self.query, self.backslashEscapes)
+        return self.stream.tokens
+
+    def validator(self, cls, *args):
+        """
+        Validator instance for one statement type, created on first use
+        and reused by later statements of the same type.
+
+        Command validators that take the query text get the current
+        text on every reuse.
+        """
+        parser = self.validators.get(cls)
+        if parser is None:
+            parser = self.validators[cls] = cls(*args)
+        elif args:
+            parser.query = args[0].strip()
+        return parser
+
+    def validate(self, query):
+        """
+        Validates another query with this parser, reusing its
+        validators; the query type is not printed.
+        """
+        self.query = query
+        self.stream = None
+        return self.analyse(echo=False)
+
+    @classmethod
+    def analyse_many(cls, queries, stats=None, cache=None, templates=None, backslashEscapes=False):
+        """
+        Validates a stream of queries, yielding (query, error) pairs in
+        input order; error is None for a valid query.
+
+        - queries   : any iterable of strings; it is read lazily, so a
+                      generator over a large file is never materialized
+        - stats     : optional BatchStats, updated as results are yielded
+        - cache     : optional QueryCache consulted before validating
+        - templates : optional QueryCache of query shapes known to be
+                      valid (see analyse)
+        - backslashEscapes : lex backslashes in literals as escapes
+                      (MySQL)
+
+        One parser and one validator per statement type serve the whole
+        batch, and the query type is not printed.
+        """
+        parser = cls("", cache, templates, backslashEscapes)
+        clock = time.perf_counter
+
+        for query in queries:
+            start = clock()
+            err = parser.validate(query)
+
+            if stats is not None:
+                stats.elapsed += clock() - start
+                stats.statements += 1
+                if err:
+                    stats.invalid += 1
+
+            yield query, err
+
+    @classmethod
+    def analyse_script(cls, source, stats=None, **options):
         """
-        sql = self.query.strip()
-        tokens = []
-        word = ""
-        i = 0
+        Validates every statement of a SQL script (migration file, dump)
+        read incrementally from a file object, yielding
+        (Statement, error) pairs; each Statement carries its byte offset
+        and line number.
 
-        OP_CHARS = set("<>!=")
+        options are passed to ScriptSplitter (backend, chunkSize,
+        backslashEscapes, encoding); backslashEscapes also applies to
+        lexing the statements.
+        """
+        pending = deque()
 
-        while i < len(sql):
-            ch = sql[i]
+        def texts():
+            for statement in ScriptSplitter(source, **options):
+                pending.append(statement)
+                yield statement.text
 
-            # Build identifiers (letters, digits, underscore)
-            if ch.isalnum() or ch == "_":
-                word += ch
-                i += 1
-                continue
+        for _, err in cls.analyse_many(texts(), stats, backslashEscapes=options.get("backslashEscapes", False)):
+            yield pending.popleft(), err
 
-            # Flush accumulated identifier
-            if word:
-                tokens.append(word.lower())
-                word = ""
+    @classmethod
+    def analyse_mapped(cls, path, stats=None, templates=None, **options):
+        """
+        Validates every statement of a SQL file through a memory map,
+        yielding (Statement, error) pairs like analyse_script.
 
-            # Operator token (possibly multi-character)
-            if ch in OP_CHARS:
-                op = ch
-                i += 1
-                while i < len(sql) and sql[i] in OP_CHARS:
-                    op += sql[i]
-                    i += 1
-                tokens.append(op)
-                continue
+        The map is split in place and only the statement being validated
+        is decoded, so resident memory stays flat whatever the size of
+        the dump. With a templates cache, statements are lexed in place
+        (ByteLexer) and those of a shape already found valid are
+        answered without decoding their literals; their Statement.text
+        is None.
 
-            # Single-character tokens
-            if ch in {",", "(", ")", ";", "*", "+", "-", "/", "%", "."}:
-                tokens.append(ch)
-                i += 1
-                continue
+        options are passed to ScriptSplitter (backend, backslashEscapes,
+        encoding); backslashEscapes also applies to lexing the
+        statements.
+        """
+        escapes = options.get("backslashEscapes", False)
+        parser = cls("", templates=templates, backslashEscapes=escapes)
+        encoding = options.get("encoding", "utf-8")
+        clock = time.perf_counter
 
-            # Ignore whitespace and unknown characters
-            i += 1
+        with openMapped(path) as script:
+            for statement in ScriptSplitter(script, decode=templates is None, **options):
+                start = clock()
+                if templates is None:
+                    err = parser.validate(statement.text)
+                else:
+                    tokens = ByteLexer.tokenize(script, statement.start, statement.end, encoding, escapes)
+                    err = parser.validate_bytes(tokens)
 
-        # Flush trailing identifier
-        if word:
-            tokens.append(word.lower())
+                if stats is not None:
+                    stats.elapsed += clock() - start
+                    stats.statements += 1
+                    if err:
+                        stats.invalid += 1
 
-        return tokens
+                yield statement, err
 
-    def analyse(self):
+    def validate_bytes(self, tokens):
+        """
+        Validates a statement lexed by ByteLexer; the query type is not
+        printed. A statement whose shape is in the templates cache is
+        answered from its byte tokens; any other is decoded and
+        validated like validate(). The QueryCache, keyed by the query
+        text, is not consulted.
+        """
+        templates = self.templates
+        key = None
+        if templates is not None:
+            key = shape(tokens)
+            queryType = templates.get(key, VALIDATOR_VERSION)
+            if queryType is not None:
+                self.queryType = queryType
+                return None
+
+        self.stream = tokens.stream()
+        self.query = self.stream.sql
+        err = self.dispatch(echo=False)
+        if key is not None and err is None:
+            templates.put(key, self.queryType, VALIDATOR_VERSION)
+        return err
+
+    def analyse(self, echo=True):
         """
         Main entry point for query validation.
+
+        Without caches this is dispatch(). With a QueryCache the result
+        is looked up by the normalized query text first; on a hit the
+        stored query type is echoed and the stored error returned
+        without lexing. Misses are validated and stored.
+
+        With a templates cache, a query is also looked up by its shape
+        (lexer.Fingerprint): literals and IN lists of literals do not
+        change a verdict, so a query whose template was already found
+        valid is valid too. Only valid shapes are stored, since error
+        messages may quote literal values.
+        """
+        cache = self.cache
+        if cache is None:
+            return self.match_template(echo)
+
+        key = QueryCache.normalize(self.query)
+        if self.backslashEscapes:
+            # The same text holds other literals: not the same entry
+            key = ("backslashEscapes", key)
+        entry = cache.get(key, VALIDATOR_VERSION)
+        if entry is not None:
+            queryType, err = entry
+            if echo and queryType is not None:
+                print(queryType)
+            return err
+
+        err = self.match_template(echo)
+        cache.put(key, (self.queryType, err), VALIDATOR_VERSION)
+        return err
+
+    def match_template(self, echo=True):
+        """
+        dispatch(), answered from the templates cache when the query's
+        shape is stored there.
+        """
+        templates = self.templates
+        if templates is None:
+            return self.dispatch(echo)
+
+        self.tokenize()
+        key = shape(self.stream)
+        queryType = templates.get(key, VALIDATOR_VERSION)
+        if queryType is not None:
+            self.queryType = queryType
+            if echo:
+                print(queryType)
+            return None
+
+        err = self.dispatch(echo)
+        if err is None:
+            templates.put(key, self.queryType, VALIDATOR_VERSION)
+        return err
+
+    def dispatch(self, echo=True):
+        """
+        Validates the query (see route).
+
+        Validators that stop where only a few tokens are legal list them
+        in the error ("expected") and suggest among those only. Any
+        other error without a suggestion of its own gets one when a word
+        of the query looks like a misspelled keyword (strict check). Only
+        invalid queries are spell-checked: a valid one may well have a
+        column named like a keyword (e.g. "data").
+        """
+        err = self.route(echo)
+
+        if isinstance(err, dict) and not err.get("suggestion") and "expected" not in err:
+            spell_errors = spell_check_tokens(self.stream.tokens, strict=True)
+            if spell_errors:
+                first = spell_errors[0]
+                text = self.stream.texts[first["position"]]
+                err = dict(err, suggestion=f"Did you mean '{first['suggestions'][0]}' instead of '{text}'?")
+
+        return err
+
+    def route(self, echo=True):
+        """
+        Validates the query.
         Performs:
         - Tokenization
+        - Unterminated literal / comment rejection
         - Semicolon validation
         - Query type detection
         - Delegation to statement-specific parser
+
+        With echo=False the detected query type is not printed.
         """
+        self.queryType = None
         tokens = self.tokenize()
 
+        # An open quote or /* comment swallowed the rest of the query
+        if self.stream.unterminated:
+            return {
+                "error": "Unterminated string literal or comment",
+                "suggestion": "Close every quote and /* comment."
+            }
+
         # Empty input
         if not tokens:
             return {
                 "error": "empty query"
             }
-        
-        # spell_errors = spell_check_tokens(tokens)
-        # print(spell_errors)
-        # suggestion = spell_errors[0]['suggestions'][0]
-
-        # if spell_errors:
-        #     return {
-        #         "error": f"Spelling mistake in SQL keyword. Do you mean {suggestion}",
-        #     }
-
 
         # Semicolon validation
         if ";" in tokens:
@@ -140,40 +377,48 @@ class QueryParser:
             return {"empty query"}
 
         # Determine query type
-        queryType = tokens[0]
-        print(queryType)
+        queryType = self.queryType = tokens[0]
+        if echo:
+            print(queryType)
 
         if queryType not in self.queryTypes:
+            err = expected_error("Invalid sql query", self.stream.texts[0], [t.upper() for t in self.queryTypes])
             return {
-                "Error": "Invalid sql query",
-                "Issue": "The start token is not a valid sql keyword"
+                "Error": err["error"],
+                "Issue": "The start token is not a valid sql keyword",
+                "suggestion": err["suggestion"],
+                "expected": err["expected"]
             }
 
+        # Validators receive the already lexed stream
+        stream = self.stream
+
         if queryType == "alter":
-            parser = AlterCommand(self.query)
-            return parser.analyse()
+            parser = self.validator(AlterCommand, self.query)
+            return parser.analyse_stream(stream)
         elif queryType == "delete":
-            parser = DeleteCommand(self.query)
-            return parser.validate()
+            parser = self.validator(DeleteCommand, self.query)
+            return parser.validate_stream(stream)
         elif queryType == "insert":
-            parser = InsertCommand()
-            return parser.validate(self.query)
+            parser = self.validator(InsertCommand)
+            return parser.validate_stream(stream)
         elif queryType == "update":
-            parser = UpdateCommand(self.query)
-            return parser.validate()
+            parser = self.validator(UpdateCommand, self.query)
+            return parser.validate_stream(stream)
         elif queryType == "create":
-            parser = CreateDDL()
-            return parser.validate_create(self.query)
+            parser = self.validator(CreateDDL)
+            return parser.validate_create_stream(stream)
         elif queryType == 'truncate':
-            return TruncateDDL.validateTruncateQuery(self.query)
+            return TruncateDDL.validateTruncateStream(stream)
         elif queryType == 'drop':
-            return DropDDL.validateDropQuery(self.query)
+            return DropDDL.validateDropStream(stream)
         elif queryType in ("commit", "rollback", "savepoint"):
-            parser = TCLValidator()
-            return parser.validate(self.query)
+            parser = self.validator(TCLValidator)
+            return parser.validate_stream(stream)
         elif queryType == "select":
-            parser = SelectParser()
-            return parser.analyse(tokens)
+            parser = self.validator(SelectParser)
+            # Shares the bracket index built while lexing
+            return parser.analyse(stream.span(0, len(tokens)))
         else:
             return {
                 "error": "Not a valid query or query not supported"
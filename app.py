@@ -42,7 +42,7 @@ if run:
     else:
         parser = QueryParser(sql_query)
         result = parser.analyse()
-        tokens = parser.tokenize()
+        tokens = parser.tokenize()   # cached by analyse(), no second scan
 
         st.divider()
 
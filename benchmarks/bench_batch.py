@@ -0,0 +1,65 @@
+"""
+Throughput of validating many statements in one batch.
+
+Compares two flows over the same mixed workload (the statements of
+bench_dispatch, repeated):
+- single: a new QueryParser per statement, analyse() printing the
+          query type (stdout is sent to a null sink, as in a CI log)
+- batch : QueryParser.analyse_many over a generator of the statements,
+          reusing one validator per statement type, no printing
+
+Run from the repository root:
+    python -m benchmarks.bench_batch [statements]
+"""
+import contextlib
+import io
+import itertools
+import sys
+import time
+
+from QueryParser import QueryParser, BatchStats
+from benchmarks.bench_dispatch import QUERIES
+
+
+def workload(count):
+    """
+    Lazily cycles through the sample statements.
+    """
+    return itertools.islice(itertools.cycle(QUERIES.values()), count)
+
+
+def single(count):
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        for query in workload(count):
+            QueryParser(query).analyse()
+    return time.perf_counter() - start
+
+
+def batch(count):
+    stats = BatchStats()
+    start = time.perf_counter()
+    for _ in QueryParser.analyse_many(workload(count), stats):
+        pass
+    return time.perf_counter() - start, stats
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+
+    # Warm up imports and regex caches
+    single(100)
+    batch(100)
+
+    before = min(single(count) for _ in range(3))
+    after, stats = min((batch(count) for _ in range(3)), key=lambda run: run[0])
+
+    print(f"statements : {count:,}")
+    print(f"single     : {before:.2f} s ({count / before:,.0f} statements/s)")
+    print(f"batch      : {after:.2f} s ({count / after:,.0f} statements/s)")
+    print(f"speedup    : {before / after:.2f}x")
+    print(f"batch stats: {stats.summary()}")
+
+
+if __name__ == "__main__":
+    main()
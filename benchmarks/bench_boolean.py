@@ -0,0 +1,81 @@
+"""
+Scaling of WHERE validation with the number of AND / OR predicates.
+
+Builds machine-generated filters of growing size
+    SELECT a FROM t WHERE c0 = 0 AND (c1 = 1 OR c2 > 2) AND ...
+and reports the time for validateBooleanExpr alone and for the whole
+QueryParser.analyse call. Linear validation keeps the time per
+predicate flat as the filter grows; the recursive version grew
+quadratically and hit the recursion limit after a few thousand
+conjuncts.
+
+Run from the repository root:
+    python -m benchmarks.bench_boolean [max_predicates]
+"""
+import contextlib
+import io
+import sys
+import time
+
+from QueryParser import QueryParser
+from lexer.Lexer import Lexer
+from select_module.helper.whereChecksHelper import extractConditions, validateBooleanExpr
+
+
+def build_query(predicates):
+    """
+    WHERE clause with `predicates` comparisons; every fifth pair is
+    grouped in parentheses with OR.
+    """
+    parts = []
+    i = 0
+    while i < predicates:
+        if i % 5 == 0 and i + 1 < predicates:
+            parts.append(f"(c{i} = {i} OR c{i + 1} > {i + 1})")
+            i += 2
+        else:
+            parts.append(f"c{i} = {i}")
+            i += 1
+
+    return "SELECT a FROM t WHERE " + " AND ".join(parts) + ";"
+
+
+def timed(fn, repeat=3):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def main():
+    largest = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    sizes = [n for n in (100, 1000, 10000, 100000) if n <= largest]
+
+    print(f"{'predicates':>10} {'where (ms)':>11} {'us/pred':>8} {'analyse (ms)':>13} {'us/pred':>8}")
+    print("-" * 54)
+
+    for n in sizes:
+        query = build_query(n)
+        where = extractConditions(Lexer.tokenize(query).span(0, -1))
+
+        where_time, err = timed(lambda: validateBooleanExpr(where))
+        if err:
+            raise SystemExit(f"unexpected error for {n} predicates: {err}")
+
+        # QueryParser.analyse prints the query type; keep it out of the report
+        with contextlib.redirect_stdout(io.StringIO()):
+            full_time, err = timed(lambda: QueryParser(query).analyse())
+        if err:
+            raise SystemExit(f"unexpected error for {n} predicates: {err}")
+
+        print(
+            f"{n:>10} {where_time * 1e3:>11.2f} {where_time / n * 1e6:>8.2f}"
+            f" {full_time * 1e3:>13.2f} {full_time / n * 1e6:>8.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Throughput of QueryParser with and without the result cache.
+
+Simulates production traffic: `distinct` query strings (variants of the
+bench_dispatch statements with different columns, tables and casing)
+repeated in random order. Runs QueryParser.analyse_many over the same
+stream with no cache and with a QueryCache large enough for the working
+set, and reports throughput and the cache counters.
+
+Run from the repository root:
+    python -m benchmarks.bench_cache [statements] [distinct]
+"""
+import random
+import sys
+import time
+
+from QueryParser import QueryParser
+from QueryCache import QueryCache
+from benchmarks.bench_dispatch import QUERIES
+
+
+def traffic(count, distinct, seed=1):
+    """
+    `count` queries drawn from `distinct` variants; half of the repeats
+    differ from their first occurrence in case or spacing only.
+    """
+    rng = random.Random(seed)
+    bases = list(QUERIES.values())
+    variants = [
+        bases[i % len(bases)].replace(" t", f" t{i}").replace("users", f"users{i}")
+        for i in range(distinct)
+    ]
+
+    queries = []
+    for _ in range(count):
+        query = rng.choice(variants)
+        if rng.random() < 0.5:
+            query = "  " + query.lower().replace(" ", "\n  ", 2)
+        queries.append(query)
+    return queries
+
+
+def run(queries, cache):
+    start = time.perf_counter()
+    for _ in QueryParser.analyse_many(queries, cache=cache):
+        pass
+    return time.perf_counter() - start
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    distinct = int(sys.argv[2]) if len(sys.argv) > 2 else 3000
+    queries = traffic(count, distinct)
+
+    uncached = run(queries, None)
+    cache = QueryCache(maxsize=2 * distinct)
+    cached = run(queries, cache)
+    info = cache.info()
+
+    print(f"statements: {count:,} ({distinct:,} distinct)")
+    print(f"no cache  : {count / uncached:>10,.0f} statements/s")
+    print(f"cache     : {count / cached:>10,.0f} statements/s ({uncached / cached:.1f}x)")
+    print(f"hits {info['hits']:,}, misses {info['misses']:,}, "
+          f"evictions {info['evictions']:,}, hit rate {info['hit_rate']:.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+Wall time of the command-line validator on a generated monorepo.
+
+Writes `files` small .sql files (a few statements each, about one in
+ten invalid) into nested folders of a temporary directory and runs
+`python -m cli` over the directory in-process, once per worker count.
+The output of every run is compared with the single-process run, so
+the benchmark also checks that results stay in input order.
+
+Run from the repository root:
+    python -m benchmarks.bench_cli [files] [workers ...]
+"""
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+
+from cli.runner import main, available_cores
+from benchmarks.bench_dispatch import QUERIES
+
+
+def write_repo(root, files):
+    queries = list(QUERIES.values()) + ["SELECT FROM t;", "INSERT INTO t;"]
+    for i in range(files):
+        folder = os.path.join(root, f"service{i % 40}", f"migrations{i % 7}")
+        os.makedirs(folder, exist_ok=True)
+        with open(os.path.join(folder, f"{i:05d}.sql"), "w") as out:
+            out.write(f"-- migration {i}\n")
+            for j in range(4):
+                out.write(queries[(i + j) % len(queries)] + "\n")
+
+
+def run(root, workers):
+    out = io.StringIO()
+    with contextlib.redirect_stdout(out), contextlib.redirect_stderr(io.StringIO()):
+        start = time.perf_counter()
+        main([root, "--workers", str(workers)])
+        elapsed = time.perf_counter() - start
+    return elapsed, out.getvalue()
+
+
+def main_bench():
+    files = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    counts = [int(arg) for arg in sys.argv[2:]] or sorted({1, 2, available_cores()})
+
+    with tempfile.TemporaryDirectory() as root:
+        write_repo(root, files)
+        print(f"files: {files:,} ({files * 4:,} statements), cores available: {available_cores()}")
+
+        baseline = None
+        for workers in counts:
+            elapsed, output = run(root, workers)
+            if baseline is None:
+                baseline = output
+            same = "same output" if output == baseline else "OUTPUT DIFFERS"
+            print(f"workers {workers:>3}: {elapsed:6.2f} s ({files / elapsed:,.0f} files/s, {same})")
+
+
+if __name__ == "__main__":
+    main_bench()
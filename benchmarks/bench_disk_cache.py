@@ -0,0 +1,92 @@
+"""
+Repeated command-line runs over a tree of SQL files with --cache.
+
+Writes `files` scripts of `statements` statements each (variants of the
+bench_dispatch statements) to a temporary directory and times
+python -m cli over it:
+
+- no cache : plain run
+- cold     : empty cache file
+- warm     : nothing changed (every file answered from its manifest)
+- touched  : every mtime changed, contents unchanged (files re-hashed)
+- edited   : one file in 20 gains a statement (its other statements
+             reused from the statement cache)
+
+Run from the repository root:
+    python -m benchmarks.bench_disk_cache [files] [statements] [workers]
+"""
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+
+from cli.runner import main as cli
+from benchmarks.bench_dispatch import QUERIES
+
+
+def write_tree(root, files, statements):
+    bases = list(QUERIES.values())
+    paths = []
+    for f in range(files):
+        path = os.path.join(root, f"m{f:05d}.sql")
+        with open(path, "w") as out:
+            for s in range(statements):
+                out.write(bases[(f + s) % len(bases)].replace(" t", f" t{f}_{s}") + "\n")
+        paths.append(path)
+    return paths
+
+
+def age(paths, seconds):
+    """
+    Sets mtimes in the past, so the cache may trust them.
+    """
+    past = time.time() - seconds
+    for path in paths:
+        os.utime(path, (past, past))
+
+
+def run(*args):
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+        cli(list(args))
+    return time.perf_counter() - start
+
+
+def main():
+    files = int(sys.argv[1]) if len(sys.argv) > 1 else 400
+    statements = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+    workers = sys.argv[3] if len(sys.argv) > 3 else "1"
+
+    with tempfile.TemporaryDirectory() as root:
+        tree = os.path.join(root, "sql")
+        os.mkdir(tree)
+        paths = write_tree(tree, files, statements)
+        age(paths, 3600)
+        cache = os.path.join(root, "cache.db")
+        common = [tree, "-q", "-j", workers]
+
+        timings = [("no cache", run(*common))]
+        timings.append(("cold", run(*common, "--cache", cache)))
+        timings.append(("warm", run(*common, "--cache", cache)))
+
+        age(paths, 1800)
+        timings.append(("touched", run(*common, "--cache", cache)))
+
+        for path in paths[::20]:
+            with open(path, "a") as out:
+                out.write("DELETE FROM audit WHERE id = 1;\n")
+        age(paths, 600)
+        timings.append(("edited", run(*common, "--cache", cache)))
+
+        size = os.path.getsize(cache)
+
+    print(f"{files:,} files x {statements:,} statements, workers: {workers}, cache file: {size / 1e6:.1f} MB\n")
+    base = timings[0][1]
+    for name, elapsed in timings:
+        print(f"{name:<9} {elapsed:>8.2f} s {base / elapsed:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
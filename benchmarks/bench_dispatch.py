@@ -0,0 +1,103 @@
+"""
+Per-statement-type latency of QueryParser.analyse.
+
+Compares two flows over the same queries:
+- relex : every stage scans the raw text again (QueryParser tokenizes,
+          the validator re-lexes its string argument, the caller
+          tokenizes once more to read the query type)
+- stream: QueryParser lexes once and hands the cached stream to the
+          dispatched validator
+
+Run from the repository root:
+    python -m benchmarks.bench_dispatch [iterations]
+"""
+import contextlib
+import io
+import sys
+import timeit
+
+from QueryParser import QueryParser
+from Alter_module.alter import AlterCommand
+from Delete_module.delete import DeleteCommand
+from insert_module.insert_command import InsertCommand
+from update_module.update import UpdateCommand
+from create.CreateDDL import CreateDDL
+from truncate.TruncateDDL import TruncateDDL
+from drop.DropDDL import DropDDL
+from tcl.tcl_validator import TCLValidator
+from select_module.selectParser import SelectParser
+
+
+QUERIES = {
+    "select": "SELECT a, SUM(b) AS s FROM t WHERE a > 1 AND c IN (1, 2, 3) GROUP BY a HAVING SUM(b) > 10 ORDER BY a DESC LIMIT 5;",
+    "insert": "INSERT INTO users (id, name, email) VALUES (1, 'Alice', 'a@x.io'), (2, 'Bob', 'b@x.io');",
+    "update": "UPDATE users SET name = 'Alice', age = 30 WHERE id = 1 AND active = 1;",
+    "delete": "DELETE FROM users WHERE id = 1;",
+    "alter": "ALTER TABLE users ADD COLUMN email VARCHAR(255), DROP COLUMN age;",
+    "create": "CREATE TABLE orders (id INT PRIMARY KEY, user_id INT REFERENCES users(id), total DECIMAL(10, 2) NOT NULL);",
+    "drop": "DROP TABLE IF EXISTS users, orders CASCADE;",
+    "truncate": "TRUNCATE TABLE users RESTART IDENTITY CASCADE;",
+    "tcl": "ROLLBACK TO sp1;",
+}
+
+
+def relex(query):
+    """
+    Old flow: each stage works from the raw query text.
+    """
+    tokens = QueryParser(query).tokenize()
+    kind = tokens[0]
+
+    if kind == "select":
+        SelectParser().analyse(tokens[:-1])
+    elif kind == "insert":
+        InsertCommand().validate(query)
+    elif kind == "update":
+        UpdateCommand(query).validate()
+    elif kind == "delete":
+        DeleteCommand(query).validate()
+    elif kind == "alter":
+        AlterCommand(query).analyse()
+    elif kind == "create":
+        CreateDDL().validate_create(query)
+    elif kind == "drop":
+        DropDDL.validateDropQuery(query)
+    elif kind == "truncate":
+        TruncateDDL.validateTruncateQuery(query)
+    else:
+        TCLValidator().validate(query)
+
+    return QueryParser(query).tokenize()[0]
+
+
+def stream(query):
+    """
+    New flow: one lexing pass, shared by dispatch and the caller.
+    """
+    parser = QueryParser(query)
+    parser.analyse()
+    return parser.tokenize()[0]
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+
+    print(f"{'statement':<10} {'relex (us)':>12} {'stream (us)':>12} {'speedup':>9}")
+    print("-" * 46)
+
+    # QueryParser.analyse prints the query type; keep it out of the report
+    with contextlib.redirect_stdout(io.StringIO()):
+        rows = []
+        for name, query in QUERIES.items():
+            before = min(timeit.repeat(lambda: relex(query), number=iterations, repeat=3))
+            after = min(timeit.repeat(lambda: stream(query), number=iterations, repeat=3))
+            rows.append((name, before, after))
+
+    for name, before, after in rows:
+        before_us = before / iterations * 1e6
+        after_us = after / iterations * 1e6
+        print(f"{name:<10} {before_us:>12.1f} {after_us:>12.1f} {before / after:>8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Cost of the grammar-driven statement checks.
+
+Reports:
+- per type : latency of each validator on its lexed stream, and the
+             share of it spent in the LL(1) parse (SQL.parse)
+- length   : parse time per token of CREATE TABLE and INSERT statements
+             of growing length (one pass: flat per token)
+- rules    : a TRUNCATE parsed with the whole SQL grammar and with a
+             grammar holding only the TRUNCATE rules (the statement
+             types a grammar holds add table rows, not time)
+
+Run from the repository root:
+    python -m benchmarks.bench_grammar [iterations]
+"""
+import sys
+import timeit
+
+from lexer.Lexer import Lexer
+from grammar.Grammar import Grammar
+from grammar.SqlGrammar import SQL, statementEnd
+from Alter_module.alter import AlterCommand
+from Delete_module.delete import DeleteCommand
+from insert_module.insert_command import InsertCommand
+from update_module.update import UpdateCommand
+from create.CreateDDL import CreateDDL
+from truncate.TruncateDDL import TruncateDDL
+from drop.DropDDL import DropDDL
+from tcl.tcl_validator import TCLValidator
+from benchmarks.bench_dispatch import QUERIES
+
+
+VALIDATORS = {
+    "insert": lambda stream: InsertCommand().validate_stream(stream),
+    "update": lambda stream: UpdateCommand(stream.sql).validate_stream(stream),
+    "delete": lambda stream: DeleteCommand(stream.sql).validate_stream(stream),
+    "alter": lambda stream: AlterCommand(stream.sql).analyse_stream(stream),
+    "create": lambda stream: CreateDDL().validate_create_stream(stream),
+    "drop": DropDDL.validateDropStream,
+    "truncate": TruncateDDL.validateTruncateStream,
+    "tcl": lambda stream: TCLValidator().validate_stream(stream),
+}
+
+# Start rule of each statement type
+RULES = {"tcl": "rollback"}
+
+TRUNCATE_ONLY = Grammar("""
+truncate           : TRUNCATE truncate_table
+truncate_table     : TABLE table_name truncate_options
+table_name         : name
+name               : <name> { '.' <name> }
+truncate_options   : { truncate_option }
+truncate_option    : RESTART identity | CONTINUE identity | CASCADE | RESTRICT
+identity           : IDENTITY
+""")
+
+
+def perCall(function, number):
+    return min(timeit.repeat(function, number=number, repeat=5)) / number * 1e6
+
+
+def parser(grammar, rule, stream):
+    tokens = stream.tokens
+    kinds = stream.kinds
+    end = statementEnd(tokens)
+    return lambda: grammar.parse(rule, tokens, kinds, 0, end)
+
+
+def main():
+    number = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+
+    print(f"{'type':<9} {'validate':>10} {'parse':>9} {'share':>6}")
+    for kind, validate in VALIDATORS.items():
+        stream = Lexer.tokenize(QUERIES[kind])
+        assert validate(stream) is None, kind
+        whole = perCall(lambda: validate(stream), number)
+        parse = perCall(parser(SQL, RULES.get(kind, kind), stream), number)
+        print(f"{kind:<9} {whole:>8.1f}us {parse:>7.1f}us {parse / whole:>6.0%}")
+
+    print(f"\n{'statement':<22} {'tokens':>7} {'parse':>10} {'per token':>10}")
+    for count in (10, 100, 1000):
+        columns = ", ".join(f"c{i} VARCHAR(20) NOT NULL" for i in range(count))
+        rows = ", ".join(f"({i}, 'x{i}')" for i in range(count))
+        for label, rule, query in (
+            (f"CREATE TABLE x{count}", "create", f"CREATE TABLE t ({columns});"),
+            (f"INSERT x{count} rows", "insert", f"INSERT INTO t (a, b) VALUES {rows};"),
+        ):
+            stream = Lexer.tokenize(query)
+            assert SQL.parse(rule, stream.tokens, stream.kinds, 0, statementEnd(stream.tokens)).ok, label
+            elapsed = perCall(parser(SQL, rule, stream), max(number // count, 10))
+            size = len(stream.tokens)
+            print(f"{label:<22} {size:>7,} {elapsed:>8.1f}us {elapsed / size * 1e3:>8.0f}ns")
+
+    stream = Lexer.tokenize(QUERIES["truncate"])
+    print()
+    for label, grammar in (("whole grammar", SQL), ("TRUNCATE only", TRUNCATE_ONLY)):
+        elapsed = perCall(parser(grammar, "truncate", stream), number)
+        print(f"{label:<14} {len(grammar.names):>4} rules {elapsed:>7.2f}us per TRUNCATE")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Lexing statements whose bytes are mostly string literals and comments.
+
+Each statement carries a long quoted value with escaped quotes, a block
+comment and a line comment. The lexer skips every body in one scan and
+emits one token per literal; the word-by-word pattern the lexer used
+before (comments lexed as code, '' splitting a literal in two) is timed
+for comparison.
+
+Reports tokens per statement and statements per second for both.
+
+Run from the repository root:
+    python -m benchmarks.bench_lexer_literals [statements] [literal_length]
+"""
+import re
+import sys
+import time
+
+from lexer.Lexer import Lexer
+
+
+WORD_BY_WORD = re.compile(r"""
+      (?P<string>'[^']*'?)
+    | (?P<quoted>"[^"]*"?|`[^`]*`?)
+    | (?P<number>\d+\.\d+)
+    | (?P<word>\w+)
+    | (?P<operator>[<>!=]+)
+    | (?P<symbol>\S)
+""", re.VERBOSE)
+
+
+def statements(count, length):
+    words = ("lorem", "ipsum", "it''s", "dolor", "sit;", "amet")
+    text = " ".join(words[i % len(words)] for i in range(length // 6))
+    note = " ".join(f"step {i} of the migration;" for i in range(length // 50 + 1))
+    return [
+        f"/* {note} */ UPDATE docs SET body = '{text} {i}' WHERE id = {i}; -- {note}"
+        for i in range(count)
+    ]
+
+
+def timed(lex, queries):
+    start = time.perf_counter()
+    tokens = sum(lex(query) for query in queries)
+    return tokens, time.perf_counter() - start
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    length = int(sys.argv[2]) if len(sys.argv) > 2 else 2000
+    queries = statements(count, length)
+
+    results = [
+        ("literal-aware", timed(lambda q: len(Lexer.tokenize(q)), queries)),
+        ("word by word", timed(lambda q: sum(1 for _ in WORD_BY_WORD.finditer(q)), queries)),
+    ]
+
+    print(f"{count:,} statements, {sum(map(len, queries)) / count:,.0f} chars each\n")
+    for name, (tokens, elapsed) in results:
+        print(f"{name:<14} {tokens / count:>8,.0f} tokens/stmt {count / elapsed:>10,.0f} stmt/s")
+
+
+if __name__ == "__main__":
+    main()
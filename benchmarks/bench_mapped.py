@@ -0,0 +1,111 @@
+"""
+Validating a large SQL dump read in chunks against one memory-mapped.
+
+Writes a synthetic dump to a temporary file, 2 GB by default: a few
+tables, each created and then filled by multi-row INSERTs with quoted
+text (';', escaped quotes, non-ASCII), and validates every statement
+with:
+
+- chunked   : QueryParser.analyse_script over the file object (each
+              statement decoded and lexed as text)
+- mapped    : QueryParser.analyse_mapped (split and lexed in place,
+              each statement decoded once to be validated)
+- templates : analyse_mapped with a templates cache (statements lexed
+              in place; those of a known shape answered without
+              decoding their literals)
+
+Reports statements/s, MB/s and the growth of resident memory over the
+run, sampled every 10,000 statements; it stays flat for every mode,
+whatever the dump size.
+
+Run from the repository root:
+    python -m benchmarks.bench_mapped [size_in_mb]
+"""
+import os
+import resource
+import sys
+import tempfile
+import time
+
+from QueryParser import QueryParser
+from QueryCache import QueryCache
+
+
+TABLES = 20
+
+
+def write_dump(path, size):
+    """
+    Writes about `size` bytes of dump-like SQL to path.
+    """
+    written = 0
+    i = 0
+    with open(path, "w", encoding="utf-8") as out:
+        out.write("-- synthetic dump\n")
+        for t in range(TABLES):
+            out.write(f"CREATE TABLE t{t} (id INT PRIMARY KEY, name VARCHAR(40), note TEXT);\n")
+        while written < size:
+            rows = ", ".join(f"({i * 10 + r}, 'name {r}; it''s', 'café {i}')" for r in range(10))
+            block = f"INSERT INTO t{i % TABLES} (id, name, note) VALUES {rows};\n"
+            if i % 50 == 0:
+                block += f"-- rows of block {i}; done\n"
+            out.write(block)
+            written += len(block)
+            i += 1
+
+
+def rss():
+    """
+    Current resident memory in bytes (peak on systems without /proc).
+    """
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def run(results):
+    base = rss()
+    grown = 0
+    count = 0
+    invalid = 0
+    start = time.perf_counter()
+    for _, err in results:
+        count += 1
+        if err:
+            invalid += 1
+        if count % 10000 == 0:
+            grown = max(grown, rss() - base)
+    return count, invalid, time.perf_counter() - start, grown
+
+
+def main():
+    size = int(float(sys.argv[1]) * (1 << 20)) if len(sys.argv) > 1 else 2 << 30
+
+    with tempfile.TemporaryDirectory() as root:
+        path = os.path.join(root, "dump.sql")
+        write_dump(path, size)
+        size = os.path.getsize(path)
+
+        def chunked():
+            with open(path, "rb") as source:
+                yield from QueryParser.analyse_script(source)
+
+        modes = [
+            ("chunked", chunked()),
+            ("mapped", QueryParser.analyse_mapped(path)),
+            ("templates", QueryParser.analyse_mapped(path, templates=QueryCache())),
+        ]
+
+        print(f"dump size: {size / (1 << 20):,.1f} MB\n")
+        print(f"{'mode':<10} {'statements':>11} {'invalid':>8} {'stmt/s':>9} {'MB/s':>7} {'RSS growth':>11}")
+        print("-" * 61)
+        for name, results in modes:
+            count, invalid, elapsed, grown = run(results)
+            print(f"{name:<10} {count:>11,} {invalid:>8,} {count / elapsed:>9,.0f} "
+                  f"{size / (1 << 20) / elapsed:>7.2f} {grown / (1 << 20):>8.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Peak memory and allocation count of validating one very large SELECT.
+
+Builds a machine-generated query of roughly the requested size
+    SELECT c0, c1, ... FROM t WHERE c0 = 0 AND (c1 = 1 OR c2 > 2) AND ...
+      AND c7 > (SELECT max(c7) FROM t7 WHERE ...) ...
+and reports, for QueryParser.analyse:
+- time of one untraced call
+- peak traced memory (tracemalloc)
+- generation-0 garbage collections during the call; the collector
+  runs one every 700 container allocations, so this tracks how many
+  lists, dicts and views the call creates
+
+Helpers receive TokenSpan views instead of sliced lists, so clause and
+subquery extraction do not copy tokens; peak memory stays close to the
+size of the token stream itself.
+
+Run from the repository root:
+    python -m benchmarks.bench_memory [size_in_kb]
+"""
+import contextlib
+import gc
+import io
+import sys
+import time
+import tracemalloc
+
+from QueryParser import QueryParser
+
+
+def build_query(size):
+    """
+    SELECT with a long column list and a WHERE filter of about `size`
+    characters; every tenth predicate compares with a subquery.
+    """
+    columns = ", ".join(f"c{i}" for i in range(200))
+    parts = []
+    length = 0
+    i = 0
+    while length < size:
+        if i % 10 == 7:
+            part = f"c{i} > (SELECT max(c{i}) FROM t{i} WHERE c{i} > {i} AND c{i + 1} < {i})"
+        elif i % 5 == 0:
+            part = f"(c{i} = {i} OR c{i + 1} > {i + 1})"
+        else:
+            part = f"c{i} = {i}"
+        parts.append(part)
+        length += len(part) + 5
+        i += 1
+
+    return f"SELECT {columns} FROM t WHERE " + " AND ".join(parts) + ";"
+
+
+def measure(query):
+    # QueryParser.analyse prints the query type; keep it out of the report
+    with contextlib.redirect_stdout(io.StringIO()):
+        gc.collect()
+        collections = gc.get_stats()[0]["collections"]
+        tracemalloc.start()
+        err = QueryParser(query).analyse()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        collections = gc.get_stats()[0]["collections"] - collections
+
+    if err:
+        raise SystemExit(f"unexpected error: {err}")
+    return peak, collections
+
+
+def main():
+    size = int(sys.argv[1]) * 1024 if len(sys.argv) > 1 else 1024 * 1024
+    query = build_query(size)
+
+    # Untraced run first, so imports and caches are not counted
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        QueryParser(query).analyse()
+        elapsed = time.perf_counter() - start
+
+    peak, collections = measure(query)
+
+    print(f"query size       : {len(query) / 1024:,.0f} KB")
+    print(f"analyse time     : {elapsed:.2f} s")
+    print(f"peak memory      : {peak / 2 ** 20:,.1f} MB")
+    print(f"gen-0 collections: {collections:,}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Scaling of validate_parallel with the number of worker processes.
+
+Validates the same mixed workload (the statements of bench_dispatch plus
+some invalid ones, repeated) with 1, 2, 4, ... workers and reports
+throughput, speedup over one worker and parallel efficiency. Each run
+uses a warmed-up pool from make_pool, so process start-up is not
+counted. Worker counts above the cores available are skipped unless
+given explicitly.
+
+Also reports the bytes pickled back per statement: the compact chunk
+results against the validator dicts they replace.
+
+Run from the repository root:
+    python -m benchmarks.bench_parallel [statements] [workers ...]
+"""
+import contextlib
+import io
+import itertools
+import pickle
+import sys
+import time
+
+from QueryParser import QueryParser
+from ParallelValidator import validate_parallel, validate_chunk, make_pool, available_cores
+from benchmarks.bench_dispatch import QUERIES
+
+
+STATEMENTS = list(QUERIES.values()) + ["SELECT FROM t;", "INSERT INTO t;", "UPDATE t SET;"]
+
+
+def workload(count):
+    return list(itertools.islice(itertools.cycle(STATEMENTS), count))
+
+
+def run(statements, workers, chunksize):
+    with make_pool(workers) as pool:
+        # Let every worker start and warm up before timing
+        list(validate_parallel(statements[:workers * chunksize], workers, chunksize, pool))
+
+        start = time.perf_counter()
+        for _ in validate_parallel(statements, workers, chunksize, pool):
+            pass
+        return time.perf_counter() - start
+
+
+def payload(statements, chunksize):
+    chunk = statements[:chunksize]
+    with contextlib.redirect_stdout(io.StringIO()):
+        errors = [QueryParser(query).analyse() for query in chunk]
+    return len(pickle.dumps(validate_chunk(chunk))) / len(chunk), len(pickle.dumps(errors)) / len(chunk)
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    cores = available_cores()
+    counts = [int(arg) for arg in sys.argv[2:]] or [n for n in (1, 2, 4, 8, 16) if n <= cores]
+    chunksize = 256
+    statements = workload(count)
+
+    compact, dicts = payload(statements, chunksize)
+    print(f"statements: {count:,}, chunksize: {chunksize}, cores available: {cores}")
+    print(f"result bytes per statement: {compact:.1f} compact vs {dicts:.1f} as dicts\n")
+    print(f"{'workers':>7} {'statements/s':>13} {'speedup':>8} {'efficiency':>11}")
+    print("-" * 42)
+
+    base = None
+    for workers in counts:
+        elapsed = run(statements, workers, chunksize)
+        rate = count / elapsed
+        base = base or rate
+        speedup = rate / base
+        print(f"{workers:>7} {rate:>13,.0f} {speedup:>7.2f}x {speedup / workers:>10.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Cost of validating parameterized calls: full validation of every bound
+query against one prepare() per template and check() per call.
+
+Each template of TEMPLATES is bound with fresh parameters on every
+call. The baseline renders the parameters into the query text and
+validates it with QueryParser; the prepared path checks the parameters
+against the PreparedQuery. Reports time per call and prepare's one-off
+cost per template.
+
+Run from the repository root:
+    python -m benchmarks.bench_prepared [calls]
+"""
+import random
+import sys
+import time
+
+from QueryParser import QueryParser
+from PreparedQuery import prepare
+
+
+TEMPLATES = (
+    ("SELECT id, name FROM users WHERE id = ? AND status = ?;", lambda r: (r.randrange(10 ** 6), "active")),
+    ("SELECT a, COUNT(b) FROM orders WHERE region = ? GROUP BY a LIMIT ?;", lambda r: (r.randrange(100), 50)),
+    ("INSERT INTO events (id, kind, amount) VALUES (?, ?, ?);", lambda r: (r.randrange(10 ** 6), "click", r.random() * 100)),
+    ("UPDATE accounts SET balance = ? WHERE id = ?;", lambda r: (r.randrange(10 ** 6), r.randrange(10 ** 6))),
+    ("DELETE FROM sessions WHERE user_id = ? AND token = ?;", lambda r: (r.randrange(10 ** 6), "abc")),
+)
+
+
+def render(template, params):
+    """
+    template with its '?' replaced by SQL literals of params.
+    """
+    parts = template.split("?")
+    out = [parts[0]]
+    for value, part in zip(params, parts[1:]):
+        out.append(f"'{value}'" if isinstance(value, str) else f"{value:.2f}" if isinstance(value, float) else str(value))
+        out.append(part)
+    return "".join(out)
+
+
+def main():
+    calls = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    rng = random.Random(1)
+    workload = [TEMPLATES[rng.randrange(len(TEMPLATES))] for _ in range(calls)]
+    workload = [(template, make(rng)) for template, make in workload]
+
+    parser = QueryParser("")
+    start = time.perf_counter()
+    for template, params in workload:
+        parser.validate(render(template, params))
+    full = time.perf_counter() - start
+
+    start = time.perf_counter()
+    prepared = {template: prepare(template, parser) for template, _ in TEMPLATES}
+    once = time.perf_counter() - start
+    assert all(query.valid for query in prepared.values())
+
+    start = time.perf_counter()
+    for template, params in workload:
+        prepared[template].check(params)
+    checked = time.perf_counter() - start
+
+    print(f"calls: {calls:,} over {len(TEMPLATES)} templates")
+    print(f"full validation : {full / calls * 1e6:>8.2f} us/call")
+    print(f"prepared check  : {checked / calls * 1e6:>8.2f} us/call ({full / checked:,.0f}x)")
+    print(f"prepare         : {once / len(TEMPLATES) * 1e3:>8.2f} ms/template (once)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Cost of keyword spelling suggestions over the words of many queries.
+
+The words are those of a batch of generated queries: column and table
+names drawn from a small schema, keywords and a few typos. Each
+word is checked with:
+
+- difflib  : get_close_matches against every keyword (what
+             SpellChecker.check did on every call)
+- index    : SuggestionIndex, memo cleared (first sight of every word)
+- memoized : SuggestionIndex after a first pass (repeated words)
+
+Also reports the time QueryParser spends per invalid query on the
+whole-query spell check that adds a suggestion to its error.
+
+Run from the repository root:
+    python -m benchmarks.bench_spelling [queries]
+"""
+import difflib
+import random
+import sys
+import time
+
+from QueryParser import QueryParser
+from spell_checker.utils import SpellChecker
+
+
+COLUMNS = ["id", "name", "email", "status", "total", "created", "region", "price", "qty", "note"]
+TABLES = ["users", "orders", "items", "events", "accounts"]
+TYPOS = {"SELECT": "SELEC", "FROM": "FRM", "WHERE": "WHER", "DELETE": "DELTE", "UPDATE": "UPDTE"}
+
+
+def build(count, rng):
+    queries = []
+    for _ in range(count):
+        words = ["SELECT", rng.choice(COLUMNS), ",", rng.choice(COLUMNS), "FROM",
+                 rng.choice(TABLES), "WHERE", rng.choice(COLUMNS), "=", str(rng.randrange(100))]
+        typo = rng.randrange(len(words))
+        words[typo] = TYPOS.get(words[typo], words[typo])
+        queries.append(" ".join(words) + ";")
+    return queries
+
+
+def timed(check, words):
+    start = time.perf_counter()
+    for word in words:
+        check(word)
+    return time.perf_counter() - start
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    queries = build(count, random.Random(1))
+    words = [word.upper() for query in queries for word in query[:-1].split() if word.isalpha()]
+    keywords = SpellChecker.KEYWORDS
+    index = SpellChecker.INDEX
+
+    old = timed(lambda w: w in keywords or difflib.get_close_matches(w, keywords, n=3, cutoff=0.6), words)
+    index.suggest.cache_clear()
+    cold = timed(lambda w: w in index.members or index._suggest(w), words)
+    timed(SpellChecker.check, words)
+    warm = timed(SpellChecker.check, words)
+
+    # Invalid queries validated with (dispatch) and without (route) the
+    # spell check of their words
+    parser = QueryParser("")
+    invalid = [query for query in queries if parser.validate(query)]
+    spent = {}
+    for method in ("route", "dispatch"):
+        start = time.perf_counter()
+        for query in invalid:
+            parser.query = query
+            parser.stream = None
+            getattr(parser, method)(echo=False)
+        spent[method] = time.perf_counter() - start
+
+    print(f"{len(words):,} words ({len(set(words))} distinct) from {count:,} queries\n")
+    for name, elapsed in (("difflib", old), ("index", cold), ("memoized", warm)):
+        print(f"{name:<9} {elapsed / len(words) * 1e6:>8.2f} us/word {old / elapsed:>8.1f}x")
+    extra = max(spent["dispatch"] - spent["route"], 0.0)
+    print(f"\nspell check per invalid query: {extra / len(invalid) * 1e6:.1f} us "
+          f"({len(invalid):,} invalid queries, {spent['route'] / len(invalid) * 1e6:.1f} us to validate each)")
+
+
+if __name__ == "__main__":
+    main()
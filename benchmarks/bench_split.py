@@ -0,0 +1,106 @@
+"""
+Throughput and memory of splitting a large SQL script into statements.
+
+Writes a synthetic dump of the requested size to a temporary file
+(CREATE TABLE, multi-row INSERTs with quoted text containing ';' and
+escaped quotes, comments, UPDATEs) and splits it with each
+ScriptSplitter backend, reading the file in 64 KB chunks.
+
+Reports, per backend:
+- statements found and throughput in MB/s
+- peak traced memory (tracemalloc), which stays near the chunk size
+  plus the longest statement, not the file size
+
+Then splits single statements of growing size: the pending statement
+is extended in place, so the time per MB stays flat however many
+chunks one statement spans.
+
+Run from the repository root:
+    python -m benchmarks.bench_split [size_in_mb]
+"""
+import io
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from lexer.ScriptSplitter import ScriptSplitter
+
+
+def write_dump(path, size):
+    """
+    Writes about `size` bytes of dump-like SQL to path.
+    """
+    written = 0
+    i = 0
+    with open(path, "w", encoding="utf-8") as out:
+        out.write("-- synthetic dump\n/* header; not a statement */\n")
+        while written < size:
+            rows = ", ".join(f"({i * 10 + r}, 'name {r}; it''s', \"q{r}\")" for r in range(10))
+            block = (
+                f"CREATE TABLE t{i} (id INT PRIMARY KEY, name VARCHAR(40), note TEXT);\n"
+                f"INSERT INTO t{i} (id, name, note) VALUES {rows};\n"
+                f"-- row block {i}; done\n"
+                f"UPDATE t{i} SET name = 'x;y' WHERE id = {i};\n"
+            )
+            out.write(block)
+            written += len(block)
+            i += 1
+
+
+def split(path, backend):
+    with open(path, "rb") as source:
+        start = time.perf_counter()
+        count = sum(1 for _ in ScriptSplitter(source, backend=backend))
+        elapsed = time.perf_counter() - start
+
+    with open(path, "rb") as source:
+        tracemalloc.start()
+        for _ in ScriptSplitter(source, backend=backend):
+            pass
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    return count, elapsed, peak
+
+
+def split_long(megabytes, backend):
+    """
+    Seconds to split one INSERT of about `megabytes` MB.
+    """
+    rows = b",".join(b"(1, 'abc')" for _ in range(megabytes * 2 ** 20 // 11))
+    script = io.BytesIO(b"INSERT INTO t VALUES " + rows + b";")
+
+    start = time.perf_counter()
+    for _ in ScriptSplitter(script, backend=backend, decode=False):
+        pass
+    return time.perf_counter() - start
+
+
+def main():
+    size = int(float(sys.argv[1]) * 2 ** 20) if len(sys.argv) > 1 else 32 * 2 ** 20
+
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, "dump.sql")
+        write_dump(path, size)
+        megabytes = os.path.getsize(path) / 2 ** 20
+
+        print(f"dump size: {megabytes:,.1f} MB")
+        print(f"{'backend':<8} {'statements':>11} {'MB/s':>8} {'peak memory':>12}")
+        print("-" * 42)
+
+        for backend in ("native", "sqlite"):
+            count, elapsed, peak = split(path, backend)
+            print(f"{backend:<8} {count:>11,} {megabytes / elapsed:>8.1f} {peak / 2 ** 10:>9,.0f} KB")
+
+    print(f"\n{'backend':<8} {'statement':>10} {'seconds':>8} {'s/MB':>6}")
+    print("-" * 35)
+    for backend in ("native", "sqlite"):
+        for megabytes in (4, 8, 16):
+            elapsed = split_long(megabytes, backend)
+            print(f"{backend:<8} {megabytes:>7} MB {elapsed:>8.2f} {elapsed / megabytes:>6.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Throughput of QueryParser with the text cache and the template cache.
+
+Simulates application traffic: a few hundred statement templates whose
+literal values (ids, names, prices, IN lists) change on every call, so
+almost every query text is new. Runs QueryParser.analyse_many over the
+same stream with no cache, with a QueryCache of normalized texts and
+with a templates QueryCache, and reports throughput and hit rates.
+
+Run from the repository root:
+    python -m benchmarks.bench_templates [statements] [templates]
+"""
+import random
+import sys
+import time
+
+from QueryParser import QueryParser
+from QueryCache import QueryCache
+
+
+SHAPES = (
+    "SELECT id, name FROM users{n} WHERE id = {int} AND status = {str};",
+    "SELECT a, COUNT(b) FROM orders{n} WHERE region IN ({ints}) GROUP BY a;",
+    "INSERT INTO events{n} (id, kind, amount) VALUES ({int}, {str}, {dec});",
+    "UPDATE accounts{n} SET balance = {int}, note = {str} WHERE id = {int};",
+    "DELETE FROM sessions{n} WHERE user_id = {int} AND token = {str};",
+)
+
+
+def traffic(count, templates, seed=1):
+    """
+    `count` queries over `templates` shapes, each with fresh literals.
+    """
+    rng = random.Random(seed)
+    values = {
+        "int": lambda: str(rng.randrange(10 ** 6)),
+        "dec": lambda: f"{rng.randrange(10 ** 4)}.{rng.randrange(100):02d}",
+        "str": lambda: f"'{rng.randrange(10 ** 6):x}'",
+        "ints": lambda: ", ".join(str(rng.randrange(100)) for _ in range(rng.randint(1, 6))),
+    }
+
+    queries = []
+    for _ in range(count):
+        i = rng.randrange(templates)
+        query = SHAPES[i % len(SHAPES)].replace("{n}", str(i))
+        while "{" in query:
+            start = query.index("{")
+            end = query.index("}", start)
+            query = query[:start] + values[query[start + 1:end]]() + query[end + 1:]
+        queries.append(query)
+    return queries
+
+
+def run(queries, cache=None, templates=None):
+    start = time.perf_counter()
+    for _ in QueryParser.analyse_many(queries, cache=cache, templates=templates):
+        pass
+    return time.perf_counter() - start
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    shapes = int(sys.argv[2]) if len(sys.argv) > 2 else 500
+    queries = traffic(count, shapes)
+
+    uncached = run(queries)
+    cache = QueryCache(maxsize=2 * shapes)
+    texts = run(queries, cache=cache)
+    templates = QueryCache(maxsize=2 * shapes)
+    shaped = run(queries, templates=templates)
+
+    print(f"statements: {count:,} ({shapes:,} templates)")
+    print(f"no cache       : {count / uncached:>10,.0f} statements/s")
+    print(f"text cache     : {count / texts:>10,.0f} statements/s "
+          f"({uncached / texts:.1f}x, hit rate {cache.info()['hit_rate']:.1%})")
+    print(f"template cache : {count / shaped:>10,.0f} statements/s "
+          f"({uncached / shaped:.1f}x, hit rate {templates.info()['hit_rate']:.1%})")
+
+
+if __name__ == "__main__":
+    main()
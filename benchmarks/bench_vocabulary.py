@@ -0,0 +1,91 @@
+"""
+Typo suggestions for a batch of unknown names against a large schema
+vocabulary, with each Vocabulary backend.
+
+Builds `names` synthetic table and column names (prefix_noun_suffix)
+and `words` misspellings of some of them (one or two edits), then
+times Vocabulary.suggest_many over the batch:
+
+- python : one pair at a time, with length buckets and early exits;
+           timed on the first `sample` words only, it is much slower
+- numpy  : one vectorized dynamic program per bucket and word length
+           (skipped when NumPy is not installed)
+
+Reports time per word and how many typos got their original name as
+the first suggestion.
+
+Run from the repository root:
+    python -m benchmarks.bench_vocabulary [names] [words] [sample]
+"""
+import random
+import string
+import sys
+import time
+
+from spell_checker.vocabulary import Vocabulary, numpy
+
+
+PREFIXES = ["", "dim_", "fact_", "stg_", "raw_", "tmp_"]
+NOUNS = ["customer", "order", "invoice", "product", "account", "session", "payment",
+         "shipment", "region", "vendor", "employee", "ticket", "campaign", "device"]
+SUFFIXES = ["", "_id", "_key", "_date", "_total", "_count", "_status", "_code", "_name"]
+
+
+def build_names(count, rng):
+    names = set()
+    while len(names) < count:
+        names.add(f"{rng.choice(PREFIXES)}{rng.choice(NOUNS)}{rng.choice(SUFFIXES)}{rng.randrange(1000)}")
+    return sorted(names)
+
+
+def misspell(name, rng):
+    chars = list(name)
+    for _ in range(rng.randrange(1, 3)):
+        pos = rng.randrange(len(chars))
+        edit = rng.randrange(3)
+        if edit == 0:
+            chars[pos] = rng.choice(string.ascii_lowercase)
+        elif edit == 1:
+            chars.insert(pos, rng.choice(string.ascii_lowercase))
+        elif len(chars) > 1:
+            del chars[pos]
+    return "".join(chars)
+
+
+def timed(vocabulary, words):
+    start = time.perf_counter()
+    found = vocabulary.suggest_many(words)
+    return time.perf_counter() - start, found
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    total = int(sys.argv[2]) if len(sys.argv) > 2 else 1000
+    sample = int(sys.argv[3]) if len(sys.argv) > 3 else 10
+
+    rng = random.Random(1)
+    names = build_names(count, rng)
+    originals = [rng.choice(names) for _ in range(total)]
+    words = [misspell(name, rng) for name in originals]
+
+    runs = [("python", words[:sample])]
+    if numpy is not None:
+        runs.append(("numpy", words))
+
+    print(f"{count:,} names, {total:,} misspelled words\n")
+    for backend, batch in runs:
+        start = time.perf_counter()
+        vocabulary = Vocabulary(names, backend=backend)
+        built = time.perf_counter() - start
+
+        elapsed, found = timed(vocabulary, batch)
+        hits = sum(1 for original, best in zip(originals, found) if best and best[0] == original)
+        print(f"{backend:<7} {elapsed / len(batch) * 1e3:>9.2f} ms/word over {len(batch):,} words, "
+              f"first suggestion right: {hits / len(batch):.0%}, index built in {built:.2f} s")
+
+    if numpy is None:
+        print("numpy   not installed")
+
+
+if __name__ == "__main__":
+    main()
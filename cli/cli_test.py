@@ -0,0 +1,125 @@
+import contextlib
+import io
+import json
+import os
+import tempfile
+
+from cli.runner import main
+
+
+def run(*args):
+    out = io.StringIO()
+    with contextlib.redirect_stdout(out), contextlib.redirect_stderr(io.StringIO()):
+        status = main(list(args))
+    return status, out.getvalue()
+
+
+def rejected(*args):
+    with contextlib.redirect_stderr(io.StringIO()):
+        try:
+            main(list(args))
+        except SystemExit as exit:
+            return exit.code == 2
+    return False
+
+
+def collect_cases():
+    # Worker processes may re-import this module; only the main run builds a pool
+    with tempfile.TemporaryDirectory() as root:
+        os.makedirs(os.path.join(root, "b"))
+        files = {
+            "a.sql": "SELECT a FROM t;\nSELECT FROM t;\n",
+            os.path.join("b", "c.sql"): "-- setup\nCOMMIT;\nDROP TABLE t;\nINSERT INTO t;",
+            "notes.txt": "not sql;",
+        }
+        for name, text in files.items():
+            with open(os.path.join(root, name), "w") as out:
+                out.write(text)
+
+        a = os.path.join(root, "a.sql")
+        c = os.path.join(root, "b", "c.sql")
+
+        serial = run(root, "-j", "1", "-q")
+        parallel = run(root, "-j", "3", "-c", "1", "-q")
+        valid = run(a, "-j", "1", "-q", "--json")
+        lines = [json.loads(line) for line in valid[1].splitlines()]
+
+        cases = [
+            ("errors in input order", serial, (1, (
+                f"{a}:2: error: No select statment\n"
+                f"{c}:4: error: Missing VALUES clause.; suggestion: INSERT requires a VALUES clause.; expected: '(', VALUES\n"
+            ))),
+            ("parallel output matches serial", parallel, serial),
+            ("json lines", [(item["line"], item["offset"], item["valid"]) for item in lines], [(1, 0, True), (2, 17, False)]),
+            ("unreadable input", run(c.replace("c.sql", "missing.sql"), "-q")[0], 2),
+            ("no workers rejected", rejected("-j", "0"), True),
+            ("explicit file ignores extension", run(os.path.join(root, "notes.txt"), "-j", "1", "-q")[0], 1),
+        ]
+
+        # Cached runs: cold, warm (files answered from manifests), then
+        # with one file edited (its unchanged statements reused)
+        cache = os.path.join(root, "cache.db")
+        uncached = run(root, "-j", "1", "-q", "-v")
+        cold = run(root, "-j", "1", "-q", "-v", "--cache", cache)
+        warm = run(root, "-j", "3", "-c", "1", "-q", "-v", "--cache", cache)
+        with open(a, "a") as out:
+            out.write("DELETE FROM t;\n")
+        edited = run(root, "-j", "1", "-q", "--json", "--cache", cache)
+
+        # The backends split this script differently: sqlite ignores
+        # the parentheses around the first ';'
+        split = os.path.join(root, "split.txt")
+        with open(split, "w") as out:
+            out.write("SELECT a FROM t WHERE a IN (1;\nSELECT 2);\n")
+        run(split, "-q", "--backend", "native", "--cache", cache)
+
+        # A MySQL dump: valid only with backslash escapes
+        mysql = os.path.join(root, "mysql.txt")
+        with open(mysql, "w") as out:
+            out.write("INSERT INTO t (a) VALUES ('O\\'Neil; x');\n")
+        run(mysql, "-q", "--cache", cache)
+
+        cases += [
+            ("cold cached run matches uncached", cold, uncached),
+            ("warm cached run matches cold", warm, cold),
+            ("edited file revalidated", edited, run(root, "-j", "1", "-q", "--json")),
+            ("manifests kept per backend", run(split, "-q", "--json", "--backend", "sqlite", "--cache", cache),
+             run(split, "-q", "--json", "--backend", "sqlite")),
+            ("backslash escapes validated", run(mysql, "-j", "2", "-q", "--backslash-escapes"), (0, "")),
+            ("statement results kept per escapes", run(mysql, "-q", "--backslash-escapes", "--cache", cache), (0, "")),
+            ("unusable cache file", run(a, "-q", "--cache", os.path.join(root, "missing", "cache.db"))[0], 2),
+        ]
+
+    return cases
+
+
+if __name__ == "__main__":
+    failed_tests = []
+    total_tests = 0
+
+    print("\n===== CLI TEST RESULTS =====\n")
+
+    for name, got, expected in collect_cases():
+        total_tests += 1
+
+        if got == expected:
+            print(f"[PASS] {name}")
+        else:
+            print(f"[FAIL] {name} -> {got} (expected {expected})")
+            failed_tests.append((name, got))
+
+
+    #TEST SUMMARY
+
+    print("\n===== TEST SUMMARY =====")
+    print(f"Total Test Cases : {total_tests}")
+    print(f"Passed           : {total_tests - len(failed_tests)}")
+    print(f"Failed           : {len(failed_tests)}")
+
+    if failed_tests:
+        print("\n--- Failed Test Descriptions ---")
+        for i, (q, got) in enumerate(failed_tests, start=1):
+            print(f"{i}. Case : {q!r}")
+            print(f"   Got  : {got}")
+    else:
+        print("\nAll CLI tests passed successfully.")
@@ -0,0 +1,318 @@
+"""
+Command-line validator for SQL files, directories and stdin.
+
+Every input is split into statements with ScriptSplitter and the
+statements are validated in chunks on a process pool. Results are
+printed in input order (files in the order given, directories walked
+in sorted order), so the output is the same for any number of workers.
+
+Usage (from the repository root):
+    python -m cli [paths ...] [--workers N] [--chunksize K] [--json]
+                  [--cache FILE [--cache-size MB]]
+
+With --cache, results are kept in a sqlite3 file (DiskCache): files
+whose content was already checked are answered from their manifest
+without splitting or validating them, and only statements never seen
+before are sent to the workers.
+
+With no paths, or '-', the script is read from stdin. Exit status is 0
+when every statement is valid, 1 if any is invalid and 2 if an input
+could not be read.
+"""
+import argparse
+import contextlib
+import json
+import os
+import sys
+import time
+from collections import deque
+
+from ParallelValidator import validate_parallel, available_cores, make_pool
+from DiskCache import DiskCache, HashingReader
+from QueryParser import VALIDATOR_VERSION
+from lexer.ScriptSplitter import ScriptSplitter, Statement, BACKENDS
+
+
+# ---------------------------------------------------------
+# Inputs
+# ---------------------------------------------------------
+
+def find_scripts(paths, extension=".sql"):
+    """
+    Yields the files to check: files named on the command line as
+    given, directories walked recursively for `extension` files in
+    sorted order, and '-' for stdin.
+    """
+    for path in paths:
+        if os.path.isdir(path):
+            for folder, subfolders, files in os.walk(path):
+                subfolders.sort()
+                for name in sorted(files):
+                    if name.endswith(extension):
+                        yield os.path.join(folder, name)
+        else:
+            yield path
+
+
+def read_statements(paths, options, problems):
+    """
+    Yields (file name, Statement) for every statement of every input,
+    reading each file incrementally. Unreadable inputs are reported in
+    `problems` and skipped.
+    """
+    for path in find_scripts(paths, options.extension):
+        if path == "-":
+            for statement in ScriptSplitter(sys.stdin.buffer, **options.splitter):
+                yield "<stdin>", statement
+            continue
+
+        try:
+            with open(path, "rb") as source:
+                for statement in ScriptSplitter(source, **options.splitter):
+                    yield path, statement
+        except OSError as err:
+            problems.append(f"{path}: {err.strerror or err}")
+
+
+# ---------------------------------------------------------
+# Validation
+# ---------------------------------------------------------
+
+def validate_statements(items, options):
+    """
+    Validates (name, Statement) items with validate_parallel, yielding
+    (name, Statement, error message or None) in input order.
+    """
+    pending = deque()
+
+    def texts():
+        for item in items:
+            pending.append(item)
+            yield item[1].text
+
+    results = validate_parallel(texts(), options.workers, options.chunksize,
+                                backslashEscapes=options.backslash_escapes)
+    for _, message in results:
+        name, statement = pending.popleft()
+        yield name, statement, message
+
+
+# ---------------------------------------------------------
+# Cached validation
+# ---------------------------------------------------------
+
+class FileResults:
+    """
+    Results of one script being validated, stored as its manifest once
+    the last one is known.
+    """
+
+    def __init__(self, source):
+        self.reader = HashingReader(source)
+        self.stat = os.fstat(source.fileno())     # taken before reading
+        self.results = []
+
+
+def read_cached(paths, options, problems, cache):
+    """
+    Like read_statements, but yields (name, Statement, result, file)
+    where result is the cached (valid, message) or None if the statement
+    still has to be validated, and file is the FileResults collecting
+    its script's results (None for stdin and for files answered from a
+    manifest). After the statements of a validated file comes an item
+    with Statement None, marking the end of that file.
+    """
+    splitter = options.splitter
+    key = options.cache_key
+    lexer_key = options.lexer_key
+
+    for path in find_scripts(paths, options.extension):
+        if path == "-":
+            for statement in ScriptSplitter(sys.stdin.buffer, **splitter):
+                yield "<stdin>", statement, cache.get(statement.text, lexer_key), None
+            continue
+
+        try:
+            manifest = cache.manifest(cache.file_digest(path), key)
+            if manifest is not None:
+                for start, end, line, valid, message in manifest:
+                    yield path, Statement(None, start, end, line), (valid, message), None
+                continue
+
+            with open(path, "rb") as source:
+                file = FileResults(source)
+                for statement in ScriptSplitter(file.reader, **splitter):
+                    yield path, statement, cache.get(statement.text, lexer_key), file
+        except OSError as err:
+            problems.append(f"{path}: {err.strerror or err}")
+            continue
+
+        yield path, None, None, file
+
+
+def validate_cached(items, cache, options):
+    """
+    Validates the items of read_cached that have no cached result,
+    yielding (name, Statement, error message or None) in input order.
+    New results are stored in the cache, and the manifest of every
+    script validated in full.
+
+    Items are resolved in windows of a few chunks per worker, so memory
+    stays bounded while long runs of cached statements are passed
+    through. The pool is started on the first statement to validate.
+    """
+    workers = options.workers
+    batch = workers * options.chunksize * 4
+    pool = None
+
+    def resolve(window, texts):
+        nonlocal pool
+        if texts and workers > 1 and pool is None:
+            pool = make_pool(workers)
+        results = validate_parallel(texts, workers, options.chunksize, pool, options.backslash_escapes)
+
+        for name, statement, result, file in window:
+            if statement is None:
+                content = file.reader.digest()
+                cache.put_manifest(content, file.results, options.cache_key)
+                cache.remember_file(name, content, file.stat)
+                continue
+
+            if result is None:
+                result = next(results)
+                cache.put(statement.text, *result, options=options.lexer_key)
+
+            valid, message = result
+            if file is not None:
+                file.results.append((statement.start, statement.end, statement.line, valid, message))
+            yield name, statement, message
+
+    try:
+        window = []
+        texts = []
+        for item in items:
+            window.append(item)
+            if item[1] is not None and item[2] is None:
+                texts.append(item[1].text)
+            if len(texts) >= batch or len(window) >= 4 * batch:
+                yield from resolve(window, texts)
+                window = []
+                texts = []
+        yield from resolve(window, texts)
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+
+# ---------------------------------------------------------
+# Output
+# ---------------------------------------------------------
+
+def report(name, statement, err, options, out):
+    if options.json:
+        out.write(json.dumps({
+            "file": name,
+            "line": statement.line,
+            "offset": statement.start,
+            "valid": err is None,
+            "error": err,
+        }) + "\n")
+    elif err is not None:
+        out.write(f"{name}:{statement.line}: {err}\n")
+    elif options.verbose:
+        out.write(f"{name}:{statement.line}: ok\n")
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(
+        prog="python -m cli",
+        description="Validate the SQL statements of files, directories or stdin.",
+    )
+    parser.add_argument("paths", nargs="*", default=["-"],
+                        help="SQL files or directories ('-' or nothing for stdin)")
+    parser.add_argument("-j", "--workers", type=int, default=available_cores(),
+                        help="worker processes (1 validates in this process; default: all cores)")
+    parser.add_argument("-c", "--chunksize", type=int, default=256,
+                        help="statements sent to a worker at a time (default: 256)")
+    parser.add_argument("--ext", dest="extension", default=".sql",
+                        help="file extension searched in directories (default: .sql)")
+    parser.add_argument("--backend", choices=BACKENDS, default="native",
+                        help="statement boundary detection (default: native)")
+    parser.add_argument("--backslash-escapes", action="store_true",
+                        help="treat backslash as an escape in literals (MySQL dumps)")
+    parser.add_argument("--json", action="store_true",
+                        help="print one JSON object per statement")
+    parser.add_argument("-v", "--verbose", action="store_true",
+                        help="also print valid statements")
+    parser.add_argument("-q", "--quiet", action="store_true",
+                        help="do not print the summary")
+    parser.add_argument("--cache", metavar="FILE",
+                        help="keep results in this sqlite3 file and skip unchanged files and statements")
+    parser.add_argument("--cache-size", type=float, default=256, metavar="MB",
+                        help="size the cache is pruned back to after a run (default: 256)")
+
+    options = parser.parse_args(argv)
+    if options.workers < 1:
+        parser.error("--workers must be at least 1")
+    if options.chunksize < 1:
+        parser.error("--chunksize must be at least 1")
+    if options.cache_size <= 0:
+        parser.error("--cache-size must be positive")
+
+    options.splitter = {"backend": options.backend, "backslashEscapes": options.backslash_escapes}
+    # Manifests hold statement boundaries, which depend on the splitter:
+    # its backend (sqlite ignores parentheses) and the escapes
+    options.cache_key = f"backend={options.backend}|backslash={int(options.backslash_escapes)}"
+    # Statement results depend on the lexer's escapes only
+    options.lexer_key = "backslash=1" if options.backslash_escapes else ""
+    return options
+
+
+def main(argv=None):
+    options = parse_args(argv)
+    out = sys.stdout
+    problems = []
+    statements = 0
+    invalid = 0
+
+    start = time.perf_counter()
+    with contextlib.ExitStack() as stack:
+        if options.cache:
+            try:
+                cache = stack.enter_context(DiskCache(
+                    options.cache, VALIDATOR_VERSION, int(options.cache_size * (1 << 20))))
+            except (ValueError, OSError) as err:
+                print(f"--cache: {err}", file=sys.stderr)
+                return 2
+            results = validate_cached(read_cached(options.paths, options, problems, cache), cache, options)
+        else:
+            items = read_statements(options.paths, options, problems)
+            results = validate_statements(items, options)
+
+        for name, statement, err in results:
+            statements += 1
+            if err is not None:
+                invalid += 1
+            report(name, statement, err, options, out)
+
+        if options.cache:
+            reused = f", cache: {cache.files_skipped:,} files skipped, {cache.hits:,} statements reused"
+        else:
+            reused = ""
+
+    elapsed = time.perf_counter() - start
+
+    for problem in problems:
+        print(problem, file=sys.stderr)
+
+    if not options.quiet:
+        rate = statements / elapsed if elapsed else 0.0
+        print(
+            f"{statements:,} statements, {invalid:,} invalid "
+            f"in {elapsed:.2f} s ({rate:,.0f} statements/s, workers: {options.workers}{reused})",
+            file=sys.stderr,
+        )
+
+    if problems:
+        return 2
+    return 1 if invalid else 0
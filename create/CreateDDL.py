@@ -1,74 +1,149 @@
 from validator.SyntaxValidator import SyntaxValidator
+from lexer.Lexer import Lexer
+from grammar.Grammar import Message
+from grammar.Expression import Expression
+from grammar.SqlGrammar import SQL, statementEnd
 
 
 class CreateDDL:
 
+    # Errors of a statement the grammar stops in, by rule
+    MESSAGES = {
+        "create": Message("Statement must start with CREATE"),
+        "table_statement": Message("Statement must start with CREATE"),
+        "view_statement": Message("Statement must start with CREATE"),
+        "index_statement": Message("Statement must start with CREATE"),
+        "database_statement": Message("Statement must start with CREATE"),
+        "create_object": Message("Unsupported CREATE statement"),
+        "table_keyword": Message("Expected TABLE keyword"),
+        "view_keyword": Message("Expected VIEW keyword"),
+        "or_replace": Message("Expected VIEW keyword"),
+        "index_keyword": Message("Expected INDEX keyword"),
+        "unique_index": Message("Expected INDEX keyword"),
+        "database_keyword": Message("Expected DATABASE keyword"),
+        "if_not_exists": Message("IF must be followed by NOT EXISTS"),
+
+        # ---- TABLE ----
+        "create_table": Message("Column definitions must be enclosed in parentheses",
+                                missing="Incomplete CREATE TABLE statement"),
+        "table_name": Message("Invalid table name '{token}'", missing="Table name is missing"),
+        "table_end": Message("Column definitions must be enclosed in parentheses"),
+        "table_elements": Message("Invalid column name '{token}'", missing="Table must have at least one column"),
+        "next_element": Message("Invalid column name '{token}'",
+                                missing="Trailing comma in column definition is not allowed"),
+        "column_definition": Message("Invalid column constraint '{token}'"),
+        "column_name": Message("Invalid column name '{token}'",
+                               missing="Column definition must include name and data type"),
+        "column_type": Message("Column definition must include name and data type"),
+        "type_arguments": Message("Invalid data type argument '{token}'", missing="Data type argument list is empty"),
+        "next_argument": Message("Invalid data type argument '{token}'",
+                                 missing="Trailing comma in data type arguments is not allowed"),
+        "primary_key": Message("PRIMARY must be followed by KEY"),
+        "not_null": Message("NOT must be followed by NULL"),
+        "default_value": Message("DEFAULT must have a value"),
+        "check_body": Message("CHECK constraint must be enclosed in parentheses"),
+        "references": Message("Invalid referenced table '{token}'", missing="REFERENCES must specify a table"),
+        "ref_table": Message("Invalid referenced table '{token}'", missing="REFERENCES must specify a table"),
+        "ref_columns": Message("REFERENCES must specify referenced column"),
+
+        # ---- VIEW ----
+        "create_view": Message("Invalid view name '{token}'", missing="View name is missing"),
+        "view_name": Message("Invalid view name '{token}'", missing="View name is missing"),
+        "view_body": Message("Missing AS keyword"),
+        "view_columns": Message("Invalid view column '{token}'", missing="Empty column name in view definition"),
+        "view_column": Message("Invalid view column '{token}'", missing="Empty column name in view definition"),
+        "next_view_column": Message("Invalid view column '{token}'",
+                                    missing="Trailing comma in view column list is not allowed"),
+        "view_select": Message("CREATE VIEW must use SELECT"),
+
+        # ---- INDEX ----
+        "create_index": Message("Invalid index name '{token}'", missing="Index name is missing"),
+        "index_name": Message("Invalid index name '{token}'", missing="Index name is missing"),
+        "index_on": Message("Missing ON keyword"),
+        "index_columns": Message("Index column list must be enclosed in parentheses"),
+        "index_end": Message("Index column list must be enclosed in parentheses"),
+        "index_column": Message("Invalid index column '{token}'", missing="Index must contain at least one column"),
+        "next_index_column": Message("Invalid index column '{token}'",
+                                     missing="Trailing comma in index column list is not allowed"),
+        "index_order": Message("Invalid sort order '{token}'"),
+
+        # ---- DATABASE ----
+        "create_database": Message("Invalid database name '{token}'", missing="Database name is missing"),
+        "database_name": Message("Invalid database name '{token}'", missing="Database name is missing"),
+        "database_end": Message("Unexpected extra tokens after database name"),
+    }
+
+    # Rules holding a name, checked once the grammar has read them
+    NAMES = {
+        "table_name": "Invalid table name '{}'",
+        "column_name": "Invalid column name '{}'",
+        "ref_table": "Invalid referenced table '{}'",
+        "view_name": "Invalid view name '{}'",
+        "view_column": "Invalid view column '{}'",
+        "next_view_column": "Invalid view column '{}'",
+        "index_name": "Invalid index name '{}'",
+        "index_column_name": "Invalid index column '{}'",
+        "database_name": "Invalid database name '{}'",
+    }
+
+    # Expressions of CHECK and DEFAULT constraints
+    CHECK = Expression(True, aggregates=False, place="CHECK constraint")
+    DEFAULT = Expression(False, aggregates=False, place="DEFAULT value")
+
     # --------------------------------------------------
-    # COLUMN / CONSTRAINT HELPERS
+    # SHARED
     # --------------------------------------------------
 
     @staticmethod
-    def isTableConstraint(defn):
-        first = SyntaxValidator.tokenize(defn)[0].upper()
-        return first in ("PRIMARY", "UNIQUE", "FOREIGN", "CHECK")
-
-    @staticmethod
-    def validateColumnDefinition(defn):
-        tokens = SyntaxValidator.tokenize(defn)
-
-        if len(tokens) < 2:
-            return {"error": "Column definition must include name and data type"}
-
-        colName = tokens[0]
-        if not SyntaxValidator.isValidIdentifier(colName):
-            return {"error": f"Invalid column name '{colName}'"}
-
-        i = 2
-
-        while i < len(tokens):
-            token = tokens[i].upper()
-
-            if token == "PRIMARY":
-                if i + 1 < len(tokens) and tokens[i + 1].upper() == "KEY":
-                    i += 2
-                else:
-                    return {"error": "PRIMARY must be followed by KEY"}
-
-            elif token == "UNIQUE":
-                i += 1
-
-            elif token == "NOT":
-                if i + 1 < len(tokens) and tokens[i + 1].upper() == "NULL":
-                    i += 2
-                else:
-                    return {"error": "NOT must be followed by NULL"}
-
-            elif token == "DEFAULT":
-                if i + 1 >= len(tokens):
-                    return {"error": "DEFAULT must have a value"}
-                i += 2
-
-            elif token == "CHECK":
-                if "(" not in defn or ")" not in defn:
-                    return {"error": "CHECK constraint must be enclosed in parentheses"}
-                break
+    def checkParse(stream, parse):
+        """
+        Error of a parsed CREATE statement: the first invalid name or
+        CHECK / DEFAULT expression the grammar read, else the grammar's
+        own error.
+        """
+        hasElements = hasColumn = False
+
+        for rule, start, end in parse.spans:
+            if end is None:
+                continue
 
-            elif token == "REFERENCES":
-                if i + 1 >= len(tokens):
-                    return {"error": "REFERENCES must specify a table"}
+            if rule in CreateDDL.NAMES:
+                name = stream.text(start, end)
+                if not SyntaxValidator.isValidIdentifier(name):
+                    return {"error": CreateDDL.NAMES[rule].format(name)}
+            elif rule == "check_condition":
+                err = CreateDDL.CHECK.check(stream.span(start, end))
+                if err:
+                    return {"error": "Invalid CHECK constraint", "details": err}
+            elif rule == "default_value":
+                err = CreateDDL.DEFAULT.check(stream.span(start, end))
+                if err:
+                    return {"error": "Invalid DEFAULT value", "details": err}
+            elif rule == "table_elements":
+                hasElements = True
+            elif rule == "column_definition":
+                hasColumn = True
+
+        # Table constraints alone make no table
+        if hasElements and not hasColumn:
+            return {"error": "Table must contain at least one column"}
 
-                refTable = tokens[i + 1].split("(")[0]
-                if not SyntaxValidator.isValidIdentifier(refTable):
-                    return {"error": f"Invalid referenced table '{refTable}'"}
+        return parse.error(CreateDDL.MESSAGES, stream.texts, starts=stream.starts)
 
-                if "(" not in defn or ")" not in defn:
-                    return {"error": "REFERENCES must specify referenced column"}
-                break
+    @staticmethod
+    def validateStream(stream, rule, balanced=True):
+        """
+        Validates a CREATE statement as one `rule` of the grammar.
+        """
+        if not stream.tokens:
+            return {"error": "Query is empty"}
 
-            else:
-                return {"error": f"Invalid column constraint '{tokens[i]}'"}
+        if balanced and not stream.hasBalancedParentheses():
+            return {"error": "Unbalanced parentheses in query"}
 
-        return None
+        tokens = stream.tokens
+        parse = SQL.parse(rule, tokens, stream.kinds, 0, statementEnd(tokens))
+        return CreateDDL.checkParse(stream, parse)
 
     # --------------------------------------------------
     # CREATE TABLE
@@ -79,64 +154,11 @@ class CreateDDL:
         if not query or not query.strip():
             return {"error": "Query is empty"}
 
-        if not SyntaxValidator.hasBalancedParentheses(query):
-            return {"error": "Unbalanced parentheses in query"}
-
-        query = query.strip().rstrip(";")
-        tokens = SyntaxValidator.tokenize(query)
-
-        if len(tokens) < 4:
-            return {"error": "Incomplete CREATE TABLE statement"}
+        return CreateDDL.validateCreateTableStream(Lexer.tokenize(query))
 
-        if tokens[0].upper() != "CREATE":
-            return {"error": "Statement must start with CREATE"}
-
-        if tokens[1].upper() != "TABLE":
-            return {"error": "Expected TABLE keyword"}
-
-        index = 2
-        if tokens[index:index + 3] == ["IF", "NOT", "EXISTS"]:
-            index += 3
-
-        if index >= len(tokens):
-            return {"error": "Table name is missing"}
-
-        tableName = tokens[index].split("(")[0]
-        if not SyntaxValidator.isValidIdentifier(tableName):
-            return {"error": f"Invalid table name '{tableName}'"}
-
-        remainder = query[query.find(tableName) + len(tableName):].strip()
-
-        if not remainder.startswith("(") or not remainder.endswith(")"):
-            return {"error": "Column definitions must be enclosed in parentheses"}
-
-        block = remainder[1:-1].strip()
-        if not block:
-            return {"error": "Table must have at least one column"}
-
-        if block.endswith(","):
-            return {"error": "Trailing comma in column definition is not allowed"}
-
-        definitions = SyntaxValidator.splitByCommaRespectingParens(block)
-        hasColumn = False
-
-        for d in definitions:
-            if not d:
-                return {"error": "Empty column definition due to trailing comma"}
-
-            if CreateDDL.isTableConstraint(d):
-                continue
-
-            err = CreateDDL.validateColumnDefinition(d)
-            if err:
-                return err
-
-            hasColumn = True
-
-        if not hasColumn:
-            return {"error": "Table must contain at least one column"}
-
-        return None
+    @staticmethod
+    def validateCreateTableStream(stream):
+        return CreateDDL.validateStream(stream, "table_statement")
 
     # --------------------------------------------------
     # CREATE VIEW
@@ -147,60 +169,11 @@ class CreateDDL:
         if not query or not query.strip():
             return {"error": "Query is empty"}
 
-        if not SyntaxValidator.hasBalancedParentheses(query):
-            return {"error": "Unbalanced parentheses in query"}
-
-        query = query.strip().rstrip(";")
-        tokens = SyntaxValidator.tokenize(query)
-
-        if tokens[0].upper() != "CREATE":
-            return {"error": "Statement must start with CREATE"}
-
-        index = 1
-        if tokens[index:index + 3] == ["OR", "REPLACE", "VIEW"]:
-            index += 3
-        elif tokens[index].upper() == "VIEW":
-            index += 1
-        else:
-            return {"error": "Expected VIEW keyword"}
-
-        if tokens[index:index + 3] == ["IF", "NOT", "EXISTS"]:
-            index += 3
-
-        if index >= len(tokens):
-            return {"error": "View name is missing"}
-
-        viewName = tokens[index]
-        if not SyntaxValidator.isValidIdentifier(viewName):
-            return {"error": f"Invalid view name '{viewName}'"}
-
-        remainder = query[query.find(viewName) + len(viewName):].strip()
-
-        if remainder.startswith("("):
-            close = remainder.find(")")
-            if close == -1:
-                return {"error": "Unclosed column list"}
-
-            columnBlock = remainder[1:close]
-            if columnBlock.strip().endswith(","):
-                return {"error": "Trailing comma in view column list is not allowed"}
-
-            columns = SyntaxValidator.splitByCommaRespectingParens(columnBlock)
-            for col in columns:
-                if not col:
-                    return {"error": "Empty column name in view definition"}
-                if not SyntaxValidator.isValidIdentifier(col):
-                    return {"error": f"Invalid view column '{col}'"}
+        return CreateDDL.validateCreateViewStream(Lexer.tokenize(query))
 
-            remainder = remainder[close + 1:].strip()
-
-        if not remainder.upper().startswith("AS"):
-            return {"error": "Missing AS keyword"}
-
-        if not remainder[2:].strip().upper().startswith("SELECT"):
-            return {"error": "CREATE VIEW must use SELECT"}
-
-        return None
+    @staticmethod
+    def validateCreateViewStream(stream):
+        return CreateDDL.validateStream(stream, "view_statement")
 
     # --------------------------------------------------
     # CREATE INDEX
@@ -211,65 +184,11 @@ class CreateDDL:
         if not query or not query.strip():
             return {"error": "Query is empty"}
 
-        query = query.strip().rstrip(";")
-        tokens = SyntaxValidator.tokenize(query)
-
-        if len(tokens) < 5:
-            return {"error": "Incomplete CREATE INDEX statement"}
-
-        if tokens[0].upper() != "CREATE":
-            return {"error": "Statement must start with CREATE"}
-
-        index = 1
-        if tokens[index].upper() == "UNIQUE":
-            index += 1
-
-        if tokens[index].upper() != "INDEX":
-            return {"error": "Expected INDEX keyword"}
-
-        index += 1
-        if index >= len(tokens):
-            return {"error": "Index name is missing"}
-
-        indexName = tokens[index]
-        if not SyntaxValidator.isValidIdentifier(indexName):
-            return {"error": f"Invalid index name '{indexName}'"}
+        return CreateDDL.validateCreateIndexStream(Lexer.tokenize(query))
 
-        index += 1
-        if index >= len(tokens) or tokens[index].upper() != "ON":
-            return {"error": "Missing ON keyword"}
-
-        index += 1
-        if index >= len(tokens):
-            return {"error": "Table name is missing"}
-
-        tableName = tokens[index].split("(")[0]
-        if not SyntaxValidator.isValidIdentifier(tableName):
-            return {"error": f"Invalid table name '{tableName}'"}
-
-        onPos = query.upper().find(" ON ")
-        parenStart = query.find("(", onPos)
-
-        if parenStart == -1 or not query.endswith(")"):
-            return {"error": "Index column list must be enclosed in parentheses"}
-
-        columnBlock = query[parenStart + 1:-1].strip()
-        if not columnBlock:
-            return {"error": "Index must contain at least one column"}
-
-        if columnBlock.endswith(","):
-            return {"error": "Trailing comma in index column list is not allowed"}
-
-        columns = SyntaxValidator.splitByCommaRespectingParens(columnBlock)
-        for col in columns:
-            parts = SyntaxValidator.tokenize(col)
-            if not parts or not SyntaxValidator.isValidIdentifier(parts[0]):
-                return {"error": f"Invalid index column '{parts[0]}'"}
-
-            if len(parts) > 1 and parts[1].upper() not in ("ASC", "DESC"):
-                return {"error": f"Invalid sort order '{parts[1]}'"}
-
-        return None
+    @staticmethod
+    def validateCreateIndexStream(stream):
+        return CreateDDL.validateStream(stream, "index_statement", balanced=False)
 
     # --------------------------------------------------
     # CREATE DATABASE
@@ -280,43 +199,15 @@ class CreateDDL:
         if not query or not query.strip():
             return {"error": "Query is empty"}
 
-        query = query.strip().rstrip(";")
-        tokens = SyntaxValidator.tokenize(query)
+        return CreateDDL.validateCreateDatabaseStream(Lexer.tokenize(query))
 
-        if len(tokens) < 3:
-            return {"error": "Incomplete CREATE DATABASE statement"}
-
-        if tokens[0].upper() != "CREATE":
-            return {"error": "Statement must start with CREATE"}
-
-        if tokens[1].upper() != "DATABASE":
-            return {"error": "Expected DATABASE keyword"}
-
-        index = 2
-        if tokens[index:index + 3] == ["IF", "NOT", "EXISTS"]:
-            index += 3
-
-        if index >= len(tokens):
-            return {"error": "Database name is missing"}
-
-        if index + 1 < len(tokens):
-            return {"error": "Unexpected extra tokens after database name"}
-
-        if not SyntaxValidator.isValidIdentifier(tokens[index]):
-            return {"error": f"Invalid database name '{tokens[index]}'"}
-
-        return None
+    @staticmethod
+    def validateCreateDatabaseStream(stream):
+        return CreateDDL.validateStream(stream, "database_statement", balanced=False)
 
     def validate_create(self, query):
-        q = query.strip().upper()
-
-        if q.startswith("CREATE TABLE"):
-            return CreateDDL.validateCreateTableQuery(query)
-        if q.startswith("CREATE VIEW"):
-            return CreateDDL.validateCreateViewQuery(query)
-        if q.startswith("CREATE INDEX") or q.startswith("CREATE UNIQUE INDEX"):
-            return CreateDDL.validateCreateIndexQuery(query)
-        if q.startswith("CREATE DATABASE"):
-            return CreateDDL.validateCreateDatabaseQuery(query)
-
-        return {"error": "Unsupported CREATE statement"}
+        return self.validate_create_stream(Lexer.tokenize(query))
+
+    def validate_create_stream(self, stream):
+        # The grammar tells the object type apart
+        return CreateDDL.validateStream(stream, "create")
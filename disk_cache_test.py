@@ -0,0 +1,123 @@
+import os
+import tempfile
+import time
+
+from DiskCache import DiskCache
+
+
+def rejects(*args, **options):
+    try:
+        DiskCache(*args, **options)
+    except ValueError:
+        return True
+    return False
+
+
+failed_tests = []
+total_tests = 0
+
+print("\n===== DISK CACHE TEST RESULTS =====\n")
+
+with tempfile.TemporaryDirectory() as root:
+    path = os.path.join(root, "cache.db")
+    script = os.path.join(root, "a.sql")
+    with open(script, "w") as out:
+        out.write("SELECT a FROM t;\n")
+    hour_ago = time.time() - 3600
+    os.utime(script, (hour_ago, hour_ago))
+
+    #STATEMENTS AND MANIFESTS
+
+    with DiskCache(path, version="1") as cache:
+        missing = cache.get("SELECT a FROM t;")
+        cache.put("SELECT a FROM t;", True)
+        cache.put("SELECT FROM t;", False, "error: No select statment")
+
+        content = cache.file_digest(script)
+        results = [(0, 16, 1, True, None), (17, 31, 2, False, "error: x"), (32, 40, 3, False, "error: x")]
+        cache.put_manifest(content, results, "backslash=0")
+        same_run = cache.manifest(content, "backslash=0")
+
+    with DiskCache(path, version="1") as cache:
+        cases = [
+            ("miss", missing, None),
+            ("valid statement", cache.get("SELECT a FROM t;"), (True, None)),
+            ("invalid statement", cache.get("SELECT FROM t;"), (False, "error: No select statment")),
+            ("statement text is exact", cache.get("select a from t;"), None),
+            ("manifest round trip", same_run, results),
+            ("persisted", cache.manifest(content, "backslash=0"), results),
+            ("other splitter options", cache.manifest(content, "backslash=1"), None),
+            ("counters", (cache.hits, cache.misses, cache.files_skipped), (2, 1, 1)),
+            ("run number", cache.run, 2),
+        ]
+
+    with DiskCache(path, version="2") as cache:
+        cases.append(("other validator version", (cache.get("SELECT a FROM t;"), cache.manifest(content, "backslash=0")), (None, None)))
+
+    #FILE DIGESTS
+
+    with DiskCache(path) as cache:
+        old = cache.file_digest(script)
+        with open(script, "r+") as out:
+            out.write("SELECT b")           # same size, mtime restored
+        os.utime(script, (hour_ago, hour_ago))
+        trusted = cache.file_digest(script)
+
+        with open(script, "w") as out:
+            out.write("SELECT b FROM t;\n")
+        recent = cache.file_digest(script)
+        entries = len(cache)
+        cache.remember_file(script, recent)
+
+        cases += [
+            ("unchanged stat not read again", trusted, old),
+            ("changed file hashed again", recent != old, True),
+            ("recently modified file not recorded", len(cache), entries),
+        ]
+
+    #PRUNING
+
+    small = os.path.join(root, "small.db")
+    with DiskCache(small, max_bytes=10 ** 9) as cache:
+        for i in range(100):
+            cache.put(f"SELECT c{i} FROM t;", True)
+
+    with DiskCache(small, max_bytes=2500) as cache:
+        for i in range(50, 100):
+            cache.get(f"SELECT c{i} FROM t;")
+        cache.put("SELECT new FROM t;", True)
+
+    with DiskCache(small) as cache:
+        kept = [i for i in range(100) if cache.get(f"SELECT c{i} FROM t;")]
+        cases += [
+            ("pruned to size", len(kept), 50),
+            ("least recently used dropped first", min(kept), 50),
+            ("newest kept", cache.get("SELECT new FROM t;"), (True, None)),
+        ]
+
+    cases.append(("bad size", rejects(os.path.join(root, "x.db"), max_bytes=0), True))
+
+for name, got, expected in cases:
+    total_tests += 1
+
+    if got == expected:
+        print(f"[PASS] {name}")
+    else:
+        print(f"[FAIL] {name} -> {got} (expected {expected})")
+        failed_tests.append((name, got))
+
+
+#TEST SUMMARY
+
+print("\n===== TEST SUMMARY =====")
+print(f"Total Test Cases : {total_tests}")
+print(f"Passed           : {total_tests - len(failed_tests)}")
+print(f"Failed           : {len(failed_tests)}")
+
+if failed_tests:
+    print("\n--- Failed Test Descriptions ---")
+    for i, (q, got) in enumerate(failed_tests, start=1):
+        print(f"{i}. Case : {q!r}")
+        print(f"   Got  : {got}")
+else:
+    print("\nAll DISK CACHE tests passed successfully.")
@@ -1,115 +1,71 @@
 from validator.SyntaxValidator import SyntaxValidator
+from lexer.Lexer import Lexer
+from grammar.Grammar import Message
+from grammar.SqlGrammar import SQL, statementEnd, stoppedAfter
 
 
 class DropDDL:
 
+    OBJECT_TYPES = ("TABLE", "DATABASE", "VIEW", "INDEX")
+
+    # Errors of a statement the grammar stops in, by rule ({type}: the
+    # object type)
+    MESSAGES = {
+        "drop": Message("Statement must start with DROP"),
+        "drop_object": Message("DROP supports TABLE, DATABASE, VIEW, or INDEX only",
+                               missing="Incomplete DROP statement"),
+        "object_name": Message("Invalid {type} name '{token}'", missing="Missing {type} name"),
+        "next_object": Message("Invalid {type} name '{token}'", missing="Trailing comma is not allowed"),
+        "drop_names": Message("Invalid {type} name '{token}'", missing="Missing {type} name"),
+        "if_exists": Message("IF must be followed by EXISTS"),
+        "option_end": Message("Only one of CASCADE or RESTRICT is allowed"),
+        "database_name": Message("Invalid database name '{token}'", missing="Missing database name"),
+        "drop_database": Message("Invalid database name '{token}'", missing="Missing database name"),
+        "database_end": Message("Invalid database name '{token}'",
+                                missing="Only one database can be dropped at a time"),
+    }
+
+    # Rules holding a name, checked once the grammar has read them
+    NAMES = ("object_name", "next_object", "database_name")
+
     @staticmethod
     def validateDropQuery(query):
         if not query or not query.strip():
             return {"error": "Query is empty"}
 
-        query = query.strip().rstrip(";")
-        tokens = query.split()
-
-        if len(tokens) < 3:
-            return {"error": "Incomplete DROP statement"}
-
-        if tokens[0].upper() != "DROP":
-            return {"error": "Statement must start with DROP"}
-
-        # ---- object type ----
-        objectType = tokens[1].upper()
-        if objectType not in ("TABLE", "DATABASE", "VIEW", "INDEX"):
-            return {
-                "error": "DROP supports TABLE, DATABASE, VIEW, or INDEX only"
-            }
-
-        index = 2
-
-        # ---- IF EXISTS ----
-        if (
-            index + 1 < len(tokens)
-            and tokens[index].upper() == "IF"
-            and tokens[index + 1].upper() == "EXISTS"
-        ):
-            index += 2
-
-        if index >= len(tokens):
-            return {
-                "error": f"Missing {objectType.lower()} name"
-            }
+        return DropDDL.validateDropStream(Lexer.tokenize(query))
 
-        remainingTokens = tokens[index:]
-
-        # --------------------------------------------------
-        # DROP DATABASE (special case)
-        # --------------------------------------------------
-        if objectType == "DATABASE":
-            remaining = " ".join(remainingTokens).strip()
-
-            if "," in remaining:
-                return {
-                    "error": "Only one database can be dropped at a time"
-                }
-
-            if not SyntaxValidator.isValidIdentifier(remaining):
-                return {
-                    "error": f"Invalid database name '{remaining}'"
-                }
-
-            return None
-
-        # --------------------------------------------------
-        # CASCADE / RESTRICT
-        # --------------------------------------------------
-        options = [
-            t.upper() for t in remainingTokens
-            if t.upper() in ("CASCADE", "RESTRICT")
-        ]
-
-        if len(options) > 1:
-            return {
-                "error": "Only one of CASCADE or RESTRICT is allowed"
-            }
-
-        lastToken = remainingTokens[-1].upper()
-        if lastToken in ("CASCADE", "RESTRICT"):
-            remainingTokens = remainingTokens[:-1]
-            if not remainingTokens:
-                return {
-                    "error": f"{lastToken} must follow at least one {objectType.lower()} name"
-                }
-
-        # --------------------------------------------------
-        # object names
-        # --------------------------------------------------
-        remaining = " ".join(remainingTokens).strip()
+    @staticmethod
+    def validateDropStream(stream):
+        tokens = stream.tokens
+        if not tokens:
+            return {"error": "Query is empty"}
 
-        if remaining.endswith(","):
-            return {
-                "error": "Trailing comma is not allowed"
-            }
+        end = statementEnd(tokens)
+        parse = SQL.parse("drop", tokens, stream.kinds, 0, end)
+        objectType = tokens[1] if end > 1 and tokens[1].upper() in DropDDL.OBJECT_TYPES else "object"
 
-        rawNames = remaining.split(",")
-        names = []
+        # ---- names the grammar read ----
+        for rule, start, stop in parse.spans:
+            if stop is None or rule not in DropDDL.NAMES:
+                continue
 
-        for name in rawNames:
-            stripped = name.strip()
-            if not stripped:
+            # A lone CASCADE / RESTRICT is read as the name
+            if rule == "object_name" and stop == end and stop - start == 1 and tokens[start] in ("cascade", "restrict"):
                 return {
-                    "error": "Empty object name between commas is not allowed"
+                    "error": f"{tokens[start].upper()} must follow at least one {objectType} name"
                 }
-            names.append(stripped)
-
-        if not names:
-            return {
-                "error": f"No {objectType.lower()} names specified"
-            }
 
-        for name in names:
+            name = stream.text(start, stop)
             if not SyntaxValidator.isValidIdentifier(name):
-                return {
-                    "error": f"Invalid {objectType.lower()} name '{name}'"
-                }
+                return {"error": f"Invalid {objectType} name '{name}'"}
+
+        # ---- a token after a name, worded by what it is ----
+        if stoppedAfter(parse, DropDDL.NAMES):
+            word = tokens[parse.index]
+            if word in ("(", ")"):
+                return {"error": f"Parentheses are not allowed after the {objectType} name"}
+            if word == "if":
+                return {"error": f"IF EXISTS must come before the {objectType} name"}
 
-        return None
+        return parse.error(DropDDL.MESSAGES, stream.texts, starts=stream.starts, type=objectType)
@@ -0,0 +1,452 @@
+"""
+Pratt (top-down operator precedence) parsing of SQL expressions.
+
+One engine checks the expressions of every statement: WHERE, HAVING
+and JOIN ON conditions, SELECT and ORDER BY expressions, UPDATE SET
+values, and CHECK and DEFAULT in CREATE TABLE. Each caller builds an
+Expression once, with what its place allows:
+
+    CONDITION = Expression(boolean=True, aggregates=False, place="WHERE clause")
+    err = CONDITION.check(stream.span(start, end))
+
+Operators, loosest first:
+
+    OR
+    AND
+    NOT                                              (prefix)
+    = != <> < > <= >=  [NOT] IN  [NOT] BETWEEN  [NOT] LIKE  IS [NOT]
+    + -
+    * / %
+    + -                                              (sign)
+
+Comparisons do not chain (a = b = c is an error). Operands are names
+(t.a), numbers, strings, function and aggregate calls, parenthesized
+expressions and scalar subqueries.
+
+check() makes one pass over the tokens. Operators waiting for their
+right operand and open parentheses are kept on an explicit stack, so
+nesting does not grow the Python call stack.
+"""
+from lexer.Lexer import TokenSpan, KIND_OPERATOR, KIND_AGGREGATE, KIND_DECIMAL
+from select_module.helper.utils import COLUMN_KINDS, OPERAND_KINDS
+
+
+# Binding powers; 0 is that of the frames an operand closes (parentheses)
+OR, AND, NOT, COMPARE, ADD, MULTIPLY, SIGN = range(1, 8)
+
+BINDING = {
+    "or": OR, "and": AND,
+    "=": COMPARE, "!=": COMPARE, "<>": COMPARE, "<": COMPARE, ">": COMPARE, "<=": COMPARE, ">=": COMPARE,
+    "in": COMPARE, "between": COMPARE, "like": COMPARE, "is": COMPARE,
+    "+": ADD, "-": ADD,
+    "*": MULTIPLY, "/": MULTIPLY, "%": MULTIPLY,
+}
+
+# Keywords that are operators, never operands
+OPERATOR_WORDS = {"and", "or", "not", "in", "between", "like", "is"}
+
+# What NOT may negate after an operand (a NOT IN (...))
+NEGATED = {"in", "between", "like"}
+
+# What may follow IS [NOT]
+IS_VALUES = {"null", "true", "false"}
+
+VALUE_KINDS = OPERAND_KINDS | {KIND_DECIMAL}
+
+# Types of a parsed operand
+VALUE = 0          # a value
+SUBQUERY = 1       # a scalar subquery: a value no arithmetic applies to
+STAR = 2           # a lone '*' (SELECT *, COUNT(*))
+COMPARISON = 3     # a comparison not in parentheses: a condition
+CONDITION = 4      # any other condition
+
+VALUES = (VALUE, SUBQUERY)
+CONDITIONS = (COMPARISON, CONDITION)
+
+# Frames an operand closes, bound by ')' or ','
+GROUP, CALL, AGGREGATE, LIST = "(", "call", "aggregate", "list"
+
+
+class Expression:
+    """
+    Checker of the expressions allowed in one place of a statement.
+
+    - boolean    : a condition is expected (WHERE), else a value (SET)
+    - aggregates : SUM(a) and the like are allowed
+    - star       : a lone '*' is a value (SELECT *)
+    - subqueries : called as subqueries(tokens, inList) with the
+                   TokenSpan of each subquery met (without parentheses);
+                   returns its error or None. None: no subqueries here
+    - place      : where the expression stands, for errors ("WHERE
+                   clause")
+    """
+
+    def __init__(self, boolean, aggregates=True, star=False, subqueries=None, place="expression"):
+        self.boolean = boolean
+        self.aggregates = aggregates
+        self.star = star
+        self.subqueries = subqueries
+        self.place = place
+
+    def check(self, tokens):
+        """
+        Error dict of the expression in tokens (a TokenSpan or a token
+        list), or None if it is valid.
+        """
+        span = TokenSpan.of(tokens)
+        base = span.base
+        kinds = span.kindArray
+        match = span.match
+        start = span.start
+        end = span.end
+
+        # Redundant outer parentheses; a bare SELECT is a scalar subquery
+        while start < end and base[start] == "(" and match[start] == end - 1:
+            start += 1
+            end -= 1
+        if start == end:
+            return {"error": "Empty expression"}
+        if base[start] == "select":
+            err = self._subquery(span, start, end, False)
+            return err or self._result(SUBQUERY)
+
+        frames = []
+        i = start
+
+        while True:
+            # ---- an operand (with the prefix operators before it) ----
+            if i == end:
+                return self._missing(frames, None)
+
+            tok = base[i]
+            kind = kinds[i]
+
+            if tok == "(":
+                close = match[i]
+                if close == -1 or close >= end:
+                    return {"error": "Unmatched parenthesis in expression"}
+
+                first, last = i + 1, close
+                while first < last and base[first] == "(" and match[first] == last - 1:
+                    first += 1
+                    last -= 1
+                if first == last:
+                    return {"error": "Empty expression"}
+
+                if base[first] == "select":
+                    err = self._subquery(span, first, last, False)
+                    if err:
+                        return err
+                    left = SUBQUERY
+                    i = close + 1
+                else:
+                    frames.append((0, GROUP, None, i))
+                    i += 1
+                    continue
+
+            elif tok == "not":
+                frames.append((NOT, "not", None, i))
+                i += 1
+                continue
+
+            elif tok == "-" or tok == "+":
+                frames.append((SIGN, tok, None, i))
+                i += 1
+                continue
+
+            elif kind == KIND_AGGREGATE:
+                if not self.aggregates:
+                    return {"error": f"Aggregate functions are not allowed in {self.place}"}
+                if i + 1 >= end or base[i + 1] != "(" or not i + 1 < match[i + 1] < end:
+                    return {"error": "Invalid aggregate function usage"}
+                frames.append((0, AGGREGATE, None, i))
+                i += 2
+                if base[i] == "distinct":
+                    i += 1
+                continue
+
+            elif kind in VALUE_KINDS and tok not in OPERATOR_WORDS:
+                # Function call: f(a, b), f()
+                if i + 1 < end and base[i + 1] == "(" and kind in COLUMN_KINDS:
+                    if i + 2 < end and base[i + 2] == ")":
+                        left = VALUE
+                        i += 3
+                    else:
+                        frames.append((0, CALL, None, i))
+                        i += 2
+                        continue
+                else:
+                    # Qualified name: t.a, s.t.a
+                    while i + 2 < end and base[i + 1] == "." and kinds[i + 2] in COLUMN_KINDS:
+                        i += 2
+                    left = VALUE
+                    i += 1
+
+            elif tok == "*" and (i == start or base[i - 1] == "(") and (i + 1 == end or base[i + 1] == ")") \
+                    and (frames and frames[-1][1] == AGGREGATE or self.star):
+                left = STAR
+                i += 1
+
+            elif tok == ")" or tok == "," or tok in BINDING or tok in OPERATOR_WORDS:
+                return self._missing(frames, tok, i - span.start)
+
+            else:
+                return {"error": "Expected operand in expression", "position": i - span.start, "token": tok}
+
+            # ---- the operators after it ----
+            while True:
+                if i == end:
+                    tok = None
+                    bp = 0
+                else:
+                    tok = base[i]
+                    bp = BINDING.get(tok)
+                    if bp is None:
+                        if tok == ")" or tok == ",":
+                            bp = 0
+                        elif tok == "not":
+                            if i + 1 == end or base[i + 1] not in NEGATED:
+                                return {"error": "NOT must be followed by IN, BETWEEN or LIKE"}
+                            bp = COMPARE
+                        elif kinds[i] == KIND_OPERATOR:
+                            return {"error": f"Invalid comparator: {tok}"}
+                        else:
+                            return {"error": "Expected arithmetic operator", "position": i - span.start, "token": tok}
+
+                # Apply the operators that bind at least as tightly
+                while frames and frames[-1][0] >= bp and frames[-1][0]:
+                    frame = frames[-1]
+                    if frame[1] == "between":
+                        if tok == "and":
+                            break
+                        return {"error": "BETWEEN missing AND"}
+                    frames.pop()
+                    left, err = self._apply(frame, left)
+                    if err:
+                        return err
+
+                # BETWEEN low AND: now the high bound
+                if tok == "and" and frames and frames[-1][1] == "between":
+                    frame = frames.pop()
+                    err = self._operand(left)
+                    if err:
+                        return err
+                    frames.append((COMPARE, "between and", frame[2], frame[3]))
+                    i += 1
+                    break
+
+                if tok is None:
+                    if frames:
+                        return {"error": "Unmatched parenthesis in expression"}
+                    return self._result(left)
+
+                if bp == 0:
+                    if not frames:
+                        if tok == ")":
+                            return {"error": "Unmatched parenthesis in expression"}
+                        return {"error": "Expected arithmetic operator", "position": i - span.start, "token": tok}
+
+                    frame = frames[-1]
+                    role = frame[1]
+
+                    if tok == ")":
+                        frames.pop()
+                        if role == GROUP:
+                            # (a = 1) is a condition, but no longer a bare comparison
+                            left = CONDITION if left == COMPARISON else left
+                        elif role == LIST:
+                            err = self._operand(left)
+                            if err:
+                                return err
+                            left = COMPARISON
+                        else:
+                            if left != STAR or role == CALL:
+                                err = self._operand(left)
+                                if err:
+                                    return err
+                            left = VALUE
+                        i += 1
+                        continue
+
+                    # ',' between arguments or IN values
+                    if role == AGGREGATE:
+                        return {"error": "Invalid aggregate function usage"}
+                    if role == GROUP:
+                        return {"error": "Expected arithmetic operator", "position": i - span.start, "token": tok}
+
+                    err = self._operand(left)
+                    if err:
+                        return err
+                    i += 1
+                    if i < end and (base[i] == "," or base[i] == ")"):
+                        return {"error": "Empty value in IN list" if role == LIST else "Empty function argument"}
+                    break
+
+                # ---- infix operators ----
+                if tok == "and" or tok == "or":
+                    if left not in CONDITIONS:
+                        return {"error": "Missing comparison operator"}
+                    frames.append((bp, tok, left, i))
+                    i += 1
+                    break
+
+                if bp == COMPARE:
+                    if left == COMPARISON:
+                        return {"error": "Multiple comparison operators"}
+                    err = self._operand(left)
+                    if err:
+                        return err
+
+                    op = tok
+                    if tok == "not":
+                        i += 1
+                        op = base[i]
+
+                    if op == "is":
+                        i += 1
+                        if i < end and base[i] == "not":
+                            i += 1
+                        if i == end or base[i] not in IS_VALUES:
+                            return {"error": "IS must be followed by NULL, TRUE or FALSE"}
+                        left = COMPARISON
+                        i += 1
+                        continue
+
+                    if op == "in":
+                        err, i, opened = self._inList(span, i, end, frames)
+                        if err:
+                            return err
+                        if opened:
+                            # The values follow as operands
+                            break
+                        left = COMPARISON
+                        continue
+
+                    frames.append((bp, op, left, i))
+                    i += 1
+                    break
+
+                # Arithmetic
+                if left == SUBQUERY:
+                    return {"error": "Arithmetic on subquery is not allowed"}
+                err = self._operand(left)
+                if err:
+                    return err
+                frames.append((bp, tok, left, i))
+                i += 1
+                break
+
+    # ---------------------------------------------------------
+    # Helpers
+    # ---------------------------------------------------------
+
+    def _subquery(self, span, first, last, inList):
+        if self.subqueries is None:
+            return {"error": f"Subqueries are not allowed in {self.place}"}
+        return self.subqueries(span.sub(first - span.start, last - span.start), inList)
+
+    def _inList(self, span, i, end, frames):
+        """
+        Reads the list of the IN at i: (error, index, opened). A value
+        list is opened on frames with index past its '('; a subquery is
+        checked and index is past its ')'.
+        """
+        base = span.base
+        match = span.match
+
+        paren = i + 1
+        if paren == end:
+            return {"error": "Incomplete IN expression"}, i, False
+        if base[paren] != "(":
+            return {"error": "IN requires parenthesized list or subquery"}, i, False
+
+        close = match[paren]
+        if close == -1 or close >= end:
+            return {"error": "Unmatched parenthesis in expression"}, i, False
+
+        first, last = paren + 1, close
+        while first < last and base[first] == "(" and match[first] == last - 1:
+            first += 1
+            last -= 1
+        if first == last:
+            return {"error": "IN list cannot be empty"}, i, False
+
+        if base[first] == "select":
+            return self._subquery(span, first, last, True), close + 1, False
+
+        frames.append((0, LIST, None, paren))
+        return None, paren + 1, True
+
+    def _operand(self, kind):
+        """
+        Error if an operand of this type is not a value.
+        """
+        if kind in VALUES:
+            return None
+        if kind == STAR:
+            return {"error": "Expected operand in expression", "token": "*"}
+        return {"error": "Expected a value, not a condition"}
+
+    def _apply(self, frame, right):
+        """
+        (type, error) of the operator of a frame applied to its right
+        operand.
+        """
+        bp, op, left, _ = frame
+
+        if bp == OR or bp == AND or bp == NOT:
+            if right not in CONDITIONS:
+                return None, {"error": "Missing comparison operator"}
+            return CONDITION, None
+
+        if right == SUBQUERY and bp != COMPARE:
+            return None, {"error": "Arithmetic on subquery is not allowed"}
+        err = self._operand(right)
+        if err:
+            return None, err
+
+        return (COMPARISON if bp == COMPARE else VALUE), None
+
+    def _missing(self, frames, tok, position=None):
+        """
+        Error of an operand missing before tok (None: the end).
+        """
+        if BINDING.get(tok) == MULTIPLY:
+            # a = *: no operator waits here, the '*' is out of place
+            return {"error": "Expected operand in expression", "position": position, "token": tok}
+
+        if frames and frames[-1][0]:
+            bp, op = frames[-1][0], frames[-1][1]
+            if bp <= NOT:
+                return {"error": "Logical operator without operand"}
+            if op == "between":
+                return {"error": "Incomplete BETWEEN expression"}
+            if op == "between and":
+                return {"error": "Incomplete BETWEEN bounds"}
+            if bp == COMPARE:
+                return {"error": "Incomplete comparison"}
+            return {"error": "Expression cannot end with operator"}
+
+        if frames and frames[-1][1] == LIST:
+            return {"error": "Empty value in IN list"}
+        if tok is None or tok == ")":
+            return {"error": "Empty expression"}
+        if tok in ("and", "or", "not"):
+            return {"error": "Logical operator without operand"}
+        if tok == "in":
+            return {"error": "Incomplete IN expression"}
+        if tok == "between":
+            return {"error": "Incomplete BETWEEN expression"}
+        if BINDING.get(tok) == COMPARE:
+            return {"error": "Incomplete comparison"}
+        return {"error": "Expected operand in expression", "position": position, "token": tok}
+
+    def _result(self, kind):
+        if self.boolean:
+            if kind in CONDITIONS:
+                return None
+            return {"error": "Missing comparison operator"}
+
+        if kind in VALUES or (kind == STAR and self.star):
+            return None
+        return self._operand(kind)
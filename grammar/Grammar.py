@@ -0,0 +1,561 @@
+"""
+LL(1) parsing driven by tables compiled from a declarative grammar.
+
+A grammar is plain text, one rule per `name :` header:
+
+    truncate         : TRUNCATE TABLE table_name { truncate_option }
+    truncate_option  : RESTART IDENTITY | CONTINUE IDENTITY
+                     | CASCADE | RESTRICT
+    table_name       : <name> { '.' <name> }
+
+- UPPERCASE words are keywords, quoted symbols ('(' ',' '=') are
+  punctuation or operators, lowercase words are rules
+- <name>, <number> and <string> match one token of that class; <any>
+  matches any token but ( ) , ;
+- [ ... ] is optional, { ... } repeats zero or more times, | separates
+  alternatives, and an empty alternative matches nothing
+- # starts a comment
+
+Grammar() desugars [ ] and { } into rules of their own, computes the
+FIRST and FOLLOW sets, and builds one table row per rule (token ->
+alternative), raising ValueError if the grammar is not LL(1). Rules
+expanded one inside the other on the same token (table_name -> name ->
+<name>) are then folded into one entry that also matches that token, so
+parse() checks tokens[start:end] in a single pass of about one row
+lookup per token. A statement type is one more start rule; it adds
+table rows, not work per token.
+
+A token is looked up by its text (keywords and symbols), then by its
+class, then as <any>. Keywords are names too, except the reserved
+ones, wherever the keyword itself is not legal.
+"""
+import re
+
+from lexer.Lexer import (
+    Lexer, KEYWORDS, KIND_KEYWORD, KIND_OTHER, KIND_IDENTIFIER, KIND_NUMBER,
+    KIND_DECIMAL, KIND_STRING, KIND_OPERATOR, KIND_PUNCTUATION, KIND_AGGREGATE
+)
+from spell_checker.utils import expected_error
+
+
+# Token classes; no token's text looks like these
+NAME = "<name>"
+NUMBER = "<number>"
+STRING = "<string>"
+ANY = "<any>"
+END = "<end>"
+
+CLASSES = (NAME, NUMBER, STRING, ANY)
+
+# Tokens <any> never matches: they delimit what it stands in
+STRUCTURAL = {"(", ")", ",", ";"}
+
+# Stack marker ending the innermost open span
+CLOSE = -1
+
+# A rule is missing (not just wrong) where the statement ends or one
+# of these stands in its place
+CLOSERS = {")", ",", ";"}
+
+# How classes are written in an error's list of expected tokens (keywords
+# are uppercased, symbols quoted)
+LABELS = {NAME: "a name", NUMBER: "a number", STRING: "a string", ANY: "a value"}
+
+# Class of each kind of token that is not a keyword
+KIND_CLASSES = {
+    KIND_OTHER: NAME,
+    KIND_IDENTIFIER: NAME,
+    KIND_NUMBER: NUMBER,
+    KIND_DECIMAL: NUMBER,
+    KIND_STRING: STRING,
+    KIND_OPERATOR: None,
+    KIND_PUNCTUATION: None,
+    KIND_AGGREGATE: NAME,
+}
+
+GRAMMAR_TOKEN = re.compile(r"\s+|#[^\n]*|'[^']+'|<\w+>|\w+|.")
+
+
+class Message:
+    """
+    Error of a statement that stopped inside a rule.
+
+    - error, suggestion : for an unexpected token ({token} is its text)
+    - missing           : for a rule missing altogether (nothing of it
+                          read before the end of the statement or a
+                          ) , ;): an error, or an (error, suggestion)
+                          pair; default the same as error
+    """
+
+    __slots__ = ("unexpected", "missing")
+
+    def __init__(self, error, suggestion=None, missing=None):
+        self.unexpected = (error, suggestion)
+        if missing is None:
+            self.missing = self.unexpected
+        elif isinstance(missing, str):
+            self.missing = (missing, suggestion)
+        else:
+            self.missing = tuple(missing)
+
+
+class Parse:
+    """
+    Result of Grammar.parse.
+
+    - spans    : [rule, start, end] of every named rule expanded, in
+                 order of expansion (end is None if the parse stopped
+                 inside it)
+    - end      : end of the tokens parsed
+    - index    : where the parse stopped (None if it succeeded)
+    - rules    : (rule, start) of the rules open there, innermost first
+    - expected : tokens legal there (keys: keywords lowercase, symbols,
+                 classes, END)
+    """
+
+    __slots__ = ("spans", "end", "index", "rules", "expected")
+
+    def __init__(self, spans, end, index=None, rules=(), expected=()):
+        self.spans = spans
+        self.end = end
+        self.index = index
+        self.rules = rules
+        self.expected = expected
+
+    @property
+    def ok(self):
+        return self.index is None
+
+    def error(self, messages, texts, exclude=(), starts=None, **fields):
+        """
+        Error dict of a failed parse (None if it succeeded), with the
+        message of the innermost open rule found in messages (None key:
+        tokens left after the statement) and the expected tokens, less
+        those in exclude. fields fill the messages' placeholders.
+
+        Given the token offsets (starts), a token written against the
+        rule read just before it (users$, @users) is reported with that
+        rule, and {token} is the whole run written without whitespace.
+        """
+        index = self.index
+        if index is None:
+            return None
+
+        end = self.end
+        word = texts[index] if index < end else None
+        rules = self.rules
+        token = word or ""
+
+        if starts is not None:
+            first, last = self._run(texts, starts, index)
+            if last > first:
+                token = "".join(texts[first:last])
+                if first < index and texts[index - 1] not in STRUCTURAL:
+                    # Rules that ended right before the glued token
+                    closed = [(rule, start) for rule, start, stop in reversed(self.spans) if stop == index]
+                    rules = closed + list(rules)
+
+        for rule, start in rules:
+            message = messages.get(rule)
+            if message is not None:
+                break
+        else:
+            message, start = messages.get(None), index
+            if message is None:
+                message = Message("Unexpected '{token}'", missing="Incomplete statement")
+
+        missing = start == index and (word is None or word in CLOSERS)
+        error, suggestion = message.missing if missing else message.unexpected
+
+        fields["token"] = token
+        error = error.format(**fields)
+        suggestion = suggestion.format(**fields) if suggestion else suggestion
+        expected = [
+            LABELS.get(key) or (key.upper() if key[0].isalpha() else f"'{key}'")
+            for key in self.expected
+            if key != END and key not in exclude
+        ]
+
+        # Only the end of the statement is legal here
+        if not expected and END in self.expected:
+            expected = ["';'"]
+
+        if not expected:
+            return {"error": error, "suggestion": suggestion} if suggestion else {"error": error}
+        return expected_error(error, word, expected, suggestion)
+
+    def _run(self, texts, starts, index):
+        """
+        [first, last) of the tokens written without whitespace around
+        the one at index (the last one read, at the end), stopping at
+        ( ) , ; -- empty if that token is one of them.
+        """
+        end = self.end
+        if index == end:
+            index -= 1
+        if index < 0 or texts[index] in STRUCTURAL:
+            return index, index
+
+        first = index
+        while first > 0 and texts[first - 1] not in STRUCTURAL \
+                and starts[first] == starts[first - 1] + len(texts[first - 1]):
+            first -= 1
+
+        last = index + 1
+        while last < end and texts[last] not in STRUCTURAL \
+                and starts[last] == starts[last - 1] + len(texts[last - 1]):
+            last += 1
+
+        # At the end, only a run glued onto the last token counts
+        if self.index == end and last - first == 1:
+            return index, index
+        return first, last
+
+
+class Grammar:
+    """
+    A grammar compiled into LL(1) parse tables.
+
+    - rules    : grammar text (see the module docstring)
+    - reserved : keywords that are never names
+
+    Every rule can start a parse. Rules made from [ ] and { } are named
+    after the rule holding them plus a dot and a number; they get no
+    span.
+    """
+
+    def __init__(self, rules, reserved=()):
+        self.reserved = frozenset(word.lower() for word in reserved)
+        self.names = []             # rule id -> name
+        self.ids = {}               # name -> rule id
+        self.alternatives = []      # rule id -> [tuple of symbols]
+
+        # Class of each token kind, keywords included
+        self.classes = [KIND_CLASSES[kind] for kind in range(KIND_KEYWORD)]
+        self.classes += [None if word in self.reserved else NAME for word in KEYWORDS]
+
+        self._read(rules)
+
+        # Rule id -> name, or None for rules that get no span
+        self.spanNames = [None if "." in name else name for name in self.names]
+
+        self._computeFirst()
+        self._computeFollow()
+        self._buildTables()
+        self._foldTables()
+
+    # ---------------------------------------------------------
+    # Reading the grammar
+    # ---------------------------------------------------------
+
+    def _rule(self, name):
+        ruleId = self.ids.get(name)
+        if ruleId is None:
+            ruleId = self.ids[name] = len(self.names)
+            self.names.append(name)
+            self.alternatives.append(None)
+        return ruleId
+
+    def _read(self, text):
+        words = [word for word in GRAMMAR_TOKEN.findall(text) if not word.isspace() and word[0] != "#"]
+        words.append(None)
+
+        # Rule headers: a lowercase word followed by ':'
+        heads = [i for i in range(len(words) - 1) if words[i + 1] == ":"]
+        if not heads or heads[0] != 0:
+            raise ValueError("grammar must start with a rule header 'name :'")
+
+        for number, head in enumerate(heads):
+            name = words[head]
+            if not name.islower() or not name.replace("_", "a").isalnum():
+                raise ValueError(f"bad rule name {name!r}")
+            ruleId = self._rule(name)
+            if self.alternatives[ruleId] is not None:
+                raise ValueError(f"rule {name!r} defined twice")
+
+            stop = heads[number + 1] if number + 1 < len(heads) else len(words) - 1
+            body = words[head + 2:stop] + [None]
+            self._counter = 0
+            alternatives, position = self._readAlternatives(name, body, 0)
+            if body[position] is not None:
+                raise ValueError(f"unexpected {body[position]!r} in rule {name!r}")
+            self.alternatives[ruleId] = alternatives
+
+        for name, alternatives in zip(self.names, self.alternatives):
+            if alternatives is None:
+                raise ValueError(f"rule {name!r} is used but not defined")
+
+    def _readAlternatives(self, rule, body, position):
+        alternatives = [[]]
+        while True:
+            word = body[position]
+            if word is None or word in ("]", "}"):
+                return [tuple(alt) for alt in alternatives], position
+
+            position += 1
+            if word == "|":
+                alternatives.append([])
+            elif word in ("[", "{"):
+                inner, position = self._readAlternatives(rule, body, position)
+                closer = "]" if word == "[" else "}"
+                if body[position] != closer:
+                    raise ValueError(f"missing {closer!r} in rule {rule!r}")
+                position += 1
+
+                # [ x ] -> r : x | ;  { x } -> r : x r |
+                self._counter += 1
+                ruleId = self._rule(f"{rule}.{self._counter}")
+                if word == "{":
+                    inner = [alt + (ruleId,) for alt in inner]
+                self.alternatives[ruleId] = inner + [()]
+                alternatives[-1].append(ruleId)
+            else:
+                alternatives[-1].append(self._symbol(rule, word))
+
+    def _symbol(self, rule, word):
+        if word[0] == "'":
+            return word[1:-1]
+        if word[0] == "<":
+            if word not in CLASSES:
+                raise ValueError(f"unknown token class {word!r} in rule {rule!r}")
+            return word
+        if word.isupper():
+            return word.lower()
+        if word.islower():
+            return self._rule(word)
+        raise ValueError(f"unexpected {word!r} in rule {rule!r}")
+
+    # ---------------------------------------------------------
+    # FIRST / FOLLOW
+    # ---------------------------------------------------------
+
+    def _firstOf(self, symbols):
+        """
+        (FIRST set as an ordered dict, nullable) of a symbol sequence.
+        """
+        first = {}
+        for symbol in symbols:
+            if symbol.__class__ is str:
+                first[symbol] = True
+                return first, False
+            first.update(self.first[symbol])
+            if not self.nullable[symbol]:
+                return first, False
+        return first, True
+
+    def _computeFirst(self):
+        count = len(self.names)
+        self.first = [{} for _ in range(count)]
+        self.nullable = [False] * count
+
+        changed = True
+        while changed:
+            changed = False
+            for ruleId, alternatives in enumerate(self.alternatives):
+                first = self.first[ruleId]
+                for alt in alternatives:
+                    found, nullable = self._firstOf(alt)
+                    if nullable and not self.nullable[ruleId]:
+                        self.nullable[ruleId] = changed = True
+                    for key in found:
+                        if key not in first:
+                            first[key] = changed = True
+
+    def _computeFollow(self):
+        # Any rule may start a parse, so the end may follow any rule
+        self.follow = [{END: True} for _ in self.names]
+
+        changed = True
+        while changed:
+            changed = False
+            for ruleId, alternatives in enumerate(self.alternatives):
+                for alt in alternatives:
+                    for position, symbol in enumerate(alt):
+                        if symbol.__class__ is str:
+                            continue
+                        found, nullable = self._firstOf(alt[position + 1:])
+                        if nullable:
+                            found.update(self.follow[ruleId])
+                        follow = self.follow[symbol]
+                        for key in found:
+                            if key not in follow:
+                                follow[key] = changed = True
+
+    def _buildTables(self):
+        """
+        One row per rule: lookahead key -> alternative, reversed so that
+        it is pushed onto the parse stack as is.
+        """
+        self.rows = []
+        for ruleId, alternatives in enumerate(self.alternatives):
+            row = {}
+            for alt in alternatives:
+                found, nullable = self._firstOf(alt)
+                if nullable:
+                    found.update(self.follow[ruleId])
+                for key in found:
+                    if key in row and row[key] != alt[::-1]:
+                        raise ValueError(f"grammar is not LL(1): rule {self.names[ruleId]!r} on {key!r}")
+                    row[key] = alt[::-1]
+            self.rows.append(row)
+
+    # ---------------------------------------------------------
+    # Folding
+    # ---------------------------------------------------------
+
+    def _lookup(self, ruleId, key):
+        """
+        Alternative the parser takes in a rule on a token of this key
+        (see _foldTables), or None.
+        """
+        row = self.rows[ruleId]
+        if key == END:
+            return row.get(END)
+        if key in CLASSES:
+            found = row.get(key)
+            return row.get(ANY) if found is None else found
+        found = row.get(key)
+        if found is None:
+            found = row.get(self.classes[Lexer.classify([key])[0]])
+        if found is None and key not in STRUCTURAL:
+            found = row.get(ANY)
+        return found
+
+    def _foldTables(self):
+        """
+        One entry per rule and key: (spans opened, symbols pushed, token
+        matched), the rule being expanded along with the rules it
+        expands first on that token, down to the token itself.
+
+        Keys stand for every token the parser can meet: the keywords and
+        symbols of the grammar (looked up by text), the other tokens of
+        each class, the other tokens <any> matches (ANY) and END, so an
+        entry holds what the plain tables give on any of its tokens.
+        """
+        keys = {}
+        for alternatives in self.alternatives:
+            for alt in alternatives:
+                for symbol in alt:
+                    if symbol.__class__ is str and symbol not in CLASSES:
+                        keys[symbol] = True
+        keys = list(keys) + [NAME, NUMBER, STRING, ANY, END]
+
+        self.table = []
+        for ruleId in range(len(self.names)):
+            entries = {}
+            for key in keys:
+                if self._lookup(ruleId, key) is None:
+                    continue
+
+                opens = []
+                pushed = [ruleId]
+                steps = 0
+                while pushed and pushed[-1].__class__ is int and pushed[-1] >= 0:
+                    inner = pushed.pop()
+                    production = self._lookup(inner, key)
+                    if production is None:
+                        # Fails there: left for parse() to report
+                        pushed.append(inner)
+                        break
+                    steps += 1
+                    if steps > len(self.names):
+                        raise ValueError(f"grammar is not LL(1): rule {self.names[ruleId]!r} loops on {key!r}")
+                    if self.spanNames[inner] is not None:
+                        opens.append(self.spanNames[inner])
+                        pushed.append(CLOSE)
+                    pushed.extend(production)
+
+                matched = bool(pushed) and pushed[-1].__class__ is str
+                if matched:
+                    pushed.pop()
+                entries[key] = (tuple(opens), tuple(pushed), matched)
+            self.table.append(entries)
+
+    # ---------------------------------------------------------
+    # Parsing
+    # ---------------------------------------------------------
+
+    def parse(self, rule, tokens, kinds, start=0, end=None):
+        """
+        Parses tokens[start:end] (normalized tokens and their kinds, as
+        in a TokenStream) as one `rule`. Returns a Parse.
+        """
+        if end is None:
+            end = len(tokens)
+
+        table = self.table
+        classes = self.classes
+        spans = []
+        opened = []
+        stack = [END, self.ids[rule]]
+        pop = stack.pop
+        push = stack.extend
+        i = start
+
+        while True:
+            symbol = pop()
+
+            if symbol.__class__ is int:
+                if symbol == CLOSE:
+                    opened.pop()[2] = i
+                    continue
+
+                row = table[symbol]
+                if i < end:
+                    tok = tokens[i]
+                    entry = row.get(tok)
+                    if entry is None:
+                        entry = row.get(classes[kinds[i]])
+                        if entry is None and tok not in STRUCTURAL:
+                            entry = row.get(ANY)
+                else:
+                    entry = row.get(END)
+
+                if entry is None:
+                    return self._failed(spans, end, i, symbol, stack)
+
+                opens, pushed, matched = entry
+                if opens:
+                    for name in opens:
+                        span = [name, i, None]
+                        spans.append(span)
+                        opened.append(span)
+                if pushed:
+                    push(pushed)
+                if matched:
+                    i += 1
+
+            elif i < end:
+                tok = tokens[i]
+                if symbol == tok or symbol == classes[kinds[i]] or (symbol == ANY and tok not in STRUCTURAL):
+                    i += 1
+                else:
+                    return self._failed(spans, end, i, symbol, stack)
+
+            elif symbol == END:
+                return Parse(spans, end)
+
+            else:
+                return self._failed(spans, end, i, symbol, stack)
+
+    def _failed(self, spans, end, index, symbol, stack):
+        # Open rules, innermost first; a rule that failed to expand
+        # starts where the parse stopped
+        rules = [(rule, start) for rule, start, stop in reversed(spans) if stop is None]
+        if symbol.__class__ is int and self.spanNames[symbol] is not None:
+            rules.insert(0, (self.spanNames[symbol], index))
+
+        # Legal tokens: what the symbols left to parse could start with,
+        # up to the first that cannot be empty
+        expected = {}
+        for pending in [symbol] + stack[::-1]:
+            if pending.__class__ is str:
+                expected[pending] = True
+                break
+            if pending == CLOSE:
+                continue
+            expected.update(self.first[pending])
+            if not self.nullable[pending]:
+                break
+
+        return Parse(spans, end, index, rules, list(expected))
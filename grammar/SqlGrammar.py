@@ -0,0 +1,214 @@
+"""
+Grammar of the DDL, DML and TCL statements checked by the statement
+modules (SELECT has its own parser), compiled once at import.
+
+    from grammar.SqlGrammar import SQL, statementEnd
+
+    parse = SQL.parse("drop", stream.tokens, stream.kinds, 0, statementEnd(stream.tokens))
+    err = parse.error(MESSAGES, stream.texts)
+
+The grammar checks the shape of a statement. The modules check what it
+cannot see (identifier spelling, data types, duplicate options, value
+counts) on the spans of the rules they care about, and word the errors
+with their own Message per rule. Rules ending in `_end` are empty:
+they stand where the statement must end, so that extra tokens are
+reported there.
+"""
+from grammar.Grammar import Grammar
+
+
+RULES = r"""
+# ---------------- shared ----------------
+
+name               : <name> { '.' <name> }
+table_name         : name
+database_name      : name
+database_end       :
+if_exists          : IF EXISTS
+if_not_exists      : IF NOT EXISTS
+balanced           : { <any> | ',' | '(' balanced ')' }
+clause             : clause_item { clause_item }
+clause_item        : <any> | ',' | '(' balanced ')'
+column_type        : <any> [ '(' type_arguments ')' ]
+type_arguments     : type_argument { ',' next_argument }
+next_argument      : type_argument
+type_argument      : <number> | <string>
+
+# ---------------- TCL ----------------
+
+commit             : COMMIT commit_end
+commit_end         : ';'
+rollback           : ROLLBACK rollback_end
+rollback_end       : ';' | rollback_to
+rollback_to        : TO savepoint_name { ';' }
+savepoint          : SAVEPOINT savepoint_name { ';' }
+savepoint_name     : <name>
+
+# ---------------- TRUNCATE ----------------
+
+truncate           : TRUNCATE truncate_table
+truncate_table     : TABLE table_name truncate_options
+truncate_options   : { truncate_option }
+truncate_option    : RESTART identity | CONTINUE identity | CASCADE | RESTRICT
+identity           : IDENTITY
+
+# ---------------- DROP ----------------
+
+drop               : DROP drop_object
+drop_object        : TABLE drop_names | DATABASE drop_database | VIEW drop_names | INDEX drop_names
+drop_names         : [ if_exists ] object_name { ',' next_object } [ drop_option ]
+object_name        : name
+next_object        : name
+drop_option        : CASCADE option_end | RESTRICT option_end
+option_end         :
+drop_database      : [ if_exists ] database_name database_end
+
+# ---------------- DELETE ----------------
+
+delete             : DELETE delete_from
+delete_from        : FROM delete_table delete_where
+delete_table       : <name>
+delete_where       : [ WHERE clause ]
+
+# ---------------- ALTER TABLE ----------------
+
+alter              : ALTER alter_table
+alter_table        : TABLE alter_name alter_actions
+alter_name         : <name>
+alter_actions      : alter_action { ',' next_action }
+next_action        : alter_action
+alter_action       : ADD add_column | DROP drop_column | MODIFY modify_column
+add_column         : [ COLUMN ] add_name add_type column_tail
+add_name           : <name>
+add_type           : column_type
+modify_column      : [ COLUMN ] modify_name modify_type column_tail
+modify_name        : <name>
+modify_type        : column_type
+drop_column        : [ COLUMN ] drop_name drop_end
+drop_name          : <name>
+drop_end           :
+column_tail        : { <any> [ '(' balanced ')' ] }
+
+# ---------------- CREATE ----------------
+
+create             : CREATE create_object
+create_object      : TABLE create_table | DATABASE create_database | VIEW create_view
+                   | INDEX create_index | UNIQUE unique_index | OR or_replace
+unique_index       : INDEX create_index
+or_replace         : REPLACE VIEW create_view
+
+# One kind of object only (CreateDDL.validateCreate*Stream)
+table_statement    : CREATE table_keyword create_table
+table_keyword      : TABLE
+view_statement     : CREATE view_keyword create_view
+view_keyword       : VIEW | OR REPLACE VIEW
+index_statement    : CREATE index_keyword create_index
+index_keyword      : INDEX | UNIQUE INDEX
+database_statement : CREATE database_keyword create_database
+database_keyword   : DATABASE
+
+create_table       : [ if_not_exists ] table_name '(' table_elements ')' table_end
+table_end          :
+table_elements     : table_element { ',' next_element }
+next_element       : table_element
+table_element      : table_constraint | column_definition
+table_constraint   : PRIMARY constraint_body | UNIQUE constraint_body
+                   | FOREIGN constraint_body | CHECK check_body
+constraint_body    : { <any> | '(' balanced ')' }
+column_definition  : column_name column_type { column_constraint }
+column_name        : name
+column_constraint  : PRIMARY primary_key | UNIQUE | NOT not_null | DEFAULT default_value
+                   | CHECK check_body | REFERENCES references
+primary_key        : KEY
+not_null           : NULL
+default_value      : [ '-' | '+' ] default_term
+default_term       : '(' balanced ')' | <any> [ '(' balanced ')' ]
+check_body         : '(' check_condition ')' { <any> [ '(' balanced ')' ] }
+check_condition    : balanced
+references         : ref_table ref_columns { <any> [ '(' balanced ')' ] }
+ref_table          : name
+ref_columns        : '(' balanced ')'
+
+create_view        : [ if_not_exists ] view_name view_body
+view_name          : name
+view_body          : [ '(' view_columns ')' ] AS view_select
+view_columns       : view_column { ',' next_view_column }
+view_column        : name
+next_view_column   : name
+view_select        : SELECT { clause_item }
+
+create_index       : index_name index_on table_name index_columns index_end
+index_name         : name
+index_on           : ON
+index_columns      : '(' index_column { ',' next_index_column } ')'
+index_column       : index_column_name index_order
+next_index_column  : index_column_name index_order
+index_column_name  : name
+index_order        : [ ASC | DESC ]
+index_end          :
+
+create_database    : [ if_not_exists ] database_name database_end
+
+# ---------------- INSERT ----------------
+
+insert             : INSERT insert_into
+insert_into        : INTO insert_table insert_body
+insert_table       : name
+insert_body        : [ '(' insert_columns ')' ] insert_values
+insert_columns     : insert_column { ',' insert_column }
+insert_column      : name
+insert_values      : VALUES value_rows
+value_rows         : value_row { ',' value_row }
+value_row          : '(' row_values row_end
+row_end            : ')'
+row_values         : value { ',' next_value }
+next_value         : value
+value              : value_item { value_item }
+value_item         : <any> | '(' balanced ')'
+
+# ---------------- UPDATE ----------------
+
+update             : UPDATE update_table update_set update_where
+update_table       : <name>
+update_set         : SET first_assignment more_assignments
+first_assignment   : assignment
+more_assignments   : { ',' next_assignment }
+next_assignment    : assignment
+assignment         : set_column '=' set_value
+set_column         : <name>
+set_value          : set_term { set_term }
+set_term           : <any> | '(' balanced ')'
+update_where       : [ WHERE clause ]
+"""
+
+# Keywords that end the name before them (INSERT INTO t VALUES,
+# UPDATE t SET), so they can never be names themselves
+RESERVED = ("set", "values")
+
+SQL = Grammar(RULES, reserved=RESERVED)
+
+
+def statementEnd(tokens):
+    """
+    Index just past the last token, ignoring trailing semicolons.
+    """
+    end = len(tokens)
+    while end and tokens[end - 1] == ";":
+        end -= 1
+    return end
+
+
+def stoppedAfter(parse, rules):
+    """
+    The one of rules that ended right where the parse stopped on a
+    token (None if the parse succeeded or ran out of tokens, or no such
+    rule ended there): DROP TABLE t ( stops after object_name.
+    """
+    index = parse.index
+    if index is None or index >= parse.end:
+        return None
+
+    for rule, start, stop in reversed(parse.spans):
+        if stop == index and rule in rules:
+            return rule
+    return None
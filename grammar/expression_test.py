@@ -0,0 +1,131 @@
+from lexer.Lexer import Lexer
+from grammar.Expression import Expression
+
+
+def noSubquery(tokens, inList):
+    return None
+
+
+CONDITION = Expression(True, aggregates=False, subqueries=noSubquery, place="WHERE clause")
+VALUE = Expression(False, aggregates=False, place="SET clause")
+ITEM = Expression(False, star=True, subqueries=noSubquery)
+
+
+def check(expression, query):
+    stream = Lexer.tokenize(query)
+    err = expression.check(stream.span(0, len(stream.tokens)))
+    return err and err["error"]
+
+
+failed_tests = []
+total_tests = 0
+
+print("\n===== EXPRESSION TEST RESULTS =====\n")
+
+#CONDITIONS
+
+conditions = [
+    ("a = 1", None),
+    ("t.a <> 2.5 AND b >= -1", None),
+    ("a = 1 OR b = 2 AND NOT c < 3", None),
+    ("a BETWEEN 1 AND 2 AND b IN (1, 2)", None),
+    ("a NOT IN (SELECT b FROM u) OR a NOT LIKE 'x%'", None),
+    ("a IS NOT NULL", None),
+    ("f(a, b) + g() * 2 % 3 > (1 - a)", None),
+    ("((a = 1))", None),
+    ("", "Empty expression"),
+    ("a", "Missing comparison operator"),
+    ("a AND b = 1", "Missing comparison operator"),
+    ("a = 1 AND", "Logical operator without operand"),
+    ("a = *", "Expected operand in expression"),
+    ("a == 1", "Invalid comparator: =="),
+    ("a = 1 = 2", "Multiple comparison operators"),
+    ("(a = 1) = 2", "Expected a value, not a condition"),
+    ("a =", "Incomplete comparison"),
+    ("a + = 1", "Expression cannot end with operator"),
+    ("a = 1 b", "Expected arithmetic operator"),
+    ("(a = 1", "Unmatched parenthesis in expression"),
+    ("a IN 1", "IN requires parenthesized list or subquery"),
+    ("a IN ()", "IN list cannot be empty"),
+    ("a IN (1,)", "Empty value in IN list"),
+    ("a BETWEEN 1", "BETWEEN missing AND"),
+    ("a BETWEEN 1 AND", "Incomplete BETWEEN bounds"),
+    ("a IS 1", "IS must be followed by NULL, TRUE or FALSE"),
+    ("a NOT = 1", "NOT must be followed by IN, BETWEEN or LIKE"),
+    ("f(a,) = 1", "Empty function argument"),
+    ("SUM(a) > 1", "Aggregate functions are not allowed in WHERE clause"),
+    ("a = (SELECT b FROM u) + 1", "Arithmetic on subquery is not allowed"),
+]
+
+cases = [(f"condition {query!r}", check(CONDITION, query), expected) for query, expected in conditions]
+
+#VALUES
+
+values = [
+    ("1 + 2 * (3 - a)", None),
+    ("-f(a)", None),
+    ("a = 1", "Expected a value, not a condition"),
+    ("COUNT(a)", "Aggregate functions are not allowed in SET clause"),
+    ("(SELECT 1)", "Subqueries are not allowed in SET clause"),
+    ("*", "Expected operand in expression"),
+]
+
+cases += [(f"value {query!r}", check(VALUE, query), expected) for query, expected in values]
+
+#SELECT ITEMS
+
+items = [
+    ("*", None),
+    ("COUNT(*) + 1", None),
+    ("SUM(DISTINCT a)", None),
+    ("COUNT(a, b)", "Invalid aggregate function usage"),
+    ("f(*)", "Expected operand in expression"),
+]
+
+cases += [(f"item {query!r}", check(ITEM, query), expected) for query, expected in items]
+
+#SUBQUERIES
+
+seen = []
+IN_LIST = Expression(True, subqueries=lambda tokens, inList: seen.append((list(tokens), inList)))
+IN_LIST.check(Lexer.tokenize("a IN ((SELECT b FROM u)) AND c = (SELECT d FROM v)").tokens)
+
+cases += [
+    ("subqueries passed without parentheses", seen,
+     [(["select", "b", "from", "u"], True), (["select", "d", "from", "v"], False)]),
+    ("subquery errors returned", Expression(True, subqueries=lambda tokens, inList: {"error": "bad"})
+     .check(Lexer.tokenize("a = (SELECT b FROM u)").tokens), {"error": "bad"}),
+]
+
+#NESTING
+
+deep = "(" * 5000 + "a = 1" + ")" * 5000 + " AND " + "- " * 5000 + "1 > 0"
+cases += [
+    ("deep nesting does not recurse", check(CONDITION, deep), None),
+    ("token lists are accepted", CONDITION.check(["a", "=", "1"]), None),
+]
+
+for name, got, expected in cases:
+    total_tests += 1
+
+    if got == expected:
+        print(f"[PASS] {name}")
+    else:
+        print(f"[FAIL] {name} -> {got} (expected {expected})")
+        failed_tests.append((name, got))
+
+
+#TEST SUMMARY
+
+print("\n===== TEST SUMMARY =====")
+print(f"Total Test Cases : {total_tests}")
+print(f"Passed           : {total_tests - len(failed_tests)}")
+print(f"Failed           : {len(failed_tests)}")
+
+if failed_tests:
+    print("\n--- Failed Test Descriptions ---")
+    for i, (q, got) in enumerate(failed_tests, start=1):
+        print(f"{i}. Case : {q!r}")
+        print(f"   Got  : {got}")
+else:
+    print("\nAll EXPRESSION tests passed successfully.")
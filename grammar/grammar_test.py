@@ -0,0 +1,145 @@
+from lexer.Lexer import Lexer
+from grammar.Grammar import Grammar, Message
+from grammar.SqlGrammar import SQL, RULES, statementEnd, stoppedAfter
+
+
+TINY = Grammar("""
+list      : '(' item { ',' more } ')' [ order ]
+item      : <name> | <number>
+more      : item
+order     : ASC | DESC
+pick      : PICK <any> FROM source
+source    : <name>
+""", reserved=("from",))
+
+MESSAGES = {
+    "list": Message("Bad list", missing="No list"),
+    "more": Message("Bad item '{token}'", missing="Trailing comma"),
+}
+
+
+def parse(grammar, rule, query):
+    stream = Lexer.tokenize(query)
+    return stream, grammar.parse(rule, stream.tokens, stream.kinds, 0, statementEnd(stream.tokens))
+
+
+def error(grammar, rule, query, messages=MESSAGES):
+    stream, result = parse(grammar, rule, query)
+    err = result.error(messages, stream.texts, starts=stream.starts)
+    return err and (err["error"], err["expected"])
+
+
+def rejects(rules):
+    try:
+        Grammar(rules)
+    except ValueError:
+        return True
+    return False
+
+
+failed_tests = []
+total_tests = 0
+
+print("\n===== GRAMMAR TEST RESULTS =====\n")
+
+#PARSE CASES
+
+cases = [
+    ("parses", parse(TINY, "list", "(a, 1, b) desc")[1].ok, True),
+    ("spans", parse(TINY, "list", "(a, 1)")[1].spans,
+     [["list", 0, 5], ["item", 1, 2], ["more", 3, 4], ["item", 3, 4]]),
+    ("open spans end as None", parse(TINY, "list", "(a, b")[1].spans[0], ["list", 0, None]),
+    ("stops where it fails", (parse(TINY, "list", "(a b)")[1].index, parse(TINY, "list", "(a b)")[1].rules),
+     (2, [("list", 0)])),
+    ("expected tokens", parse(TINY, "list", "(a b)")[1].expected, [",", ")"]),
+    ("keywords are names", parse(TINY, "list", "(asc)")[1].ok, True),
+    ("reserved keywords are not", parse(TINY, "pick", "pick a from from")[1].ok, False),
+    ("any value", parse(TINY, "pick", "pick 'x' from t")[1].ok, True),
+    ("any is not structural", parse(TINY, "pick", "pick , from t")[1].ok, False),
+    ("ignores trailing semicolons", parse(TINY, "list", "(a);;")[1].ok, True),
+]
+
+#ERROR CASES
+
+cases += [
+    ("unexpected token", error(TINY, "list", "(a) up"), ("Bad list", ["ASC", "DESC"])),
+    ("missing rule", error(TINY, "list", "(a, )"), ("Trailing comma", ["a name", "a number"])),
+    ("missing at the end", error(TINY, "list", ""), ("No list", ["'('"])),
+    ("expected listed", error(TINY, "list", "(a b)"), ("Bad list", ["','", "')'"])),
+    ("default message", error(TINY, "pick", "pick a from t u"), ("Unexpected 'u'", ["';'"])),
+    ("end of statement suggested", parse(TINY, "pick", "pick a from t u")[1].error(MESSAGES, ["pick", "a", "from", "t", "u"])["suggestion"],
+     "Expected ';'."),
+    ("suggestion among expected", parse(TINY, "list", "(a) dsc")[1].error(MESSAGES, ["(", "a", ")", "dsc"])["suggestion"],
+     "Did you mean 'DESC' instead of 'dsc'?"),
+    ("exclude", parse(TINY, "list", "(a) up")[1].error(MESSAGES, ["(", "a", ")", "up"], exclude=("asc",))["expected"],
+     ["DESC"]),
+    ("glued tokens reported whole", error(TINY, "list", "(a, b$)")[0], "Bad item 'b$'"),
+    ("succeeded", parse(TINY, "list", "(a)")[1].error(MESSAGES, ["(", "a", ")"]), None),
+    ("stopped after a rule", stoppedAfter(parse(TINY, "pick", "pick a from t (")[1], ("source",)), "source"),
+    ("stopped inside a rule", stoppedAfter(parse(TINY, "list", "(a b)")[1], ("more",)), None),
+    ("stopped at the end", stoppedAfter(parse(TINY, "list", "(a")[1], ("item",)), None),
+]
+
+#GRAMMAR CHECKS
+
+cases += [
+    ("not LL(1)", rejects("r : A x | A y\nx : B\ny : C"), True),
+    ("left recursion", rejects("r : r A | B"), True),
+    ("undefined rule", rejects("r : A missing"), True),
+    ("defined twice", rejects("r : A\nr : B"), True),
+    ("unclosed bracket", rejects("r : [ A"), True),
+    ("unknown class", rejects("r : <word>"), True),
+    ("SQL grammar compiles", Grammar(RULES, reserved=("set", "values")).names == SQL.names, True),
+]
+
+#STATEMENTS
+
+statements = [
+    ("truncate", "TRUNCATE TABLE a.b RESTART IDENTITY CASCADE;", True),
+    ("drop", "DROP TABLE IF EXISTS a, b CASCADE;", True),
+    ("alter", "ALTER TABLE t ADD COLUMN c VARCHAR(20) NOT NULL, DROP d;", True),
+    ("create", "CREATE TABLE t (id INT PRIMARY KEY, total DECIMAL(10, 2) CHECK (total > 0));", True),
+    ("create", "CREATE UNIQUE INDEX i ON t (a DESC, b);", True),
+    ("create", "CREATE TABLE t (a INT, CHECK a > 0);", False),
+    ("create", "CREATE TABLE t (a VARCHAR(20), b DECIMAL(10, 2), c ENUM('x', 'y'));", True),
+    ("create", "CREATE TABLE t (a INT (b >));", False),
+    ("create", "CREATE TABLE t (a INT, u KEY (a));", False),
+    ("create", "CREATE TABLE t (a INT DEFAULT 0, b CHECK (b > 0));", False),
+    ("insert", "INSERT INTO t (a, b) VALUES (1, 'x'), (2, f(3));", True),
+    ("insert", "INSERT INTO t VALUES;", False),
+    ("update", "UPDATE t SET a = 1, b = 'x' WHERE (a > 1);", True),
+    ("update", "UPDATE t SET a = b * (c + 1), d = f(2) WHERE a > 1;", True),
+    ("update", "UPDATE t SET a = ;", False),
+    ("delete", "DELETE FROM t WHERE a = 1;", True),
+    ("rollback", "ROLLBACK TO sp1;", True),
+]
+
+cases += [
+    (f"{rule}: {query!r}", parse(SQL, rule, query)[1].ok, ok)
+    for rule, query, ok in statements
+]
+
+for name, got, expected in cases:
+    total_tests += 1
+
+    if got == expected:
+        print(f"[PASS] {name}")
+    else:
+        print(f"[FAIL] {name} -> {got} (expected {expected})")
+        failed_tests.append((name, got))
+
+
+#TEST SUMMARY
+
+print("\n===== TEST SUMMARY =====")
+print(f"Total Test Cases : {total_tests}")
+print(f"Passed           : {total_tests - len(failed_tests)}")
+print(f"Failed           : {len(failed_tests)}")
+
+if failed_tests:
+    print("\n--- Failed Test Descriptions ---")
+    for i, (q, got) in enumerate(failed_tests, start=1):
+        print(f"{i}. Case : {q!r}")
+        print(f"   Got  : {got}")
+else:
+    print("\nAll GRAMMAR tests passed successfully.")
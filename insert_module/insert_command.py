@@ -13,3 +13,7 @@ class InsertCommand:
     def validate(self, query: str):
         parsed = self.parser.parse_insert(query)
         return self.validator.validate_insert(parsed)
+
+    def validate_stream(self, stream):
+        parsed = self.parser.parse_insert_stream(stream)
+        return self.validator.validate_insert(parsed)
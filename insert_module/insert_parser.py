@@ -1,64 +1,67 @@
+from lexer.Lexer import Lexer
+from grammar.Grammar import Message
+from grammar.SqlGrammar import SQL, statementEnd
+
+
 class InsertParser:
-    def parse_insert(self, query: str) -> dict:
-        parsed = {
-            "raw": query,
+    # Errors of a statement the grammar stops in, by rule
+    MESSAGES = {
+        "insert": Message("Query does not start with INSERT.", "INSERT statements must begin with INSERT."),
+        "insert_into": Message("Missing INTO keyword.", "Use: INSERT INTO <table> VALUES (...)"),
+        "insert_table": Message("Missing table name.", "Specify a table name after INTO."),
+        "insert_body": Message("Missing VALUES clause.", "INSERT requires a VALUES clause."),
+        "insert_columns": Message("Column list is incorrectly formatted.", "Separate column names with commas."),
+        "value_rows": Message("VALUES clause is incorrectly formatted.",
+                              "VALUES must contain at least one value list."),
+        "row_values": Message("Empty VALUES list.", "VALUES cannot be empty."),
+        "next_value": Message("Invalid value '{token}' in VALUES list.",
+                              missing=("Missing value after ',' in VALUES list.", "Remove the trailing comma.")),
+        "row_end": Message("VALUES list must be enclosed in parentheses", "Close each value list with ')'."),
+    }
+
+    def _empty_result(self, raw) -> dict:
+        return {
+            "raw": raw,
+            "tokens": [],
             "table": None,
             "columns": [],
             "values": [],
-            "has_into": False
+            "has_into": False,
+            "error": None
         }
 
+    def parse_insert(self, query: str) -> dict:
         if not query or not isinstance(query, str):
-            return parsed
-
-        query = query.strip().rstrip(";")
-        upper_query = query.upper()
-
-        # --- Locate VALUES keyword ---
-        values_index = upper_query.find("VALUES")
-        if values_index == -1:
-            return parsed
-
-        left_part = query[:values_index].strip()
-        right_part = query[values_index + len("VALUES"):].strip()
-
-        # --- Parse INSERT INTO table ---
-        left_tokens = left_part.split()
-        upper_tokens = [t.upper() for t in left_tokens]
-
-        if "INTO" in upper_tokens:
-            parsed["has_into"] = True
-            into_index = upper_tokens.index("INTO")
-            if into_index + 1 < len(left_tokens):
-                parsed["table"] = left_tokens[into_index + 1]
+            return self._empty_result(query)
 
-        # --- Parse column list ---
-        if "(" in left_part and ")" in left_part:
-            start = left_part.find("(")
-            end = left_part.find(")", start)
-            column_section = left_part[start + 1:end]
-            parsed["columns"] = [
-                col.strip() for col in column_section.split(",") if col.strip()
-            ]
+        return self.parse_insert_stream(Lexer.tokenize(query))
 
-        # --- Parse VALUES rows ---
-        rows = []
-        current = ""
-        depth = 0
+    def parse_insert_stream(self, stream) -> dict:
+        parsed = self._empty_result(stream.sql)
+        tokens = stream.tokens
+        parsed["tokens"] = tokens
 
-        for char in right_part:
-            if char == "(":
-                depth += 1
-                current = ""
-            elif char == ")":
-                depth -= 1
-                rows.append(current)
-            elif depth > 0:
-                current += char
+        parse = SQL.parse("insert", tokens, stream.kinds, 0, statementEnd(tokens))
+        parsed["error"] = parse.error(self.MESSAGES, stream.texts, starts=stream.starts)
 
-        for row in rows:
-            parsed["values"].append(
-                [val.strip() for val in row.split(",")]
-            )
+        # --- Table, columns and VALUES rows the grammar read ---
+        row = []
+        for rule, start, end in parse.spans:
+            if rule == "insert_into":
+                parsed["has_into"] = True
+            elif rule == "value_row":
+                # A row the query stops in is not counted; the grammar
+                # error names what it is missing
+                row = []
+                if end is not None:
+                    parsed["values"].append(row)
+            elif end is None:
+                continue
+            elif rule == "insert_table":
+                parsed["table"] = stream.text(start, end)
+            elif rule == "insert_column":
+                parsed["columns"].append(stream.text(start, end))
+            elif rule == "value":
+                row.append(stream.text(start, end))
 
         return parsed
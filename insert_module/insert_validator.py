@@ -8,43 +8,18 @@ class InsertValidator:
                 "suggestion": "Provide a valid INSERT statement."
             }
 
-        upper_query = raw_query.upper()
+        tokens = parsed.get("tokens", [])
 
-        if not upper_query.strip().startswith("INSERT"):
+        if not tokens or tokens[0] != "insert":
             return {
                 "error": "Query does not start with INSERT.",
                 "suggestion": "INSERT statements must begin with INSERT."
             }
 
-        if "INTO" not in upper_query:
-            return {
-                "error": "Missing INTO keyword.",
-                "suggestion": "Use: INSERT INTO <table> VALUES (...)"
-            }
-
-        if parsed.get("has_into") and not parsed.get("table"):
-            return {
-                "error": "Missing table name.",
-                "suggestion": "Specify a table name after INTO."
-            }
-
-        if "VALUES" not in upper_query:
-            return {
-                "error": "Missing VALUES clause.",
-                "suggestion": "INSERT requires a VALUES clause."
-            }
-
-        values = parsed.get("values", [])
-        if not values:
-            return {
-                "error": "VALUES clause is incorrectly formatted.",
-                "suggestion": "VALUES must contain at least one value list."
-            }
-
         columns = parsed.get("columns", [])
         if columns:
             col_count = len(columns)
-            for row in values:
+            for row in parsed.get("values", []):
                 if len(row) != col_count:
                     return {
                         "error": "Column-value count mismatch.",
@@ -54,11 +29,5 @@ class InsertValidator:
                         )
                     }
 
-        for row in values:
-            if not any(val for val in row):
-                return {
-                    "error": "Empty VALUES list.",
-                    "suggestion": "VALUES cannot be empty."
-                }
-
-        return None
+        # Shape errors found while parsing
+        return parsed.get("error")
@@ -0,0 +1,264 @@
+import re
+from array import array
+
+from lexer.Lexer import (
+    Lexer,
+    TokenStream,
+    isTerminated,
+    quotedPattern,
+    WORDS,
+    KIND_OTHER,
+    KIND_IDENTIFIER,
+    KIND_NUMBER,
+    KIND_STRING,
+    GROUP_KINDS,
+)
+
+
+# Known words by their bytes: lowercase bytes -> (interned text, kind)
+BYTE_WORDS = {word.encode("ascii"): known for word, known in WORDS.items()}
+
+# Text of the single-byte symbol tokens
+SYMBOLS = {bytes([byte]): chr(byte) for byte in range(0x80)}
+
+
+class ByteTokenStream:
+    """
+    Tokens of a byte range of a buffer (bytes, bytearray, mmap), kept
+    as offsets into the buffer.
+
+    Words, operators, symbols and quoted identifiers are decoded, since
+    validators inspect them. Closed ASCII string literals are not: their
+    entry in `tokens` is the raw bytes, decoded only by token() or
+    stream(). Fingerprint.shape() works on these tokens directly, so a
+    statement can be matched against known templates without decoding
+    its values.
+
+    Attributes:
+    - buffer       : buffer lexed
+    - start, end   : byte range of the statement in the buffer
+    - encoding     : encoding of the buffer (ASCII compatible)
+    - tokens       : normalized tokens as in TokenStream, except for
+                     string literals left as bytes
+    - starts, ends : array('q') of the byte offsets of each token in
+                     the buffer
+    - kinds, match, depth, balanced, unterminated, backslashEscapes :
+                     as in TokenStream
+    - exact        : False if the range holds non-ASCII text (or ASCII
+                     separators \\x1c-\\x1f) outside literals and
+                     comments, where the bytes pattern and Lexer may
+                     disagree; such a range has no tokens and stream()
+                     decodes it and lexes it with Lexer
+    """
+
+    def __init__(self, buffer, start, end, encoding, tokens, starts, ends,
+                 kinds, match, depth, balanced, unterminated, exact=True, backslashEscapes=False):
+        self.buffer = buffer
+        self.start = start
+        self.end = end
+        self.encoding = encoding
+        self.tokens = tokens
+        self.starts = starts
+        self.ends = ends
+        self.kinds = kinds
+        self.match = match
+        self.depth = depth
+        self.balanced = balanced
+        self.unterminated = unterminated
+        self.exact = exact
+        self.backslashEscapes = backslashEscapes
+
+    def __len__(self):
+        return len(self.tokens)
+
+    def decode(self, start=None, end=None):
+        """
+        Decodes buffer[start:end] (default: the whole range).
+        """
+        start = self.start if start is None else start
+        end = self.end if end is None else end
+        return self.buffer[start:end].decode(self.encoding, "replace")
+
+    def token(self, i):
+        """
+        Normalized token i as a str, decoding it if it is a literal.
+        """
+        tok = self.tokens[i]
+        if tok.__class__ is bytes:
+            tok = self.tokens[i] = tok.decode(self.encoding, "replace")
+        return tok
+
+    def stream(self):
+        """
+        Decodes the range and returns the TokenStream Lexer.tokenize()
+        gives for its text, reusing the tokens already found.
+        """
+        sql = self.decode()
+        if not self.exact:
+            return Lexer.tokenize(sql, self.backslashEscapes)
+
+        buffer = self.buffer
+        encoding = self.encoding
+        starts = self.starts
+        ends = self.ends
+        texts = []
+        charStarts = []
+        tokens = list(self.tokens)
+
+        # Offsets become character offsets in sql; they differ from byte
+        # offsets only after a multi-byte character
+        ascii = buffer[self.start:self.end].isascii()
+        position = 0
+        previous = self.start
+
+        for i in range(len(tokens)):
+            start = starts[i]
+            end = ends[i]
+            text = buffer[start:end].decode(encoding, "replace")
+            if ascii:
+                charStarts.append(start - self.start)
+            else:
+                position += len(buffer[previous:start].decode(encoding, "replace"))
+                charStarts.append(position)
+                position += len(text)
+                previous = end
+            texts.append(text)
+            if tokens[i].__class__ is bytes:
+                tokens[i] = text
+
+        return TokenStream(sql, tokens, texts, charStarts, self.match, self.depth,
+                           self.balanced, self.unterminated, self.kinds, self.backslashEscapes)
+
+
+class ByteLexer:
+    """
+    Lexer over bytes, giving the tokens Lexer gives for the decoded
+    text without decoding the whole statement.
+
+    TOKEN_PATTERNS are Lexer.TOKEN_PATTERNS written for bytes. Both agree
+    on ASCII; any other byte outside literals and comments is caught by
+    the `other` group and the range is left to Lexer (exact=False).
+    Literal and comment bodies are matched whatever bytes they hold.
+    """
+
+    TOKEN_PATTERNS = {
+        escapes: re.compile(rb"""
+              (?P<comment>--[^\n]*|/\*[^*]*\*+(?:[^/*][^*]*\*+)*/|/\*(?s:.*))
+            | (?P<string>""" + quotedPattern("'", escapes).encode() + rb""")
+            | (?P<quoted>""" + (quotedPattern('"', escapes) + "|" + quotedPattern("`", escapes)).encode() + rb""")
+            | (?P<number>\d+\.\d+)
+            | (?P<word>\w+)
+            | (?P<operator>[<>!=]+)
+            | (?P<other>[\x80-\xff\x1c-\x1f])
+            | (?P<symbol>\S)
+        """, re.VERBOSE)
+        for escapes in (False, True)
+    }
+    TOKEN_PATTERN = TOKEN_PATTERNS[False]
+
+    @staticmethod
+    def tokenize(buffer, start=0, end=None, encoding="utf-8", backslashEscapes=False):
+        """
+        Lexes buffer[start:end] into a ByteTokenStream, in place (a
+        memory map is not copied). backslashEscapes as in
+        Lexer.tokenize.
+        """
+        if end is None:
+            end = len(buffer)
+
+        tokens = []
+        starts = array("q")
+        ends = array("q")
+        kinds = array("B")
+        unterminated = False
+
+        match = []
+        depth = []
+        openStack = []
+        balanced = True
+
+        addToken = tokens.append
+        addStart = starts.append
+        addEnd = ends.append
+        addKind = kinds.append
+        addMatch = match.append
+        addDepth = depth.append
+        words = BYTE_WORDS
+
+        for found in ByteLexer.TOKEN_PATTERNS[backslashEscapes].finditer(buffer, start, end):
+            text = found.group()
+            kind = found.lastgroup
+
+            if kind == "comment":
+                if text[1] == 42 and (len(text) < 4 or text[-2:] != b"*/"):
+                    unterminated = True
+                continue
+
+            if kind == "other":
+                return ByteTokenStream(buffer, start, end, encoding, [], array("q"), array("q"),
+                                       array("B"), [], [], True, False, exact=False,
+                                       backslashEscapes=backslashEscapes)
+
+            addStart(found.start())
+            addEnd(found.end())
+            addDepth(len(openStack))
+
+            if kind == "word":
+                word = text.lower()
+                known = words.get(word)
+                if known is not None:
+                    word, wordKind = known
+                else:
+                    word = word.decode("ascii")
+                    if word.isidentifier():
+                        wordKind = KIND_IDENTIFIER
+                    elif word.isnumeric():
+                        wordKind = KIND_NUMBER
+                    else:
+                        wordKind = KIND_OTHER
+                addToken(word)
+                addKind(wordKind)
+                addMatch(-1)
+                continue
+
+            if kind == "symbol":
+                text = SYMBOLS[text]
+            elif kind == "string":
+                # Closed ASCII literals stay bytes. Others are decoded,
+                # so that two literals compare equal exactly when their
+                # decoded texts do.
+                addKind(KIND_STRING)
+                addMatch(-1)
+                if not isTerminated(text, backslashEscapes):
+                    unterminated = True
+                    text = text.decode(encoding, "replace")
+                elif not text.isascii():
+                    text = text.decode(encoding, "replace")
+                addToken(text)
+                continue
+            else:
+                if kind == "quoted" and not isTerminated(text, backslashEscapes):
+                    unterminated = True
+                text = text.decode(encoding, "replace")
+            addKind(GROUP_KINDS[kind])
+
+            if text == "(":
+                openStack.append(len(match))
+                addMatch(-1)
+            elif text == ")" and openStack:
+                partner = openStack.pop()
+                match[partner] = len(match)
+                addMatch(partner)
+            else:
+                if text == ")":
+                    balanced = False
+                addMatch(-1)
+
+            addToken(text)
+
+        if openStack:
+            balanced = False
+
+        return ByteTokenStream(buffer, start, end, encoding, tokens, starts, ends,
+                               kinds, match, depth, balanced, unterminated,
+                               backslashEscapes=backslashEscapes)
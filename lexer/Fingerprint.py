@@ -0,0 +1,153 @@
+import hashlib
+
+from lexer.Lexer import Lexer, TokenStream, isTerminated, KIND_NUMBER, KIND_DECIMAL, KIND_STRING
+from lexer.ByteLexer import ByteTokenStream
+
+
+# Placeholder codes of the shape signature, one per '?' of a template:
+# a literal, an IN list of literals of one code (upper case) or a '?'
+# written in the query itself
+NUMBER = "n"
+DECIMAL = "d"
+STRING = "s"
+QUESTION_MARK = "q"
+
+
+def _literalCode(tok, kind, backslashEscapes=False):
+    """
+    Placeholder code of a literal token, or None if the token is kept
+    as written. Numbers count only when made of ASCII digits (the
+    validators' digit checks differ on other numerals) and strings only
+    when closed.
+    """
+    if kind == KIND_NUMBER or kind == KIND_DECIMAL:
+        if tok.isascii():
+            return NUMBER if kind == KIND_NUMBER else DECIMAL
+    elif kind == KIND_STRING:
+        if isTerminated(tok, backslashEscapes):
+            return STRING
+    return None
+
+
+def _inList(tokens, kinds, start, close, backslashEscapes=False):
+    """
+    Code shared by every item of the IN list between the parentheses at
+    start and close if it is a comma separated list of literals, else
+    None.
+    """
+    if close - start < 2 or (close - start) % 2:
+        return None
+
+    code = _literalCode(tokens[start + 1], kinds[start + 1], backslashEscapes)
+    if code is None:
+        return None
+
+    for i in range(start + 2, close, 2):
+        if tokens[i] != "," or _literalCode(tokens[i + 1], kinds[i + 1], backslashEscapes) != code:
+            return None
+    return code.upper()
+
+
+def _placeholder(seen, code, value):
+    """
+    Signature entry of a placeholder: its code, followed by the number
+    of the first placeholder with the same value if there is one.
+    """
+    first = seen.get(value)
+    if first is None:
+        seen[value] = len(seen)
+        return code
+    return code + str(first)
+
+
+def shape(query):
+    """
+    Returns (template, signature) of a query (text, TokenStream or
+    ByteTokenStream; string literals of the latter are not decoded).
+
+    template is the token sequence with every literal replaced by '?'
+    and every IN list of literals by '(?)'; tokens written together stay
+    together and any whitespace between tokens becomes one space.
+    signature holds one placeholder code per '?' of the template, so
+    literals of different kinds (which validate differently) never
+    share a shape, nor do placeholders and a '?' in the query. A
+    literal or IN list repeating an earlier one is coded with the
+    number of that placeholder (e.g. "nsn0"): GROUP BY, HAVING and
+    ORDER BY compare expressions token by token, so "a + 1 ... GROUP BY
+    a + 1" and "a + 1 ... GROUP BY a + 2" must not share a shape.
+
+    Queries with the same shape differ only in literal values and IN
+    list lengths, and every value used twice is still used twice, so
+    they get the same verdict.
+    """
+    if isinstance(query, ByteTokenStream):
+        stream = query if query.exact else query.stream()
+    elif isinstance(query, TokenStream):
+        stream = query
+    else:
+        stream = Lexer.tokenize(query)
+
+    tokens = stream.tokens
+    starts = stream.starts
+    if isinstance(stream, ByteTokenStream):
+        ends = stream.ends
+    else:
+        ends = [start + len(text) for start, text in zip(starts, stream.texts)]
+    kinds = stream.kinds
+    match = stream.match
+    escapes = stream.backslashEscapes
+
+    parts = []
+    signature = []
+    seen = {}                   # literal or IN list -> placeholder number
+    end = None
+    i = 0
+    n = len(tokens)
+
+    while i < n:
+        tok = tokens[i]
+        if end is not None and starts[i] != end:
+            parts.append(" ")
+
+        code = _literalCode(tok, kinds[i], escapes)
+        if code is not None:
+            parts.append("?")
+            signature.append(_placeholder(seen, code, tok))
+        elif tok == "?":
+            parts.append("?")
+            signature.append(QUESTION_MARK)
+        elif tok == "(" and i and tokens[i - 1] == "in" and match[i] > i:
+            close = match[i]
+            code = _inList(tokens, kinds, i, close, escapes)
+            if code is not None:
+                parts.append("(?)")
+                signature.append(_placeholder(seen, code, tuple(tokens[i + 1:close:2])))
+                i = close
+            else:
+                parts.append(tok)
+        else:
+            parts.append(tok)
+
+        end = ends[i]
+        i += 1
+
+    return "".join(parts), "".join(signature)
+
+
+def template(query):
+    """
+    Query text with its literals and IN lists of literals replaced by
+    placeholders, e.g. "select a from t where id = ? and b in (?)".
+    """
+    return shape(query)[0]
+
+
+def fingerprint(query):
+    """
+    Stable 16 hex digit hash of the shape of a query: the same for
+    every query of one template, in every process and Python version.
+    Use it to group log lines by template.
+    """
+    template, signature = shape(query)
+    data = template.encode("utf-8", "surrogatepass") + b"\0" + signature.encode("ascii")
+    return hashlib.blake2b(data, digest_size=8).hexdigest()
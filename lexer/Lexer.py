@@ -0,0 +1,545 @@
+import re
+import sys
+from array import array
+
+
+# Tokens that always end a name
+NAME_BREAKS = {"(", ")", ",", ";"}
+
+# Token kinds (one byte per token in TokenStream.kinds)
+KIND_OTHER = 0          # word that is neither a name nor a number (e.g. 1abc)
+KIND_IDENTIFIER = 1     # name or quoted identifier
+KIND_NUMBER = 2         # integer (str.isnumeric)
+KIND_DECIMAL = 3        # 12.50
+KIND_STRING = 4         # 'text'
+KIND_OPERATOR = 5       # run of < > ! =
+KIND_PUNCTUATION = 6    # any other single character
+KIND_AGGREGATE = 7      # sum, count, avg, min, max
+KIND_KEYWORD = 8        # keyword ids: KIND_KEYWORD + position in KEYWORDS
+
+AGGREGATES = ("sum", "count", "avg", "min", "max")
+
+KEYWORDS = (
+    # SELECT
+    "select", "from", "where", "group", "by", "having", "order", "limit",
+    "as", "distinct", "asc", "desc",
+    # expressions
+    "and", "or", "not", "in", "between", "like", "is", "null",
+    # joins
+    "join", "inner", "left", "right", "full", "outer", "cross", "on",
+    # DML
+    "insert", "into", "values", "update", "set", "delete",
+    # DDL
+    "create", "alter", "drop", "truncate", "table", "view", "index",
+    "database", "schema", "add", "modify", "column", "rename", "to",
+    "primary", "foreign", "key", "references", "unique", "check",
+    "default", "constraint", "if", "exists", "cascade", "restrict",
+    "identity",
+    # TCL
+    "begin", "commit", "rollback", "savepoint", "release", "transaction",
+    "work",
+)
+
+# Known words: lowercase text -> (interned text, kind). Interned keyword
+# tokens are the same objects as the string constants in the helpers,
+# so comparisons and set lookups on them short-circuit on identity.
+WORDS = {word: (sys.intern(word), KIND_KEYWORD + i) for i, word in enumerate(KEYWORDS)}
+WORDS.update((word, (sys.intern(word), KIND_AGGREGATE)) for word in AGGREGATES)
+
+# Kinds of the non-word lexer groups
+GROUP_KINDS = {
+    "string": KIND_STRING,
+    "quoted": KIND_IDENTIFIER,
+    "number": KIND_DECIMAL,
+    "operator": KIND_OPERATOR,
+    "symbol": KIND_PUNCTUATION,
+}
+
+DECIMAL_PATTERN = re.compile(r"\d+\.\d+")
+WORD_PATTERN = re.compile(r"\w+")
+OPERATOR_PATTERN = re.compile(r"[<>!=]+")
+
+
+def keywordKind(word):
+    """
+    Kind id of a keyword in KEYWORDS.
+    """
+    return KIND_KEYWORD + KEYWORDS.index(word)
+
+
+# A backslash and the character it escapes (backslashEscapes)
+ESCAPE_PATTERN = re.compile(r"\\.", re.DOTALL)
+BYTE_ESCAPE_PATTERN = re.compile(rb"\\.", re.DOTALL)
+
+
+def isTerminated(literal, backslashEscapes=False):
+    """
+    True if a string literal or quoted identifier token (str or bytes)
+    has its closing quote. A doubled quote inside is an escaped one, so
+    a complete token holds an even number of its quote characters
+    ('it''s'). With backslashEscapes, a backslash escapes the character
+    after it ('it\\'s') and the pair is not counted.
+    """
+    if backslashEscapes:
+        if literal.__class__ is bytes:
+            literal = BYTE_ESCAPE_PATTERN.sub(b"", literal)
+        else:
+            literal = ESCAPE_PATTERN.sub("", literal)
+    return len(literal) > 1 and literal.count(literal[0]) % 2 == 0
+
+
+def quotedPattern(quote, backslashEscapes):
+    """
+    Regex source of a token quoted with `quote`, closing quote optional
+    (an open one runs to the end of the query). A doubled quote and,
+    with backslashEscapes, a backslash escape the character after them;
+    bodies are single character-class runs between escapes.
+    """
+    if backslashEscapes:
+        return rf"{quote}[^{quote}\\]*(?:(?:{quote}{quote}|\\(?s:.)?)[^{quote}\\]*)*{quote}?"
+    return rf"{quote}[^{quote}]*(?:{quote}{quote}[^{quote}]*)*{quote}?"
+
+
+class TokenStream:
+    """
+    Token stream produced by a single lexing pass over a query.
+
+    Every statement validator consumes this object instead of
+    re-scanning the raw query text.
+
+    Attributes:
+    - sql          : original query text
+    - tokens       : normalized tokens (words lowercased, string literals
+                     and quoted identifiers kept verbatim)
+    - texts        : original token text (used in error messages)
+    - starts       : offset of each token in the query text
+    - unterminated : True if a quote or a /* comment was left open
+    - match        : bracket index; for '(' / ')' the index of the
+                     partner parenthesis, -1 for everything else
+    - depth        : parenthesis nesting before each token
+    - balanced     : True if every parenthesis has a partner
+    - kinds        : array('B') of token kinds (KIND_* constants)
+    - backslashEscapes : True if lexed with backslash escapes
+    """
+
+    def __init__(self, sql, tokens, texts, starts, match, depth,
+                 balanced=True, unterminated=False, kinds=None, backslashEscapes=False):
+        self.sql = sql
+        self.tokens = tokens
+        self.texts = texts
+        self.starts = starts
+        self.match = match
+        self.depth = depth
+        self.balanced = balanced
+        self.unterminated = unterminated
+        self.kinds = Lexer.classify(tokens) if kinds is None else kinds
+        self.backslashEscapes = backslashEscapes
+
+    def __len__(self):
+        return len(self.tokens)
+
+    def text(self, start, end):
+        """
+        Returns the source text covered by tokens[start:end].
+        """
+        if start >= end:
+            return ""
+        return self.sql[self.starts[start]:self.starts[end - 1] + len(self.texts[end - 1])]
+
+    def findClosing(self, i):
+        """
+        Returns the index of the ')' matching the '(' at index i,
+        or -1 if it is never closed.
+        """
+        return self.match[i]
+
+    def hasBalancedParentheses(self):
+        """
+        Checks that every '(' token has a matching ')' token.
+        Parentheses inside literals are already part of a single token.
+        """
+        return self.balanced
+
+    def span(self, start=0, end=None):
+        """
+        Returns tokens[start:end] as a TokenSpan view sharing this
+        stream's bracket index (no copy).
+        """
+        start, end, _ = slice(start, end).indices(len(self.tokens))
+        return TokenSpan(self.tokens, start, max(start, end), self.match, self.depth,
+                         memoryview(self.kinds))
+
+    def splitTopLevel(self, start, end, separator=","):
+        """
+        Splits tokens[start:end] on a separator outside parentheses.
+        Returns a list of (start, end) index pairs.
+        """
+        tokens = self.tokens
+        match = self.match
+        parts = []
+        partStart = start
+        i = start
+
+        while i < end:
+            tok = tokens[i]
+            if tok == "(":
+                close = match[i]
+                if close == -1 or close >= end:
+                    break
+                i = close
+            elif tok == ")":
+                break
+            elif tok == separator:
+                parts.append((partStart, i))
+                partStart = i + 1
+            i += 1
+
+        parts.append((partStart, end))
+        return parts
+
+    def consumeName(self, i):
+        """
+        Consumes a name starting at index i: a run of tokens written
+        without whitespace between them (e.g. schema.table), stopping
+        at parentheses, commas and semicolons.
+        Returns (end_index, name_text).
+        """
+        tokens = self.tokens
+        starts = self.starts
+        texts = self.texts
+        n = len(tokens)
+        end = i
+
+        while end < n and tokens[end] not in NAME_BREAKS:
+            end += 1
+            if end < n and starts[end] != starts[end - 1] + len(texts[end - 1]):
+                break
+
+        return end, self.text(i, end)
+
+
+class TokenSpan:
+    """
+    Read-only view of tokens[start:end] of a query.
+
+    Helpers receive spans instead of sliced lists: slicing a span
+    returns another span over the same base list, so walking clauses
+    and subqueries never copies tokens. The view also carries the
+    query's bracket index, so matching parentheses and nesting levels
+    are single lookups.
+
+    - base       : token list of the whole query
+    - start, end : bounds of the view in base
+    - match      : bracket index of base (absolute positions)
+    - depth      : nesting depth of base (absolute positions)
+    - kindArray  : memoryview of the token kinds of base
+    """
+
+    __slots__ = ("base", "start", "end", "match", "depth", "kindArray")
+
+    def __init__(self, base, start, end, match, depth, kindArray):
+        self.base = base
+        self.start = start
+        self.end = end
+        self.match = match
+        self.depth = depth
+        self.kindArray = kindArray
+
+    @staticmethod
+    def of(tokens):
+        """
+        Returns tokens as a TokenSpan. A plain list is viewed in place,
+        with its bracket index built once.
+        """
+        if isinstance(tokens, TokenSpan):
+            return tokens
+
+        match, depth, _ = Lexer.bracketIndex(tokens)
+        return TokenSpan(tokens, 0, len(tokens), match, depth,
+                         memoryview(Lexer.classify(tokens)))
+
+    def sub(self, start, end=None):
+        """
+        Sub-view tokens[start:end] (indices relative to this view).
+        """
+        if end is None:
+            end = self.end - self.start
+        return TokenSpan(self.base, self.start + start, self.start + end,
+                         self.match, self.depth, self.kindArray)
+
+    # ---- sequence protocol ----
+
+    def __len__(self):
+        return self.end - self.start
+
+    def __getitem__(self, index):
+        if index.__class__ is int:
+            index += self.end if index < 0 else self.start
+            if self.start <= index < self.end:
+                return self.base[index]
+            raise IndexError("token index out of range")
+
+        start, stop, step = index.indices(self.end - self.start)
+        if step != 1:
+            return [self[i] for i in range(start, stop, step)]
+        return self.sub(start, max(start, stop))
+
+    def __iter__(self):
+        # islice would walk base from index 0; index the range instead
+        return map(self.base.__getitem__, range(self.start, self.end))
+
+    def __contains__(self, tok):
+        try:
+            self.base.index(tok, self.start, self.end)
+        except ValueError:
+            return False
+        return True
+
+    def index(self, tok, start=0, end=None):
+        if end is None:
+            end = self.end - self.start
+        return self.base.index(tok, self.start + start, self.start + end) - self.start
+
+    def __eq__(self, other):
+        if isinstance(other, (TokenSpan, list)):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return repr(self.base[self.start:self.end])
+
+    @property
+    def kinds(self):
+        """
+        Token kinds of this view (indices relative to the view, no copy).
+        """
+        return self.kindArray[self.start:self.end]
+
+    # ---- bracket index ----
+
+    def closing(self, i):
+        """
+        Index of the ')' matching the '(' at i, or -1 if the partner
+        is not inside this view.
+        """
+        close = self.match[self.start + i]
+        if close == -1:
+            return -1
+
+        close -= self.start
+        return close if i < close < self.end - self.start else -1
+
+    def level(self, i):
+        """
+        Nesting depth of token i relative to the start of this view.
+        """
+        depth = self.depth
+        return depth[self.start + i] - depth[self.start]
+
+    def topLevel(self, start=0, end=None):
+        """
+        Yields (index, token) for tokens outside parentheses, jumping over
+        parenthesized groups in one step. Stops where the nesting
+        would never return to the top level (unbalanced input).
+        """
+        base = self.base
+        match = self.match
+        offset = self.start
+        i = offset + start
+        stop = self.end if end is None else offset + end
+
+        while i < stop:
+            tok = base[i]
+            if tok == "(":
+                close = match[i]
+                if close < i or close >= stop:
+                    return
+                i = close + 1
+                continue
+            if tok == ")":
+                return
+            yield i - offset, tok
+            i += 1
+
+
+class Lexer:
+    """
+    Single-pass SQL lexer shared by every statement validator.
+
+    Token classes (in match order):
+    - comments               -- to the end of the line, /* ... */
+                             (skipped like whitespace)
+    - string literals        'text', 'it''s' ('it\\'s' with backslashEscapes)
+    - quoted identifiers     "name" or `name` ("a""b" escapes a quote)
+    - decimal numbers        12.50
+    - words                  identifiers, keywords, integers
+    - comparison operators   =, <>, !=, <=, >=
+    - any other single non-space character
+
+    Comment and literal bodies are matched as single character-class
+    runs ([^']*, [^*]*), so the scan jumps from one quote or '*' to the
+    next instead of looking at each character, and a literal or comment
+    costs one match whatever its length. A literal or block comment
+    left open runs to the end of the query.
+    """
+
+    TOKEN_PATTERNS = {
+        escapes: re.compile(r"""
+              (?P<comment>--[^\n]*|/\*[^*]*\*+(?:[^/*][^*]*\*+)*/|/\*(?s:.*))
+            | (?P<string>""" + quotedPattern("'", escapes) + r""")
+            | (?P<quoted>""" + quotedPattern('"', escapes) + "|" + quotedPattern("`", escapes) + r""")
+            | (?P<number>\d+\.\d+)
+            | (?P<word>\w+)
+            | (?P<operator>[<>!=]+)
+            | (?P<symbol>\S)
+        """, re.VERBOSE)
+        for escapes in (False, True)
+    }
+    TOKEN_PATTERN = TOKEN_PATTERNS[False]
+
+    @staticmethod
+    def tokenize(sql, backslashEscapes=False):
+        """
+        Lexes a query into a TokenStream.
+        Whitespace is skipped; words are lowercased in `tokens` and
+        keywords are interned. With backslashEscapes (MySQL), a
+        backslash also escapes the next character of a literal or
+        quoted identifier, as in ScriptSplitter.
+        """
+        if not isinstance(sql, str):
+            sql = ""
+
+        tokens = []
+        texts = []
+        starts = []
+        kinds = array("B")
+        unterminated = False
+
+        # Bracket index, filled in the same pass
+        match = []
+        depth = []
+        openStack = []
+        balanced = True
+
+        # Bound appends: this loop runs once per token of every query
+        addToken = tokens.append
+        addText = texts.append
+        addStart = starts.append
+        addKind = kinds.append
+        addMatch = match.append
+        addDepth = depth.append
+        words = WORDS
+
+        for found in Lexer.TOKEN_PATTERNS[backslashEscapes].finditer(sql):
+            text = found.group()
+            kind = found.lastgroup
+
+            if kind == "comment":
+                # An unclosed /* runs to the end ('/*/' does not close)
+                if text[1] == "*" and (len(text) < 4 or text[-2:] != "*/"):
+                    unterminated = True
+                continue
+
+            addText(text)
+            addStart(found.start())
+            addDepth(len(openStack))
+
+            if kind == "word":
+                word = text.lower()
+                known = words.get(word)
+                if known is not None:
+                    word, wordKind = known
+                elif word.isidentifier():
+                    wordKind = KIND_IDENTIFIER
+                elif word.isnumeric():
+                    wordKind = KIND_NUMBER
+                else:
+                    wordKind = KIND_OTHER
+                addToken(word)
+                addKind(wordKind)
+                addMatch(-1)
+                continue
+
+            addKind(GROUP_KINDS[kind])
+
+            if kind in ("string", "quoted") and not isTerminated(text, backslashEscapes):
+                unterminated = True
+
+            if text == "(":
+                openStack.append(len(match))
+                addMatch(-1)
+            elif text == ")" and openStack:
+                partner = openStack.pop()
+                match[partner] = len(match)
+                addMatch(partner)
+            else:
+                if text == ")":
+                    balanced = False
+                addMatch(-1)
+
+            addToken(text)
+
+        if openStack:
+            balanced = False
+
+        return TokenStream(sql, tokens, texts, starts, match, depth,
+                           balanced, unterminated, kinds, backslashEscapes)
+
+    @staticmethod
+    def bracketIndex(tokens):
+        """
+        Builds (match, depth, balanced) for an already tokenized list.
+        """
+        match = []
+        depth = []
+        openStack = []
+        balanced = True
+
+        for tok in tokens:
+            depth.append(len(openStack))
+            if tok == "(":
+                openStack.append(len(match))
+                match.append(-1)
+            elif tok == ")" and openStack:
+                partner = openStack.pop()
+                match[partner] = len(match)
+                match.append(partner)
+            else:
+                if tok == ")":
+                    balanced = False
+                match.append(-1)
+
+        return match, depth, balanced and not openStack
+
+    @staticmethod
+    def classify(tokens):
+        """
+        Builds the kinds array for an already tokenized list, giving
+        each token the kind tokenize() would have given it.
+        """
+        kinds = array("B")
+
+        for tok in tokens:
+            known = WORDS.get(tok)
+            if known is not None:
+                kinds.append(known[1])
+            elif not tok:
+                kinds.append(KIND_OTHER)
+            elif tok[0] == "'":
+                kinds.append(KIND_STRING)
+            elif tok[0] in "\"`" or tok.isidentifier():
+                kinds.append(KIND_IDENTIFIER)
+            elif tok.isnumeric():
+                kinds.append(KIND_NUMBER)
+            elif DECIMAL_PATTERN.fullmatch(tok):
+                kinds.append(KIND_DECIMAL)
+            elif WORD_PATTERN.fullmatch(tok):
+                kinds.append(KIND_OTHER)
+            elif OPERATOR_PATTERN.fullmatch(tok):
+                kinds.append(KIND_OPERATOR)
+            else:
+                kinds.append(KIND_PUNCTUATION)
+
+        return kinds
@@ -0,0 +1,478 @@
+import codecs
+import contextlib
+import mmap
+import os
+import re
+
+try:
+    import sqlite3
+except ImportError:         # Python built without the sqlite3 module
+    sqlite3 = None
+
+
+QUOTES = (b"'", b'"', b"`")
+
+
+def _literalPattern(quote, backslashEscapes):
+    """
+    Regex of a complete quoted literal; a doubled quote (and, if
+    enabled, a backslash) escapes the next byte. The literal may not be
+    followed by its quote, so 'a''b' has only one reading and a failed
+    match never backtracks into it.
+    """
+    if backslashEscapes:
+        plain = b"[^" + quote + rb"\\]*"
+        body = quote + plain + b"(?:(?:" + quote + quote + rb"|\\.)" + plain + b")*" + quote
+    else:
+        plain = b"[^" + quote + b"]*"
+        body = quote + plain + b"(?:" + quote + quote + plain + b")*" + quote
+    return body + b"(?!" + quote + b")"
+
+
+# Comments, written so that each has a single reading
+COMMENT_PATTERN = rb"--[^\n]*\n|/\*[^*]*\*+(?:[^/*][^*]*\*+)*/"
+
+
+def _literals(backslashEscapes):
+    return b"|".join(_literalPattern(quote, backslashEscapes) for quote in QUOTES)
+
+
+def _statementPattern(backslashEscapes):
+    """
+    Regex of the text up to the next ';' outside literals and comments,
+    matched in one call. Parentheses are counted afterwards.
+    """
+    plain = rb"""[^;'"`\-/]*"""
+    return re.compile(
+        plain + b"(?:(?:" + _literals(backslashEscapes) + b"|" + COMMENT_PATTERN
+        + rb"|-(?!-)|/(?!\*))" + plain + b")*;",
+        re.DOTALL,
+    )
+
+
+def _segmentPattern(backslashEscapes):
+    """
+    Regex of what the token-by-token scan has to look at: semicolons,
+    parentheses and whole literals and comments. The partial group
+    catches an opener whose end is not in the buffer yet, and a lone
+    '-' or '/' at the end of the buffer that may be half of a comment
+    opener.
+    """
+    return re.compile(
+        rb"(?P<semicolon>;)|(?P<open>\()|(?P<close>\))|"
+        + _literals(backslashEscapes) + b"|" + COMMENT_PATTERN
+        + rb"""|(?P<partial>['"`]|--|/\*|[-/]\Z)""",
+        re.DOTALL,
+    )
+
+
+def _nonParenPattern(backslashEscapes):
+    """
+    Regex of everything in a statement but its parentheses (literals
+    and comments included).
+    """
+    return re.compile(
+        _literals(backslashEscapes) + b"|" + COMMENT_PATTERN + rb"""|[^()'"`\-/]+|[-/]""",
+        re.DOTALL,
+    )
+
+
+STATEMENT_PATTERNS = {escapes: _statementPattern(escapes) for escapes in (False, True)}
+SEGMENT_PATTERNS = {escapes: _segmentPattern(escapes) for escapes in (False, True)}
+NON_PAREN_PATTERNS = {escapes: _nonParenPattern(escapes) for escapes in (False, True)}
+
+# End of a quoted literal when backslash escapes are enabled
+ESCAPED_QUOTE_PATTERNS = {
+    quote: re.compile(rb"[\\" + quote + rb"]")
+    for quote in QUOTES
+}
+
+# Whitespace and comments in front of a statement
+LEADING_PATTERN = re.compile(rb"(?:\s+|--[^\n]*(?:\n|\Z)|/\*.*?\*/)*", re.DOTALL)
+
+BACKENDS = ("native", "sqlite")
+
+# Buffers scanned in place instead of read in chunks
+BUFFERS = (bytes, bytearray, mmap.mmap)
+
+# Pages of a memory-mapped script already split are handed back to the
+# system every this many bytes, so resident memory stays flat
+RELEASE_EVERY = 4 << 20
+
+
+class Statement:
+    """
+    One statement of a SQL script.
+
+    - text  : statement text, from its first token to its terminating
+              semicolon (included when present)
+    - start : byte offset of the text in the script
+    - end   : byte offset just past the text
+    - line  : 1-based line number of the first token
+    """
+
+    __slots__ = ("text", "start", "end", "line")
+
+    def __init__(self, text, start, end, line):
+        self.text = text
+        self.start = start
+        self.end = end
+        self.line = line
+
+    def __eq__(self, other):
+        if not isinstance(other, Statement):
+            return NotImplemented
+        return (self.text, self.start, self.end, self.line) == (other.text, other.start, other.end, other.line)
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"Statement(line={self.line}, start={self.start}, end={self.end}, text={self.text!r})"
+
+
+class ScriptSplitter:
+    """
+    Streaming splitter of SQL scripts (migrations, dumps) into statements.
+
+    The script is read from a file object in chunks, so memory stays
+    bounded by the longest statement plus one chunk, however large the
+    file is. Statements are yielded as Statement objects with their byte
+    offset and line number; blank statements (only whitespace, comments
+    or a lone ';') are skipped.
+
+    Backends deciding where a statement ends:
+    - native : a ';' outside quotes ('text', "name", `name`), comments
+               (-- and /* */) and parentheses. Doubled quotes are
+               escapes; with backslashEscapes=True (MySQL dumps) so is
+               a backslash.
+    - sqlite : a ';' for which sqlite3.complete_statement accepts the
+               text so far; follows SQLite's own rules, including
+               CREATE TRIGGER ... BEGIN ... END blocks, but ignores
+               parentheses.
+
+    source is a binary or text file object, or a whole script as str,
+    bytes, bytearray or mmap (see openMapped). Text is encoded as UTF-8,
+    so offsets are UTF-8 byte offsets; binary input is scanned as it is
+    and decoded with `encoding`. A buffer is scanned in place, so the
+    offsets of a memory-mapped file index the map, and its pages are
+    released as the scan moves past them.
+
+    With decode=False, Statement.text is None: the statement is
+    source[start:end], to be decoded (or lexed with ByteLexer) by the
+    caller.
+    """
+
+    def __init__(self, source, backend="native", chunkSize=1 << 16,
+                 backslashEscapes=False, encoding="utf-8", decode=True):
+        if backend not in BACKENDS:
+            raise ValueError(f"unknown splitter backend {backend!r}; expected one of {BACKENDS}")
+        if backend == "sqlite" and sqlite3 is None:
+            raise ValueError("the sqlite backend needs the sqlite3 module")
+
+        if isinstance(source, str):
+            source = source.encode("utf-8")
+        self.backend = backend
+        self.backslashEscapes = backslashEscapes
+        self.encoding = encoding
+        self.decode = decode
+
+        if isinstance(source, BUFFERS):
+            self.buf = source           # the whole script, never appended to
+            self.read = lambda: b""
+        else:
+            self.buf = bytearray()      # unconsumed part of the script
+            self.read = _reader(source, chunkSize)
+        self.mapped = isinstance(source, mmap.mmap) and hasattr(mmap, "MADV_DONTNEED")
+        self.released = 0      # end of the pages of a map released so far
+
+        self.base = 0          # byte offset of buf[0] in the script
+        self.start = 0         # start of the pending statement in buf
+        self.line = 1          # line number at buf[start]
+        self.pos = 0           # scan position in buf
+        self.depth = 0         # open parentheses of the pending statement
+        self.inside = None     # open quote or comment: b"'", b"--", b"/*", ...
+
+        # sqlite backend: buf[start:pos] decoded, extended as it is scanned
+        self.text = ""
+        self.decoder = codecs.getincrementaldecoder(encoding)("replace")
+
+    def __iter__(self):
+        scan = self.scanSqlite if self.backend == "sqlite" else self.scanNative
+
+        while True:
+            chunk = self.read()
+            eof = not chunk
+            if not eof:
+                self.append(chunk)
+
+            for end in scan(eof):
+                statement = self.emit(end)
+                if statement is not None:
+                    yield statement
+                if self.mapped and end - self.released >= RELEASE_EVERY:
+                    self.release(end)
+
+            if eof:
+                break
+
+        # Trailing statement without a semicolon
+        statement = self.emit(len(self.buf))
+        if statement is not None:
+            yield statement
+
+    # ---------------------------------------------------------
+    # Buffer
+    # ---------------------------------------------------------
+
+    def append(self, chunk):
+        """
+        Drops consumed statements from the buffer and adds a chunk.
+
+        Both happen in place: the pending statement is not copied per
+        chunk, so a statement of any length is read in linear time.
+        """
+        start = self.start
+        if start:
+            del self.buf[:start]
+        self.buf += chunk
+        self.base += start
+        self.pos -= start
+        self.start = 0
+
+    def emit(self, end):
+        """
+        Turns buf[start:end] into a Statement (None if it is blank)
+        and moves the pending statement past it.
+        """
+        start = self.start
+        piece = self.buf[start:end]         # a map has no count()
+        first = LEADING_PATTERN.match(piece).end()
+        line = self.line + piece.count(b"\n", 0, first)
+
+        self.line += piece.count(b"\n")
+        self.start = end
+
+        body = piece[first:].rstrip()
+        if not body or body == b";":
+            return None
+
+        text = body.decode(self.encoding, "replace") if self.decode else None
+        first += self.base + start
+        return Statement(text, first, first + len(body), line)
+
+    def release(self, end):
+        """
+        Hands the pages of a memory-mapped script before `end` back to
+        the system. They are clean file pages: reading them again just
+        maps them in again.
+        """
+        end -= end % mmap.PAGESIZE
+        if end > self.released:
+            self.buf.madvise(mmap.MADV_DONTNEED, self.released, end - self.released)
+            self.released = end
+
+    # ---------------------------------------------------------
+    # Backends
+    # ---------------------------------------------------------
+
+    def scanNative(self, eof):
+        """
+        Yields the end offset of every statement completed in the
+        buffer. Stops where more input is needed to decide (open
+        literal or comment, possible comment opener at the end).
+        """
+        buf = self.buf
+        n = len(buf)
+        pos = self.pos
+        depth = self.depth
+        inside = self.inside
+        statement = STATEMENT_PATTERNS[self.backslashEscapes].match
+        nonParen = NON_PAREN_PATTERNS[self.backslashEscapes].sub
+        segments = SEGMENT_PATTERNS[self.backslashEscapes].finditer
+        escaped = ESCAPED_QUOTE_PATTERNS if self.backslashEscapes else None
+
+        while pos < n:
+            if inside is None:
+                # Fast path: one regex call per ';', with the parentheses
+                # counted only when the text before it has any
+                found = statement(buf, pos)
+                if found is not None:
+                    end = found.end()
+                    if depth or buf.find(b"(", pos, end) != -1 or buf.find(b")", pos, end) != -1:
+                        depth = _depthAfter(depth, nonParen(b"", buf[pos:end]))
+                    pos = end
+                    if depth == 0:
+                        yield end
+                    continue
+
+                # No ';' reachable in the buffer: scan token by token,
+                # stopping where more input is needed
+                waiting = False
+
+                for found in segments(buf, pos):
+                    kind = found.lastgroup
+
+                    if kind is None:
+                        # Whole literal or comment. A quote closing on the
+                        # last byte may be doubled by the next chunk.
+                        if found.end() == n and not eof and buf[found.start()] in b"'\"`":
+                            inside = bytes(buf[found.start():found.start() + 1])
+                            pos = n - 1
+                            break
+                    elif kind == "semicolon":
+                        if depth == 0:
+                            yield found.end()
+                    elif kind == "open":
+                        depth += 1
+                    elif kind == "close":
+                        if depth:
+                            depth -= 1
+                    else:
+                        tok = found.group()
+                        if tok == b"-" or tok == b"/":
+                            # Lone '-' or '/' as the last byte of the buffer
+                            if not eof:
+                                pos = found.start()
+                                waiting = True
+                                break
+                            continue
+
+                        # Literal or comment not closed in the buffer:
+                        # follow it incrementally below
+                        inside = tok
+                        pos = found.end()
+                        break
+                else:
+                    pos = n
+
+                if waiting:
+                    break
+
+            elif inside == b"--":
+                close = buf.find(b"\n", pos)
+                if close == -1:
+                    pos = n
+                    break
+                inside = None
+                pos = close + 1
+
+            elif inside == b"/*":
+                close = buf.find(b"*/", pos)
+                if close == -1:
+                    # Keep the last byte: it may be the '*' of '*/'
+                    pos = max(pos, n - 1)
+                    break
+                inside = None
+                pos = close + 2
+
+            else:
+                if escaped is None:
+                    close = buf.find(inside, pos)
+                else:
+                    found = escaped[inside].search(buf, pos)
+                    close = -1 if found is None else found.start()
+
+                if close == -1:
+                    pos = n
+                    break
+
+                if buf[close] == 92:   # backslash escapes the next byte
+                    if close + 1 == n:
+                        pos = close
+                        break
+                    pos = close + 2
+                    continue
+
+                # A doubled quote is an escaped quote, not the end
+                if close + 1 == n and not eof:
+                    pos = close
+                    break
+                if buf[close + 1:close + 2] == inside:
+                    pos = close + 2
+                    continue
+
+                inside = None
+                pos = close + 1
+
+        self.pos = pos
+        self.depth = depth
+        self.inside = inside
+
+    def scanSqlite(self, eof):
+        """
+        Yields the end offset of every ';' at which SQLite considers
+        the pending text a complete statement.
+        """
+        buf = self.buf
+        pos = self.pos
+        text = self.text
+        complete = sqlite3.complete_statement
+        decode = self.decoder.decode
+
+        # Only the bytes after the last check are decoded and appended,
+        # so a long statement is decoded once, not once per ';'
+        while True:
+            semicolon = buf.find(b";", pos)
+            if semicolon == -1:
+                break
+
+            text += decode(buf[pos:semicolon + 1])
+            pos = semicolon + 1
+            if complete(text):
+                text = ""
+                yield pos
+
+        self.text = text + decode(buf[pos:], eof)
+        self.pos = len(buf)
+
+
+def _depthAfter(depth, parens):
+    """
+    Nesting depth after a run of parentheses, starting at depth; a ')'
+    with nothing open is ignored.
+    """
+    for paren in parens:
+        if paren == 40:         # '('
+            depth += 1
+        elif depth:
+            depth -= 1
+    return depth
+
+
+@contextlib.contextmanager
+def openMapped(path):
+    """
+    Context manager memory-mapping a script read-only, for splitting
+    (and lexing with ByteLexer) in place:
+
+        with openMapped("dump.sql") as script:
+            for statement in ScriptSplitter(script, decode=False):
+                tokens = ByteLexer.tokenize(script, statement.start, statement.end)
+
+    An empty file, which cannot be mapped, gives b"".
+    """
+    with open(path, "rb") as source:
+        if os.fstat(source.fileno()).st_size == 0:
+            yield b""
+            return
+        mapped = mmap.mmap(source.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            mapped.madvise(mmap.MADV_SEQUENTIAL)
+        except (AttributeError, OSError):
+            pass
+        with mapped:
+            yield mapped
+
+
+def _reader(source, chunkSize):
+    """
+    Returns a function reading the next chunk of source as bytes
+    (b"" at the end).
+    """
+    def read():
+        chunk = source.read(chunkSize)
+        if isinstance(chunk, str):
+            return chunk.encode("utf-8")
+        return chunk
+
+    return read
@@ -0,0 +1,134 @@
+import io
+import os
+import tempfile
+
+from lexer.ByteLexer import ByteLexer
+from lexer.Lexer import Lexer
+from lexer.Fingerprint import shape
+from lexer.ScriptSplitter import ScriptSplitter, openMapped
+
+
+FIELDS = ("sql", "tokens", "texts", "starts", "match", "depth", "balanced", "unterminated", "kinds", "backslashEscapes")
+
+
+def same_as_lexer(query, backslashEscapes=False):
+    """
+    True if lexing the UTF-8 bytes of query gives the TokenStream and
+    the shape Lexer gives for the text.
+    """
+    tokens = ByteLexer.tokenize(query.encode(), backslashEscapes=backslashEscapes)
+    stream, expected = tokens.stream(), Lexer.tokenize(query, backslashEscapes)
+    return all(getattr(stream, f) == getattr(expected, f) for f in FIELDS) and shape(tokens) == shape(expected)
+
+
+#EQUIVALENCE CASES (bytes and text lexing agree)
+
+equivalence_cases = [
+    "SELECT a, COUNT(b) FROM t WHERE c >= 1.5 AND d <> 'x' GROUP BY a;",
+    "INSERT INTO t (a, b) VALUES (1, 'it''s; fine'), (2, \"q\"\"r\");",
+    "UPDATE t SET a = 'héllo wörld' WHERE id IN (1, 2, 3) -- done",
+    "SELECT /* note; 'quoted' */ a FROM `my table`",
+    "SELECT a FROM t WHERE b = 'open",
+    "SELECT a FROM t /* open",
+    "SELECT café, ½ FROM t",
+    "a\x1cb",
+    "((a)) ) (",
+    "",
+]
+
+# Lexed with backslash escapes (MySQL)
+escaped_cases = [
+    r"SELECT a FROM t WHERE b = 'O\'Neil; x' AND c = 'it''s'",
+    r"SELECT a FROM t WHERE b = 'a\\' AND c = `q\`r`",
+    r"SELECT a FROM t WHERE b = 'open\'",
+    r"SELECT 'é\'' FROM t",
+]
+
+failed_tests = []
+total_tests = 0
+
+print("\n===== BYTE LEXER TEST RESULTS =====\n")
+
+for query in equivalence_cases:
+    total_tests += 1
+    got = same_as_lexer(query)
+
+    if got:
+        print(f"[PASS] {query!r}")
+    else:
+        print(f"[FAIL] {query!r} -> differs from Lexer")
+        failed_tests.append((query, got))
+
+for query in escaped_cases:
+    total_tests += 1
+    got = same_as_lexer(query, backslashEscapes=True)
+
+    if got:
+        print(f"[PASS] escaped {query!r}")
+    else:
+        print(f"[FAIL] escaped {query!r} -> differs from Lexer")
+        failed_tests.append((query, got))
+
+
+# A statement lexed inside a larger buffer, by offset
+buffer = b"COMMIT; SELECT a, 'x' FROM t WHERE b = 'y' AND c = 'r\xc3\xa9'; ROLLBACK;"
+start = buffer.index(b"SELECT")
+end = buffer.index(b"; ROLLBACK") + 1
+tokens = ByteLexer.tokenize(buffer, start, end)
+
+helper_cases = [
+    ("offsets index the buffer", buffer[tokens.starts[0]:tokens.ends[0]], b"SELECT"),
+    ("ASCII literals left as bytes", [tok for tok in tokens.tokens if tok.__class__ is bytes], [b"'x'", b"'y'"]),
+    ("other literals decoded", tokens.tokens[-2], "'ré'"),
+    ("token() decodes", (tokens.token(3), tokens.tokens[3]), ("'x'", "'x'")),
+    ("stream text", tokens.stream().sql, "SELECT a, 'x' FROM t WHERE b = 'y' AND c = 'ré';"),
+    ("character offsets", tokens.stream().starts[-1], len("SELECT a, 'x' FROM t WHERE b = 'y' AND c = 'ré'")),
+    ("non-ASCII code left to Lexer", ByteLexer.tokenize("SELECT café FROM t".encode()).exact, False),
+]
+
+# Splitting a memory-mapped script in place
+script = "-- dump\nCREATE TABLE t (id INT);\nINSERT INTO t VALUES (1, 'a;b'), (2, 'ü');\nCOMMIT"
+with tempfile.TemporaryDirectory() as root:
+    path = os.path.join(root, "dump.sql")
+    empty = os.path.join(root, "empty.sql")
+    with open(path, "wb") as out:
+        out.write(script.encode())
+    open(empty, "wb").close()
+
+    expected = list(ScriptSplitter(io.BytesIO(script.encode()), chunkSize=5))
+    with openMapped(path) as mapped:
+        statements = list(ScriptSplitter(mapped))
+        lazy = [(s.text, mapped[s.start:s.end].decode()) for s in ScriptSplitter(mapped, decode=False)]
+    with openMapped(empty) as mapped:
+        nothing = list(ScriptSplitter(mapped))
+
+helper_cases += [
+    ("mapped split matches chunked split", statements, expected),
+    ("decode=False leaves text to the caller", lazy, [(None, s.text) for s in expected]),
+    ("empty file", nothing, []),
+]
+
+for name, got, expected in helper_cases:
+    total_tests += 1
+
+    if got == expected:
+        print(f"[PASS] {name}")
+    else:
+        print(f"[FAIL] {name} -> {got} (expected {expected})")
+        failed_tests.append((name, got))
+
+
+#TEST SUMMARY
+
+print("\n===== TEST SUMMARY =====")
+print(f"Total Test Cases : {total_tests}")
+print(f"Passed           : {total_tests - len(failed_tests)}")
+print(f"Failed           : {len(failed_tests)}")
+
+if failed_tests:
+    print("\n--- Failed Test Descriptions ---")
+    for i, (q, got) in enumerate(failed_tests, start=1):
+        print(f"{i}. Case : {q!r}")
+        print(f"   Got  : {got}")
+else:
+    print("\nAll BYTE LEXER tests passed successfully.")
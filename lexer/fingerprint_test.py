@@ -0,0 +1,87 @@
+from lexer.Lexer import Lexer
+from lexer.Fingerprint import shape, template, fingerprint
+
+
+#SHAPE CASES (query, expected (template, signature))
+
+shape_cases = [
+    # Literals become placeholders, whitespace runs one space
+    ("SELECT a FROM t WHERE id = 1 AND name = 'x';", ("select a from t where id = ? and name = ?;", "ns")),
+
+    # Tokens written together stay together
+    ("select a from t where id=1.5", ("select a from t where id=?", "d")),
+
+    # IN lists of literals collapse whatever their length
+    ("SELECT a FROM t WHERE b IN (1, 2, 3) AND c NOT IN ('x');", ("select a from t where b in (?) and c not in (?);", "NS")),
+
+    # Lists with other items or mixed kinds are kept
+    ("DELETE FROM t WHERE b IN (1, 'x', c);", ("delete from t where b in (?, ?, c);", "ns")),
+    ("SELECT a FROM t WHERE b IN (SELECT b FROM u WHERE c = 2);",
+     ("select a from t where b in (select b from u where c = ?);", "n")),
+
+    # A repeated literal or list refers to its first occurrence
+    ("SELECT a + 1 FROM t GROUP BY a + 1;", ("select a + ? from t group by a + ?;", "nn0")),
+    ("SELECT a + 1 FROM t GROUP BY a + 2;", ("select a + ? from t group by a + ?;", "nn")),
+    ("SELECT a IN (1, 2) FROM t GROUP BY a IN (1, 2);", ("select a in (?) from t group by a in (?);", "NN0")),
+
+    # A '?' in the query is not a literal; unclosed strings and
+    # non-ASCII numerals are kept as written
+    ("SELECT a FROM t WHERE id = ?;", ("select a from t where id = ?;", "q")),
+    ("SELECT a FROM t WHERE b = 'open", ("select a from t where b = 'open", "")),
+    ("SELECT a FROM t WHERE b = 'it''s' -- note", ("select a from t where b = ?", "s")),
+    ("SELECT a FROM t WHERE b = 'it''", ("select a from t where b = 'it''", "")),
+    ("SELECT a FROM t LIMIT ²", ("select a from t limit ²", "")),
+]
+
+failed_tests = []
+total_tests = 0
+
+print("\n===== FINGERPRINT TEST RESULTS =====\n")
+
+for query, expected in shape_cases:
+    total_tests += 1
+    got = shape(query)
+
+    if got == expected:
+        print(f"[PASS] {query!r}")
+    else:
+        print(f"[FAIL] {query!r} -> {got}")
+        failed_tests.append((query, got))
+
+
+#OTHER CASES
+
+other_cases = [
+    ("template", template("UPDATE t SET a = 'x' WHERE id IN (4, 5);"), "update t set a = ? where id in (?);"),
+    ("same template, same fingerprint",
+     fingerprint("SELECT a FROM t WHERE id = 1;") == fingerprint("select a\n from t where id = 42;"), True),
+    ("literal kind changes fingerprint",
+     fingerprint("SELECT a FROM t WHERE id = 1;") == fingerprint("SELECT a FROM t WHERE id = '1';"), False),
+    ("stable across processes", fingerprint("SELECT a FROM t WHERE id = 1;"), "21de84c3c190ebcd"),
+    ("accepts a token stream", shape(Lexer.tokenize("COMMIT;")), ("commit;", "")),
+]
+
+for name, got, expected in other_cases:
+    total_tests += 1
+
+    if got == expected:
+        print(f"[PASS] {name}")
+    else:
+        print(f"[FAIL] {name} -> {got} (expected {expected})")
+        failed_tests.append((name, got))
+
+
+#TEST SUMMARY
+
+print("\n===== TEST SUMMARY =====")
+print(f"Total Test Cases : {total_tests}")
+print(f"Passed           : {total_tests - len(failed_tests)}")
+print(f"Failed           : {len(failed_tests)}")
+
+if failed_tests:
+    print("\n--- Failed Test Descriptions ---")
+    for i, (q, got) in enumerate(failed_tests, start=1):
+        print(f"{i}. Case : {q!r}")
+        print(f"   Got  : {got}")
+else:
+    print("\nAll FINGERPRINT tests passed successfully.")
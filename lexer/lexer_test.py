@@ -0,0 +1,148 @@
+import sys
+
+from lexer.Lexer import (
+    Lexer,
+    TokenSpan,
+    keywordKind,
+    KIND_OTHER,
+    KIND_IDENTIFIER,
+    KIND_NUMBER,
+    KIND_DECIMAL,
+    KIND_STRING,
+    KIND_OPERATOR,
+    KIND_PUNCTUATION,
+    KIND_AGGREGATE,
+)
+
+
+#TOKENIZATION CASES (query, expected normalized tokens)
+
+tokenize_cases = [
+    # Keywords and identifiers are lowercased
+    ("SELECT a FROM t", ["select", "a", "from", "t"]),
+    ("select A,B from T;", ["select", "a", ",", "b", "from", "t", ";"]),
+
+    # Grouped comparison operators
+    ("a>=1 AND b<>2 OR c!=3", ["a", ">=", "1", "and", "b", "<>", "2", "or", "c", "!=", "3"]),
+
+    # String literals and quoted identifiers are single tokens
+    ("name = 'Alice Smith'", ["name", "=", "'Alice Smith'"]),
+    ('DROP TABLE "User Table";', ["drop", "table", '"User Table"', ";"]),
+    ("x = `My Col`", ["x", "=", "`My Col`"]),
+    ("'a;b' ;", ["'a;b'", ";"]),
+
+    # Doubled quotes are escapes inside a literal
+    ("x = 'it''s'", ["x", "=", "'it''s'"]),
+    ('SELECT "a""b" FROM t', ["select", '"a""b"', "from", "t"]),
+    ("'--' || '/*'", ["'--'", "|", "|", "'/*'"]),
+
+    # Comments are skipped
+    ("SELECT a -- trailing; note\nFROM t", ["select", "a", "from", "t"]),
+    ("SELECT /* one; two */ a FROM t", ["select", "a", "from", "t"]),
+    ("a--b", ["a"]),
+    ("/**/a/* x * y **/b", ["a", "b"]),
+
+    # Numbers and qualified names
+    ("price = 12.50", ["price", "=", "12.50"]),
+    ("t.col", ["t", ".", "col"]),
+    ("VARCHAR(255)", ["varchar", "(", "255", ")"]),
+
+    # Whitespace only
+    ("   ", []),
+]
+
+
+#STREAM HELPER CASES
+
+failed_tests = []
+total_tests = 0
+
+print("\n===== LEXER TEST RESULTS =====\n")
+
+for query, expected in tokenize_cases:
+    total_tests += 1
+    tokens = Lexer.tokenize(query).tokens
+
+    if tokens == expected:
+        print(f"[PASS] {query!r}")
+    else:
+        print(f"[FAIL] {query!r} -> {tokens}")
+        failed_tests.append((query, tokens))
+
+
+stream = Lexer.tokenize("CREATE TABLE public.users (id INT, name VARCHAR(50))")
+helper_cases = [
+    ("text", stream.text(0, 2), "CREATE TABLE"),
+    ("consumeName", stream.consumeName(2), (5, "public.users")),
+    ("findClosing", stream.findClosing(5), len(stream) - 1),
+    ("splitTopLevel", stream.splitTopLevel(6, len(stream) - 1), [(6, 8), (9, 14)]),
+    ("hasBalancedParentheses", stream.hasBalancedParentheses(), True),
+    ("unterminated", Lexer.tokenize("SET a = 'open").unterminated, True),
+    ("unterminated escape", Lexer.tokenize("SET a = 'it''").unterminated, True),
+    ("unterminated comment", Lexer.tokenize("SELECT a /* open").unterminated, True),
+    ("half-closed comment", Lexer.tokenize("SELECT a /*/").unterminated, True),
+    ("closed literals", Lexer.tokenize("SET a = 'it''s' /* x */ -- y").unterminated, False),
+    ("starts after comment", Lexer.tokenize("/* x */ a -- y\nb").starts, [8, 15]),
+    ("backslash escapes", Lexer.tokenize(r"SET a = 'O\'Neil; x'", backslashEscapes=True).tokens,
+     ["set", "a", "=", r"'O\'Neil; x'"]),
+    ("backslash kept by default", Lexer.tokenize(r"SET a = 'O\'Neil; x'").unterminated, True),
+    ("escaped backslash", Lexer.tokenize(r"SET a = 'a\\', b = 'c'", backslashEscapes=True).tokens[3:],
+     [r"'a\\'", ",", "b", "=", "'c'"]),
+    ("unterminated after escape", Lexer.tokenize(r"SET a = 'x\'", backslashEscapes=True).unterminated, True),
+]
+
+# Bracket index: a = ( b ) and ( ( c ) )
+indexed = Lexer.tokenize("a = (b) AND ((c))")
+tokens = indexed.span()
+inner = tokens.sub(5)
+helper_cases += [
+    ("match", indexed.match, [-1, -1, 4, -1, 2, -1, 10, 9, -1, 7, 6]),
+    ("depth", indexed.depth, [0, 0, 0, 1, 1, 0, 0, 1, 2, 2, 1]),
+    ("unbalanced", Lexer.tokenize("(a)) (").balanced, False),
+    ("topLevel", [i for i, _ in tokens.topLevel()], [0, 1, 5]),
+    ("sub closing", inner.closing(1), 5),
+    ("sub level", inner.level(3), 2),
+    ("partner outside sub", tokens.sub(0, 3).closing(2), -1),
+    ("plain list", TokenSpan.of(["(", "x", ")"]).closing(0), 2),
+]
+
+# Token kinds: SELECT COUNT(x), "y" FROM t WHERE a >= 1.5 AND b = 'z' OR 1c
+kinded = Lexer.tokenize("""SELECT COUNT(x), "y" FROM t WHERE a >= 1.5 AND b = 'z' OR 1c""")
+helper_cases += [
+    ("kinds", list(kinded.kinds), [
+        keywordKind("select"), KIND_AGGREGATE, KIND_PUNCTUATION, KIND_IDENTIFIER,
+        KIND_PUNCTUATION, KIND_PUNCTUATION, KIND_IDENTIFIER, keywordKind("from"),
+        KIND_IDENTIFIER, keywordKind("where"), KIND_IDENTIFIER, KIND_OPERATOR,
+        KIND_DECIMAL, keywordKind("and"), KIND_IDENTIFIER, KIND_OPERATOR,
+        KIND_STRING, keywordKind("or"), KIND_OTHER,
+    ]),
+    ("integer kind", Lexer.tokenize("LIMIT 10").kinds[1], KIND_NUMBER),
+    ("classify", Lexer.classify(kinded.tokens), kinded.kinds),
+    ("span kinds", list(kinded.span(9, 13).kinds), [keywordKind("where"), KIND_IDENTIFIER, KIND_OPERATOR, KIND_DECIMAL]),
+    ("keywords interned", kinded.tokens[0] is sys.intern("select"), True),
+]
+
+for name, got, expected in helper_cases:
+    total_tests += 1
+
+    if got == expected:
+        print(f"[PASS] {name}")
+    else:
+        print(f"[FAIL] {name} -> {got} (expected {expected})")
+        failed_tests.append((name, got))
+
+
+#TEST SUMMARY
+
+print("\n===== TEST SUMMARY =====")
+print(f"Total Test Cases : {total_tests}")
+print(f"Passed           : {total_tests - len(failed_tests)}")
+print(f"Failed           : {len(failed_tests)}")
+
+if failed_tests:
+    print("\n--- Failed Test Descriptions ---")
+    for i, (q, got) in enumerate(failed_tests, start=1):
+        print(f"{i}. Case : {q!r}")
+        print(f"   Got  : {got}")
+else:
+    print("\nAll LEXER tests passed successfully.")
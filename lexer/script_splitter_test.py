@@ -0,0 +1,115 @@
+import io
+
+from lexer.ScriptSplitter import ScriptSplitter, Statement, sqlite3
+
+
+def texts(script, **options):
+    return [statement.text for statement in ScriptSplitter(script, **options)]
+
+
+def rejects(backend):
+    try:
+        ScriptSplitter("", backend=backend)
+    except ValueError:
+        return True
+    return False
+
+
+#SPLIT CASES (script, expected statement texts)
+
+split_cases = [
+    # One statement per semicolon, trailing one without semicolon kept
+    ("SELECT a FROM t; DELETE FROM u;\nCOMMIT", ["SELECT a FROM t;", "DELETE FROM u;", "COMMIT"]),
+
+    # Semicolons inside literals and quoted identifiers
+    ("INSERT INTO t VALUES ('a;b'); SELECT \"x;y\", `z;w` FROM t;",
+     ["INSERT INTO t VALUES ('a;b');", "SELECT \"x;y\", `z;w` FROM t;"]),
+
+    # Doubled quotes are escapes
+    ("INSERT INTO t VALUES ('it''s; fine'); COMMIT;", ["INSERT INTO t VALUES ('it''s; fine');", "COMMIT;"]),
+
+    # Comments: skipped in front of a statement, kept inside it
+    ("-- header; note\n/* block; */ SELECT a -- tail;\nFROM t; /* end */",
+     ["SELECT a -- tail;\nFROM t;"]),
+
+    # Semicolons inside parentheses do not end a statement
+    ("CREATE TABLE t (a INT; b INT); DROP TABLE t;", ["CREATE TABLE t (a INT; b INT);", "DROP TABLE t;"]),
+
+    # Blank statements are skipped
+    (";;  \n ; SELECT 1;;", ["SELECT 1;"]),
+
+    # Unterminated literal runs to the end of the script
+    ("SELECT 'open; SELECT 2;", ["SELECT 'open; SELECT 2;"]),
+]
+
+failed_tests = []
+total_tests = 0
+
+print("\n===== SCRIPT SPLITTER TEST RESULTS =====\n")
+
+for script, expected in split_cases:
+    for chunkSize in (1, 3, 1 << 16):
+        total_tests += 1
+        got = texts(io.BytesIO(script.encode()), chunkSize=chunkSize)
+
+        if got == expected:
+            print(f"[PASS] {script!r} (chunks of {chunkSize})")
+        else:
+            print(f"[FAIL] {script!r} (chunks of {chunkSize}) -> {got}")
+            failed_tests.append((script, got))
+
+
+#OTHER CASES
+
+script = "SELECT 1;\n\n  UPDATE t SET a = 'é';\n-- x\nCOMMIT;"
+other_cases = [
+    ("offsets and lines", list(ScriptSplitter(io.StringIO(script), chunkSize=4)), [
+        Statement("SELECT 1;", 0, 9, 1),
+        Statement("UPDATE t SET a = 'é';", 13, 35, 3),
+        Statement("COMMIT;", 41, 48, 5),
+    ]),
+    ("backslash escapes", texts(r"INSERT INTO t VALUES ('O\'Neil; x'); COMMIT;", backslashEscapes=True),
+     [r"INSERT INTO t VALUES ('O\'Neil; x');", "COMMIT;"]),
+    ("backslash escapes across chunks", texts(io.BytesIO(rb"SELECT 'a\';'; SELECT 2;"), backslashEscapes=True, chunkSize=1),
+     [r"SELECT 'a\';';", "SELECT 2;"]),
+    ("statement longer than many chunks", texts(io.BytesIO(b"SELECT " + b"a, " * 5000 + b"1; COMMIT;"), chunkSize=7),
+     ["SELECT " + "a, " * 5000 + "1;", "COMMIT;"]),
+    ("comment opener split across chunks", texts(io.BytesIO(b"SELECT 1 -- a;\n;SELECT 2 /* ; */;"), chunkSize=1),
+     ["SELECT 1 -- a;\n;", "SELECT 2 /* ; */;"]),
+    ("unknown backend", rejects("regex"), True),
+]
+
+if sqlite3 is not None:
+    other_cases += [
+        ("sqlite backend", texts(io.BytesIO(b"SELECT ';'; -- c;\nCOMMIT;"), backend="sqlite", chunkSize=2),
+         ["SELECT ';';", "COMMIT;"]),
+        ("sqlite trigger body", texts("CREATE TRIGGER r AFTER INSERT ON t BEGIN DELETE FROM u; END; COMMIT;", backend="sqlite"),
+         ["CREATE TRIGGER r AFTER INSERT ON t BEGIN DELETE FROM u; END;", "COMMIT;"]),
+        ("sqlite characters split across chunks", texts(io.BytesIO("SELECT 'é;€'; SELECT 2;".encode()), backend="sqlite", chunkSize=1),
+         ["SELECT 'é;€';", "SELECT 2;"]),
+    ]
+
+for name, got, expected in other_cases:
+    total_tests += 1
+
+    if got == expected:
+        print(f"[PASS] {name}")
+    else:
+        print(f"[FAIL] {name} -> {got} (expected {expected})")
+        failed_tests.append((name, got))
+
+
+#TEST SUMMARY
+
+print("\n===== TEST SUMMARY =====")
+print(f"Total Test Cases : {total_tests}")
+print(f"Passed           : {total_tests - len(failed_tests)}")
+print(f"Failed           : {len(failed_tests)}")
+
+if failed_tests:
+    print("\n--- Failed Test Descriptions ---")
+    for i, (q, got) in enumerate(failed_tests, start=1):
+        print(f"{i}. Case : {q!r}")
+        print(f"   Got  : {got}")
+else:
+    print("\nAll SCRIPT SPLITTER tests passed successfully.")
@@ -0,0 +1,75 @@
+import contextlib
+import io
+import pickle
+
+from QueryParser import QueryParser
+from ParallelValidator import validate_parallel, validate_chunk, make_pool, describe
+
+#MIXED STATEMENTS (every type, about a third invalid)
+
+statements = [
+    "SELECT a FROM t WHERE a = 1;",
+    "SELECT a FROM;",
+    "INSERT INTO users (id, name) VALUES (1, 'Alice');",
+    "UPDATE users SET;",
+    "DELETE FROM users WHERE id = 3;",
+    "ALTER TABLE users;",
+    "CREATE TABLE t (id INT PRIMARY KEY);",
+    "DROP TABLE users;",
+    "TRUNCATE TABLE users;",
+    "ROLLBACK TO sp1;",
+    "HELLO world;",
+] * 7
+
+
+def collect_cases():
+    # Worker processes may re-import this module; only the main run builds a pool
+    with contextlib.redirect_stdout(io.StringIO()):
+        errors = [QueryParser(query).analyse() for query in statements]
+    expected = [(err is None, None if err is None else describe(err)) for err in errors]
+
+    with make_pool(2) as pool:
+        first = list(validate_parallel(statements, workers=2, chunksize=4, pool=pool))
+        second = list(validate_parallel(iter(statements), workers=2, chunksize=5, pool=pool))
+
+    failures, messages = validate_chunk(statements[:11])
+    return [
+        ("in process", list(validate_parallel(statements, workers=1, chunksize=3)), expected),
+        ("pool of 3", list(validate_parallel(statements, workers=3, chunksize=2)), expected),
+        ("reused pool", (first, second), (expected, expected)),
+        ("only failures sent back", failures[::2], (1, 3, 5, 10)),
+        ("distinct messages", len(messages), 4),
+        ("smaller than dicts", len(pickle.dumps(validate_chunk(statements))) < len(pickle.dumps(errors)), True),
+    ]
+
+
+if __name__ == "__main__":
+    failed_tests = []
+    total_tests = 0
+
+    print("\n===== PARALLEL VALIDATOR TEST RESULTS =====\n")
+
+    for name, got, expected in collect_cases():
+        total_tests += 1
+
+        if got == expected:
+            print(f"[PASS] {name}")
+        else:
+            print(f"[FAIL] {name} -> {got} (expected {expected})")
+            failed_tests.append((name, got))
+
+
+    #TEST SUMMARY
+
+    print("\n===== TEST SUMMARY =====")
+    print(f"Total Test Cases : {total_tests}")
+    print(f"Passed           : {total_tests - len(failed_tests)}")
+    print(f"Failed           : {len(failed_tests)}")
+
+    if failed_tests:
+        print("\n--- Failed Test Descriptions ---")
+        for i, (q, got) in enumerate(failed_tests, start=1):
+            print(f"{i}. Case : {q!r}")
+            print(f"   Got  : {got}")
+    else:
+        print("\nAll PARALLEL VALIDATOR tests passed successfully.")
@@ -0,0 +1,131 @@
+import datetime
+import decimal
+
+from PreparedQuery import prepare, placeholders, literalKind, NUMBER, STRING, NULL, DECIMAL
+
+
+def error(result):
+    return result["error"] if result else None
+
+
+failed_tests = []
+total_tests = 0
+
+print("\n===== PREPARED QUERY TEST RESULTS =====\n")
+
+
+#PLACEHOLDERS
+
+cases = [
+    ("positional", placeholders("SELECT a FROM t WHERE a = ? AND b IN (?, ?);"),
+     ("?", [(26, 27, 1), (38, 39, 2), (41, 42, 3)])),
+    ("numbered may repeat", [key for _, _, key in placeholders("SELECT a FROM t WHERE a = $2 OR b = $1 OR c = $2;")[1]], [2, 1, 2]),
+    ("named", [key for _, _, key in placeholders("UPDATE t SET a = :a WHERE id = :id_1;")[1]], ["a", "id_1"]),
+    ("ignored in literals", placeholders("SELECT a FROM t WHERE b = '?' AND \"c:x\" = ':y';"), (None, [])),
+    ("ignored in comments", placeholders("SELECT a /* ? */ FROM t -- :b\nWHERE c = 'it''s?';"), (None, [])),
+    ("casts and $ in names ignored", placeholders("SELECT a::int, b$1 FROM t;"), (None, [])),
+]
+
+
+#PREPARE
+
+select = prepare("SELECT name FROM users WHERE id = ? AND status = ?;")
+limit = prepare("SELECT a FROM t WHERE a = $1 OR b = $1 LIMIT $2;")
+update = prepare("UPDATE t SET a = :a, b = :b WHERE id = :id;")
+insert = prepare("INSERT INTO t (a, b) VALUES (?, ?);")
+
+cases += [
+    ("valid template", (select.valid, select.style, select.parameters), (True, "?", (1, 2))),
+    ("numbered parameters", limit.parameters, (1, 2)),
+    ("named parameters in order", update.parameters, ("a", "b", "id")),
+    ("invalid template", error(prepare("SELECT FROM t WHERE a = ?;").error), "No select statment"),
+    ("mixed styles", error(prepare("DELETE FROM t WHERE a = :x AND b = ?;").error), "Invalid placeholders"),
+    ("unused number", error(prepare("SELECT a FROM t WHERE a = $2;").error), "Invalid placeholders"),
+    ("kinds follow the validator", ("negative integer" in limit.accepted[2],
+                                    "negative integer" in limit.accepted[1]), (False, True)),
+    ("LIMIT takes integers only", limit.accepted[2], frozenset({NUMBER})),
+    ("VALUES take every kind", len(insert.accepted[1]), 6),
+]
+
+
+#CHECK
+
+cases += [
+    ("valid call", select.check((42, "active")), None),
+    ("NULL and strings", select.check((None, "x")), None),
+    ("count", error(select.check((1,))), "Wrong number of parameters"),
+    ("decimal operand", select.check((1.5, "x")), None),
+    ("decimal LIMIT", limit.check((1, 2.5))["kind"], DECIMAL),
+    ("negative LIMIT", limit.check((1, -2))["parameter"], 2),
+    ("unsupported type", error(select.check((object(), "x"))), "Unsupported parameter type"),
+    ("sequence for ?", error(select.check({"a": 1})), "Positional placeholders need a sequence of parameters"),
+    ("mapping call", update.check({"a": 1, "b": "x", "id": 3, "extra": 0}), None),
+    ("missing name", update.check({"a": 1, "id": 3}), {"error": "Missing parameter", "parameter": "b"}),
+    ("mapping for :", error(update.check((1, 2, 3))), "Named placeholders need a mapping of parameters"),
+    ("no placeholders", (prepare("COMMIT;").check(()), prepare("COMMIT;").check({})), (None, None)),
+    ("invalid template on every call", error(prepare("SELECT FROM t WHERE a = ?;").check((1,))), "No select statment"),
+]
+
+
+#COMBINATIONS (each kind fits alone, two strings do not)
+
+class NoTwoStrings:
+    def __init__(self):
+        self.calls = 0
+
+    def validate(self, query):
+        self.calls += 1
+        return {"error": "Two strings"} if query.count("'") == 4 else None
+
+
+pair = NoTwoStrings()
+both = prepare("SELECT a FROM t WHERE a = ? AND b = ?;", pair)
+prepared_calls = pair.calls
+rejected = both.check(("x", "y"))
+both.check(("x", "y"))
+
+cases += [
+    ("each kind accepted alone", STRING in both.accepted[1] and STRING in both.accepted[2], True),
+    ("combination validated on check", rejected, {
+        "error": "Parameters not allowed together",
+        "kinds": [STRING, STRING],
+        "why": {"error": "Two strings"},
+    }),
+    ("combination remembered", pair.calls - prepared_calls, 1),
+    ("combinations from prepare reused", (both.check((1, "y")), pair.calls - prepared_calls), (None, 1)),
+]
+
+
+#LITERAL KINDS
+
+cases += [
+    ("literal kinds", [literalKind(v) for v in (7, True, "x", b"x", None, datetime.date(2024, 1, 1))],
+     [NUMBER, NUMBER, STRING, STRING, NULL, STRING]),
+    ("decimal kinds", [literalKind(v) for v in (2.5, -2.5, decimal.Decimal("1.10"), float("nan"), decimal.Decimal("inf"))],
+     [DECIMAL, "negative decimal", DECIMAL, None, None]),
+]
+
+for name, got, expected in cases:
+    total_tests += 1
+
+    if got == expected:
+        print(f"[PASS] {name}")
+    else:
+        print(f"[FAIL] {name} -> {got} (expected {expected})")
+        failed_tests.append((name, got))
+
+
+#TEST SUMMARY
+
+print("\n===== TEST SUMMARY =====")
+print(f"Total Test Cases : {total_tests}")
+print(f"Passed           : {total_tests - len(failed_tests)}")
+print(f"Failed           : {len(failed_tests)}")
+
+if failed_tests:
+    print("\n--- Failed Test Descriptions ---")
+    for i, (q, got) in enumerate(failed_tests, start=1):
+        print(f"{i}. Case : {q!r}")
+        print(f"   Got  : {got}")
+else:
+    print("\nAll PREPARED QUERY tests passed successfully.")
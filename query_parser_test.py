@@ -0,0 +1,278 @@
+import contextlib
+import io
+import os
+import tempfile
+import threading
+
+from QueryParser import QueryParser, BatchStats, VALIDATOR_VERSION
+from QueryCache import QueryCache
+
+#MIXED BATCH (one statement of every type, valid and invalid)
+
+batch_queries = [
+    "SELECT a FROM t WHERE a = 1;",
+    "SELECT a FROM;",
+    "INSERT INTO users (id, name) VALUES (1, 'Alice');",
+    "UPDATE users SET name = 'Bob' WHERE id = 2;",
+    "UPDATE users SET;",
+    "DELETE FROM users WHERE id = 3;",
+    "ALTER TABLE users ADD COLUMN email VARCHAR(255);",
+    "ALTER TABLE users;",
+    "CREATE TABLE t (id INT PRIMARY KEY);",
+    "DROP TABLE users;",
+    "TRUNCATE TABLE users;",
+    "COMMIT;",
+    "ROLLBACK TO sp1;",
+    "HELLO world;",
+    "",
+    "SELECT b FROM u;",
+]
+
+failed_tests = []
+total_tests = 0
+
+print("\n===== QUERY PARSER BATCH TEST RESULTS =====\n")
+
+with contextlib.redirect_stdout(io.StringIO()):
+    expected = [QueryParser(query).analyse() for query in batch_queries]
+
+consumed = []
+
+def reading(queries):
+    for query in queries:
+        consumed.append(query)
+        yield query
+
+stats = BatchStats()
+output = io.StringIO()
+with contextlib.redirect_stdout(output):
+    results = QueryParser.analyse_many(reading(batch_queries), stats)
+    first = next(results)
+    consumed_first = len(consumed)
+    results = [first] + list(results)
+
+cases = [
+    ("same verdicts as analyse()", [err for _, err in results], expected),
+    ("input order kept", [query for query, _ in results], batch_queries),
+    ("input read lazily", consumed_first, 1),
+    ("no stdout writes", output.getvalue(), ""),
+    ("statement count", stats.statements, len(batch_queries)),
+    ("invalid count", stats.invalid, sum(1 for err in expected if err)),
+]
+
+
+#SPELLING SUGGESTIONS (invalid queries only)
+
+speller = QueryParser("")
+cases += [
+    ("misspelled keyword suggested", speller.validate("SELECT a FRM t;").get("suggestion"), "Did you mean 'FROM' instead of 'FRM'?"),
+    ("misspelled statement type", speller.validate("DELTE FROM t;").get("suggestion"), "Did you mean 'DELETE' instead of 'DELTE'?"),
+    ("validator suggestion kept", speller.validate("ALTER TABEL t ADD c INT;").get("suggestion"), "Did you mean 'TABLE' instead of 'TABEL'?"),
+    ("expected tokens listed", speller.validate("ALTER TABLE t ADDD c INT;").get("expected"), ["ADD", "DROP", "MODIFY"]),
+    ("suggested among expected only", speller.validate("DELETE FROM t WHRE id = 1;").get("suggestion"),
+     "Did you mean 'WHERE' instead of 'WHRE'?"),
+    ("no close expected token", speller.validate("ALTER TABLE t RENAME c;").get("suggestion"), "Expected one of: ADD, DROP, MODIFY."),
+    ("data types expected", speller.validate("ALTER TABLE t ADD c VARCHR(20);").get("suggestion"),
+     "Did you mean 'VARCHAR' instead of 'VARCHR'?"),
+    ("unused options expected", speller.validate("TRUNCATE TABLE t CASCADE RESTRT IDENTITY;").get("expected"),
+     ["RESTART", "CONTINUE"]),
+    ("valid query not spell-checked", speller.validate("SELECT data FROM t;"), None),
+    ("statement end expected", speller.validate("CREATE TABLE t (a INT) ENGINE=InnoDB;").get("expected"), ["';'"]),
+    ("savepoint name expected", speller.validate("SAVEPOINT;").get("expected"), ["a name"]),
+]
+
+
+#UNTERMINATED LITERALS AND COMMENTS (rejected for every statement type)
+
+unterminated = {"error": "Unterminated string literal or comment", "suggestion": "Close every quote and /* comment."}
+cases += [
+    (f"unterminated: {query!r}", speller.validate(query), unterminated)
+    for query in (
+        "SELECT a FROM t WHERE a = 'x",
+        "DELETE FROM t WHERE a = 1 /* open",
+        "UPDATE t SET a = 'it''s",
+        "INSERT INTO t (a) VALUES (\"x);",
+        "/* only a comment",
+    )
+]
+
+# MySQL backslash escapes, when asked for
+escaped = r"SELECT a FROM t WHERE name = 'O\'Neil; x';"
+escapes = QueryParser("", QueryCache(), QueryCache(), backslashEscapes=True)
+plain = QueryParser("", escapes.cache, escapes.templates)
+with contextlib.redirect_stdout(io.StringIO()):
+    escaped_script = [err for _, err in QueryParser.analyse_script(io.StringIO(escaped + "\n" + escaped), backslashEscapes=True)]
+    plain.validate("SELECT a FROM t WHERE name = 'x'")
+cases += [
+    ("backslash escape kept by default", plain.validate(escaped), unterminated),
+    ("backslash escape", escapes.validate(escaped), None),
+    ("backslash escapes in scripts", escaped_script, [None, None]),
+    ("template of an escaped open literal", escapes.validate(r"SELECT a FROM t WHERE name = 'x\'") == unterminated, True),
+]
+
+
+#TRUNCATED VALUES LISTS (the row the query stops in is not counted)
+
+cases += [
+    ("truncated after comma", speller.validate("INSERT INTO users (id, name) VALUES (1,").get("error"),
+     "Missing value after ',' in VALUES list."),
+    ("truncated before ')'", speller.validate("INSERT INTO users (id, name) VALUES (1, 'a'), (2").get("error"),
+     "VALUES list must be enclosed in parentheses"),
+    ("stray comment close", speller.validate("INSERT INTO users VALUES (1, */").get("error"),
+     "Invalid value '*/' in VALUES list."),
+]
+
+
+#UPDATE TABLE AND CLAUSE ORDER
+
+cases += [
+    ("several tables updated", speller.validate("UPDATE student, employee SET bonus = 5000;").get("error"),
+     "UPDATE supports only one table"),
+    ("qualified table updated", speller.validate("UPDATE s.t SET a = 1;").get("error"), "UPDATE supports only one table"),
+    ("WHERE before SET", speller.validate("UPDATE t WHERE id = 1 SET a = 1;").get("error"), "WHERE clause appears before SET."),
+    ("SET twice", speller.validate("UPDATE t SET a = 1 SET b = 2;").get("error"), "SET clause appears more than once."),
+]
+
+
+#TOKENS AFTER A NAME (worded by what they are, not as names)
+
+cases += [
+    ("parentheses after DROP name", speller.validate("DROP TABLE users();").get("error"),
+     "Parentheses are not allowed after the table name"),
+    ("IF EXISTS after DROP name", speller.validate("DROP VIEW users IF EXISTS;").get("error"),
+     "IF EXISTS must come before the view name"),
+    ("parentheses after TRUNCATE name", speller.validate("TRUNCATE TABLE users();").get("error"),
+     "Parentheses are not allowed after the table name"),
+    ("several tables truncated", speller.validate("TRUNCATE TABLE a, b;").get("error"),
+     "Only one table can be truncated at a time"),
+    ("parentheses after ALTER name", speller.validate("ALTER TABLE t() ADD a INT;").get("error"),
+     "Parentheses are not allowed after the table name."),
+    ("extra word after dropped column", speller.validate("ALTER TABLE t DROP COLUMN a b;").get("suggestion"),
+     "Did you mean: DROP COLUMN a?"),
+]
+
+
+#SCRIPT (several statements in one file)
+
+script = io.StringIO("-- migration\nCREATE TABLE t (id INT);\nINSERT INTO t (id) VALUES (1);\nSELECT id FROM;\n")
+with contextlib.redirect_stdout(io.StringIO()):
+    script_results = list(QueryParser.analyse_script(script))
+
+cases += [
+    ("script statements", [(s.line, s.text) for s, _ in script_results], [
+        (2, "CREATE TABLE t (id INT);"),
+        (3, "INSERT INTO t (id) VALUES (1);"),
+        (4, "SELECT id FROM;"),
+    ]),
+    ("script verdicts", [err is None for _, err in script_results], [True, True, False]),
+]
+
+# The same script through a memory map, with and without templates
+dump = "INSERT INTO t (id, name) VALUES (1, 'a;b');\nINSERT INTO t (id, name) VALUES (2, 'it''s');\nSELECT id FROM;\n"
+with tempfile.TemporaryDirectory() as root:
+    path = os.path.join(root, "dump.sql")
+    with open(path, "w") as out:
+        out.write(dump)
+    with contextlib.redirect_stdout(io.StringIO()):
+        expected = [(s.start, s.end, s.line, err) for s, err in QueryParser.analyse_script(io.StringIO(dump))]
+    mapped = [(s.start, s.end, s.line, err) for s, err in QueryParser.analyse_mapped(path)]
+    shapes = QueryCache()
+    templated = [(s.start, s.end, s.line, err) for s, err in QueryParser.analyse_mapped(path, templates=shapes)]
+
+cases += [
+    ("mapped script matches script", mapped, expected),
+    ("mapped script with templates", (templated, shapes.info()["hits"]), (expected, 1)),
+]
+
+
+#RESULT CACHE
+
+cache = QueryCache(maxsize=2)
+echoed = io.StringIO()
+with contextlib.redirect_stdout(echoed):
+    first = QueryParser("SELECT a FROM;", cache).analyse()
+    again = QueryParser("  select A\n  FROM;", cache).analyse()
+    QueryParser("COMMIT;", cache).analyse()
+    QueryParser("DROP TABLE t;", cache).analyse()
+counters = cache.info()
+
+cases += [
+    ("normalized key", QueryCache.normalize(" SELECT  A,\t'Mixed  Case'\n FROM t "), "select a, 'Mixed  Case' from t"),
+    ("hit returns stored error", again is first, True),
+    ("hit echoes query type", echoed.getvalue().split(), ["select", "select", "commit", "drop"]),
+    ("counters", (counters["hits"], counters["misses"], counters["evictions"], counters["size"]), (1, 3, 1, 2)),
+    ("version", counters["version"], VALIDATOR_VERSION),
+]
+
+cache.get("commit;", "other version")
+cases.append(("version change empties cache", (len(cache), cache.info()["invalidations"]), (0, 1)))
+
+shared = QueryCache(maxsize=50)
+queries = [f"SELECT c{i % 80} FROM t;" for i in range(400)]
+
+def hammer():
+    for _, err in QueryParser.analyse_many(queries, cache=shared):
+        assert err is None
+
+threads = [threading.Thread(target=hammer) for _ in range(4)]
+for thread in threads:
+    thread.start()
+for thread in threads:
+    thread.join()
+counters = shared.info()
+cases.append(("thread-safe counters", (counters["hits"] + counters["misses"], counters["size"]), (1600, 50)))
+
+
+#TEMPLATE CACHE
+
+templates = QueryCache(maxsize=10)
+echoed = io.StringIO()
+with contextlib.redirect_stdout(echoed):
+    QueryParser("SELECT a FROM t WHERE id = 1;", templates=templates).analyse()
+    served = QueryParser("select a from t where id = 2;", templates=templates).analyse()
+    decimal = QueryParser("SELECT a FROM t WHERE id = 2.5;", templates=templates).analyse()
+    QueryParser("SELECT a FROM t WHERE id = ;", templates=templates).analyse()
+    invalid = QueryParser("SELECT a FROM t WHERE id = ;", templates=templates).analyse()
+counters = templates.info()
+
+cases += [
+    ("template hit is valid", served, None),
+    ("template hit echoes query type", echoed.getvalue().split()[:2], ["select", "select"]),
+    ("other literal kind validated", decimal == QueryParser("SELECT a FROM t WHERE id = 2.5;").analyse(echo=False), True),
+    ("invalid shapes not stored", (invalid is not None, counters["size"], counters["hits"]), (True, 2, 1)),
+]
+
+with contextlib.redirect_stdout(io.StringIO()):
+    grouped = [
+        QueryParser("SELECT a + 1 FROM t GROUP BY a + 1;").analyse(),
+        QueryParser("SELECT a + 1 FROM t GROUP BY a + 2;").analyse(),
+    ]
+templates = QueryCache()
+batch = ["SELECT a + 1 FROM t GROUP BY a + 1;", "SELECT a + 1 FROM t GROUP BY a + 2;"]
+cases.append(("repeated literals kept apart",
+              [err for _, err in QueryParser.analyse_many(batch, templates=templates)], grouped))
+
+for name, got, want in cases:
+    total_tests += 1
+
+    if got == want:
+        print(f"[PASS] {name}")
+    else:
+        print(f"[FAIL] {name} -> {got} (expected {want})")
+        failed_tests.append((name, got))
+
+
+#TEST SUMMARY
+
+print("\n===== TEST SUMMARY =====")
+print(f"Total Test Cases : {total_tests}")
+print(f"Passed           : {total_tests - len(failed_tests)}")
+print(f"Failed           : {len(failed_tests)}")
+
+if failed_tests:
+    print("\n--- Failed Test Descriptions ---")
+    for i, (q, got) in enumerate(failed_tests, start=1):
+        print(f"{i}. Case : {q!r}")
+        print(f"   Got  : {got}")
+else:
+    print("\nAll QUERY PARSER BATCH tests passed successfully.")
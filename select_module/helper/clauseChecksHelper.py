@@ -1,3 +1,6 @@
+from lexer.Lexer import TokenSpan
+
+
 # Defines the correct order of SQL clauses.
 # Lower number = earlier in the query.
 clauseOrder = {
@@ -10,58 +13,82 @@ clauseOrder = {
     "limit": 7
 }
 
-def extractClauses(tokens):
+# Top-level keywords that end the clause before them.
+# A GROUP / ORDER without BY still ends the previous clause.
+CLAUSE_BOUNDARIES = {"select", "from", "where", "group", "having", "order", "limit"}
+
+
+def indexClauses(tokens):
     """
-    Scans a list of SQL tokens and extracts top-level clauses
-    along with their positions.
+    Scans a list of SQL tokens once and indexes its top-level clauses.
+    Tokens inside parentheses (subqueries, expressions) are skipped
+    group by group using the bracket index.
+
+    Returns (clauses, spans):
+    - clauses : [(name, position)] in query order
+    - spans   : name -> (bodyStart, bodyEnd) for the first occurrence
+                of each clause; the body runs up to the next top-level
+                clause keyword. A GROUP / ORDER not followed by BY is
+                indexed under its bare keyword.
     """
+    tokens = TokenSpan.of(tokens)
+    n = len(tokens)
     clauses = []
-    i = 0
-    depth = 0  # Tracks parentheses nesting level
+    bounds = []  # (name, keyword position, body start)
 
-    while i < len(tokens):
-        tok = tokens[i]
-
-        # Entering parentheses increases depth
-        if tok == "(":
-            depth += 1
-            i += 1
-            continue
-
-        # Exiting parentheses decreases depth
-        elif tok == ")":
-            depth -= 1
-            i += 1
+    for i, tok in tokens.topLevel():
+        if tok not in CLAUSE_BOUNDARIES:
             continue
 
-        # Ignore tokens inside parentheses (subqueries, expressions)
-        if depth != 0:
-            i += 1
+        # Detect multi-word GROUP BY / ORDER BY clauses.
+        # The trailing BY is not a boundary, so it is ignored
+        # on the next step.
+        if tok in ("group", "order"):
+            if i + 1 < n and tokens[i + 1] == "by":
+                clauses.append((tok + " by", i))
+                bounds.append((tok + " by", i, i + 2))
+            else:
+                bounds.append((tok, i, i + 1))
             continue
 
-        # Detect multi-word GROUP BY clause
-        if tok == "group" and i + 1 < len(tokens) and tokens[i + 1] == "by":
-            clauses.append(("group by", i))
-            i += 2
-            continue
+        # Single-word clauses (SELECT, FROM, WHERE, etc.)
+        clauses.append((tok, i))
+        bounds.append((tok, i, i + 1))
 
-        # Detect multi-word ORDER BY clause
-        if tok == "order" and i + 1 < len(tokens) and tokens[i + 1] == "by":
-            clauses.append(("order by", i))
-            i += 2
-            continue
+    spans = {}
+    for k, (name, _, bodyStart) in enumerate(bounds):
+        bodyEnd = bounds[k + 1][1] if k + 1 < len(bounds) else n
+        spans.setdefault(name, (bodyStart, bodyEnd))
 
-        # Detect single-word clauses (SELECT, FROM, WHERE, etc.)
-        if tok in clauseOrder:
-            clauses.append((tok, i))
-            i += 1
-            continue
+    return clauses, spans
 
-        i += 1
 
+def extractClauses(tokens):
+    """
+    Scans a list of SQL tokens and extracts top-level clauses
+    along with their positions.
+    """
+    clauses, _ = indexClauses(tokens)
     return clauses
 
 
+def clauseBody(tokens, spans, name):
+    """
+    Returns the tokens of a clause body from a span index.
+    Returns None if the clause is absent, or an error dict if
+    GROUP / ORDER is present without BY.
+    """
+    if name in spans:
+        start, end = spans[name]
+        return TokenSpan.of(tokens).sub(start, end)
+
+    keyword = name.split()[0]
+    if keyword != name and keyword in spans:
+        return {"error": f"{keyword.upper()} must be followed by BY"}
+
+    return None
+
+
 def checkOrder(clauses):
     """
     Ensures clauses appear in valid SQL order.
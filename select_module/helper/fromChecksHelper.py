@@ -1,4 +1,6 @@
+from lexer.Lexer import TokenSpan
 from select_module.helper.whereChecksHelper import validateBooleanExpr
+from select_module.subqueryQueue import wrapping
 
 
 # JOIN-related keywords
@@ -22,17 +24,12 @@ def extractFromList(tokens):
     if "from" not in tokens:
         return None
 
-    depth = 0
+    tokens = TokenSpan.of(tokens)
     start = None
 
-    for i, tok in enumerate(tokens):
-        if tok == "(":
-            depth += 1
-        elif tok == ")":
-            depth -= 1
-
-        # 🔥 detect OUTER FROM only
-        if depth == 0 and tok == "from":
+    # 🔥 detect OUTER FROM only
+    for i, tok in tokens.topLevel():
+        if tok == "from":
             start = i + 1
             break
 
@@ -40,22 +37,14 @@ def extractFromList(tokens):
         return None
 
     end = len(tokens)
-    depth = 0
-
-    for i in range(start, len(tokens)):
-        tok = tokens[i]
 
-        if tok == "(":
-            depth += 1
-        elif tok == ")":
-            depth -= 1
-
-        # 🔥 stop only at OUTER clause boundaries
-        if depth == 0 and tok in {"where", "group", "having", "order", "limit"}:
+    # 🔥 stop only at OUTER clause boundaries
+    for i, tok in tokens.topLevel(start):
+        if tok in {"where", "group", "having", "order", "limit"}:
             end = i
             break
 
-    return tokens[start:end]
+    return tokens.sub(start, end)
 
 
 
@@ -64,20 +53,16 @@ def splitRef(tokens):
     Splits comma-separated table references at top level only.
     Parenthesized expressions are ignored.
     """
+    tokens = TokenSpan.of(tokens)
     refs = []
-    depth = 0
     start = 0
 
-    for i, tok in enumerate(tokens):
-        if tok == '(':
-            depth += 1
-        elif tok == ')':
-            depth -= 1
-        elif tok == ',' and depth == 0:
-            refs.append(tokens[start:i])
+    for i, tok in tokens.topLevel():
+        if tok == ',':
+            refs.append(tokens.sub(start, i))
             start = i + 1
 
-    refs.append(tokens[start:])
+    refs.append(tokens.sub(start))
     return refs
 
 
@@ -131,7 +116,7 @@ def validateTableRef(tokens):
     if i != len(tokens):
         return {
             "error": "Unexpected tokens in table reference",
-            "tokens": tokens[i:]
+            "tokens": list(tokens[i:])
         }
 
     # ---- alias cannot shadow table name ----
@@ -151,15 +136,11 @@ def has_top_level_commas(tokens):
     """
     Detects comma joins at top level (not inside parentheses).
     """
-    depth = 0
-    for tok in tokens:
-        if tok == '(':
-            depth += 1
-        elif tok == ')':
-            depth -= 1
-        elif tok == ',' and depth == 0:
+    tokens = TokenSpan.of(tokens)
+    for i, tok in tokens.topLevel():
+        if tok == ',':
             return True
-    
+
     return False
 
 
@@ -195,6 +176,7 @@ def validateJoinChain(tokens, self):
     - Validates ON condition syntax
     - Ensures ON clause uses only known table aliases
     """
+    tokens = TokenSpan.of(tokens)
     i = 0
     n = len(tokens)
 
@@ -271,30 +253,30 @@ def validateJoinChain(tokens, self):
         i += 1
 
         on_start = i
-        depth = 0
-
-        # Consume ON expression until next JOIN
-        while i < n:
-            if tokens[i] == "(":
-                depth += 1
-            elif tokens[i] == ")":
-                depth -= 1
-            elif depth == 0 and tokens[i] in JOIN_TOKENS:
+        i = n
+
+        # Consume ON expression until next top-level JOIN
+        for j, tok in tokens.topLevel(on_start):
+            if tok in JOIN_TOKENS:
+                i = j
                 break
-            i += 1
 
-        on_tokens = tokens[on_start:i]
+        on_tokens = tokens.sub(on_start, i)
         if not on_tokens:
             return {"error": "Empty JOIN condition"}
 
         # ---- validate ON expression syntax ----
-        err = validateBooleanExpr(on_tokens)
-        if err:
+        def wrapCondition(err):
             return {
                 "error": "Invalid JOIN condition",
                 "details": err
             }
 
+        with wrapping(wrapCondition):
+            err = validateBooleanExpr(on_tokens, "on")
+        if err:
+            return wrapCondition(err)
+
         # ---- validate table aliases used in ON ----
         used_aliases = collect_on_aliases(on_tokens)
         allowed_aliases = set(self.from_tables.keys()) | {alias}
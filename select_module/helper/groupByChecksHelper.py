@@ -1,4 +1,7 @@
+from lexer.Lexer import TokenSpan
 from select_module.helper.selectChecksHelper import containsAggregate
+from select_module.helper.whereChecksHelper import stripOuterParens
+from select_module.helper.clauseChecksHelper import indexClauses, clauseBody
 
 
 def normalize(expr):
@@ -9,33 +12,9 @@ def normalize(expr):
 
     Used to compare SELECT and GROUP BY expressions reliably.
     """
-    expr = expr[:]
-
-    # Strip redundant outer parentheses
-    while expr and expr[0] == "(" and expr[-1] == ")":
-        depth = 0
-        valid = True
-
-        for i, tok in enumerate(expr):
-            if tok == "(":
-                depth += 1
-            elif tok == ")":
-                depth -= 1
-
-            # If outer parentheses close before the end,
-            # they are not redundant
-            if depth == 0 and i < len(expr) - 1:
-                valid = False
-                break
-
-        if not valid:
-            break
-
-        # Remove one layer of parentheses
-        expr = expr[1:-1]
-
-    # Convert normalized token list to string
-    return " ".join(expr)
+    # Strip redundant outer parentheses, then convert the
+    # normalized token list to string
+    return " ".join(stripOuterParens(expr))
 
 
 def splitSelectExpressions(selectList):
@@ -43,26 +22,22 @@ def splitSelectExpressions(selectList):
     Splits SELECT list into individual expressions.
     Commas inside parentheses are ignored.
     """
+    selectList = TokenSpan.of(selectList)
     exprs = []
-    depth = 0
     start = 0
 
-    for i, tok in enumerate(selectList):
-        if tok == "(":
-            depth += 1
-        elif tok == ")":
-            depth -= 1
-        elif tok == "," and depth == 0:
+    for i, tok in selectList.topLevel():
+        if tok == ",":
             if start == i:
                 return None, {"error": "Empty SELECT expression"}
-            exprs.append(selectList[start:i])
+            exprs.append(selectList.sub(start, i))
             start = i + 1
 
     # Trailing comma check
     if start >= len(selectList):
         return None, {"error": "Empty SELECT expression"}
 
-    exprs.append(selectList[start:])
+    exprs.append(selectList.sub(start))
     return exprs, None
 
 
@@ -71,41 +46,24 @@ def stripAlias(expr):
     Removes explicit alias from a SELECT expression.
     Only strips top-level AS aliases.
     """
-    depth = 0
-    for i, tok in enumerate(expr):
-        if tok == "(":
-            depth += 1
-        elif tok == ")":
-            depth -= 1
-
-        # Alias must be top-level
-        if depth == 0 and tok == "as":
-            return expr[:i]
+    expr = TokenSpan.of(expr)
+    for i, tok in expr.topLevel():
+        if tok == "as":
+            return expr.sub(0, i)
 
     return expr
 
 
 def extractGroupByList(tokens):
     """
-    Extracts GROUP BY clause tokens.
+    Extracts top-level GROUP BY clause tokens.
     Stops when HAVING, ORDER, or LIMIT begins.
     """
     if "group" not in tokens:
         return None
 
-    i = tokens.index("group")
-    if i + 1 >= len(tokens) or tokens[i + 1] != "by":
-        return {"error": "GROUP must be followed by BY"}
-
-    start = i + 2
-    end = len(tokens)
-
-    for clause in ("having", "order", "limit"):
-        if clause in tokens[start:]:
-            end = tokens.index(clause)
-            break
-
-    return tokens[start:end]
+    _, spans = indexClauses(tokens)
+    return clauseBody(tokens, spans, "group by")
 
 
 def splitGroupByExpressions(tokens):
@@ -113,26 +71,22 @@ def splitGroupByExpressions(tokens):
     Splits GROUP BY clause into individual expressions.
     Commas inside parentheses are ignored.
     """
+    tokens = TokenSpan.of(tokens)
     exprs = []
-    depth = 0
     start = 0
 
-    for i, tok in enumerate(tokens):
-        if tok == "(":
-            depth += 1
-        elif tok == ")":
-            depth -= 1
-        elif tok == "," and depth == 0:
+    for i, tok in tokens.topLevel():
+        if tok == ",":
             if start == i:
                 return None, {"error": "Empty GROUP BY expression"}
-            exprs.append(tokens[start:i])
+            exprs.append(tokens.sub(start, i))
             start = i + 1
 
     # Trailing comma check
     if start >= len(tokens):
         return None, {"error": "Empty GROUP BY expression"}
 
-    exprs.append(tokens[start:])
+    exprs.append(tokens.sub(start))
     return exprs, None
 
 def isScalarSubquery(expr):
@@ -1,6 +1,7 @@
+from lexer.Lexer import TokenSpan, KIND_NUMBER, KIND_STRING
 from select_module.helper.whereChecksHelper import validateBooleanExpr
 from select_module.helper.groupByChecksHelper import normalize, containsAggregate
-from select_module.helper.utils import isColumnToken
+from select_module.helper.utils import COLUMN_KINDS
 
 
 def extractHaving(tokens):
@@ -8,17 +9,12 @@ def extractHaving(tokens):
     Extracts HAVING clause tokens.
     Stops at OUTER ORDER BY or LIMIT.
     """
-    depth = 0
+    tokens = TokenSpan.of(tokens)
     start = None
 
-    for i, tok in enumerate(tokens):
-        if tok == "(":
-            depth += 1
-        elif tok == ")":
-            depth -= 1
-
-        # 🔥 outer HAVING only
-        if depth == 0 and tok == "having":
+    # 🔥 outer HAVING only
+    for i, tok in tokens.topLevel():
+        if tok == "having":
             start = i + 1
             break
 
@@ -26,22 +22,14 @@ def extractHaving(tokens):
         return None
 
     end = len(tokens)
-    depth = 0
-
-    for i in range(start, len(tokens)):
-        tok = tokens[i]
-
-        if tok == "(":
-            depth += 1
-        elif tok == ")":
-            depth -= 1
 
-        # 🔥 stop only at OUTER clauses
-        if depth == 0 and tok in {"order", "limit"}:
+    # 🔥 stop only at OUTER clauses
+    for i, tok in tokens.topLevel(start):
+        if tok in {"order", "limit"}:
             end = i
             break
 
-    return tokens[start:end]
+    return tokens.sub(start, end)
 
 
 def splitHavingExprs(tokens):
@@ -49,20 +37,16 @@ def splitHavingExprs(tokens):
     Splits HAVING expressions on top-level AND / OR.
     Parenthesized expressions are preserved.
     """
+    tokens = TokenSpan.of(tokens)
     exprs = []
-    depth = 0
     start = 0
 
-    for i, tok in enumerate(tokens):
-        if tok == "(":
-            depth += 1
-        elif tok == ")":
-            depth -= 1
-        elif depth == 0 and tok in {"and", "or"}:
-            exprs.append(tokens[start:i])
+    for i, tok in tokens.topLevel():
+        if tok in {"and", "or"}:
+            exprs.append(tokens.sub(start, i))
             start = i + 1
 
-    exprs.append(tokens[start:])
+    exprs.append(tokens.sub(start))
     return exprs
 
 
@@ -76,15 +60,10 @@ def splitComparison(expr):
     Only splits on top-level comparison operators.
     """
     expr = stripParens(expr)
-    depth = 0
 
-    for i, tok in enumerate(expr):
-        if tok == "(":
-            depth += 1
-        elif tok == ")":
-            depth -= 1
-        elif depth == 0 and tok in COMPARISON_OPS:
-            return expr[:i], tok, expr[i + 1:]
+    for i, tok in expr.topLevel():
+        if tok in COMPARISON_OPS:
+            return expr.sub(0, i), tok, expr.sub(i + 1)
 
     return None, None, None
 
@@ -92,30 +71,18 @@ def splitComparison(expr):
 def stripParens(expr):
     """
     Removes redundant outer parentheses from an expression.
+    The outer pair is redundant only if the first '(' is matched
+    by the last ')' in the bracket index.
     """
-    expr = expr[:]
-
-    while len(expr) >= 3 and expr[0] == "(" and expr[-1] == ")":
-        depth = 0
-        valid = True
-
-        for i, tok in enumerate(expr):
-            if tok == "(":
-                depth += 1
-            elif tok == ")":
-                depth -= 1
-
-            # If outer parens close early, they are not redundant
-            if depth == 0 and i < len(expr) - 1:
-                valid = False
-                break
-
-        if not valid:
-            break
+    expr = TokenSpan.of(expr)
+    start = 0
+    end = len(expr)
 
-        expr = expr[1:-1]
+    while end - start >= 3 and expr[start] == "(" and expr.closing(start) == end - 1:
+        start += 1
+        end -= 1
 
-    return expr
+    return expr.sub(start, end)
 
 
 def isValidHavingLHS(expr, group_set, alias_set):
@@ -134,7 +101,7 @@ def isValidHavingLHS(expr, group_set, alias_set):
         return True
 
     # Single column or alias
-    if len(expr) == 1 and isColumnToken(expr[0]):
+    if len(expr) == 1 and expr.kinds[0] in COLUMN_KINDS:
         col = expr[0]
         return col in alias_set or normalize([col]) in group_set
 
@@ -156,14 +123,16 @@ def isValidHavingRHS(expr, group_set, alias_set):
     if containsAggregate(expr):
         return True
 
+    kinds = expr.kinds
+
     # Single column or alias → must be grouped or aliased
-    if len(expr) == 1 and isColumnToken(expr[0]):
+    if len(expr) == 1 and kinds[0] in COLUMN_KINDS:
         key = normalize(expr)
         return key in group_set or expr[0] in alias_set
 
-    # Numeric literal (optionally parenthesized)
-    for tok in expr:
-        if not (tok.isnumeric() or tok in {"(", ")"}):
+    # Numeric or string literal (optionally parenthesized)
+    for tok, kind in zip(expr, kinds):
+        if not (kind == KIND_NUMBER or kind == KIND_STRING or tok in {"(", ")"}):
             return False
 
     return True
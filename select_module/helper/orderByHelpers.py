@@ -1,30 +1,26 @@
+from lexer.Lexer import TokenSpan, keywordKind
 from select_module.helper.havingChecksHelper import stripParens, normalize
 from select_module.helper.whereChecksHelper import validateExpression
 from select_module.helper.groupByChecksHelper import containsAggregate
+from select_module.helper.clauseChecksHelper import indexClauses, clauseBody
+from select_module.subqueryQueue import wrapping
+
+
+# Kinds of the ASC / DESC keywords
+DIRECTION_KINDS = {keywordKind("asc"), keywordKind("desc")}
 
 
 def extractOrderBy(tokens):
     """
-    Extracts ORDER BY clause tokens.
+    Extracts top-level ORDER BY clause tokens.
     Ensures ORDER is immediately followed by BY.
     Stops parsing at LIMIT.
     """
     if "order" not in tokens:
         return None
 
-    i = tokens.index("order")
-    if i + 1 >= len(tokens) or tokens[i + 1] != "by":
-        return {"error": "ORDER must be followed by BY"}
-
-    start = i + 2
-    end = len(tokens)
-
-    # ORDER BY ends when LIMIT begins
-    for clause in ("limit",):
-        if clause in tokens[start:]:
-            end = tokens.index(clause)
-
-    return tokens[start:end]
+    _, spans = indexClauses(tokens)
+    return clauseBody(tokens, spans, "order by")
 
 
 def splitOrderByItems(tokens):
@@ -32,20 +28,16 @@ def splitOrderByItems(tokens):
     Splits ORDER BY clause into individual items.
     Commas inside parentheses are ignored.
     """
+    tokens = TokenSpan.of(tokens)
     items = []
-    depth = 0
     start = 0
 
-    for i, tok in enumerate(tokens):
-        if tok == "(":
-            depth += 1
-        elif tok == ")":
-            depth -= 1
-        elif depth == 0 and tok == ",":
-            items.append(tokens[start:i])
+    for i, tok in tokens.topLevel():
+        if tok == ",":
+            items.append(tokens.sub(start, i))
             start = i + 1
 
-    items.append(tokens[start:])
+    items.append(tokens.sub(start))
     return items
 
 
@@ -60,7 +52,8 @@ def splitOrderItem(item):
     if not item:
         return None, None
 
-    if item[-1] in {"asc", "desc"}:
+    item = TokenSpan.of(item)
+    if item.kinds[-1] in DIRECTION_KINDS:
         return item[:-1], item[-1]
 
     return item, "asc"
@@ -80,11 +73,12 @@ def isValidOrderByExpr(tokens, select_set, alias_set, group_set):
     if not tokens:
         return False, "Empty ORDER BY expression"
 
+    tokens = TokenSpan.of(tokens)
     expr = tokens
 
     # Direction keyword must appear last
-    if tokens[-1] in {"asc", "desc"}:
-        expr = tokens[:-1]
+    if tokens.kinds[-1] in DIRECTION_KINDS:
+        expr = tokens.sub(0, len(tokens) - 1)
 
     if not expr:
         return False, "ORDER BY expression missing before direction"
@@ -106,7 +100,8 @@ def isValidOrderByExpr(tokens, select_set, alias_set, group_set):
         return True, None
 
     # 4️⃣ Allow any syntactically valid expression (SQL-like behavior)
-    err = validateExpression(expr, "order")
+    with wrapping(lambda err: {"error": "Invalid ORDER BY expression"}):
+        err = validateExpression(expr, "order")
     if err:
         return False, "Invalid ORDER BY expression"
 
@@ -1,12 +1,16 @@
+from lexer.Lexer import TokenSpan, KIND_STRING, KIND_AGGREGATE
 from select_module.helper.utils import (
     isQualifiedColumnAt,
     consumeAggregate,
+    kindsOf,
     SQL_KEYWORDS,
-    AGG_FUNCS,
+    COLUMN_KINDS,
+    OPERAND_KINDS,
     isColumnToken,
 )
 from select_module.helper.whereChecksHelper import validateExpression
 from select_module.helper.whereChecksHelper import ARITHMETIC_OPS
+from select_module.subqueryQueue import submit, wrapping
 
 
 # ---------------------------------------------------------
@@ -20,26 +24,17 @@ def extractSelectList(tokens):
     if "select" not in tokens:
         return None
 
-    i = tokens.index("select") + 1
-    depth = 0
-    select_list = []
-
-    while i < len(tokens):
-        tok = tokens[i]
-
-        if tok == "(":
-            depth += 1
-        elif tok == ")":
-            depth -= 1
+    tokens = TokenSpan.of(tokens)
+    start = tokens.index("select") + 1
+    end = len(tokens)
 
-        # 🔥 stop only at OUTER FROM
-        if depth == 0 and tok == "from":
+    # 🔥 stop only at OUTER FROM
+    for i, tok in tokens.topLevel(start):
+        if tok == "from":
+            end = i
             break
 
-        select_list.append(tok)
-        i += 1
-
-    return select_list
+    return tokens.sub(start, end)
 
 
 # ---------------------------------------------------------
@@ -69,58 +64,36 @@ def checkStarUsage(selectList):
     - '*' must be the only top-level SELECT item
     - '*' inside expressions or arithmetic is allowed
     """
-    depth = 0
+    selectList = TokenSpan.of(selectList)
+    kinds = selectList.kinds
+    n = len(selectList)
     top_level_star = False
     top_level_items = 0
+    in_expression = False
 
-    i = 0
-    while i < len(selectList):
-        tok = selectList[i]
+    # Only consider top-level tokens
+    for i, tok in selectList.topLevel():
 
-        # Track parentheses depth
-        if tok == "(":
-            depth += 1
-            i += 1
-            continue
-        elif tok == ")":
-            depth -= 1
-            i += 1
+        # Skip rest of the expression until comma
+        if in_expression:
+            if tok == ",":
+                in_expression = False
             continue
 
-        # Only consider top-level tokens
-        if depth == 0:
-
-            # ---- standalone SELECT * ----
-            if (
-                tok == "*" and
-                (i == 0 or selectList[i - 1] == ",") and
-                (i + 1 == len(selectList) or selectList[i + 1] == ",")
-            ):
-                top_level_star = True
-                top_level_items += 1
-                i += 1
-                continue
-
-            # ---- start of a top-level expression ----
-            if isColumnToken(tok) or tok in AGG_FUNCS or tok.isnumeric():
-                top_level_items += 1
-
-                # Skip rest of the expression until comma
-                j = i + 1
-                inner_depth = 0
-                while j < len(selectList):
-                    if selectList[j] == "(":
-                        inner_depth += 1
-                    elif selectList[j] == ")":
-                        inner_depth -= 1
-                    elif selectList[j] == "," and inner_depth == 0:
-                        break
-                    j += 1
-
-                i = j + 1 if j < len(selectList) else j
-                continue
+        # ---- standalone SELECT * ----
+        if (
+            tok == "*" and
+            (i == 0 or selectList[i - 1] == ",") and
+            (i + 1 == n or selectList[i + 1] == ",")
+        ):
+            top_level_star = True
+            top_level_items += 1
+            continue
 
-        i += 1
+        # ---- start of a top-level expression ----
+        if kinds[i] in OPERAND_KINDS or kinds[i] == KIND_AGGREGATE:
+            top_level_items += 1
+            in_expression = True
 
     if top_level_star and top_level_items > 1:
         return {
@@ -144,26 +117,19 @@ def consumeExpr(tokens, i):
     if tokens[i] != "(":
         return None
 
-    depth = 1
-    j = i + 1
-
-    while j < len(tokens) and depth > 0:
-        if tokens[j] == "(":
-            depth += 1
-        elif tokens[j] == ")":
-            depth -= 1
-        j += 1
+    tokens = TokenSpan.of(tokens)
+    close = tokens.closing(i)
 
     # Unbalanced parentheses
-    if depth != 0:
+    if close == -1:
         return None
 
-    inner = tokens[i + 1 : j - 1]
+    inner = tokens.sub(i + 1, close)
 
     # 🔥 detect scalar subquery
     is_subquery = bool(inner and inner[0] == "select")
 
-    return j, inner, is_subquery
+    return close + 1, inner, is_subquery
 
 
 
@@ -176,8 +142,11 @@ def containsAggregate(tokens):
     Checks whether a token list contains an aggregate call.
     Used to prevent nested aggregates.
     """
-    for i, tok in enumerate(tokens):
-        if tok in AGG_FUNCS and i + 1 < len(tokens) and tokens[i + 1] == "(":
+    kinds = kindsOf(tokens)
+    n = len(kinds)
+
+    for i, kind in enumerate(kinds):
+        if kind == KIND_AGGREGATE and i + 1 < n and tokens[i + 1] == "(":
             return True
     return False
 
@@ -232,9 +201,12 @@ def handleSelectOrder(selectList):
     alias_used = False
     aggregate_depth = 0   # Tracks nested aggregate context (defensive)
 
+    kinds = kindsOf(selectList)
+    n = len(selectList)
     i = 0
-    while i < len(selectList):
+    while i < n:
         tok = selectList[i]
+        kind = kinds[i]
 
         if tok == "from":
             break
@@ -268,11 +240,12 @@ def handleSelectOrder(selectList):
                     return {"error": "Empty expression in SELECT"}
                 
                 if is_subquery:
-                    from select_module.selectParser import SelectParser
-                    parser = SelectParser()
-                    err = parser.analyse(inner)
+                    err = submit(
+                        inner,
+                        lambda err: {"error": "Invalid subquery", "details": err}
+                    )
                     if err:
-                        return {"error": "Invalid subquery", "details": err}
+                        return err
 
                     # scalar subquery is a valid SELECT item
                     state = "EXPECT_ALIAS_OR_COMMA"
@@ -280,20 +253,24 @@ def handleSelectOrder(selectList):
                     continue
 
 
-                err = validateExpression(inner, "select")
-                if err:
+                def wrapExpression(err):
                     return {
                         "error": "Invalid expression in SELECT",
                         "details": err
                     }
 
+                with wrapping(wrapExpression):
+                    err = validateExpression(inner, "select")
+                if err:
+                    return wrapExpression(err)
+
                 state = "EXPECT_ALIAS_OR_COMMA"
                 alias_used = False
                 i = end
                 continue
 
             # ---- aggregate function ----
-            if tok in AGG_FUNCS:
+            if kind == KIND_AGGREGATE:
                 result = consumeAggregate(selectList, i)
                 if result is None:
                     return {
@@ -316,14 +293,18 @@ def handleSelectOrder(selectList):
                         "function": tok
                     }
 
-                err = validateExpression(inner, "select")
-                if err:
+                def wrapAggregate(err, function=tok):
                     return {
                         "error": "Invalid expression inside aggregate function",
-                        "function": tok,
+                        "function": function,
                         "details": err
                     }
 
+                with wrapping(wrapAggregate):
+                    err = validateExpression(inner, "select")
+                if err:
+                    return wrapAggregate(err)
+
                 aggregate_depth -= 1
 
                 state = "EXPECT_ALIAS_OR_COMMA"
@@ -332,27 +313,22 @@ def handleSelectOrder(selectList):
                 continue
 
             # ---- qualified column (table.column) ----
-            if isQualifiedColumnAt(selectList, i):
+            if isQualifiedColumnAt(selectList, i, kinds):
                 state = "EXPECT_ALIAS_OR_COMMA"
                 alias_used = False
                 i += 3
                 continue
 
-            # ---- simple column or '*' ----
-            # ---- simple column or '*' ----
-            if tok == "*" or isColumnToken(tok):
+            # ---- simple column, literal or '*' ----
+            if tok == "*" or kind in COLUMN_KINDS or kind == KIND_STRING:
                 i += 1
 
                 # 🔥 NEW: allow arithmetic continuation
-                while i < len(selectList):
+                while i < n:
                     if selectList[i] in ARITHMETIC_OPS:
                         i += 1
                         continue
-                    if (
-                        selectList[i] == "("
-                        or isColumnToken(selectList[i])
-                        or selectList[i].isnumeric()
-                    ):
+                    if selectList[i] == "(" or kinds[i] in OPERAND_KINDS:
                         i += 1
                         continue
                     break
@@ -379,7 +355,7 @@ def handleSelectOrder(selectList):
                 continue
 
             # implicit alias (column-name style)
-            if isColumnToken(tok) and tok not in SQL_KEYWORDS:
+            if kind in COLUMN_KINDS:
                 if alias_used:
                     return {"error": "Multiple aliases for the same column"}
                 alias_used = True
@@ -401,7 +377,7 @@ def handleSelectOrder(selectList):
         # Expecting alias name
         # -------------------------
         if state == "EXPECT_ALIAS_NAME":
-            if isColumnToken(tok) and tok not in SQL_KEYWORDS:
+            if kind in COLUMN_KINDS:
                 state = "EXPECT_ALIAS_OR_COMMA"
                 i += 1
                 continue
@@ -426,19 +402,17 @@ def checkAggregateFunctions(selectList):
     """
     Ensures aggregate functions are immediately followed by '('.
     """
-    i = 0
-    while i < len(selectList):
-        tok = selectList[i]
+    kinds = kindsOf(selectList)
+    n = len(kinds)
 
-        if tok in AGG_FUNCS:
-            if i + 1 >= len(selectList) or selectList[i + 1] != "(":
+    for i, kind in enumerate(kinds):
+        if kind == KIND_AGGREGATE:
+            if i + 1 >= n or selectList[i + 1] != "(":
                 return {
                     "error": "Aggregate function missing parentheses",
-                    "function": tok
+                    "function": selectList[i]
                 }
 
-        i += 1
-
     return None
 
 
@@ -498,28 +472,18 @@ def collectQualifiedColumns(selectedList, unresolved):
     Collects fully-qualified columns (table.column) at top level.
     Appends unresolved references for later resolution.
     """
-    depth = 0
-    i = 0
+    selectedList = TokenSpan.of(selectedList)
+    nextFree = 0
 
-    while i < len(selectedList):
-        tok = selectedList[i]
-
-        if tok == "(":
-            depth += 1
-            i += 1
-            continue
-        elif tok == ")":
-            depth -= 1
-            i += 1
+    for i, tok in selectedList.topLevel():
+        # Skip the '.' and column of a reference already collected
+        if i < nextFree:
             continue
 
-        if depth == 0 and isQualifiedColumnAt(selectedList, i):
+        if isQualifiedColumnAt(selectedList, i):
             unresolved.append({
-                "alias": selectedList[i],
+                "alias": tok,
                 "column": selectedList[i + 2],
                 "position": i
             })
-            i += 3
-            continue
-
-        i += 1
+            nextFree = i + 3
@@ -1,3 +1,15 @@
+from lexer.Lexer import (
+    Lexer,
+    TokenSpan,
+    KEYWORDS,
+    AGGREGATES,
+    WORDS,
+    KIND_IDENTIFIER,
+    KIND_NUMBER,
+    KIND_STRING,
+    KIND_KEYWORD,
+)
+from select_module.helper.clauseChecksHelper import indexClauses, clauseBody
 from spell_checker.utils import SpellChecker
 
 
@@ -6,22 +18,56 @@ SQL_KEYWORDS = {
     "having", "order", "limit", "as"
 }
 
-AGG_FUNCS = {"sum", "count", "avg", "min", "max"}
+AGG_FUNCS = set(AGGREGATES)
 
+# Opening characters of quoted identifiers ("name", `name`)
+IDENTIFIER_QUOTES = {'"', '`'}
+
+
+# Token kinds accepted by isColumnToken: names, quoted identifiers and
+# keywords outside SQL_KEYWORDS
+COLUMN_KINDS = frozenset(
+    [KIND_IDENTIFIER]
+    + [KIND_KEYWORD + i for i, word in enumerate(KEYWORDS) if word not in SQL_KEYWORDS]
+)
+
+# Token kinds of single-token operands: columns, integers, string literals
+OPERAND_KINDS = COLUMN_KINDS | {KIND_NUMBER, KIND_STRING}
+
+
+def kindsOf(tokens):
+    """
+    Token kinds of a span or a plain token list, indexed like tokens.
+    """
+    if isinstance(tokens, TokenSpan):
+        return tokens.kinds
+    return Lexer.classify(tokens)
 
 def isColumnToken(tok):
+    if tok[0] in IDENTIFIER_QUOTES:
+        return True
+
     return (
         tok.isidentifier()
         and tok not in SQL_KEYWORDS
         and tok not in AGG_FUNCS
     )
 
-def isQualifiedColumnAt(tokens, i):
+def isLiteralToken(tok):
+    """
+    String literals are emitted by the lexer as a single quoted token.
+    """
+    return tok[0] == "'"
+
+def isQualifiedColumnAt(tokens, i, kinds=None):
+    if kinds is None:
+        kinds = kindsOf(tokens)
+
     return (
-        i + 2 < len(tokens)
-        and isColumnToken(tokens[i])
+        i + 2 < len(kinds)
         and tokens[i + 1] == "."
-        and isColumnToken(tokens[i + 2])
+        and kinds[i] in COLUMN_KINDS
+        and kinds[i + 2] in COLUMN_KINDS
     )
 
 def consumeAggregate(tokens, i):
@@ -32,31 +78,20 @@ def consumeAggregate(tokens, i):
     if i + 1 >= len(tokens) or tokens[i + 1] != "(":
         return None
 
-    depth = 1
-    j = i + 2
-
-    while j < len(tokens) and depth > 0:
-        if tokens[j] == "(":
-            depth += 1
-        elif tokens[j] == ")":
-            depth -= 1
-        j += 1
+    tokens = TokenSpan.of(tokens)
+    close = tokens.closing(i + 1)
 
-    if depth != 0:
+    if close == -1:
         return None
 
-    inner = tokens[i + 2 : j - 1]
-    return j, inner
+    return close + 1, tokens.sub(i + 2, close)
 
 def extractLimit(tokens):
     if "limit" not in tokens:
         return None
 
-    i = tokens.index("limit")
-    start = i + 1
-    end = len(tokens)
-
-    return tokens[start:end]
+    _, spans = indexClauses(tokens)
+    return clauseBody(tokens, spans, "limit")
 
 def isSubquery(tokens):
     return bool(tokens) and tokens[0] == "select"
@@ -74,23 +109,37 @@ def isScalarSubquery(expr):
         and expr[1] == "select"
     )
 
-def spell_check_tokens(tokens):
+def spell_check_tokens(tokens, strict=False, vocabulary=None):
     """
     Spell-check SQL keywords and report exact token and position.
+    Words the lexer knows (keywords, aggregates) are never reported;
+    suggestions are memoized per word by SpellChecker (strict: 80%
+    similarity required instead of 60%).
+
+    With a Vocabulary (spell_checker.vocabulary), names are checked
+    against it instead, all unknown names of the tokens in one batch.
     """
+    if vocabulary is not None:
+        positions = [
+            idx for idx, token in enumerate(tokens)
+            if token.isidentifier() and token not in WORDS
+        ]
+        found = vocabulary.suggest_many([tokens[idx] for idx in positions])
+        return [
+            {"token": tokens[idx], "position": idx, "suggestions": suggestions}
+            for idx, suggestions in zip(positions, found)
+            if suggestions
+        ]
+
     errors = []
 
     for idx, token in enumerate(tokens):
-        # Skip symbols, numbers, operators
-        if not token.isalpha():
-            continue
-
-        # Valid keyword → OK
-        if token.upper() in SpellChecker.KEYWORDS:
+        # Skip symbols, numbers, operators and known SQL words
+        if not token.isalpha() or token in WORDS:
             continue
 
-        # Check for close matches
-        suggestions = SpellChecker.check(token)
+        # Valid keyword → no suggestions
+        suggestions = SpellChecker.check(token, strict)
 
         if suggestions:
             errors.append({
@@ -100,4 +149,3 @@ def spell_check_tokens(tokens):
             })
 
     return errors
-
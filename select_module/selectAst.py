@@ -0,0 +1,537 @@
+from lexer.Lexer import TokenSpan, KIND_NUMBER, KIND_STRING, KIND_AGGREGATE, KIND_OPERATOR
+from select_module.helper.utils import COLUMN_KINDS, isQualifiedColumnAt, consumeAggregate
+from select_module.helper.whereChecksHelper import stripOuterParens, split_top_level, ARITHMETIC_OPS
+from select_module.helper.fromChecksHelper import containsJoin, splitRef, validateTableRef, JOIN_TOKENS
+from select_module.helper.havingChecksHelper import stripParens
+from select_module.helper.orderByHelpers import splitOrderByItems, splitOrderItem
+
+
+# ---------------------------------------------------------
+# Nodes
+# ---------------------------------------------------------
+
+class Node:
+    """
+    Base class of the SELECT syntax tree.
+
+    Nodes use __slots__ and list their children in `fields`, which
+    drives repr, equality and walk().
+    """
+
+    __slots__ = ()
+    fields = ()
+
+    def __repr__(self):
+        args = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.fields)
+        return f"{type(self).__name__}({args})"
+
+    def __eq__(self, other):
+        if type(other) is not type(self):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.fields)
+
+    __hash__ = None
+
+
+class Select(Node):
+    """
+    One SELECT query.
+    - items    : list of SelectItem
+    - fromItems: list of Table / DerivedTable (comma separated)
+    - joins    : list of Join following the first from-item
+    - where    : condition or None
+    - groupBy  : list of expressions
+    - having   : condition or None
+    - orderBy  : list of OrderItem
+    - limit    : int, or None without LIMIT
+    """
+    __slots__ = fields = ("items", "fromItems", "joins", "where", "groupBy", "having", "orderBy", "limit")
+
+    def __init__(self, items, fromItems, joins, where, groupBy, having, orderBy, limit):
+        self.items = items
+        self.fromItems = fromItems
+        self.joins = joins
+        self.where = where
+        self.groupBy = groupBy
+        self.having = having
+        self.orderBy = orderBy
+        self.limit = limit
+
+
+class SelectItem(Node):
+    __slots__ = fields = ("expr", "alias")
+
+    def __init__(self, expr, alias=None):
+        self.expr = expr
+        self.alias = alias
+
+
+class Table(Node):
+    __slots__ = fields = ("name", "alias")
+
+    def __init__(self, name, alias=None):
+        self.name = name
+        self.alias = alias
+
+
+class DerivedTable(Node):
+    __slots__ = fields = ("query", "alias")
+
+    def __init__(self, query, alias):
+        self.query = query
+        self.alias = alias
+
+
+class Join(Node):
+    """
+    kind is "inner", "left", "right" or "full" (plain JOIN is inner).
+    """
+    __slots__ = fields = ("kind", "table", "condition")
+
+    def __init__(self, kind, table, condition):
+        self.kind = kind
+        self.table = table
+        self.condition = condition
+
+
+class OrderItem(Node):
+    __slots__ = fields = ("expr", "direction")
+
+    def __init__(self, expr, direction="asc"):
+        self.expr = expr
+        self.direction = direction
+
+
+class BoolOp(Node):
+    """
+    AND / OR over two or more conditions.
+    """
+    __slots__ = fields = ("op", "operands")
+
+    def __init__(self, op, operands):
+        self.op = op
+        self.operands = operands
+
+
+class Comparison(Node):
+    __slots__ = fields = ("op", "left", "right")
+
+    def __init__(self, op, left, right):
+        self.op = op
+        self.left = left
+        self.right = right
+
+
+class Between(Node):
+    __slots__ = fields = ("expr", "low", "high")
+
+    def __init__(self, expr, low, high):
+        self.expr = expr
+        self.low = low
+        self.high = high
+
+
+class In(Node):
+    """
+    values is a list of expressions or a Subquery.
+    """
+    __slots__ = fields = ("expr", "values", "negated")
+
+    def __init__(self, expr, values, negated=False):
+        self.expr = expr
+        self.values = values
+        self.negated = negated
+
+
+class BinaryOp(Node):
+    """
+    Arithmetic: + - * /
+    """
+    __slots__ = fields = ("op", "left", "right")
+
+    def __init__(self, op, left, right):
+        self.op = op
+        self.left = left
+        self.right = right
+
+
+class FuncCall(Node):
+    __slots__ = fields = ("name", "args")
+
+    def __init__(self, name, args):
+        self.name = name
+        self.args = args
+
+
+class Column(Node):
+    __slots__ = fields = ("name", "table")
+
+    def __init__(self, name, table=None):
+        self.name = name
+        self.table = table
+
+
+class Literal(Node):
+    """
+    value is the token text; kind is "number" or "string".
+    """
+    __slots__ = fields = ("value", "kind")
+
+    def __init__(self, value, kind):
+        self.value = value
+        self.kind = kind
+
+
+class Star(Node):
+    __slots__ = fields = ()
+
+
+class Subquery(Node):
+    """
+    Nested SELECT. `query` is filled in once the subquery itself has
+    been validated; `tokens` is its span in the query.
+    """
+    __slots__ = ("tokens", "query")
+    fields = ("query",)
+
+    def __init__(self, tokens, query=None):
+        self.tokens = tokens
+        self.query = query
+
+
+class Raw(Node):
+    """
+    Tokens the tree builder does not model (accepted by the
+    validator but outside the shapes above).
+    """
+    __slots__ = fields = ("tokens",)
+
+    def __init__(self, tokens):
+        self.tokens = list(tokens)
+
+
+def walk(node):
+    """
+    Yields node and every node below it (pre-order, no recursion).
+    """
+    stack = [node]
+
+    while stack:
+        node = stack.pop()
+        if isinstance(node, list):
+            stack.extend(reversed(node))
+            continue
+        if not isinstance(node, Node):
+            continue
+
+        yield node
+        stack.extend(getattr(node, name) for name in reversed(node.fields))
+
+
+# ---------------------------------------------------------
+# Expressions
+#
+# Builders take an optional `found` list that collects the Subquery
+# placeholders they create.
+# ---------------------------------------------------------
+
+def subquery(tokens, found):
+    node = Subquery(tokens)
+    if found is not None:
+        found.append(node)
+    return node
+
+
+def buildOperand(tokens, kinds, i, found=None):
+    """
+    Builds the operand starting at i. Returns (node, next_index),
+    or (None, i) if no operand starts there.
+    """
+    tok = tokens[i]
+    kind = kinds[i]
+
+    if tok == "(":
+        close = tokens.closing(i)
+        if close == -1:
+            return None, i
+        inner = stripOuterParens(tokens.sub(i + 1, close))
+        if inner and inner[0] == "select":
+            return subquery(inner, found), close + 1
+        return buildExpression(inner, found), close + 1
+
+    if isQualifiedColumnAt(tokens, i, kinds):
+        return Column(tokens[i + 2], tokens[i]), i + 3
+
+    if kind == KIND_AGGREGATE:
+        result = consumeAggregate(tokens, i)
+        if result is None:
+            return None, i
+        end, inner = result
+        return FuncCall(tok, [buildExpression(inner, found)]), end
+
+    if kind in COLUMN_KINDS:
+        return Column(tok), i + 1
+    if kind == KIND_NUMBER:
+        return Literal(tok, "number"), i + 1
+    if kind == KIND_STRING:
+        return Literal(tok, "string"), i + 1
+
+    return None, i
+
+
+def buildExpression(tokens, found=None):
+    """
+    Builds an arithmetic expression; * and / bind tighter than + and -.
+    """
+    tokens = stripOuterParens(TokenSpan.of(tokens))
+
+    if not tokens:
+        return Raw(tokens)
+    if tokens[0] == "select":
+        return subquery(tokens, found)
+    if len(tokens) == 1 and tokens[0] == "*":
+        return Star()
+
+    kinds = tokens.kinds
+    n = len(tokens)
+    terms = []      # operands of + / -, each already folded over * and /
+    addOps = []
+    i = 0
+
+    while True:
+        operand, i = buildOperand(tokens, kinds, i, found)
+        if operand is None:
+            return Raw(tokens)
+
+        if terms and addOps and addOps[-1] in ("*", "/"):
+            terms[-1] = BinaryOp(addOps.pop(), terms[-1], operand)
+        else:
+            terms.append(operand)
+
+        if i == n:
+            break
+        if tokens[i] not in ARITHMETIC_OPS or i + 1 == n:
+            return Raw(tokens)
+        addOps.append(tokens[i])
+        i += 1
+
+    result = terms[0]
+    for op, term in zip(addOps, terms[1:]):
+        result = BinaryOp(op, result, term)
+    return result
+
+
+# ---------------------------------------------------------
+# Conditions
+# ---------------------------------------------------------
+
+def splitLogical(tokens, op):
+    """
+    Splits on a top-level AND / OR. The AND of BETWEEN ... AND is
+    kept inside its predicate.
+    """
+    parts = []
+    start = 0
+    between = False
+
+    for i, tok in tokens.topLevel():
+        if tok == "between":
+            between = True
+        elif tok == "and" and between:
+            between = False
+        elif tok == op:
+            parts.append(tokens.sub(start, i))
+            start = i + 1
+
+    parts.append(tokens.sub(start))
+    return parts
+
+
+def buildCondition(tokens, found=None):
+    """
+    Builds an AND / OR condition; AND binds tighter than OR.
+    """
+    tokens = stripOuterParens(TokenSpan.of(tokens))
+
+    for op in ("or", "and"):
+        parts = splitLogical(tokens, op)
+        if len(parts) > 1:
+            return BoolOp(op, [buildCondition(part, found) for part in parts])
+
+    return buildPredicate(tokens, found)
+
+
+def buildPredicate(tokens, found=None):
+    kinds = tokens.kinds
+
+    for i, tok in tokens.topLevel():
+        if tok == "in":
+            negated = i > 0 and tokens[i - 1] == "not"
+            lhs = tokens.sub(0, i - 1 if negated else i)
+            rhs = tokens.sub(i + 1)
+            items = stripOuterParens(rhs.sub(1, len(rhs) - 1))
+            if items and items[0] == "select":
+                values = subquery(items, found)
+            else:
+                values = [buildExpression(part, found) for part in split_top_level(items, ",")]
+            return In(buildExpression(lhs, found), values, negated)
+
+        if tok == "between":
+            rest = tokens.sub(i + 1)
+            for j, inner in rest.topLevel():
+                if inner == "and":
+                    return Between(
+                        buildExpression(tokens.sub(0, i), found),
+                        buildExpression(rest.sub(0, j), found),
+                        buildExpression(rest.sub(j + 1), found)
+                    )
+            return Raw(tokens)
+
+        if kinds[i] == KIND_OPERATOR:
+            return Comparison(
+                tok,
+                buildExpression(tokens.sub(0, i), found),
+                buildExpression(tokens.sub(i + 1), found)
+            )
+
+    return Raw(tokens)
+
+
+# ---------------------------------------------------------
+# Clauses
+# ---------------------------------------------------------
+
+def buildSelectItem(expr, found=None):
+    """
+    Splits `expr [AS] alias` and builds the expression.
+    """
+    n = len(expr)
+
+    if n >= 3 and expr[n - 2] == "as":
+        return SelectItem(buildExpression(expr.sub(0, n - 2), found), expr[n - 1])
+
+    # Implicit alias: a name right after a complete operand
+    if n >= 2 and expr.kinds[n - 1] in COLUMN_KINDS and expr[n - 2] not in ARITHMETIC_OPS | {".", "("}:
+        return SelectItem(buildExpression(expr.sub(0, n - 1), found), expr[n - 1])
+
+    return SelectItem(buildExpression(expr, found))
+
+
+def buildTableRef(ref, found=None):
+    if ref and ref[0] == "(":
+        inner = stripParens(ref.sub(0, len(ref) - 1))
+        return DerivedTable(subquery(inner, found), ref[-1])
+
+    res = validateTableRef(ref)
+    if "error" in res:
+        return Raw(ref)
+    alias = res["alias"]
+    return Table(res["table"], None if alias == res["table"] else alias)
+
+
+def buildFrom(tokens, found=None):
+    """
+    Returns (fromItems, joins) for the FROM clause body.
+    """
+    if not containsJoin(tokens):
+        return [buildTableRef(ref, found) for ref in splitRef(tokens)], []
+
+    n = len(tokens)
+    i = 0
+    while i < n and tokens[i] not in JOIN_TOKENS:
+        i += 1
+    fromItems = [buildTableRef(tokens.sub(0, i), found)]
+    joins = []
+
+    while i < n:
+        kind = tokens[i]
+        i += 1 if kind == "join" else 2
+        if kind == "join":
+            kind = "inner"
+
+        start = i
+        while i < n and tokens[i] != "on":
+            i += 1
+        table = buildTableRef(tokens.sub(start, i), found)
+
+        onStart = i + 1
+        i = n
+        for j, tok in tokens.topLevel(onStart):
+            if tok in JOIN_TOKENS:
+                i = j
+                break
+
+        joins.append(Join(kind, table, buildCondition(tokens.sub(onStart, i), found)))
+
+    return fromItems, joins
+
+
+def buildSelect(parser, tokens, found=None):
+    """
+    Builds the tree of one validated query level from the clause
+    spans and memoized splits the checks already computed. Nested
+    queries are left as Subquery placeholders.
+    """
+    context = parser.context
+
+    exprs, _ = context.selectExprs
+    items = [buildSelectItem(expr, found) for expr in exprs]
+
+    fromItems, joins = buildFrom(parser.clauseTokens(tokens, "from"), found)
+
+    where = parser.clauseTokens(tokens, "where")
+    having = parser.clauseTokens(tokens, "having")
+
+    groupBy = []
+    if context.groupTokens:
+        groupBy = [buildExpression(expr, found) for expr in context.groupExprs[0]]
+
+    orderBy = []
+    orderTokens = parser.clauseTokens(tokens, "order by")
+    if orderTokens:
+        for part in splitOrderByItems(orderTokens):
+            expr, direction = splitOrderItem(part)
+            orderBy.append(OrderItem(buildExpression(expr, found), direction))
+
+    limit = parser.clauseTokens(tokens, "limit")
+    if limit is not None:
+        # isdigit() also admits digits int() rejects (e.g. "²")
+        limit = int(limit[0]) if limit[0].isdecimal() else Raw(limit)
+
+    return Select(
+        items,
+        fromItems,
+        joins,
+        buildCondition(where, found) if where else None,
+        groupBy,
+        buildCondition(having, found) if having else None,
+        orderBy,
+        limit
+    )
+
+
+class TreeBuilder:
+    """
+    Collects the trees of a SELECT and its subqueries while
+    validateSelect works through them (pass `add` as onValidated).
+
+    Subquery placeholders are matched to the validated subquery by
+    their span, so every level is built from its own parser's state.
+    """
+
+    def __init__(self):
+        self.root = None
+        self.pending = {}    # (start, end) -> Subquery waiting for its tree
+
+    def add(self, parser, tokens):
+        found = []
+        tree = buildSelect(parser, tokens, found)
+
+        placeholder = self.pending.pop((tokens.start, tokens.end), None)
+        if placeholder is not None and placeholder.tokens.base is tokens.base:
+            placeholder.query = tree
+        elif self.root is None:
+            self.root = tree
+
+        for node in found:
+            self.pending[(node.tokens.start, node.tokens.end)] = node
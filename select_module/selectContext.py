@@ -0,0 +1,86 @@
+from select_module.helper.selectChecksHelper import extractAliases
+from select_module.helper.groupByChecksHelper import normalize, splitSelectExpressions, splitGroupByExpressions
+
+
+class SelectContext:
+    """
+    Per-query facts shared by the GROUP BY, HAVING and ORDER BY checks.
+
+    Every value is computed on first use and reused afterwards, so the
+    SELECT list is split once and GROUP BY is normalized once per query.
+    """
+
+    def __init__(self, parser, tokens):
+        self.parser = parser
+        self.tokens = tokens
+        self._cache = {}
+
+    def _memo(self, key, compute):
+        if key not in self._cache:
+            self._cache[key] = compute()
+        return self._cache[key]
+
+    @property
+    def selectList(self):
+        return self._memo(
+            "selectList",
+            lambda: self.parser.clauseTokens(self.tokens, "select")
+        )
+
+    @property
+    def groupTokens(self):
+        return self._memo(
+            "groupTokens",
+            lambda: self.parser.clauseTokens(self.tokens, "group by")
+        )
+
+    @property
+    def selectExprs(self):
+        """
+        (expressions, error) from splitting the SELECT list.
+        """
+        return self._memo(
+            "selectExprs",
+            lambda: splitSelectExpressions(self.selectList)
+        )
+
+    @property
+    def groupExprs(self):
+        """
+        (expressions, error) from splitting the GROUP BY list.
+        """
+        return self._memo(
+            "groupExprs",
+            lambda: splitGroupByExpressions(self.groupTokens)
+        )
+
+    @property
+    def aliasMap(self):
+        return self._memo(
+            "aliasMap",
+            lambda: extractAliases(self.selectList)
+        )
+
+    @property
+    def aliasSet(self):
+        return self._memo("aliasSet", lambda: set(self.aliasMap.keys()))
+
+    @property
+    def selectSet(self):
+        """
+        Normalized SELECT expressions (requires a valid SELECT split).
+        """
+        return self._memo(
+            "selectSet",
+            lambda: {normalize(expr) for expr in self.selectExprs[0]}
+        )
+
+    @property
+    def groupSet(self):
+        """
+        Normalized GROUP BY expressions (requires a valid GROUP BY split).
+        """
+        return self._memo(
+            "groupSet",
+            lambda: {normalize(expr) for expr in self.groupExprs[0]}
+        )
@@ -1,11 +1,14 @@
-from select_module.helper.clauseChecksHelper import extractClauses, checkDuplicateClauses, checkMandatoryClauses, checkOrder
-from select_module.helper.selectChecksHelper import collectQualifiedColumns, checkAggregateFunctions, checkColumnNames,containsAggregate, handleSelectOrder, checkStarUsage, extractSelectList, extractAliases
-from select_module.helper.whereChecksHelper import checkParentheses, extractConditions, validateBooleanExpr
-from select_module.helper.fromChecksHelper import validateJoinChain, containsJoin, validateTableRef, splitRef, extractFromList
-from select_module.helper.groupByChecksHelper import normalize, stripAlias, splitGroupByExpressions, validateGroupBy, extractGroupByList, splitSelectExpressions
-from select_module.helper.havingChecksHelper import validateHavingExpr, isValidHavingRHS, stripParens, extractHaving, splitHavingExprs, splitComparison
-from select_module.helper.orderByHelpers import isValidOrderByExpr, splitOrderByItems, extractOrderBy, splitOrderByItems
-from select_module.helper.utils import extractLimit
+from lexer.Lexer import TokenSpan
+from select_module.selectContext import SelectContext
+from select_module.selectAst import TreeBuilder
+from select_module.subqueryQueue import submit, wrapping, validateSelect
+from select_module.helper.clauseChecksHelper import indexClauses, clauseBody, checkDuplicateClauses, checkMandatoryClauses, checkOrder
+from select_module.helper.selectChecksHelper import collectQualifiedColumns, checkAggregateFunctions, checkColumnNames,containsAggregate, handleSelectOrder, checkStarUsage
+from select_module.helper.whereChecksHelper import checkParentheses, validateBooleanExpr
+from select_module.helper.fromChecksHelper import validateJoinChain, containsJoin, validateTableRef, splitRef
+from select_module.helper.groupByChecksHelper import stripAlias, validateGroupBy
+from select_module.helper.havingChecksHelper import validateHavingExpr, isValidHavingRHS, stripParens, splitHavingExprs, splitComparison
+from select_module.helper.orderByHelpers import isValidOrderByExpr, splitOrderByItems
 
 class SelectParser:
     """
@@ -19,6 +22,8 @@ class SelectParser:
 
     def __init__(self):
         self.clauses = []              # ordered list of clause names
+        self.clauseSpans = {}          # clause name -> (body start, body end)
+        self.context = None            # memoized per-query SelectContext
         self.unresolved_columns = []   # qualified columns needing alias resolution
         self.from_tables = {}          # alias -> table mapping
 
@@ -32,8 +37,10 @@ class SelectParser:
         - duplicate clauses
         - mandatory clauses
         - clause ordering
+        Also builds the clause-span index read by every later check.
         """
-        clauses = extractClauses(tokens)
+        clauses, self.clauseSpans = indexClauses(tokens)
+        self.context = SelectContext(self, tokens)
         # print(clauses)
         self.clauses = [name for name, _ in clauses]
 
@@ -50,6 +57,13 @@ class SelectParser:
 
         return None
 
+    def clauseTokens(self, tokens, name):
+        """
+        Body tokens of a top-level clause, read from the span index
+        built by clauseChecks (None if the clause is absent).
+        """
+        return clauseBody(tokens, self.clauseSpans, name)
+
     # ---------------------------------------------------------
     # SELECT clause validation
     # ---------------------------------------------------------
@@ -63,7 +77,7 @@ class SelectParser:
         - star (*) rules
         Also collects qualified columns for later alias resolution.
         """
-        selectList = extractSelectList(tokens)
+        selectList = self.context.selectList
 
         if len(selectList) == 0:
             return {
@@ -101,7 +115,7 @@ class SelectParser:
         - derived tables (subqueries)
         """
 
-        fromList = extractFromList(tokens)
+        fromList = self.clauseTokens(tokens, "from")
         if not fromList:
             return {
                 "error": "Table name must be present"
@@ -134,21 +148,19 @@ class SelectParser:
                     }
 
                 alias = ref[-1]
-                inner = stripParens(ref[:-1])
+                inner = stripParens(ref.sub(0, len(ref) - 1))
 
                 if not inner or inner[0] != "select":
                     return {
                         "error": "Invalid derived table"
                     }
 
-                from select_module.selectParser import SelectParser
-                parser = SelectParser()
-                err = parser.analyse(inner)
+                err = submit(
+                    inner,
+                    lambda err: {"error": "Invalid subquery in FROM", "details": err}
+                )
                 if err:
-                    return {
-                        "error": "Invalid subquery in FROM",
-                        "details": err
-                    }
+                    return err
 
                 if alias in self.from_tables:
                     return {
@@ -205,7 +217,7 @@ class SelectParser:
 
     def whereChecks(self, tokens):
         if "where" in self.clauses:
-            whereTokens = extractConditions(tokens)
+            whereTokens = self.clauseTokens(tokens, "where")
 
             err = checkParentheses(whereTokens)
             if err:
@@ -234,8 +246,7 @@ class SelectParser:
         """
         Validates GROUP BY clause against SELECT expressions.
         """
-        selectList = extractSelectList(tokens)
-        selectExprs, err = splitSelectExpressions(selectList)
+        selectExprs, err = self.context.selectExprs
         if err:
             return err
 
@@ -243,7 +254,7 @@ class SelectParser:
         selectExprs = [stripAlias(expr) for expr in selectExprs]
         has_agg = any(containsAggregate(expr) for expr in selectExprs)
         has_non_agg = any(not containsAggregate(expr) for expr in selectExprs)
-        groupTokens = extractGroupByList(tokens)
+        groupTokens = self.context.groupTokens
 
 
         if has_agg and has_non_agg and not groupTokens:
@@ -260,7 +271,7 @@ class SelectParser:
             }
 
         if groupTokens:
-            groupExprs, err = splitGroupByExpressions(groupTokens)
+            groupExprs, err = self.context.groupExprs
             if err:
                 return err
 
@@ -279,7 +290,7 @@ class SelectParser:
         - aggregate / GROUP BY compatibility
         """
         if "having" in self.clauses:
-            havingTokens = extractHaving(tokens)
+            havingTokens = self.clauseTokens(tokens, "having")
 
             # HAVING must not be empty
             if havingTokens is not None and not havingTokens:
@@ -287,30 +298,30 @@ class SelectParser:
                     "error": "HAVING clause cannot be empty"
                 }
 
-            # Boolean structure validation
-            err = validateBooleanExpr(havingTokens, "having")
-            if err:
+            def wrapCondition(err):
                 return {
                     "error": "Invalid HAVING condition",
                     "details": err
                 }
+
+            # Boolean structure validation
+            with wrapping(wrapCondition):
+                err = validateBooleanExpr(havingTokens, "having")
+            if err:
+                return wrapCondition(err)
             
 
 
-            # Build GROUP BY normalization set
-            groupByTokens = extractGroupByList(tokens)
-            groupbyExpr, err = splitGroupByExpressions(groupByTokens)
+            # GROUP BY normalization set
+            _, err = self.context.groupExprs
             if err:
                 return err
 
-            group_set = {normalize(expr) for expr in groupbyExpr}
-
-            # Build alias set from SELECT
-            selectList = extractSelectList(tokens)
-            alias_map = extractAliases(selectList)
-            alias_set = set(alias_map.keys())
-
-            return validateHavingExpr(havingTokens, group_set, alias_set)
+            return validateHavingExpr(
+                havingTokens,
+                self.context.groupSet,
+                self.context.aliasSet
+            )
 
         return None
 
@@ -325,7 +336,7 @@ class SelectParser:
         - alias usage
         - GROUP BY compatibility
         """
-        orderTokens = extractOrderBy(tokens)
+        orderTokens = self.clauseTokens(tokens, "order by")
 
         if isinstance(orderTokens, dict):
             return orderTokens
@@ -338,24 +349,23 @@ class SelectParser:
                 "error": "ORDER BY clause cannot be empty"
             }
 
+        context = self.context
+
         # GROUP BY normalization set
         group_set = set()
-        groupByTokens = extractGroupByList(tokens)
-        if groupByTokens:
-            groupbyExpr, err = splitGroupByExpressions(groupByTokens)
+        if context.groupTokens:
+            _, err = context.groupExprs
             if err:
                 return err
-            group_set = {normalize(expr) for expr in groupbyExpr}
+            group_set = context.groupSet
 
         # SELECT aliases and expressions
-        selectList = extractSelectList(tokens)
-        alias_map = extractAliases(selectList)
-        alias_set = set(alias_map.keys())
+        alias_set = context.aliasSet
 
-        selectExprs, err = splitSelectExpressions(selectList)
+        _, err = context.selectExprs
         if err:
             return err
-        select_set = {normalize(expr) for expr in selectExprs}
+        select_set = context.selectSet
 
         # Validate each ORDER BY item
         parts = splitOrderByItems(orderTokens)
@@ -387,7 +397,7 @@ class SelectParser:
         Validates LIMIT clause:
         - single non-negative integer literal
         """
-        limitTokens = extractLimit(tokens)
+        limitTokens = self.clauseTokens(tokens, "limit")
 
         if limitTokens is None:
             return None
@@ -409,9 +419,32 @@ class SelectParser:
     # Full analysis entry point
     # ---------------------------------------------------------
 
-    def analyse(self, tokens):
+    def analyse(self, tokens, tree=False):
+        """
+        Validates a SELECT and all of its subqueries.
+        Stops on first error.
+
+        Plain token lists get their bracket index built here once;
+        a TokenSpan from the lexer is used as is. Subqueries are
+        validated from a work queue rather than by recursion, so
+        nesting depth does not grow the Python stack.
+
+        With tree=True returns (error, Select tree); the tree is built
+        level by level in the same pass and is None on error.
+        """
+        if not tree:
+            return validateSelect(type(self), TokenSpan.of(tokens))
+
+        builder = TreeBuilder()
+        err = validateSelect(type(self), TokenSpan.of(tokens), onValidated=builder.add)
+        if err:
+            return err, None
+        return None, builder.root
+
+    def runChecks(self, tokens):
         """
-        Runs all validation phases in correct semantic order.
+        Runs all validation phases of one query level in correct
+        semantic order. Subqueries found on the way are queued.
         Stops on first error.
         """
 
@@ -0,0 +1,142 @@
+from lexer.Lexer import Lexer
+from select_module.selectParser import SelectParser
+from select_module.selectAst import (
+    Select, SelectItem, Table, DerivedTable, Join, OrderItem,
+    BoolOp, Comparison, Between, In, BinaryOp, FuncCall,
+    Column, Literal, Star, Subquery, walk,
+)
+
+
+def parse(query):
+    stream = Lexer.tokenize(query)
+    return SelectParser().analyse(stream.span(0, -1), tree=True)
+
+
+def select(items, fromItems, joins=(), where=None, groupBy=(), having=None, orderBy=(), limit=None):
+    return Select(list(items), list(fromItems), list(joins), where,
+                  list(groupBy), having, list(orderBy), limit)
+
+
+def one(value):
+    return Literal(value, "number")
+
+
+#TREE CASES (query, expected tree)
+
+tree_cases = [
+    # Projections, aliases and arithmetic precedence
+    ("SELECT a, t.b AS x, a + b * 2 y FROM t;",
+     select([
+         SelectItem(Column("a")),
+         SelectItem(Column("b", "t"), "x"),
+         SelectItem(BinaryOp("+", Column("a"), BinaryOp("*", Column("b"), one("2"))), "y"),
+     ], [Table("t")])),
+
+    # Star, aggregates, GROUP BY / HAVING / ORDER BY / LIMIT
+    ("SELECT a, COUNT(*) FROM s.t x GROUP BY a HAVING COUNT(*) > 1 ORDER BY a DESC LIMIT 5;",
+     select(
+         [SelectItem(Column("a")), SelectItem(FuncCall("count", [Star()]))],
+         [Table("s.t", "x")],
+         groupBy=[Column("a")],
+         having=Comparison(">", FuncCall("count", [Star()]), one("1")),
+         orderBy=[OrderItem(Column("a"), "desc")],
+         limit=5,
+     )),
+
+    # Joins; AND binds tighter than OR
+    ("SELECT * FROM t JOIN u ON t.a = u.a LEFT JOIN v w ON w.b = t.b WHERE a = 1 OR b = 2 AND c = 'z';",
+     select(
+         [SelectItem(Star())],
+         [Table("t")],
+         joins=[
+             Join("inner", Table("u"), Comparison("=", Column("a", "t"), Column("a", "u"))),
+             Join("left", Table("v", "w"), Comparison("=", Column("b", "w"), Column("b", "t"))),
+         ],
+         where=BoolOp("or", [
+             Comparison("=", Column("a"), one("1")),
+             BoolOp("and", [
+                 Comparison("=", Column("b"), one("2")),
+                 Comparison("=", Column("c"), Literal("'z'", "string")),
+             ]),
+         ]),
+     )),
+
+    # BETWEEN keeps its AND; IN lists
+    ("SELECT a FROM t WHERE (a BETWEEN 1 AND 2) AND (b NOT IN (3, 4));",
+     select([SelectItem(Column("a"))], [Table("t")], where=BoolOp("and", [
+         Between(Column("a"), one("1"), one("2")),
+         In(Column("b"), [one("3"), one("4")], negated=True),
+     ]))),
+]
+
+# Subqueries are filled in by their own validation level
+nested = "SELECT a FROM (SELECT a FROM u) d WHERE a IN (SELECT b FROM v WHERE b > (SELECT MAX(c) FROM w));"
+tree_cases.append((nested, select(
+    [SelectItem(Column("a"))],
+    [DerivedTable(Subquery(None, select([SelectItem(Column("a"))], [Table("u")])), "d")],
+    where=In(Column("a"), Subquery(None, select(
+        [SelectItem(Column("b"))],
+        [Table("v")],
+        where=Comparison(">", Column("b"), Subquery(None, select(
+            [SelectItem(FuncCall("max", [Column("c")]))], [Table("w")]
+        ))),
+    ))),
+)))
+
+
+failed_tests = []
+total_tests = 0
+
+print("\n===== SELECT TREE TEST RESULTS =====\n")
+
+for query, expected in tree_cases:
+    total_tests += 1
+    err, tree = parse(query)
+
+    if err is None and tree == expected:
+        print(f"[PASS] {query!r}")
+    else:
+        print(f"[FAIL] {query!r} -> {err or tree}")
+        failed_tests.append((query, err or tree))
+
+
+#OTHER CASES
+
+err, tree = parse("SELECT a FROM t WHERE;")
+subqueries = [node for node in walk(parse(nested)[1]) if isinstance(node, Subquery)]
+other_cases = [
+    ("invalid query has no tree", (err is not None, tree), (True, None)),
+    ("default verdict only", SelectParser().analyse(Lexer.tokenize("SELECT a FROM t").span()), None),
+    ("subquery spans", [" ".join(node.tokens) for node in subqueries], [
+        "select a from u",
+        "select b from v where b > ( select max ( c ) from w )",
+        "select max ( c ) from w",
+    ]),
+    ("LIMIT 0", parse("SELECT a FROM t LIMIT 0;")[1].limit, 0),
+    ("slots", hasattr(Column("a"), "__dict__"), False),
+]
+
+for name, got, expected in other_cases:
+    total_tests += 1
+
+    if got == expected:
+        print(f"[PASS] {name}")
+    else:
+        print(f"[FAIL] {name} -> {got} (expected {expected})")
+        failed_tests.append((name, got))
+
+
+#TEST SUMMARY
+
+print("\n===== TEST SUMMARY =====")
+print(f"Total Test Cases : {total_tests}")
+print(f"Passed           : {total_tests - len(failed_tests)}")
+print(f"Failed           : {len(failed_tests)}")
+
+if failed_tests:
+    print("\n--- Failed Test Descriptions ---")
+    for i, (q, got) in enumerate(failed_tests, start=1):
+        print(f"{i}. Case : {q!r}")
+        print(f"   Got  : {got}")
+else:
+    print("\nAll SELECT TREE tests passed successfully.")
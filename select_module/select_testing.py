@@ -916,6 +916,21 @@ TEST_CASES = [
     # -------------------------------------------------
     ("SELECT a FROM t ORDER BY (SELECT MAX(b) FROM u)", False),
 
+    # -------------------------------------------------
+    # 11. Clause keywords inside subqueries (VALID)
+    # -------------------------------------------------
+    ("SELECT a FROM t WHERE a IN (SELECT b FROM u GROUP BY b)", True),
+    ("SELECT (SELECT MAX(b) FROM u WHERE u.c = 1) AS m FROM t WHERE a = 2", True),
+    ("SELECT x.a FROM (SELECT a FROM u ORDER BY a LIMIT 1) x", True),
+    ("SELECT a FROM t WHERE a IN (SELECT b FROM u ORDER BY b) ORDER BY a", True),
+
+    # -------------------------------------------------
+    # 12. Deeply nested subqueries
+    # -------------------------------------------------
+    ("SELECT a FROM (" * 300 + "SELECT a FROM t" + ") x" * 300, True),
+    ("SELECT b FROM u WHERE b IN (" * 300 + "SELECT b FROM u" + ")" * 300, True),
+    ("SELECT b FROM u WHERE b IN (" * 300 + "SELECT b, c FROM u" + ")" * 300, False),
+
 ]
 
 
@@ -0,0 +1,126 @@
+import contextvars
+import importlib
+from contextlib import contextmanager
+
+
+# Queue of the SELECT currently being validated (None outside a run)
+_current = contextvars.ContextVar("subqueryQueue", default=None)
+
+# SelectParser, bound by the first subquery validated outside a SELECT
+# run: selectParser imports the helpers that call submit(), so it
+# cannot be imported with this module
+_SelectParser = None
+
+
+class SubqueryQueue:
+    """
+    Work queue of the subqueries found while validating one SELECT.
+
+    Helpers that meet a subquery (IN, scalar, derived table) add it
+    here instead of starting a nested SelectParser. validateSelect then
+    validates the queued subqueries one after another, so nesting depth
+    no longer grows the Python stack.
+
+    Every item remembers the chain of wrappers its error must go
+    through, so a failing subquery still reports the same nested
+    "details" error as before.
+    """
+
+    def __init__(self, chain):
+        self.chain = chain     # wrappers of the query being validated
+        self.context = []      # wrappers of enclosing helper calls, outermost first
+        self.found = []        # (tokens, chain, single_column_error)
+
+    def add(self, tokens, wrap, columnError=None):
+        chain = (wrap,) + tuple(reversed(self.context)) + self.chain
+        self.found.append((tokens, chain, columnError))
+
+
+def wrapError(err, chain):
+    for wrap in chain:
+        err = wrap(err)
+    return err
+
+
+@contextmanager
+def wrapping(wrap):
+    """
+    Marks a helper call whose errors the caller wraps, so errors of
+    subqueries queued inside it are wrapped the same way.
+    """
+    queue = _current.get()
+    if queue is None:
+        yield
+        return
+
+    queue.context.append(wrap)
+    try:
+        yield
+    finally:
+        queue.context.pop()
+
+
+def submit(tokens, wrap, columnError=None):
+    """
+    Hands a subquery to the SELECT being validated.
+
+    - wrap        : turns the subquery's error into the caller's error
+    - columnError : error returned if the subquery does not select
+                    exactly one column (None to skip the check)
+
+    Returns None when queued. Outside a SELECT run (e.g. the WHERE
+    clause of an UPDATE) the subquery is validated on the spot and
+    its error, if any, is returned.
+    """
+    queue = _current.get()
+    if queue is not None:
+        queue.add(tokens, wrap, columnError)
+        return None
+
+    global _SelectParser
+    if _SelectParser is None:
+        _SelectParser = importlib.import_module("select_module.selectParser").SelectParser
+    return validateSelect(_SelectParser, tokens, wrap, columnError)
+
+
+def validateSelect(parserClass, tokens, wrap=None, columnError=None, onValidated=None):
+    """
+    Validates a SELECT and every subquery nested in it with an explicit
+    stack. Subqueries are validated depth first in the order they were
+    found; the first error is returned.
+
+    onValidated(parser, tokens), if given, is called for every query
+    level that passes its own checks, before its subqueries run.
+    """
+    stack = [(tokens, (wrap,) if wrap else (), columnError)]
+
+    while stack:
+        tokens, chain, columnError = stack.pop()
+
+        # Deferred single-column failure, reported after the
+        # subquery's own subqueries like the recursive validator did
+        if tokens is None:
+            return wrapError(columnError, chain)
+
+        parser = parserClass()
+        queue = SubqueryQueue(chain)
+        reset = _current.set(queue)
+        try:
+            err = parser.runChecks(tokens)
+        finally:
+            _current.reset(reset)
+
+        if err:
+            return wrapError(err, chain)
+
+        if onValidated is not None:
+            onValidated(parser, tokens)
+
+        if columnError is not None:
+            exprs, splitErr = parser.context.selectExprs
+            if splitErr or len(exprs) != 1:
+                stack.append((None, chain[1:], columnError))
+
+        stack.extend(reversed(queue.found))
+
+    return None
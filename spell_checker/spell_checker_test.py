@@ -0,0 +1,121 @@
+import difflib
+
+from spell_checker.utils import SpellChecker, SuggestionIndex, expected_error
+from spell_checker.vocabulary import Vocabulary, edit_distance, numpy
+from select_module.helper.utils import spell_check_tokens
+
+
+def rejects(*args, cls=SuggestionIndex, **options):
+    try:
+        cls(*args, **options)
+    except ValueError:
+        return True
+    return False
+
+
+failed_tests = []
+total_tests = 0
+
+print("\n===== SPELL CHECKER TEST RESULTS =====\n")
+
+#SUGGESTION CASES (the index answers like difflib.get_close_matches)
+
+words = ["ALTR", "TABEL", "ADDD", "DRQP", "MODIF", "COLMN", "INTEGR", "DATTE", "SELEC", "USERS", "X", "", "WHERE", "VARCHAR2"]
+cases = [
+    (f"matches difflib: {word!r}", SpellChecker.check(word),
+     [] if word in SpellChecker.KEYWORDS else difflib.get_close_matches(word, SpellChecker.KEYWORDS, n=3, cutoff=0.6))
+    for word in words
+]
+
+index = SuggestionIndex(["apple", "ape", "peach", "puppy"], cutoff=0.6)
+before = index.suggest.cache_info().hits
+repeated = [index.suggest("appel") for _ in range(3)]
+hits = index.suggest.cache_info().hits - before
+
+cases += [
+    ("case insensitive", SpellChecker.check("tabel"), ["TABLE"]),
+    ("keyword has no suggestions", SpellChecker.check("Select"), []),
+    ("best first", SpellChecker.check("datte"), ["DATE", "UPDATE", "DATETIME"]),
+    ("strict", (SpellChecker.check("test"), SpellChecker.check("test", strict=True)), (["TEXT"], [])),
+    ("other word lists", repeated[0], ("apple", "ape")),
+    ("memoized", hits, 2),
+    ("callers may change the result", SpellChecker.check("tabel").append("X") or SpellChecker.check("tabel"), ["TABLE"]),
+    ("bad n", rejects(["a"], n=0), True),
+    ("bad cutoff", rejects(["a"], cutoff=1.5), True),
+]
+
+#TOKEN-WIDE CHECK
+
+cases += [
+    ("misspelled keyword found", spell_check_tokens(["selec", "a", "from", "t"]),
+     [{"token": "selec", "position": 0, "suggestions": ["SELECT"]}]),
+    ("known SQL words skipped", spell_check_tokens(["update", "t", "set", "a", "=", "1"]), []),
+    ("strict skips names", spell_check_tokens(["select", "data", "from", "t"], strict=True), []),
+]
+
+#EXPECTED TOKENS (suggestions among the tokens legal at the failure point)
+
+cases += [
+    ("expected only", SpellChecker.expect("drp", ["ADD", "DROP", "MODIFY"]), ["DROP"]),
+    ("global match ignored", SpellChecker.expect("selec", ["ADD", "DROP", "MODIFY"]), []),
+    ("expected word itself", SpellChecker.expect("add", ["ADD", "DROP"]), []),
+    ("expected error", expected_error("Bad.", "FRM", ["FROM"]),
+     {"error": "Bad.", "suggestion": "Did you mean 'FROM' instead of 'FRM'?", "expected": ["FROM"]}),
+    ("fallback suggestion", expected_error("Bad.", "x", ["FROM"], "Use FROM.")["suggestion"], "Use FROM."),
+    ("expected listed", expected_error("Bad.", None, ["ASC", "DESC"])["suggestion"], "Expected one of: ASC, DESC."),
+    ("one expected token", expected_error("Bad.", None, ["AS"])["suggestion"], "Expected AS."),
+]
+
+#VOCABULARY (schema names, batch edit distance)
+
+NAMES = ["customer_id", "Customers", "orders", "order_total", "order_date", "users", "user_id", "ids", "id"]
+schema = Vocabulary(NAMES, backend="python")
+typos = ["custmer_id", "CUSTOMRS", "ordr_total", "order_dat", "usres", "users", "xyz", "idz"]
+expected = [["customer_id"], ["Customers"], ["order_total"], ["order_date"], ["users"], [], [], ["id", "ids"]]
+
+cases += [
+    ("edit distance", (edit_distance("kitten", "sitting", 3), edit_distance("kitten", "sitting", 2)), (3, 3)),
+    ("batch suggestions", schema.suggest_many(typos), expected),
+    ("one word", schema.suggest("usr_id"), ["user_id"]),
+    ("top k", Vocabulary(NAMES, k=1, backend="python").suggest("idz"), ["id"]),
+    ("distance limit", Vocabulary(NAMES, max_distance=1, backend="python").suggest("ordr_totl"), []),
+    ("memoized", sorted(schema.memo)[:2], ["custmer_id", "customrs"]),
+    ("check with a vocabulary", SpellChecker.check("usres", vocabulary=schema), ["users"]),
+    ("tokens with a vocabulary", spell_check_tokens(["select", "custmer_id", ",", "id", "from", "usres"], vocabulary=schema), [
+        {"token": "custmer_id", "position": 1, "suggestions": ["customer_id"]},
+        {"token": "usres", "position": 5, "suggestions": ["users"]},
+    ]),
+    ("bad vocabulary backend", rejects(NAMES, cls=Vocabulary, backend="gpu"), True),
+    ("bad k", rejects(NAMES, cls=Vocabulary, k=0), True),
+]
+
+if numpy is not None:
+    vectorized = Vocabulary(NAMES, backend="numpy")
+    cases.append(("numpy backend matches", vectorized.suggest_many(typos), expected))
+else:
+    cases.append(("numpy backend needs NumPy", rejects(NAMES, cls=Vocabulary, backend="numpy"), True))
+
+for name, got, expected in cases:
+    total_tests += 1
+
+    if got == expected:
+        print(f"[PASS] {name}")
+    else:
+        print(f"[FAIL] {name} -> {got} (expected {expected})")
+        failed_tests.append((name, got))
+
+
+#TEST SUMMARY
+
+print("\n===== TEST SUMMARY =====")
+print(f"Total Test Cases : {total_tests}")
+print(f"Passed           : {total_tests - len(failed_tests)}")
+print(f"Failed           : {len(failed_tests)}")
+
+if failed_tests:
+    print("\n--- Failed Test Descriptions ---")
+    for i, (q, got) in enumerate(failed_tests, start=1):
+        print(f"{i}. Case : {q!r}")
+        print(f"   Got  : {got}")
+else:
+    print("\nAll SPELL CHECKER tests passed successfully.")
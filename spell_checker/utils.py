@@ -1,32 +1,165 @@
 import difflib
+import heapq
+from collections import Counter
+from functools import lru_cache
+
+
+class SuggestionIndex:
+    """
+    Precomputed index of a frozen word list, answering
+    difflib.get_close_matches(word, words, n, cutoff) without scoring
+    every word.
+
+    get_close_matches runs a SequenceMatcher against each word and
+    keeps those whose ratio() reaches the cutoff. ratio() is bounded by
+    quick_ratio(), computed from the characters the two strings share,
+    so the index maps each character to the words holding it (with
+    their counts): one pass over the characters of the word gives the
+    shared count, and the bound, of every word at once. Only words whose
+    bound reaches the cutoff are scored, so the result is exactly that
+    of get_close_matches.
+
+    Results are memoized per word (maxsize distinct words).
+    """
+
+    def __init__(self, words, n=3, cutoff=0.6, maxsize=4096):
+        if not n > 0:
+            raise ValueError(f"n must be > 0: {n!r}")
+        if not 0.0 <= cutoff <= 1.0:
+            raise ValueError(f"cutoff must be in [0.0, 1.0]: {cutoff!r}")
+
+        self.words = tuple(words)
+        self.members = frozenset(self.words)
+        self.n = n
+        self.cutoff = cutoff
+        self.lengths = [len(word) for word in self.words]
+
+        # character -> [(word number, occurrences in that word)]
+        self.index = {}
+        for number, word in enumerate(self.words):
+            for char, count in Counter(word).items():
+                self.index.setdefault(char, []).append((number, count))
+
+        self.suggest = lru_cache(maxsize=maxsize)(self._suggest)
+
+    def _suggest(self, word):
+        """
+        Close matches of word, best first, as a tuple.
+        """
+        shared = [0] * len(self.words)
+        index = self.index
+        for char, count in Counter(word).items():
+            for number, occurrences in index.get(char, ()):
+                shared[number] += min(count, occurrences)
+
+        cutoff = self.cutoff
+        size = len(word)
+        result = []
+        matcher = None
+
+        for number, common in enumerate(shared):
+            total = size + self.lengths[number]
+            if 2.0 * common / total < cutoff:
+                continue
+
+            if matcher is None:
+                matcher = difflib.SequenceMatcher()
+                matcher.set_seq2(word)
+            candidate = self.words[number]
+            matcher.set_seq1(candidate)
+            score = matcher.ratio()
+            if score >= cutoff:
+                result.append((score, candidate))
+
+        # Same order as get_close_matches: best scorers first, ties by word
+        return tuple(candidate for _, candidate in heapq.nlargest(self.n, result))
+
 
 class SpellChecker:
     """
     A utility class to suggest corrections for misspelled SQL keywords.
     """
-    
+
     KEYWORDS = [
         "ALTER", "TABLE", "ADD", "DROP", "MODIFY", "COLUMN",
-        "INT", "INTEGER", "VARCHAR", "CHAR", "TEXT", "DATE", 
-        "DATETIME", "DECIMAL", "FLOAT", "BOOLEAN", "SELECT", 
+        "INT", "INTEGER", "VARCHAR", "CHAR", "TEXT", "DATE",
+        "DATETIME", "DECIMAL", "FLOAT", "BOOLEAN", "SELECT",
         "INSERT", "UPDATE", "DELETE", "FROM", "WHERE", "AND", "OR"
     ]
 
+    # Suggestions over the keywords above (frozen when the class is built).
+    # The strict index is for whole-query checks, where most words are
+    # names and a 60% match (test / TEXT) is usually not a typo.
+    INDEX = SuggestionIndex(KEYWORDS)
+    STRICT_INDEX = SuggestionIndex(KEYWORDS, cutoff=0.8)
+
     @staticmethod
-    def check(word):
+    def check(word, strict=False, vocabulary=None):
         """
         Checks if a word is a valid keyword. If not, returns suggestions.
-        
+
         Args:
             word (str): The word to check.
-            
+            strict (bool): Require 80% similarity instead of 60%.
+            vocabulary (Vocabulary): Check against these names (e.g. the
+                tables and columns of a schema) instead of the keywords.
+
         Returns:
             list: A list of suggested corrections if the word is close to a keyword.
         """
+        if vocabulary is not None:
+            return vocabulary.suggest(word)
+
+        index = SpellChecker.STRICT_INDEX if strict else SpellChecker.INDEX
         word_upper = word.upper()
-        if word_upper in SpellChecker.KEYWORDS:
+        if word_upper in index.members:
             return []
-            
-        # Get close matches (cutoff=0.6 means 60% similarity required)
-        matches = difflib.get_close_matches(word_upper, SpellChecker.KEYWORDS, n=3, cutoff=0.6)
-        return matches
+
+        # Close matches, memoized per word
+        return list(index.suggest(word_upper))
+
+    @staticmethod
+    def expect(word, expected):
+        """
+        Suggests corrections for a word among the tokens that are legal
+        where it stands, e.g. ADD, DROP or MODIFY after ALTER TABLE t.
+
+        Args:
+            word (str): The offending word.
+            expected (iterable): Tokens legal at that point (uppercase).
+
+        Returns:
+            list: Close matches among expected, best first.
+        """
+        return list(_close_matches(word.upper(), tuple(expected)))
+
+
+@lru_cache(maxsize=4096)
+def _close_matches(word, expected):
+    if word in expected:
+        return ()
+    return tuple(difflib.get_close_matches(word, expected, n=3, cutoff=0.6))
+
+
+def expected_error(error, word, expected, suggestion=None):
+    """
+    Error of a validator that stopped at `word` (None at the end of the
+    statement) where one of the `expected` tokens was legal.
+
+    The error lists the expected tokens (none: the statement should
+    have ended); its suggestion is the closest of them to word, else the
+    given suggestion, else the list itself.
+    """
+    expected = list(expected)
+    matches = SpellChecker.expect(word, expected) if word else []
+    if matches:
+        suggestion = f"Did you mean '{matches[0]}' instead of '{word}'?"
+    elif suggestion is None and len(expected) == 1:
+        suggestion = f"Expected {expected[0]}."
+    elif suggestion is None and expected:
+        suggestion = f"Expected one of: {', '.join(expected)}."
+    return {
+        "error": error,
+        "suggestion": suggestion,
+        "expected": expected
+    }
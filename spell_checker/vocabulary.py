@@ -0,0 +1,246 @@
+"""
+Typo suggestions against a large vocabulary of names (tables, columns).
+
+    from spell_checker.vocabulary import Vocabulary
+
+    names = Vocabulary(schema_names)             # 100k+ names
+    names.suggest("custmer_id")                  # ['customer_id']
+    names.suggest_many(["usres", "ordr_total"])  # one batch
+
+A word's suggestions are the names within max_distance edits of it
+(Levenshtein distance, case-insensitive), closest first and then in
+alphabetical order, at most k of them. Names are bucketed by length:
+a word of length n is only compared with the buckets of lengths
+n - max_distance to n + max_distance.
+
+Backends:
+- numpy  : each bucket is an encoded matrix (one row of code points per
+           name), and a batch of words of one length is scored against
+           it in one vectorized dynamic program over (words x names);
+           needs NumPy
+- python : the same search one pair at a time, stopping a pair as soon
+           as it cannot come within max_distance; no dependencies
+"""
+import heapq
+
+try:
+    import numpy
+except ImportError:         # optional: the python backend needs nothing
+    numpy = None
+
+
+BACKENDS = ("numpy", "python")
+
+# Cells of the dynamic program (words x names x name length) computed at
+# a time by the numpy backend; bounds its memory to a few tens of MB
+BLOCK_CELLS = 1 << 21
+
+# Words of one length scored together by the numpy backend
+WORD_BATCH = 64
+
+
+def edit_distance(a, b, limit):
+    """
+    Levenshtein distance of a and b, or limit + 1 if it exceeds limit.
+    """
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+
+    previous = list(range(len(b) + 1))
+    for i, char in enumerate(a, 1):
+        current = [i]
+        for j, other in enumerate(b, 1):
+            current.append(min(
+                previous[j - 1] + (char != other),
+                previous[j] + 1,
+                current[j - 1] + 1,
+            ))
+        # Every alignment goes through this row: its minimum only grows
+        if min(current) > limit:
+            return limit + 1
+        previous = current
+
+    return previous[-1] if previous[-1] <= limit else limit + 1
+
+
+class Vocabulary:
+    """
+    Frozen set of names answering typo suggestions in batches.
+
+    - names        : names to suggest (duplicates ignored, matched
+                     case-insensitively, returned as given)
+    - max_distance : largest edit distance of a suggestion
+    - k            : suggestions per word, at most
+    - backend      : "numpy" or "python" (default: numpy if installed)
+    - maxsize      : results memoized per word, at most
+    """
+
+    def __init__(self, names, max_distance=2, k=3, backend=None, maxsize=65536):
+        if backend is None:
+            backend = "numpy" if numpy is not None else "python"
+        if backend not in BACKENDS:
+            raise ValueError(f"unknown vocabulary backend {backend!r}; expected one of {BACKENDS}")
+        if backend == "numpy" and numpy is None:
+            raise ValueError("the numpy backend needs NumPy")
+        if max_distance < 0:
+            raise ValueError("max_distance must be at least 0")
+        if k < 1:
+            raise ValueError("k must be at least 1")
+
+        self.backend = backend
+        self.max_distance = max_distance
+        self.k = k
+        self.maxsize = maxsize
+        self.memo = {}
+
+        # lowercase key -> name as given (first spelling wins)
+        self.names = {}
+        for name in names:
+            self.names.setdefault(name.lower(), name)
+
+        # Bucket of each length: its keys in alphabetical order, so that
+        # among names at one distance the first found are the first in
+        # order
+        self.buckets = {}
+        for key in sorted(self.names):
+            self.buckets.setdefault(len(key), []).append(key)
+
+        if backend == "numpy":
+            self.matrices = {
+                length: numpy.frombuffer("".join(keys).encode("utf-32-le", "surrogatepass"), dtype=numpy.uint32)
+                .reshape(len(keys), length)
+                for length, keys in self.buckets.items()
+                if length
+            }
+
+    def __len__(self):
+        return len(self.names)
+
+    def __contains__(self, word):
+        return word.lower() in self.names
+
+    def suggest(self, word):
+        """
+        Suggestions for one word, closest first ([] for a known name).
+        """
+        return self.suggest_many([word])[0]
+
+    def suggest_many(self, words):
+        """
+        Suggestions for every word, as a list of lists in input order.
+        Words not seen before are scored together.
+        """
+        memo = self.memo
+        keys = [word.lower() for word in words]
+        pending = sorted({key for key in keys if key not in memo and key not in self.names})
+
+        if pending:
+            if len(memo) + len(pending) > self.maxsize:
+                memo.clear()
+            found = self._search_numpy(pending) if self.backend == "numpy" else self._search_python(pending)
+            names = self.names
+            for key in pending:
+                memo[key] = [names[name] for _, name in heapq.nsmallest(self.k, found.get(key, ()))]
+
+        return [[] if key in self.names else list(memo[key]) for key in keys]
+
+    # ---------------------------------------------------------
+    # Backends: key -> [(distance, name key)], each bucket's best k
+    # ---------------------------------------------------------
+
+    def _lengths(self, size):
+        limit = self.max_distance
+        return [length for length in range(max(size - limit, 0), size + limit + 1) if length in self.buckets]
+
+    def _search_python(self, keys):
+        limit = self.max_distance
+        k = self.k
+        found = {}
+
+        for key in keys:
+            candidates = found[key] = []
+            for length in self._lengths(len(key)):
+                scored = []
+                for name in self.buckets[length]:
+                    distance = edit_distance(key, name, limit)
+                    if distance <= limit:
+                        scored.append((distance, name))
+                candidates += heapq.nsmallest(k, scored)
+
+        return found
+
+    def _search_numpy(self, keys):
+        found = {key: [] for key in keys}
+        bySize = {}
+        for key in keys:
+            bySize.setdefault(len(key), []).append(key)
+
+        for size, group in bySize.items():
+            for first in range(0, len(group), WORD_BATCH):
+                batch = group[first:first + WORD_BATCH]
+                codes = numpy.frombuffer("".join(batch).encode("utf-32-le", "surrogatepass"), dtype=numpy.uint32)
+                codes = codes.reshape(len(batch), size)
+
+                for length in self._lengths(size):
+                    names = self.buckets[length]
+                    step = max(BLOCK_CELLS // (len(batch) * (length + 1)), 1)
+                    for start in range(0, len(names), step):
+                        if length:
+                            distances = self._distances(codes, self.matrices[length][start:start + step])
+                        else:
+                            distances = numpy.full((len(batch), 1), size)
+                        self._keep_best(batch, distances, names, start, found)
+
+        return found
+
+    def _distances(self, words, names):
+        """
+        Edit distances of every word (rows of code points, one length)
+        to every name (rows of code points, one length) as a (words x
+        names) matrix; pairs beyond max_distance may hold any larger
+        value.
+
+        One row of the dynamic program is computed per character of the
+        words, for every pair at once. Insertions chain along the row,
+        row[j] = min over i <= j of (row[i] + j - i), which is a running
+        minimum of row[i] - i.
+        """
+        count, size = words.shape
+        length = names.shape[1]
+        steps = numpy.arange(length + 1, dtype=numpy.int32)
+
+        row = numpy.broadcast_to(steps, (count, len(names), length + 1)).copy()
+        for i in range(size):
+            differ = names[None, :, :] != words[:, i, None, None]
+            current = numpy.empty_like(row)
+            current[:, :, 0] = i + 1
+            numpy.minimum(row[:, :, :-1] + differ, row[:, :, 1:] + 1, out=current[:, :, 1:])
+            current -= steps
+            numpy.minimum.accumulate(current, axis=2, out=current)
+            current += steps
+            row = current
+
+            # The row minimum bounds the final distance from below
+            if row.min() > self.max_distance:
+                break
+
+        return row[:, :, length]
+
+    def _keep_best(self, batch, distances, names, start, found):
+        """
+        Adds to found the best k names of a block for every word of the
+        batch: those within max_distance, closest first and, at equal
+        distance, first in the block (alphabetical order).
+        """
+        limit = self.max_distance
+        k = self.k
+
+        for w, key in enumerate(batch):
+            row = distances[w]
+            within = numpy.flatnonzero(row <= limit)
+            if len(within) > k:
+                kth = numpy.partition(row[within], k - 1)[k - 1]
+                below = within[row[within] < kth]
+                ties = within[row[within] == kth][:k - len(below)]
+                within = numpy.concatenate((below, ties))
+            found[key] += [(int(row[j]), names[start + j]) for j in within]
@@ -1,23 +1,27 @@
+from lexer.Lexer import Lexer
+from grammar.Grammar import Message
+from grammar.SqlGrammar import SQL
+
+
 class CommitChecker:
+    keyword = "commit"
+
+    MESSAGES = {
+        "commit_end": Message("Invalid COMMIT usage.", "COMMIT;",
+                              missing="Missing semicolon after COMMIT."),
+        None: Message("Invalid COMMIT usage.", "COMMIT;"),
+    }
+
     def validate(self, query: str):
         if not query or not query.strip():
             return None
 
-        cleaned = query.strip().upper()
+        stream = Lexer.tokenize(query)
+        return self.validate_tokens(stream.tokens, stream.kinds)
 
-        if not cleaned.startswith("COMMIT"):
+    def validate_tokens(self, tokens, kinds=None):
+        if not tokens or tokens[0] != self.keyword:
             return None  # not my statement
 
-        if cleaned == "COMMIT":
-            return {
-                "error": "Missing semicolon after COMMIT.",
-                "suggestion": "COMMIT;"
-            }
-
-        if cleaned == "COMMIT;":
-            return None
-
-        return {
-            "error": "Invalid COMMIT usage.",
-            "suggestion": "COMMIT;"
-        }
+        parse = SQL.parse("commit", tokens, kinds if kinds is not None else Lexer.classify(tokens))
+        return parse.error(self.MESSAGES, tokens)
@@ -1,33 +1,28 @@
-class RollbackChecker:
-    def validate(self, query: str):
-        if not query or not query.strip():
-            return None
+from lexer.Lexer import Lexer
+from grammar.Grammar import Message
+from grammar.SqlGrammar import SQL
 
-        cleaned = query.strip().upper()
 
-        if not cleaned.startswith("ROLLBACK"):
-            return None  # not my statement
+class RollbackChecker:
+    keyword = "rollback"
 
-        if cleaned == "ROLLBACK":
-            return {
-                "error": "Missing semicolon after ROLLBACK.",
-                "suggestion": "ROLLBACK;"
-            }
+    MESSAGES = {
+        "rollback_end": Message("Incorrect ROLLBACK syntax.", "ROLLBACK; or ROLLBACK TO savepoint_name;",
+                                missing=("Missing semicolon after ROLLBACK.", "ROLLBACK;")),
+        "rollback_to": Message("Invalid ROLLBACK TO syntax.", "ROLLBACK TO savepoint_name;"),
+        None: Message("Incorrect ROLLBACK syntax.", "ROLLBACK; or ROLLBACK TO savepoint_name;"),
+    }
 
-        if cleaned == "ROLLBACK;":
+    def validate(self, query: str):
+        if not query or not query.strip():
             return None
 
-        if cleaned.startswith("ROLLBACK TO"):
-            tokens = cleaned.rstrip(";").split()
-            if len(tokens) == 3:
-                return None
+        stream = Lexer.tokenize(query)
+        return self.validate_tokens(stream.tokens, stream.kinds)
 
-            return {
-                "error": "Invalid ROLLBACK TO syntax.",
-                "suggestion": "ROLLBACK TO savepoint_name;"
-            }
+    def validate_tokens(self, tokens, kinds=None):
+        if not tokens or tokens[0] != self.keyword:
+            return None  # not my statement
 
-        return {
-            "error": "Incorrect ROLLBACK syntax.",
-            "suggestion": "ROLLBACK; or ROLLBACK TO savepoint_name;"
-        }
+        parse = SQL.parse("rollback", tokens, kinds if kinds is not None else Lexer.classify(tokens))
+        return parse.error(self.MESSAGES, tokens)
@@ -1,25 +1,27 @@
+from lexer.Lexer import Lexer
+from grammar.Grammar import Message
+from grammar.SqlGrammar import SQL
+
+
 class SavepointChecker:
+    keyword = "savepoint"
+
+    MESSAGES = {
+        "savepoint_name": Message("Invalid SAVEPOINT syntax.", "SAVEPOINT sp1;",
+                                  missing="Missing savepoint name."),
+        "savepoint": Message("Invalid SAVEPOINT syntax.", "SAVEPOINT sp1;"),
+    }
+
     def validate(self, query: str):
         if not query or not query.strip():
             return None
 
-        cleaned = query.strip().upper()
+        stream = Lexer.tokenize(query)
+        return self.validate_tokens(stream.tokens, stream.kinds)
 
-        if not cleaned.startswith("SAVEPOINT"):
+    def validate_tokens(self, tokens, kinds=None):
+        if not tokens or tokens[0] != self.keyword:
             return None  # not my statement
 
-        tokens = cleaned.rstrip(";").split()
-
-        if cleaned in ("SAVEPOINT", "SAVEPOINT;"):
-            return {
-                "error": "Missing savepoint name.",
-                "suggestion": "SAVEPOINT sp1;"
-            }
-
-        if len(tokens) != 2:
-            return {
-                "error": "Invalid SAVEPOINT syntax.",
-                "suggestion": "SAVEPOINT sp1;"
-            }
-
-        return None  # ✅ valid
+        parse = SQL.parse("savepoint", tokens, kinds if kinds is not None else Lexer.classify(tokens))
+        return parse.error(self.MESSAGES, tokens)
@@ -1,3 +1,4 @@
+from lexer.Lexer import Lexer
 from tcl.commit_checker import CommitChecker
 from tcl.rollback_checker import RollbackChecker
 from tcl.savepoint_checker import SavepointChecker
@@ -15,19 +16,22 @@ class TCLValidator:
         if not query or not query.strip():
             return None
 
-        upper = query.strip().upper()
+        return self.validate_stream(Lexer.tokenize(query))
+
+    def validate_stream(self, stream):
+        tokens = stream.tokens
+        if not tokens:
+            return None
 
         for checker in self.checkers:
-            result = checker.validate(query)
+            result = checker.validate_tokens(tokens, stream.kinds)
 
             # If checker applies and finds an error
             if result is not None:
                 return result
 
             # If checker applies and is valid → stop
-            if upper.startswith(
-                ("COMMIT", "ROLLBACK", "SAVEPOINT")
-            ):
+            if tokens[0] == checker.keyword:
                 return None
 
         return {
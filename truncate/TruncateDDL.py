@@ -1,71 +1,71 @@
 from validator.SyntaxValidator import SyntaxValidator
+from lexer.Lexer import Lexer
+from grammar.Grammar import Message
+from grammar.SqlGrammar import SQL, statementEnd, stoppedAfter
 
 
 class TruncateDDL:
 
+    # Errors of a statement the grammar stops in, by rule
+    MESSAGES = {
+        "truncate": Message("Statement must start with TRUNCATE"),
+        "truncate_table": Message("TRUNCATE requires the TABLE keyword", missing="Incomplete TRUNCATE statement"),
+        "table_name": Message("Invalid table name '{token}'", missing="Table name is missing"),
+        "identity": Message("IDENTITY keyword must follow RESTART or CONTINUE"),
+        "truncate_options": Message("Unexpected keyword '{token}' in TRUNCATE statement"),
+    }
+
+    # Option -> the options it excludes, and the error for a second one
+    OPTION_GROUPS = {
+        "restart": (("restart", "continue"), "Duplicate identity option specified"),
+        "continue": (("restart", "continue"), "Duplicate identity option specified"),
+        "cascade": (("cascade", "restrict"), "Duplicate referential option specified"),
+        "restrict": (("cascade", "restrict"), "Duplicate referential option specified"),
+    }
+
     @staticmethod
     def validateTruncateQuery(query):
         if not query or not query.strip():
             return {"error": "Query is empty"}
 
-        if not SyntaxValidator.hasBalancedParentheses(query):
-            return {"error": "Unbalanced parentheses in query"}
-
-        query = query.strip().rstrip(";")
-        tokens = SyntaxValidator.tokenize(query)
-
-        if len(tokens) < 3:
-            return {"error": "Incomplete TRUNCATE statement"}
-
-        # ---- keyword validation ----
-        if tokens[0].upper() != "TRUNCATE":
-            return {"error": "Statement must start with TRUNCATE"}
-
-        if tokens[1].upper() != "TABLE":
-            return {"error": "TRUNCATE requires the TABLE keyword"}
-
-        index = 2
-
-        # ---- table name ----
-        if index >= len(tokens):
-            return {"error": "Table name is missing"}
-
-        tableName = tokens[index]
-        if not SyntaxValidator.isValidIdentifier(tableName):
-            return {"error": f"Invalid table name '{tableName}'"}
+        return TruncateDDL.validateTruncateStream(Lexer.tokenize(query))
 
-        index += 1
-
-        # ---- options ----
-        identityOption = None       # RESTART / CONTINUE
-        referentialOption = None    # CASCADE / RESTRICT
-
-        while index < len(tokens):
-            token = tokens[index].upper()
-
-            # RESTART / CONTINUE IDENTITY
-            if token in ("RESTART", "CONTINUE"):
-                if identityOption:
-                    return {"error": "Duplicate identity option specified"}
+    @staticmethod
+    def validateTruncateStream(stream):
+        if not stream.tokens:
+            return {"error": "Query is empty"}
 
-                if index + 1 >= len(tokens) or tokens[index + 1].upper() != "IDENTITY":
-                    return {"error": "IDENTITY keyword must follow RESTART or CONTINUE"}
+        if not stream.hasBalancedParentheses():
+            return {"error": "Unbalanced parentheses in query"}
 
-                identityOption = token
-                index += 2
-                continue
+        tokens = stream.tokens
+        parse = SQL.parse("truncate", tokens, stream.kinds, 0, statementEnd(tokens))
 
-            # CASCADE / RESTRICT
-            if token in ("CASCADE", "RESTRICT"):
-                if referentialOption:
-                    return {"error": "Duplicate referential option specified"}
+        # ---- names and options the grammar read ----
+        used = set()
 
-                referentialOption = token
-                index += 1
+        for rule, start, end in parse.spans:
+            if end is None:
                 continue
 
-            return {
-                "error": f"Unexpected keyword '{tokens[index]}' in TRUNCATE statement"
-            }
-
-        return None
+            if rule == "table_name":
+                tableName = stream.text(start, end)
+                if not SyntaxValidator.isValidIdentifier(tableName):
+                    return {"error": f"Invalid table name '{tableName}'"}
+
+            elif rule == "truncate_option":
+                group, duplicate = TruncateDDL.OPTION_GROUPS[tokens[start]]
+                if tokens[start] in used:
+                    return {"error": duplicate}
+                used.update(group)
+
+        # ---- a token after the name, worded by what it is ----
+        if stoppedAfter(parse, ("table_name",)):
+            word = tokens[parse.index]
+            if word in ("(", ")"):
+                return {"error": "Parentheses are not allowed after the table name"}
+            if word == ",":
+                return {"error": "Only one table can be truncated at a time"}
+
+        # Options already given are not suggested again
+        return parse.error(TruncateDDL.MESSAGES, stream.texts, exclude=used, starts=stream.starts)
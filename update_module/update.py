@@ -1,11 +1,36 @@
+from lexer.Lexer import Lexer
+from grammar.Grammar import Message
+from grammar.Expression import Expression
+from grammar.SqlGrammar import SQL, statementEnd
 from select_module.helper.whereChecksHelper import (
     extractConditions,
     checkParentheses,
-    validateBooleanExpr
+    validateBooleanExpr,
+    submitSubquery
 )
 
 
+SET_FORMAT = "Use: column = value [, column = value]"
+
+
 class UpdateCommand:
+    # Errors of a statement the grammar stops in, by rule
+    MESSAGES = {
+        "update": Message("UPDATE must appear exactly once."),
+        "update_table": Message("Invalid or missing table name"),
+        "update_set": Message("Missing SET clause.", "UPDATE requires a SET clause."),
+        "more_assignments": Message("Missing comma between SET assignments.", "Separate assignments with commas."),
+        "first_assignment": Message("Invalid SET assignment.", SET_FORMAT,
+                                    missing=("Empty SET clause.", "Specify at least one column assignment.")),
+        "next_assignment": Message("Invalid SET assignment.", SET_FORMAT,
+                                   missing=("Trailing comma in SET clause.", "Remove the trailing comma.")),
+        "clause": Message("Invalid WHERE clause.",
+                          missing=("Empty WHERE clause.", "Specify a condition after WHERE.")),
+    }
+
+    # Right-hand side of an assignment
+    VALUE = Expression(False, aggregates=False, subqueries=submitSubquery, place="SET clause")
+
     def __init__(self, query: str):
         self.query = query.strip() if isinstance(query, str) else ""
 
@@ -15,57 +40,36 @@ class UpdateCommand:
     def _is_identifier(self, token):
         if not token:
             return False
-        if token.upper() in {"UPDATE", "SET", "WHERE"}:
+        if token in {"update", "set", "where"}:
             return False
         if not token[0].isalpha():
             return False
         return all(ch.isalnum() or ch == "_" for ch in token)
 
-    def _tokenize(self):
-        sql = self.query
-        tokens = []
-        word = ""
-        i = 0
-
-        while i < len(sql):
-            ch = sql[i]
-
-            # string literal
-            if ch == "'":
-                literal = "'"
-                i += 1
-                while i < len(sql) and sql[i] != "'":
-                    literal += sql[i]
-                    i += 1
-                if i >= len(sql):
-                    return None  # unterminated string
-                literal += "'"
-                tokens.append(literal)
-                i += 1
-                continue
-
-            if ch.isalnum() or ch == "_":
-                word += ch
-            else:
-                if word:
-                    tokens.append(word.upper())
-                    word = ""
-                # ⬇️ ignore semicolons completely
-                if ch.strip() and ch != ";":
-                    tokens.append(ch)
-
-            i += 1
-
-        if word:
-            tokens.append(word.upper())
+    def _value_error(self, err):
+        # A whole value followed by a word: the next assignment
+        # (a = 1 b = 2) is missing its comma
+        if err["error"] == "Expected arithmetic operator":
+            return {
+                "error": "Missing comma between SET assignments.",
+                "suggestion": "Separate assignments with commas.",
+                "expected": ["','", "WHERE"]
+            }
 
-        return tokens
+        return {
+            "error": "Invalid SET value.",
+            "details": err,
+            "suggestion": SET_FORMAT
+        }
 
 
     # --------------------------------------------------
     # Validator
     # --------------------------------------------------
     def validate(self):
+        return self.validate_stream(Lexer.tokenize(self.query))
+
+    def validate_stream(self, stream):
         # ---- empty query ----
         if not self.query:
             return {
@@ -73,113 +77,66 @@ class UpdateCommand:
                 "suggestion": "Provide an UPDATE statement."
             }
 
-        tokens = self._tokenize()
-        if tokens is None:
-            return {
-                "error": "Unterminated string literal.",
-                "suggestion": "Close all string literals with a single quote."
-            }
+        tokens = stream.tokens
 
-        # ---- UPDATE keyword ----
-        if tokens.count("UPDATE") != 1:
-            return {
-                "error": "UPDATE must appear exactly once.",
-                "suggestion": None
-            }
+        # ---- keyword order ----
+        if "set" in tokens:
+            if tokens.count("set") != 1:
+                return {
+                    "error": "SET clause appears more than once.",
+                    "suggestion": None
+                }
 
-        if "SET" not in tokens:
-            return {
-                "error": "Missing SET clause.",
-                "suggestion": "UPDATE requires a SET clause."
-            }
+            if "where" in tokens and tokens.index("where") < tokens.index("set"):
+                return {
+                    "error": "WHERE clause appears before SET.",
+                    "suggestion": "Correct order is UPDATE → SET → WHERE."
+                }
 
-        if tokens.count("SET") != 1:
-            return {
-                "error": "SET clause appears more than once.",
-                "suggestion": None
-            }
+        # ---- UPDATE <table> SET <assignments> [WHERE <condition>] ----
+        parse = SQL.parse("update", tokens, stream.kinds, 0, statementEnd(tokens))
+        has_where = False
 
-        update_idx = tokens.index("UPDATE")
-        set_idx = tokens.index("SET")
-        where_idx = tokens.index("WHERE") if "WHERE" in tokens else None
+        for rule, start, end in parse.spans:
+            # The WHERE checks also word errors the grammar stops at in
+            # the clause (unbalanced parentheses)
+            if rule == "clause":
+                has_where = True
 
-        if set_idx < update_idx:
-            return {
-                "error": "SET clause appears before UPDATE.",
-                "suggestion": "Correct order is UPDATE → SET → WHERE."
-            }
+            if end is None:
+                continue
 
-        if where_idx is not None and where_idx < set_idx:
-            return {
-                "error": "WHERE clause appears before SET.",
-                "suggestion": "Correct order is UPDATE → SET → WHERE."
-            }
+            if rule == "update_table" and not self._is_identifier(tokens[start]):
+                return {
+                    "error": "Invalid or missing table name"
+                }
 
-        table_idx = update_idx + 1
-        if table_idx >= len(tokens) or not self._is_identifier(tokens[table_idx]):
-            return {
-                "error": "Invalid or missing table name"
-            }
+            if rule == "set_column" and not self._is_identifier(tokens[start]):
+                return {
+                    "error": "Invalid SET assignment.",
+                    "suggestion": SET_FORMAT
+                }
 
-        # NEXT TOKEN MUST BE SET (not another table)
-        next_idx = table_idx + 1
-        if next_idx >= len(tokens) or tokens[next_idx].lower() != "set":
-            return {
-                "error": "UPDATE supports only one table",
-                "suggestion": "Use UPDATE <table> SET column = value"
-            }
-        # --------------------------------------------------
-        # SET clause validation (multiple assignments)
-        # --------------------------------------------------
-        set_start = set_idx + 1
-        set_end = where_idx if where_idx is not None else len(tokens)
-        set_tokens = tokens[set_start:set_end]
+            if rule == "set_value":
+                err = self.VALUE.check(stream.span(start, end))
+                if err:
+                    return self._value_error(err)
 
-        if not set_tokens:
-            return {
-                "error": "Empty SET clause.",
-                "suggestion": "Specify at least one column assignment."
-            }
+        if not parse.ok and not has_where:
+            # Another table (UPDATE a, b / UPDATE a.b) where SET belongs
+            if parse.rules[0][0] == "update_set" and parse.index < parse.end and tokens[parse.index] in (",", "."):
+                return {
+                    "error": "UPDATE supports only one table",
+                    "suggestion": "Use UPDATE <table> SET column = value"
+                }
 
-        i = 0
-        expecting_assignment = True
-
-        while i < len(set_tokens):
-            if expecting_assignment:
-                if (
-                    i + 2 >= len(set_tokens)
-                    or not self._is_identifier(set_tokens[i])
-                    or set_tokens[i + 1] != "="
-                ):
-                    return {
-                        "error": "Invalid SET assignment.",
-                        "suggestion": "Use: column = value [, column = value]"
-                    }
-                i += 3
-                expecting_assignment = False
-            else:
-                if set_tokens[i] != ",":
-                    return {
-                        "error": "Missing comma between SET assignments.",
-                        "suggestion": "Separate assignments with commas."
-                    }
-                i += 1
-                expecting_assignment = True
-
-        if expecting_assignment:
-            return {
-                "error": "Trailing comma in SET clause.",
-                "suggestion": "Remove the trailing comma."
-            }
+            return parse.error(self.MESSAGES, stream.texts, starts=stream.starts)
 
         # --------------------------------------------------
         # WHERE clause (REUSED from SELECT module)
         # --------------------------------------------------
-        if where_idx is not None:
-            # WHERE engine expects lowercase tokens
-            lower_tokens = [t.lower() if isinstance(t, str) else t for t in tokens]
-
-            where_tokens = extractConditions(lower_tokens)
+        if has_where:
+            where_tokens = extractConditions(stream.span(0, parse.end))
             if not where_tokens:
                 return {
                     "error": "Empty WHERE clause.",
@@ -194,5 +151,4 @@ class UpdateCommand:
             if err:
                 return err
 
-        # ---- valid ----
-        return None
+        return parse.error(self.MESSAGES, stream.texts, starts=stream.starts)
@@ -49,64 +49,6 @@ class SyntaxValidator:
 
     #LIST / COMMA HELPERS 
 
-    #tokenize
-    """The tokenize method splits a SQL query into tokens while respecting quoted identifiers,
-    i.e. "users name" should be treated as a single token, 
-    ensuring that spaces within quotes do not break the tokenization."""
-    @staticmethod
-    def tokenize(name):
-    
-        tokens = []
-        current = ""
-        in_quote = False
-        quote_char = ""
-
-        for ch in name:
-            if ch in ('"', '`'):
-                if in_quote and ch == quote_char:
-                    in_quote = False
-                elif not in_quote:
-                    in_quote = True
-                    quote_char = ch
-
-            if ch.isspace() and not in_quote:
-                if current:
-                    tokens.append(current)
-                    current = ""
-            else:
-                current += ch
-
-        if current:
-            tokens.append(current)
-
-        return tokens
-
-
-    #hasBalancedParentheses
-    """The hasBalancedParentheses method checks if the parentheses in the query are balanced, 
-    ensuring that every opening parenthesis has a corresponding closing parenthesis and that they are properly nested."""
-    @staticmethod
-    def hasBalancedParentheses(name):
-        depth = 0
-        in_quote = False
-
-        for ch in name:
-            if ch in ('"', '`'):
-                in_quote = not in_quote
-
-            if in_quote:
-                continue
-
-            if ch == '(':
-                depth += 1
-            elif ch == ')':
-                depth -= 1
-                if depth < 0:
-                    return False
-
-        return depth == 0
-    
-
     #splitSimpleComma
     """The splitSimpleComma method splits a string by commas and trims whitespace from each part, 
     returning a list of non-empty parts. This is useful for parsing lists of identifiers or values in SQL queries."""
@@ -114,29 +56,6 @@ class SyntaxValidator:
     def splitSimpleComma(text):
         return [p.strip() for p in text.split(',') if p.strip()]
 
-    @staticmethod
-    def splitByCommaRespectingParens(text):
-        tokens = []
-        current = ""
-        depth = 0
-
-        for ch in text:
-            if ch == '(':
-                depth += 1
-            elif ch == ')':
-                depth -= 1
-
-            if ch == ',' and depth == 0:
-                tokens.append(current.strip())
-                current = ""
-            else:
-                current += ch
-
-        if current.strip():
-            tokens.append(current.strip())
-
-        return tokens
-
     #BASIC KEYWORD CHECK 
 
     #startsWithKeyword